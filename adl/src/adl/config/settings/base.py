@@ -309,6 +309,13 @@ CELERY_TASK_ROUTES = {
     # The sweep records rows a starved or dead ingestion worker left behind,
     # so it must not share that queue — routed with dispatch, its own worker
     'adl.core.tasks.sweep_stale_activity_logs': {'queue': 'dispatch'},
+    # Historical backfills get their own worker, so they never queue ahead
+    # of scheduled ingestion. See adl.core.backfill
+    'adl.core.tasks.run_backfill_slice': {'queue': 'backfill'},
+    'adl.core.tasks.resume_backfill_jobs': {'queue': 'backfill'},
+    # Long set-based deletes, kept off the ingestion and dispatch workers.
+    # See adl.core.retention
+    'adl.core.tasks.apply_raw_retention': {'queue': 'backfill'},
 }
 
 CACHES = {
@@ -335,6 +342,9 @@ EVENTSTREAM_CHANNELMANAGER_CLASS = 'django_eventstream.channelmanager.DefaultCha
 
 ADL_LOG_LEVEL = env.str("ADL_LOG_LEVEL", "INFO")
 ADL_DATABASE_LOG_LEVEL = env.str("ADL_DATABASE_LOG_LEVEL", "ERROR")
+# Lowest level of the task log lines streamed to the live monitor, independent
+# of ADL_LOG_LEVEL. See adl.core.logging
+ADL_LOG_STREAM_LEVEL = env.str("ADL_LOG_STREAM_LEVEL", "INFO")
 
 LOGGING = {
     "version": 1,
@@ -449,3 +459,29 @@ DBBACKUP_CONNECTOR_MAPPING = {
 
 # pg_tileserv base url
 ADL_PG_TILESERV_BASE_URL = env.str("ADL_PG_TILESERV_BASE_URL", "")
+
+# How ingestion upserts observation chunks: "bulk_create" or "copy".
+# See adl.core.upsert
+ADL_OBSERVATION_WRITER = env.str("ADL_OBSERVATION_WRITER", "bulk_create")
+
+# How many chunks of records ingestion may read from a source ahead of the
+# chunk being saved, on a background thread. 0 reads and saves in turn.
+# See Plugin._prefetch_iterator
+ADL_INGEST_PIPELINE_DEPTH = env.int("ADL_INGEST_PIPELINE_DEPTH", 0)
+
+# Bearer token a Prometheus scraper sends to /metrics. The endpoint is
+# disabled while empty. See adl.core.metrics
+ADL_METRICS_TOKEN = env.str("ADL_METRICS_TOKEN", "")
+
+# Soft time limit of one historical backfill slice (one station link over a
+# job's slice length). See adl.core.backfill
+ADL_BACKFILL_SLICE_TIME_LIMIT_SECONDS = env.int("ADL_BACKFILL_SLICE_TIME_LIMIT_SECONDS", 3600)
+
+# How many days of station activity logs are kept. Older logs are dropped a
+# whole day's chunk at a time. See adl.monitoring.tasks
+ADL_ACTIVITY_LOG_RETENTION_DAYS = env.int("ADL_ACTIVITY_LOG_RETENTION_DAYS", 7)
+
+# Where connections with "Archive Raw Records" keep what their source
+# returned, for replay. Not under MEDIA_ROOT, which the web proxy serves.
+# See adl.core.archive
+ADL_RAW_ARCHIVE_ROOT = env.str("ADL_RAW_ARCHIVE_ROOT", os.path.join(BASE_DIR, "raw_archive"))
@@ -9,6 +9,7 @@ from rest_framework_simplejwt.views import (
 from wagtail.admin import urls as wagtailadmin_urls
 
 from adl.api import urls as api_urls
+from adl.core.views import metrics
 from wagtail.documents import urls as wagtaildocs_urls
 
 urlpatterns = [
@@ -33,6 +34,8 @@ urlpatterns = [
 
     path("display/", include("adl.viewer.display_urls")),
 
+    path("metrics", metrics, name="metrics"),
+
     path("", include(wagtailadmin_urls)),
 ]
 
@@ -0,0 +1,149 @@
+"""
+The TimescaleDB continuous aggregates over observations.
+
+``obs_agg_1h`` (migration 0059) is built from the raw hypertable. The
+rollups are built on top of it, hierarchically:
+
+- ``obs_agg_1d`` buckets the hourly rows by UTC day,
+- ``obs_agg_1mo`` buckets the daily rows by month.
+
+Each is read through a ``_v`` wrapper view that adds the key Django needs
+(:class:`~adl.core.models.HourlyObsAgg`, :class:`~adl.core.models.DailyObsAgg`,
+:class:`~adl.core.models.MonthlyObsAgg`). Every level keeps sums and counts
+rather than averages, so that coarser buckets combine finer ones exactly:
+the wrapper views derive ``avg_value`` as ``sum_value / records_count``, or,
+for parameters aggregated as ``circular``, as the angle of the summed sines
+and cosines. A parameter's aggregation method therefore applies to data
+already aggregated as soon as it is changed.
+
+``obs_agg_10m``, built from the raw hypertable like the hourly one, is
+optional: it costs refresh time on every write, so it exists only once
+:func:`create_ten_minute_aggregate` has been run (``manage.py
+ten_minute_aggregate --enable``).
+
+The rollups read only the hourly aggregate, which outlives raw rows (see
+:mod:`adl.core.retention`), so refreshing them is safe over any range. Their
+policies only cover recent buckets; ``manage.py refresh_hourly_agg
+--rollups-only`` fills them over the whole hourly history without touching
+the hourly aggregate itself.
+"""
+
+from datetime import timedelta
+
+TEN_MINUTE_AGGREGATE = "obs_agg_10m"
+HOURLY_AGGREGATE = "obs_agg_1h"
+DAILY_AGGREGATE = "obs_agg_1d"
+MONTHLY_AGGREGATE = "obs_agg_1mo"
+
+#: Rollups built on the hourly aggregate, finest first
+ROLLUPS = (DAILY_AGGREGATE, MONTHLY_AGGREGATE)
+
+# A refresh only covers whole buckets inside its window; rollup windows are
+# widened by a bucket on each side so the edges are included
+_ROLLUP_WINDOW_MARGIN = {
+    DAILY_AGGREGATE: timedelta(days=1),
+    MONTHLY_AGGREGATE: timedelta(days=31),
+}
+
+
+def aggregate_exists(cursor, name):
+    cursor.execute(
+        "SELECT 1 FROM timescaledb_information.continuous_aggregates WHERE view_name = %s",
+        [name],
+    )
+    return cursor.fetchone() is not None
+
+
+def refresh_rollups(cursor, start, end):
+    """
+    Re-derive the daily and monthly rollups over ``[start, end)`` from the
+    hourly aggregate, after the hourly one has been refreshed there. Must be
+    called outside a transaction.
+    """
+    for name in ROLLUPS:
+        margin = _ROLLUP_WINDOW_MARGIN[name]
+        cursor.execute(
+            "CALL refresh_continuous_aggregate(%s::regclass, %s, %s)",
+            [name, start - margin, end + margin],
+        )
+
+
+def create_ten_minute_aggregate(cursor, observation_table, parameter_table):
+    """Create ``obs_agg_10m``, its wrapper view and its refresh policy."""
+    cursor.execute(f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {TEN_MINUTE_AGGREGATE}
+        WITH (timescaledb.continuous) AS
+        SELECT
+          station_id,
+          connection_id,
+          parameter_id,
+          time_bucket('10 minutes', time) AS bucket,
+          MIN(value)                 AS min_value,
+          MAX(value)                 AS max_value,
+          SUM(value)                 AS sum_value,
+          SUM(sin(radians(value)))   AS sin_sum,
+          SUM(cos(radians(value)))   AS cos_sum,
+          COUNT(*)                   AS records_count
+        FROM {observation_table}
+        WHERE is_daily = false
+        GROUP BY station_id, connection_id, parameter_id, bucket
+        WITH NO DATA;
+
+        ALTER MATERIALIZED VIEW {TEN_MINUTE_AGGREGATE}
+        SET (timescaledb.materialized_only = false);
+
+        CREATE INDEX IF NOT EXISTS {TEN_MINUTE_AGGREGATE}_idx
+          ON {TEN_MINUTE_AGGREGATE} (station_id, connection_id, parameter_id, bucket);
+
+        {wrapper_view_sql(TEN_MINUTE_AGGREGATE, parameter_table)}
+
+        SELECT add_continuous_aggregate_policy(
+          '{TEN_MINUTE_AGGREGATE}',
+          start_offset      => INTERVAL '90 days',
+          end_offset        => INTERVAL '10 minutes',
+          schedule_interval => INTERVAL '5 minutes',
+          if_not_exists     => true
+        );
+    """)
+
+
+def drop_ten_minute_aggregate(cursor):
+    cursor.execute(f"""
+        DROP VIEW IF EXISTS {TEN_MINUTE_AGGREGATE}_v;
+        DROP MATERIALIZED VIEW IF EXISTS {TEN_MINUTE_AGGREGATE};
+    """)
+
+
+def wrapper_view_sql(name, parameter_table):
+    """
+    The ``<name>_v`` view over an aggregate that keeps sums: a deterministic
+    key for Django, and ``avg_value`` derived per the parameter's
+    aggregation method.
+    """
+    return f"""
+        CREATE OR REPLACE VIEW {name}_v AS
+        SELECT
+          md5(
+            a.station_id::text || ':' ||
+            a.connection_id::text || ':' ||
+            a.parameter_id::text || ':' ||
+            extract(epoch from a.bucket)::text
+          ) AS id,
+          a.station_id,
+          a.connection_id,
+          a.parameter_id,
+          a.bucket,
+          a.min_value,
+          a.max_value,
+          CASE
+            WHEN param.aggregation_method = 'circular' THEN
+              CASE WHEN c.angle < 0 THEN c.angle + 360 ELSE c.angle END
+            ELSE
+              a.sum_value / NULLIF(a.records_count, 0)
+          END AS avg_value,
+          a.sum_value,
+          a.records_count
+        FROM {name} a
+        INNER JOIN {parameter_table} param ON param.id = a.parameter_id
+        CROSS JOIN LATERAL (SELECT degrees(atan2(a.sin_sum, a.cos_sum)) AS angle) c;
+    """
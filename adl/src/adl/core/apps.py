@@ -7,7 +7,8 @@ class CoreConfig(AppConfig):
     name = 'adl.core'
 
     def ready(self):
-        from .models import NetworkConnection, DispatchChannel
+        from .compression import update_observation_compression_policy
+        from .models import AdlSettings, NetworkConnection, DispatchChannel
         from .tasks import (
             delete_dispatch_channel_periodic_tasks,
             delete_network_plugin_periodic_tasks,
@@ -36,3 +37,7 @@ class CoreConfig(AppConfig):
 
         for model in [DispatchChannel, *dispatch_channel_models]:
             post_delete.connect(delete_dispatch_channel_periodic_tasks, sender=model)
+
+        # The compression age is configured in ADL Settings but enforced by a
+        # TimescaleDB policy, which has to follow every change
+        post_save.connect(update_observation_compression_policy, sender=AdlSettings)
@@ -0,0 +1,188 @@
+"""
+Raw record archive, and replay of archived records through the save path.
+
+With ``archive_raw_records`` set on a connection, every ingestion run writes
+what :meth:`~adl.core.registries.Plugin.get_station_data` yielded, untouched,
+to one gzip-compressed NDJSON file under ``ADL_RAW_ARCHIVE_ROOT``::
+
+    <connection id>/<station link id>/<window start>_<window end>_<activity log id>.ndjson.gz
+
+The file is written as the run consumes the source, so archiving holds no
+extra records in memory, and renamed into place when the run ends — on
+failure too, keeping whatever the source yielded before it failed.
+
+After a change to a unit mapping, a QC configuration or a plugin fix,
+:func:`replay_station_link` feeds a station link's archived records for a
+window back through :meth:`~adl.core.registries.Plugin.process_station` in
+place of the source: same normalization, QC, upsert and activity log, no
+upstream request. The ``replay_raw_archive`` management command runs it for
+many station links in parallel.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone as py_tz
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+_STAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+_FILE_PATTERN = re.compile(r"^(?P<start>\d{8}T\d{6}Z)_(?P<end>\d{8}T\d{6}Z)_(?P<run>\w+)\.ndjson\.gz$")
+
+
+class _RecordEncoder(DjangoJSONEncoder):
+    # Full precision: the Django encoder cuts datetimes to milliseconds
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def archive_root() -> Path:
+    return Path(settings.ADL_RAW_ARCHIVE_ROOT)
+
+
+def station_link_archive_dir(station_link) -> Path:
+    return archive_root() / str(station_link.network_connection_id) / str(station_link.id)
+
+
+def _stamp(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(py_tz.utc)
+    return value.strftime(_STAMP_FORMAT)
+
+
+def _parse_stamp(value: str) -> datetime:
+    return datetime.strptime(value, _STAMP_FORMAT).replace(tzinfo=py_tz.utc)
+
+
+def archive_records(station_link, records, start_date, end_date, run_id):
+    """
+    Yield ``records`` unchanged, writing every record dict to the station
+    link's archive file for the run as it passes. Non-record items such as
+    :data:`~adl.core.registries.FLUSH` pass through without being written.
+
+    The archive never fails the run: if the file cannot be written, the
+    records keep flowing and the run is simply not archived.
+    """
+    directory = station_link_archive_dir(station_link)
+    final_path = directory / f"{_stamp(start_date)}_{_stamp(end_date)}_{run_id}.ndjson.gz"
+    partial_path = final_path.with_name(final_path.name + ".partial")
+
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        archive = gzip.open(partial_path, "wt", encoding="utf-8")
+    except OSError as e:
+        logger.warning("Cannot archive raw records of station link %s: %s", station_link.id, e)
+        yield from records
+        return
+
+    written = 0
+    try:
+        for record in records:
+            if archive is not None and isinstance(record, dict):
+                try:
+                    archive.write(json.dumps(record, cls=_RecordEncoder) + "\n")
+                    written += 1
+                except (OSError, TypeError, ValueError) as e:
+                    logger.warning("Stopped archiving raw records of station link %s: %s", station_link.id, e)
+                    archive.close()
+                    archive = None
+                    partial_path.unlink(missing_ok=True)
+            yield record
+    finally:
+        if archive is not None:
+            archive.close()
+            if written:
+                os.replace(partial_path, final_path)
+            else:
+                partial_path.unlink(missing_ok=True)
+
+
+class ArchivedRun:
+    """One archived run's file and the window it was fetched for."""
+    __slots__ = ("path", "start_date", "end_date")
+
+    def __init__(self, path, start_date, end_date):
+        self.path = path
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def read(self):
+        """The run's records, one dict per line, as they were archived."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def archived_runs(station_link, start_date=None, end_date=None):
+    """
+    The station link's archived runs whose window overlaps
+    ``[start_date, end_date]``, oldest first.
+    """
+    directory = station_link_archive_dir(station_link)
+    if not directory.is_dir():
+        return []
+
+    runs = []
+    for path in directory.iterdir():
+        match = _FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        run = ArchivedRun(path, _parse_stamp(match["start"]), _parse_stamp(match["end"]))
+        if start_date is not None and run.end_date < start_date:
+            continue
+        if end_date is not None and run.start_date > end_date:
+            continue
+        runs.append(run)
+    return sorted(runs, key=lambda run: (run.start_date, run.end_date, run.path.name))
+
+
+def replay_station_link(plugin, station_link, start_date=None, end_date=None):
+    """
+    Re-ingest the station link's archived records within ``[start_date,
+    end_date]`` — by default, everything archived for it. Returns the number
+    of records saved, or ``None`` when nothing is archived for the window.
+
+    Overlapping runs repeat records; the save path deduplicates them. Like
+    a backfill, a replay never reaches below
+    :func:`~adl.core.retention.backfill_floor`: retention may already have
+    aggregated and deleted the rows there, and rows written again would be
+    deleted without the hourly aggregate ever covering them. The window is
+    cut short at the floor, and a window wholly below it replays nothing.
+    """
+    from .retention import backfill_floor
+
+    floor = backfill_floor(station_link.network_connection)
+    if floor is not None and (start_date is None or start_date < floor):
+        if end_date is not None and end_date <= floor:
+            return None
+        start_date = floor
+
+    runs = archived_runs(station_link, start_date, end_date)
+    if not runs:
+        return None
+
+    window_start = start_date or runs[0].start_date
+    window_end = end_date or max(run.end_date for run in runs)
+
+    def archived_source(station_link, start_date=None, end_date=None):
+        for run in runs:
+            yield from run.read()
+
+    return plugin.process_station(
+        station_link,
+        initial_start_date=window_start,
+        initial_end_date=window_end,
+        bypass_lock=True,
+        record_source=archived_source,
+        latest_saved_time=None,
+        archive_raw=False,
+    )
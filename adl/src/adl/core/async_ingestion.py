@@ -0,0 +1,323 @@
+"""
+Running :meth:`~adl.core.registries.Plugin.aget_station_data` sources.
+
+A plugin that implements the async contract has a whole batch fetched on one
+event loop, with a single pooled ``httpx.AsyncClient`` shared between its
+stations. Every station's async generator runs as a task on that loop from
+the start of the batch, at most :data:`ASYNC_MAX_CONCURRENT_FETCHES` of them
+awaiting upstream at once, and feeds a bounded queue of its own. Only the
+saving is handed to threads: a pool of ``max_concurrent_stations`` threads
+(see :func:`~adl.core.tasks.effective_max_concurrent_stations`) runs each
+station's :meth:`~adl.core.registries.Plugin.process_station` — lock,
+activity log, :meth:`~adl.core.registries.Plugin._iter_save_records` and all
+— draining the station's queue as its record source. A fetch that gets a
+queue's length ahead of its saves waits, and one that yields a
+:data:`~adl.core.registries.FLUSH` is not resumed until the records before
+it have been saved, exactly as with a synchronous source.
+
+Outside a batch (manual collection, backfills, the shell) the default
+:meth:`~adl.core.registries.Plugin.get_station_data` drives the generator on a
+private loop with :func:`iter_async_station_data`.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from celery.exceptions import SoftTimeLimitExceeded
+
+from .registries import FLUSH
+
+# Pool limits of the shared client. One batch holds at most ``batch_size``
+# stations, so these bound the connections a worker opens to upstream APIs
+ASYNC_HTTP_MAX_CONNECTIONS = 100
+ASYNC_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+ASYNC_HTTP_TIMEOUT_SECONDS = 30
+
+#: Station fetches awaiting upstream at once in one batch. Held only around
+#: each step of a generator, never while it waits on its queue, so a fetch
+#: that is ahead of its saves does not keep others waiting
+ASYNC_MAX_CONCURRENT_FETCHES = ASYNC_HTTP_MAX_CONNECTIONS
+
+# How often a save thread waiting on the loop checks whether the batch was
+# cut off, which it otherwise would only notice at its next record
+_BRIDGE_POLL_SECONDS = 0.5
+
+_current_http_client = contextvars.ContextVar("adl_async_http_client", default=None)
+
+
+def build_async_http_client():
+    import httpx
+
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(ASYNC_HTTP_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=ASYNC_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        follow_redirects=True,
+    )
+
+
+def current_async_http_client():
+    client = _current_http_client.get()
+    if client is None:
+        raise RuntimeError("The shared async HTTP client only exists while aget_station_data runs.")
+    return client
+
+
+def _client_context(client):
+    context = contextvars.copy_context()
+    context.run(_current_http_client.set, client)
+    return context
+
+
+def _drain(agen, run):
+    try:
+        while True:
+            try:
+                record = run(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            yield record
+    finally:
+        run(agen.aclose())
+
+
+def iter_async_station_data(plugin, station_link, start_date=None, end_date=None):
+    """
+    Iterate a plugin's :meth:`aget_station_data` from synchronous code, on an
+    event loop and HTTP client of its own that live as long as the iteration.
+    """
+    loop = asyncio.new_event_loop()
+    client = build_async_http_client()
+    context = _client_context(client)
+
+    def run(coro):
+        return context.run(loop.run_until_complete, coro)
+
+    try:
+        agen = context.run(plugin.aget_station_data, station_link, start_date=start_date, end_date=end_date)
+        yield from _drain(agen, run)
+    finally:
+        try:
+            run(client.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+
+# The end of a station's records in its queue
+_END = object()
+
+
+class _FetchFailed:
+    """An error raised by a station's generator, re-raised to its save thread."""
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class _StationFetch:
+    """
+    One station's :meth:`aget_station_data`, run as a task on the batch's
+    loop, and the bounded queue its save thread drains.
+    """
+    __slots__ = ("window", "queue", "resume", "task")
+
+    def __init__(self, window, depth):
+        self.window = window
+        self.queue = asyncio.Queue(maxsize=depth)
+        # Set by the save thread once the records before a FLUSH are saved
+        self.resume = asyncio.Event()
+        self.task = None
+
+
+class _BatchFeed:
+    """
+    The fetches of one batch, and the record sources that hand their records
+    over to the save threads.
+    """
+    __slots__ = ("plugin", "loop", "client", "fetching", "cancelled", "fetches")
+
+    def __init__(self, plugin, loop, client, fetching, cancelled):
+        self.plugin = plugin
+        self.loop = loop
+        self.client = client
+        self.fetching = fetching
+        self.cancelled = cancelled
+        self.fetches = {}
+
+    def start(self, station_link, window):
+        """Start fetching ``station_link`` over ``window``; on the loop."""
+        fetch = _StationFetch(window, self.plugin.SAVE_CHUNK_SIZE)
+        fetch.task = self.loop.create_task(self._fetch(station_link, fetch))
+        self.fetches[station_link.id] = fetch
+        return fetch
+
+    async def _start(self, station_link, window):
+        return self.start(station_link, window)
+
+    async def _fetch(self, station_link, fetch):
+        _current_http_client.set(self.client)
+        start_date, end_date = fetch.window
+        agen = self.plugin.aget_station_data(station_link, start_date=start_date, end_date=end_date)
+        try:
+            while True:
+                async with self.fetching:
+                    try:
+                        record = await agen.__anext__()
+                    except StopAsyncIteration:
+                        break
+                await fetch.queue.put(record)
+                if record is FLUSH:
+                    await fetch.resume.wait()
+                    fetch.resume.clear()
+            await fetch.queue.put(_END)
+        except Exception as e:
+            await fetch.queue.put(_FetchFailed(e))
+        finally:
+            await agen.aclose()
+
+    def _run(self, coro):
+        if self.cancelled.is_set():
+            coro.close()
+            raise SoftTimeLimitExceeded()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        while True:
+            try:
+                return future.result(timeout=_BRIDGE_POLL_SECONDS)
+            except FutureTimeoutError:
+                if self.cancelled.is_set():
+                    future.cancel()
+                    raise SoftTimeLimitExceeded()
+
+    def station_records(self, station_link, start_date=None, end_date=None):
+        """
+        The record source of ``station_link``'s save thread: the records its
+        fetch has queued. A window other than the one fetched (a station whose
+        window could not be resolved up front) is fetched from here.
+        """
+        fetch = self.fetches.get(station_link.id)
+        if fetch is None or fetch.window != (start_date, end_date):
+            self.stop(station_link.id)
+            fetch = self._run(self._start(station_link, (start_date, end_date)))
+        while True:
+            record = self._run(fetch.queue.get())
+            if record is _END:
+                return
+            if isinstance(record, _FetchFailed):
+                raise record.error
+            yield record
+            if record is FLUSH:
+                self.loop.call_soon_threadsafe(fetch.resume.set)
+
+    def stop(self, station_link_id):
+        """
+        Cancel a station's fetch once its save thread is done with it — also
+        when the station was skipped or failed before reading its records.
+        Once the batch is cut off the loop no longer runs; the batch's own
+        task cancels what is left.
+        """
+        fetch = self.fetches.get(station_link_id)
+        if fetch is not None and not self.cancelled.is_set() and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(fetch.task.cancel)
+
+
+def _save_station(feed, plugin, station_link_id, task_id, threads, window, process_kwargs):
+    from .tasks import _process_station_in_thread
+
+    if window is not None:
+        process_kwargs = {**process_kwargs, "initial_start_date": window[0], "initial_end_date": window[1]}
+    try:
+        return _process_station_in_thread(
+            plugin, station_link_id, task_id, threads, record_source=feed.station_records, **process_kwargs
+        )
+    finally:
+        feed.stop(station_link_id)
+
+
+async def _run_batch(plugin, windows, task_id, threads, executor, futures, process_kwargs):
+    loop = asyncio.get_running_loop()
+    station_links = process_kwargs.get("station_links") or {}
+    async with build_async_http_client() as client:
+        fetching = asyncio.Semaphore(min(len(windows), ASYNC_MAX_CONCURRENT_FETCHES) or 1)
+        feed = _BatchFeed(plugin, loop, client, fetching, threads.cancelled)
+        for station_link_id, window in windows.items():
+            if window is not None:
+                feed.start(station_links[station_link_id], window)
+        for station_link_id, window in windows.items():
+            futures.append(executor.submit(
+                _save_station, feed, plugin, station_link_id, task_id, threads, window, process_kwargs,
+            ))
+        try:
+            return await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+        finally:
+            tasks = [fetch.task for fetch in feed.fetches.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _resolve_windows(plugin, station_link_ids, station_links=None, latest_saved_times=None, **process_kwargs):
+    """
+    Each station's fetch window, resolved before the loop starts: the ORM
+    may not be used on it. ``None`` where the station link is not in the
+    bundle or its window fails to resolve; its save thread reports why.
+    """
+    from .registries import UNRESOLVED
+
+    windows = {}
+    for station_link_id in station_link_ids:
+        station_link = (station_links or {}).get(station_link_id)
+        windows[station_link_id] = None
+        if station_link is None:
+            continue
+        latest_saved_time = (latest_saved_times or {}).get(station_link_id, UNRESOLVED)
+        try:
+            windows[station_link_id] = plugin.get_dates_for_station(station_link, latest_saved_time=latest_saved_time)
+        except Exception:
+            pass
+    return windows
+
+
+def run_async_station_batch(plugin, station_link_ids, task_id, concurrency, log, **process_kwargs):
+    """
+    Process a batch of an async plugin's stations and return their
+    :class:`~adl.core.tasks.BatchStationOutcome` list. ``process_kwargs`` are
+    passed on to each station, as in a threaded batch.
+
+    Every station is fetched on the loop from the start; ``concurrency``
+    bounds the threads saving at once. The soft time limit reaches the event
+    loop on the calling thread and cuts the batch off the same way a threaded
+    batch is cut off (see :func:`~adl.core.tasks._cut_off_stations`); the
+    batch's own task is then cancelled and unwound on the loop, cancelling
+    the fetches and closing the shared client, before the loop is closed.
+    """
+    from .tasks import _StationThreads, _cut_off_stations
+
+    windows = _resolve_windows(plugin, station_link_ids, **process_kwargs)
+    threads = _StationThreads()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="adl-async-save")
+    futures = []
+    loop = asyncio.new_event_loop()
+    batch = loop.create_task(_run_batch(plugin, windows, task_id, threads, executor, futures, process_kwargs))
+    try:
+        outcomes = loop.run_until_complete(batch)
+        executor.shutdown(wait=True)
+        return outcomes
+    except SoftTimeLimitExceeded:
+        _cut_off_stations(threads, executor, futures, log)
+        raise
+    finally:
+        try:
+            if not batch.done():
+                batch.cancel()
+                try:
+                    loop.run_until_complete(batch)
+                except asyncio.CancelledError:
+                    pass
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
@@ -0,0 +1,292 @@
+"""
+Historical backfills, run as many small checkpointed tasks instead of one long
+``process_station`` call.
+
+A :class:`~adl.core.models.BackfillJob` window is cut into
+:class:`~adl.core.models.BackfillSlice` rows, one per station link and
+``slice_days`` of time (:func:`create_backfill_job`). :func:`fill_backfill_job`
+keeps up to the job's ``max_concurrent_slices`` of them in flight on the
+backfill queue, claiming the newest pending slices first so recent data lands
+before old data. Every slice that finishes, succeeds or not, fills the job
+again, so a job drains itself. A job whose in-flight slices died with their
+worker is picked up again by the periodic :func:`~adl.core.tasks.resume_backfill_jobs`.
+
+Slices run ``process_station`` with ``bypass_lock=True`` on a queue of their
+own, so scheduled ingestion neither waits for a backfill nor collides with
+its per-station lock. Both may write the same rows; the upsert makes that
+harmless.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone as dj_timezone
+
+logger = logging.getLogger(__name__)
+
+# A slice that fails this many times is left FAILED; the rest of the job
+# carries on, and resume_failed_slices can queue it again
+MAX_SLICE_ATTEMPTS = 3
+
+
+def backfill_slice_soft_limit_seconds():
+    return settings.ADL_BACKFILL_SLICE_TIME_LIMIT_SECONDS
+
+
+def backfill_slice_budget_seconds():
+    """
+    The longest a slice can legitimately stay RUNNING: its soft limit plus
+    the same grace and margin ingestion allows its own runs. A RUNNING slice
+    older than this died with its worker.
+    """
+    from .tasks import INGEST_LOCK_TTL_MARGIN_SECONDS, INGEST_TIME_LIMIT_GRACE_SECONDS
+
+    return (backfill_slice_soft_limit_seconds()
+            + INGEST_TIME_LIMIT_GRACE_SECONDS
+            + INGEST_LOCK_TTL_MARGIN_SECONDS)
+
+
+def plan_slices(start_date, end_date, slice_days):
+    """
+    ``(start, end)`` ranges of at most ``slice_days`` covering
+    ``[start_date, end_date]``, newest first. Slices are cut back from
+    ``end_date``, so only the oldest one can be short.
+    """
+    step = timedelta(days=slice_days)
+    slices = []
+    slice_end = end_date
+    while slice_end > start_date:
+        slice_start = max(start_date, slice_end - step)
+        slices.append((slice_start, slice_end))
+        slice_end = slice_start
+    return slices
+
+
+def create_backfill_job(network_connection, start_date, end_date, station_links=None, **options):
+    """
+    Create a :class:`~adl.core.models.BackfillJob` for the window with its
+    slices, and start it once the transaction commits. ``station_links``
+    defaults to every enabled station link of the connection; ``options``
+    are further job fields (``slice_days``, ``max_concurrent_slices``).
+    """
+    from .models import BackfillJob
+
+    with transaction.atomic():
+        job = BackfillJob.objects.create(
+            network_connection=network_connection,
+            start_date=start_date,
+            end_date=end_date,
+            **options,
+        )
+        if station_links:
+            job.station_links.set(station_links)
+        plan_backfill_job(job)
+    return job
+
+
+def plan_backfill_job(job):
+    """
+    Create the slices of a job that has none yet, and start it once the
+    transaction commits.
+    """
+    from .models import BackfillSlice
+
+    station_links = list(job.station_links.all()) or list(
+        job.network_connection.station_links.filter(enabled=True)
+    )
+    ranges = plan_slices(job.start_date, job.end_date, job.slice_days)
+
+    # Range-major order, so the ids follow the newest-first claim order
+    BackfillSlice.objects.bulk_create([
+        BackfillSlice(job=job, station_link=station_link, start_date=start, end_date=end)
+        for start, end in ranges
+        for station_link in station_links
+    ], ignore_conflicts=True)
+
+    transaction.on_commit(lambda: fill_backfill_job(job.id))
+
+
+def _requeue_stale_slices(job, now):
+    from .models import BackfillSlice
+
+    budget = timedelta(seconds=backfill_slice_budget_seconds())
+    running = job.slices.filter(status=BackfillSlice.Status.RUNNING)
+
+    # Claimed but never started by a worker. A queued slice waits at most
+    # for the slices ahead of it to run to their budget; past that its
+    # message was lost. Claimed again, the task that carried it (should it
+    # ever run) finds its token gone
+    lost = running.filter(
+        started_at__isnull=True,
+        claimed_at__lt=now - budget * job.max_concurrent_slices,
+    ).update(status=BackfillSlice.Status.PENDING, claim_token=None, error="Queued slice never started")
+
+    stale = running.filter(started_at__lt=now - budget)
+    requeued = stale.filter(attempts__lt=MAX_SLICE_ATTEMPTS).update(
+        status=BackfillSlice.Status.PENDING, claim_token=None,
+        error="Worker died mid-slice (no completion recorded)",
+    )
+    failed = stale.update(
+        status=BackfillSlice.Status.FAILED, claim_token=None, finished_at=now,
+        error="Worker died mid-slice (no completion recorded)",
+    )
+    if lost or requeued or failed:
+        logger.warning("[BACKFILL] Job %s: %d lost and %d stale slice(s) requeued, %d failed",
+                       job.id, lost, requeued, failed)
+
+
+def fill_backfill_job(job_id):
+    """
+    Top the job up to ``max_concurrent_slices`` running slices, newest
+    pending slices first, and close the job once nothing is pending or
+    running. Safe to call at any time from any process: the job row is
+    locked while slices are claimed, so two callers never claim the same
+    slice or exceed the cap.
+
+    :return: The ids of the slices queued.
+    """
+    from .models import BackfillJob, BackfillSlice
+    from .tasks import BACKFILL_QUEUE_NAME, INGEST_TIME_LIMIT_GRACE_SECONDS, run_backfill_slice
+
+    now = dj_timezone.now()
+    with transaction.atomic():
+        job = BackfillJob.objects.select_for_update().filter(id=job_id).first()
+        if job is None or not job.is_active:
+            return []
+
+        _requeue_stale_slices(job, now)
+
+        in_flight = job.slices.filter(status=BackfillSlice.Status.RUNNING).count()
+        free = max(0, job.max_concurrent_slices - in_flight)
+        claimed = list(
+            job.slices.filter(status=BackfillSlice.Status.PENDING)
+            .order_by("-end_date", "id")
+            .values_list("id", flat=True)[:free]
+        )
+
+        claim_token = uuid.uuid4()
+        if claimed:
+            # started_at is left to the task: a slice may wait in the queue
+            # well past its run budget before a worker picks it up
+            job.slices.filter(id__in=claimed).update(
+                status=BackfillSlice.Status.RUNNING,
+                claim_token=claim_token,
+                claimed_at=now,
+                started_at=None,
+                attempts=F("attempts") + 1,
+            )
+            if job.status == BackfillJob.Status.PENDING:
+                job.status = BackfillJob.Status.RUNNING
+                job.started_at = now
+                job.save(update_fields=["status", "started_at"])
+        elif not in_flight:
+            has_failures = job.slices.filter(status=BackfillSlice.Status.FAILED).exists()
+            job.status = BackfillJob.Status.FAILED if has_failures else BackfillJob.Status.COMPLETED
+            job.finished_at = now
+            job.save(update_fields=["status", "finished_at"])
+            logger.info("[BACKFILL] Job %s finished: %s", job.id, job.status)
+
+        # Sent on commit, so a worker can never pick up a slice before it
+        # reads as RUNNING. A send that fails leaves the slice RUNNING until
+        # the lost-slice requeue above gives it back
+        soft_limit = backfill_slice_soft_limit_seconds()
+        for slice_id in claimed:
+            transaction.on_commit(lambda slice_id=slice_id: run_backfill_slice.apply_async(
+                args=[slice_id, str(claim_token)],
+                queue=BACKFILL_QUEUE_NAME,
+                soft_time_limit=soft_limit,
+                time_limit=soft_limit + INGEST_TIME_LIMIT_GRACE_SECONDS,
+            ))
+    return claimed
+
+
+def run_slice(backfill_slice, task_id=None):
+    """
+    Fetch and save one slice, and record the outcome on it. A slice that
+    fails goes back to PENDING until it has used up its
+    :data:`MAX_SLICE_ATTEMPTS`.
+    """
+    from .models import BackfillSlice
+    from .registries import plugin_registry
+    from .redaction import redact_secrets
+    from .retention import backfill_floor
+    from .tasks import load_station_link_bundle
+
+    # The concrete link, with its mappings loaded — not the base-class row a
+    # select_related on the slice would give
+    station_link = load_station_link_bundle([backfill_slice.station_link_id])[backfill_slice.station_link_id]
+
+    # Retention moves on while a job runs: what it has already passed would
+    # be deleted without ever reaching the hourly aggregate
+    start_date = backfill_slice.start_date
+    floor = backfill_floor(station_link.network_connection)
+    if floor is not None and start_date < floor:
+        if backfill_slice.end_date <= floor:
+            backfill_slice.status = BackfillSlice.Status.COMPLETED
+            backfill_slice.records_count = 0
+            backfill_slice.error = "Skipped: the slice is older than the raw retention keeps"
+            backfill_slice.finished_at = dj_timezone.now()
+            backfill_slice.save(update_fields=["status", "records_count", "error", "finished_at"])
+            return backfill_slice
+        start_date = floor
+
+    plugin = plugin_registry.get(station_link.network_connection.plugin)
+    if task_id:
+        plugin.set_task_context(task_id)
+
+    try:
+        records = plugin.process_station(
+            station_link,
+            initial_start_date=start_date,
+            initial_end_date=backfill_slice.end_date,
+            bypass_lock=True,
+            # The slice replaces the resolved window, so resolving it from
+            # the database would be a wasted query
+            latest_saved_time=None,
+            raise_errors=True,
+            backfill=True,
+        )
+    except Exception as e:
+        # SoftTimeLimitExceeded included: the slice is recorded and the job
+        # filled again before the hard limit
+        retry = backfill_slice.attempts < MAX_SLICE_ATTEMPTS
+        backfill_slice.status = BackfillSlice.Status.PENDING if retry else BackfillSlice.Status.FAILED
+        backfill_slice.error = redact_secrets(str(e))[:2000] or e.__class__.__name__
+        backfill_slice.finished_at = None if retry else dj_timezone.now()
+    else:
+        backfill_slice.status = BackfillSlice.Status.COMPLETED
+        backfill_slice.records_count = records
+        backfill_slice.error = ""
+        backfill_slice.finished_at = dj_timezone.now()
+
+    backfill_slice.save(update_fields=["status", "records_count", "error", "finished_at"])
+    return backfill_slice
+
+
+def resume_failed_slices(job):
+    """Give a finished job's failed slices a fresh set of attempts and start it again."""
+    from .models import BackfillJob, BackfillSlice
+
+    with transaction.atomic():
+        reset = job.slices.filter(status=BackfillSlice.Status.FAILED).update(
+            status=BackfillSlice.Status.PENDING, attempts=0, finished_at=None,
+        )
+        if reset or job.status == BackfillJob.Status.CANCELLED:
+            BackfillJob.objects.filter(id=job.id).update(status=BackfillJob.Status.RUNNING, finished_at=None)
+        transaction.on_commit(lambda: fill_backfill_job(job.id))
+    return reset
+
+
+def cancel_backfill_job(job):
+    """
+    Stop queueing the job's slices. Slices already running finish; their
+    results are kept and a later resume skips them.
+    """
+    from .models import BackfillJob
+
+    BackfillJob.objects.filter(id=job.id).update(status=BackfillJob.Status.CANCELLED,
+                                                 finished_at=dj_timezone.now())
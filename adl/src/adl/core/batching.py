@@ -0,0 +1,130 @@
+"""
+Cost-aware packing of a connection's station links into ingestion batches.
+
+Batches used to be ``batch_size`` consecutive ids, so a few slow stations
+landing together would blow that batch's soft limit while the others finished
+in seconds. :func:`plan_ingest_batches` instead estimates what each station
+costs from its recent pull runs (:func:`estimate_station_seconds`) and deals
+the stations out to the same number of batches, slowest first, each to the
+batch with the least expected time that still has room — the
+longest-processing-time rule. Batch count and the ``batch_size`` cap are
+unchanged; only which stations share a batch, and the batch's expected
+duration, are new.
+
+Stations without usable history are costed at the median of the others, and
+a connection with no history at all keeps the id-ordered batches.
+"""
+
+import statistics
+from datetime import timedelta
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone as dj_timezone
+
+# How far back, and how many of a station's latest pull runs, to estimate from
+COST_LOOKBACK = timedelta(days=2)
+COST_SAMPLE_RUNS = 10
+
+# A run that saved more than this many times the station's usual record count
+# was catching up (after an outage, or a backfill slice) and says nothing
+# about the next scheduled run
+CATCH_UP_RECORDS_FACTOR = 3
+
+
+def _recent_runs(station_link_ids, now):
+    from adl.monitoring.models import StationLinkActivityLog
+
+    rows = (
+        StationLinkActivityLog.objects
+        .filter(
+            station_link_id__in=station_link_ids,
+            direction="pull",
+            time__gte=now - COST_LOOKBACK,
+            duration_ms__isnull=False,
+            status__in=[StationLinkActivityLog.ActivityStatus.COMPLETED,
+                        StationLinkActivityLog.ActivityStatus.FAILED],
+        )
+        .annotate(recency=Window(RowNumber(), partition_by=F("station_link_id"), order_by=F("time").desc()))
+        .filter(recency__lte=COST_SAMPLE_RUNS)
+        .values_list("station_link_id", "duration_ms", "records_count")
+    )
+    runs = {}
+    for station_link_id, duration_ms, records_count in rows:
+        runs.setdefault(station_link_id, []).append((duration_ms / 1000, records_count or 0))
+    return runs
+
+
+def _station_seconds(runs):
+    typical_records = statistics.median(records for _, records in runs)
+    usual = [
+        seconds for seconds, records in runs
+        if records <= max(typical_records, 1) * CATCH_UP_RECORDS_FACTOR
+    ]
+    return statistics.median(usual or [seconds for seconds, _ in runs])
+
+
+def estimate_station_seconds(station_link_ids, now=None):
+    """
+    Expected duration in seconds of each station's next run, keyed by id:
+    the median of its latest :data:`COST_SAMPLE_RUNS` completed or failed
+    pull runs within :data:`COST_LOOKBACK`, leaving out catch-up runs (see
+    :data:`CATCH_UP_RECORDS_FACTOR`). Stations with no such run are left out.
+    A failed run is counted at the time it took to fail — for a timed-out
+    run that is a lower bound, which still ranks the station among the slow.
+    """
+    runs = _recent_runs(station_link_ids, now or dj_timezone.now())
+    return {station_link_id: _station_seconds(station_runs) for station_link_id, station_runs in runs.items()}
+
+
+class PlannedBatch:
+    __slots__ = ("station_link_ids", "expected_seconds")
+
+    def __init__(self):
+        self.station_link_ids = []
+        self.expected_seconds = 0.0
+
+    def add(self, station_link_id, seconds):
+        self.station_link_ids.append(station_link_id)
+        self.expected_seconds += seconds
+
+
+def pack_batches(station_link_ids, batch_size, costs):
+    """
+    ``station_link_ids`` in ``ceil(n / batch_size)`` batches of at most
+    ``batch_size``, balanced by ``costs`` (seconds per station; a station
+    missing from it is costed at the median). Each batch keeps its ids in
+    ascending order.
+    """
+    batch_count = -(-len(station_link_ids) // batch_size)
+    fallback = statistics.median(costs.values()) if costs else 0.0
+    batches = [PlannedBatch() for _ in range(batch_count)]
+
+    # Slowest first; ties (and the no-history case) fall back to id order
+    ordered = sorted(station_link_ids, key=lambda station_link_id: (-costs.get(station_link_id, fallback),
+                                                                    station_link_id))
+    for station_link_id in ordered:
+        open_batches = [batch for batch in batches if len(batch.station_link_ids) < batch_size]
+        target = min(open_batches, key=lambda batch: batch.expected_seconds)
+        target.add(station_link_id, costs.get(station_link_id, fallback))
+
+    for batch in batches:
+        batch.station_link_ids.sort()
+    return batches
+
+
+def plan_ingest_batches(station_link_ids, batch_size, now=None):
+    """
+    The batches :func:`~adl.core.tasks.run_network_plugin` spawns for
+    ``station_link_ids``. Without any run history to go on, these are the
+    plain id-ordered chunks, with no expected duration.
+    """
+    costs = estimate_station_seconds(station_link_ids, now=now)
+    if not costs:
+        batches = []
+        for start in range(0, len(station_link_ids), batch_size):
+            batch = PlannedBatch()
+            batch.station_link_ids = list(station_link_ids[start:start + batch_size])
+            batches.append(batch)
+        return batches
+    return pack_batches(station_link_ids, batch_size, costs)
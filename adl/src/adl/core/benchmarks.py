@@ -0,0 +1,318 @@
+"""
+Ingestion benchmarks: throughput, peak memory and query count of the save
+path, measured against the configured database.
+
+A synthetic plugin (:class:`SyntheticPlugin`) yields a configurable
+:class:`Workload` of stations × parameters × timestamps. It mixes in the cases
+the save path has to handle: duplicate ``(time, parameter)`` pairs,
+out-of-window timestamps and values that need a unit conversion. Each
+scenario runs in a transaction that is rolled back, so a benchmark leaves no
+rows behind.
+
+A scenario is one entry path, :meth:`~adl.core.registries.Plugin.save_records`
+for a single station or :func:`~adl.core.tasks.process_station_link_batch`
+over every station, with or without a QC pipeline on every parameter.
+:func:`compare_to_baseline` turns a run into a pass/fail against stored
+results. Run it with ``manage.py benchmark_ingestion`` on a TimescaleDB
+instance. Numbers from a test database or a busy shared host are not
+comparable with a baseline taken elsewhere.
+"""
+
+import json
+import random
+import resource
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone as py_tz
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.contrib.gis.geos import Point
+from django.db import connection, transaction
+
+from .registries import Plugin, UNRESOLVED, plugin_registry
+
+SYNTHETIC_PLUGIN_TYPE = "adl_benchmark_synthetic"
+
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+# How far a result may fall behind its baseline before it counts as a
+# regression. Query counts are deterministic for a workload and get none
+DEFAULT_TOLERANCE = 0.2
+
+# A range check and a step check, which needs stored history — together
+# they exercise both the per-chunk QC and the history prefetch
+BENCHMARK_QC_CHECKS = [
+    SimpleNamespace(block_type="range_check", value={"min_value": -80, "max_value": 60}),
+    SimpleNamespace(block_type="step_check", value={"max_step_change": 10}),
+]
+
+
+@dataclass(frozen=True)
+class Workload:
+    """
+    What the synthetic source yields: ``stations`` stations, each with
+    ``timestamps`` records of ``parameters`` values, one every
+    ``interval_minutes``. ``duplicate_fraction`` of the records are yielded a
+    second time with a different value (the later one wins),
+    ``out_of_window_fraction`` are dated before the window and dropped, and
+    ``converted_fraction`` of the parameters arrive in Kelvin for a Celsius
+    parameter.
+    """
+    stations: int = 10
+    parameters: int = 8
+    timestamps: int = 1000
+    interval_minutes: int = 5
+    duplicate_fraction: float = 0.05
+    out_of_window_fraction: float = 0.02
+    converted_fraction: float = 0.5
+    seed: int = 0
+
+    @property
+    def window(self):
+        end = datetime(2025, 1, 1, tzinfo=py_tz.utc)
+        start = end - timedelta(minutes=self.interval_minutes * self.timestamps)
+        return start, end
+
+
+class SyntheticPlugin(Plugin):
+    """
+    Yields :attr:`workload` records for any station link, and gives every
+    link the benchmark's :attr:`variable_mappings`.
+    """
+    type = SYNTHETIC_PLUGIN_TYPE
+    label = "Synthetic Benchmark Source"
+
+    def __init__(self, workload, variable_mappings):
+        super().__init__()
+        self.workload = workload
+        self.variable_mappings = variable_mappings
+
+    def get_dates_for_station(self, station_link, latest=False, latest_saved_time=UNRESOLVED):
+        return self.workload.window
+
+    def process_station(self, station_link, *args, **kwargs):
+        station_link.get_variable_mappings = lambda: self.variable_mappings
+        return super().process_station(station_link, *args, **kwargs)
+
+    def get_station_data(self, station_link, start_date=None, end_date=None):
+        workload = self.workload
+        rng = random.Random(workload.seed * 1_000_003 + station_link.id)
+        window_start, _ = workload.window
+        step = timedelta(minutes=workload.interval_minutes)
+
+        def record(index):
+            if rng.random() < workload.out_of_window_fraction:
+                obs_time = window_start - step * (index + 1)
+            else:
+                obs_time = window_start + step * (index + 1)
+            values = {
+                mapping.source_parameter_name: (
+                    rng.uniform(-10, 40) + (273.15 if mapping.source_parameter_unit.symbol == "K" else 0)
+                )
+                for mapping in self.variable_mappings
+            }
+            return {"observation_time": obs_time, **values}
+
+        for index in range(workload.timestamps):
+            yield record(index)
+            if rng.random() < workload.duplicate_fraction:
+                yield record(index)
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    source_records: int
+    saved_records: int
+    seconds: float
+    records_per_second: float
+    peak_rss_mb: float
+    queries: int
+
+
+def _reset_peak_rss():
+    # Linux resets the VmHWM high-water mark on this write; elsewhere the
+    # peak stays the process's lifetime peak
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _QueryCounter:
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _create_fixtures(workload, with_qc):
+    from .models import DataParameter, Network, NetworkConnection, Station, StationLink, Unit
+
+    celsius, _ = Unit.objects.get_or_create(symbol="degC", defaults={"name": "Celsius"})
+    kelvin, _ = Unit.objects.get_or_create(symbol="K", defaults={"name": "Kelvin"})
+
+    mappings = []
+    converted = round(workload.parameters * workload.converted_fraction)
+    for index in range(workload.parameters):
+        parameter = DataParameter.objects.create(name=f"benchmark_parameter_{index}", unit=celsius)
+        mappings.append(SimpleNamespace(
+            id=index + 1,
+            adl_parameter=parameter,
+            source_parameter_name=f"p{index}",
+            source_parameter_unit=kelvin if index < converted else celsius,
+            qc_checks=BENCHMARK_QC_CHECKS if with_qc else [],
+        ))
+
+    network = Network.objects.create(name="Benchmark Network", type="automatic")
+    network_connection = NetworkConnection.objects.create(
+        name="Benchmark Connection", network=network, plugin=SYNTHETIC_PLUGIN_TYPE,
+        stations_timezone="UTC", batch_size=workload.stations,
+        # Worker threads use connections of their own, which cannot see the
+        # uncommitted fixtures
+        max_concurrent_stations=1,
+    )
+    station_links = []
+    for index in range(workload.stations):
+        station = Station.objects.create(
+            station_id=f"BENCH-{index:04d}", name=f"Benchmark Station {index}", network=network,
+            station_type=0, location=Point(36.8, -1.3), wsi_series=0, wsi_issuer=0,
+            wsi_issue_number=0, wsi_local=str(index),
+        )
+        station_links.append(StationLink.objects.create(network_connection=network_connection, station=station))
+
+    return network_connection, station_links, mappings
+
+
+def _count_source_records(plugin, station_links):
+    return sum(sum(1 for _ in plugin.get_station_data(link)) for link in station_links)
+
+
+def _run_save_records(plugin, network_connection, station_links):
+    station_link = station_links[0]
+    station_link.get_variable_mappings = lambda: plugin.variable_mappings
+    start, end = plugin.workload.window
+    saved, _, _ = plugin.save_records(station_link, plugin.get_station_data(station_link), start, end)
+    return saved
+
+
+def _run_batch(plugin, network_connection, station_links):
+    from .tasks import process_station_link_batch
+
+    result = process_station_link_batch(network_connection.id, [link.id for link in station_links])
+    return result["total_records"]
+
+
+#: Each scenario with the number of the workload's stations it runs (``None``
+#: for all of them)
+SCENARIOS = {
+    "save_records": (_run_save_records, 1),
+    "batch": (_run_batch, None),
+}
+
+
+def run_scenario(name, workload, with_qc=False):
+    """
+    Run scenario ``name`` (a key of :data:`SCENARIOS`) over ``workload`` and
+    return its :class:`BenchmarkResult`. Nothing it writes is kept.
+    """
+    run, stations = SCENARIOS[name]
+    scenario = f"{name}{'+qc' if with_qc else ''}"
+
+    with transaction.atomic():
+        network_connection, station_links, mappings = _create_fixtures(workload, with_qc)
+        station_links = station_links[:stations]
+        plugin = SyntheticPlugin(workload, mappings)
+        plugin_registry.register(plugin)
+        try:
+            # Counted up front: generating the source again must not be timed
+            source_records = _count_source_records(plugin, station_links)
+            counter = _QueryCounter()
+            _reset_peak_rss()
+            started = time.perf_counter()
+            with connection.execute_wrapper(counter):
+                saved = run(plugin, network_connection, station_links)
+            seconds = time.perf_counter() - started
+        finally:
+            plugin_registry.unregister(SYNTHETIC_PLUGIN_TYPE)
+            transaction.set_rollback(True)
+
+    return BenchmarkResult(
+        scenario=scenario,
+        source_records=source_records,
+        saved_records=saved,
+        seconds=round(seconds, 3),
+        records_per_second=round(saved / seconds, 1) if seconds else 0.0,
+        peak_rss_mb=round(_peak_rss_mb(), 1),
+        queries=counter.count,
+    )
+
+
+def run_benchmarks(workload, scenarios=None):
+    """Every scenario, without and with QC, in a fixed order."""
+    return [
+        run_scenario(name, workload, with_qc)
+        for name in (scenarios or SCENARIOS)
+        for with_qc in (False, True)
+    ]
+
+
+def save_baseline(path, workload, results):
+    Path(path).write_text(json.dumps({
+        "workload": asdict(workload),
+        "results": {result.scenario: asdict(result) for result in results},
+    }, indent=2) + "\n")
+
+
+def load_baseline(path):
+    return json.loads(Path(path).read_text())
+
+
+def compare_to_baseline(baseline, workload, results, tolerance=DEFAULT_TOLERANCE):
+    """
+    The regressions of ``results`` against ``baseline``, as messages; empty
+    when there are none. A result regresses when its throughput falls more
+    than ``tolerance`` below the baseline's, its peak RSS rises more than
+    ``tolerance`` above it, or it issues more queries. Results are only
+    comparable for the workload the baseline was taken with.
+    """
+    if baseline.get("workload") != asdict(workload):
+        return [
+            f"The baseline was taken with a different workload ({baseline.get('workload')}); "
+            f"run with the same options or save a new baseline."
+        ]
+
+    regressions = []
+    for result in results:
+        expected = baseline["results"].get(result.scenario)
+        if expected is None:
+            continue
+        if result.records_per_second < expected["records_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{result.scenario}: {result.records_per_second} records/s, "
+                f"baseline {expected['records_per_second']}"
+            )
+        if result.peak_rss_mb > expected["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{result.scenario}: peak RSS {result.peak_rss_mb} MB, baseline {expected['peak_rss_mb']} MB"
+            )
+        if result.queries > expected["queries"]:
+            regressions.append(f"{result.scenario}: {result.queries} queries, baseline {expected['queries']}")
+    return regressions
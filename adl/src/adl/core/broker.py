@@ -326,10 +326,30 @@ def get_ingestion_queue_health():
     )
 
 
-def _queue_depth(connection):
+def get_queue_depths(queue_names):
+    """
+    Broker-visible depth of each of ``queue_names`` over one short-lived,
+    bounded connection: ``{name: depth}``, with ``None`` for a queue whose
+    depth could not be read. Subject to the same caveats and version guard
+    as the diagnostic's queue-depth signal. Never raises.
+    """
+    depths = dict.fromkeys(queue_names)
+    if _version_guard_message(SIGNAL_GUARD_LIBRARIES["queue_depth"], local_library_versions()):
+        return depths
+    try:
+        with bounded_broker_connection() as connection:
+            for queue_name in queue_names:
+                depth = _queue_depth(connection, queue_name)
+                depths[queue_name] = None if depth is _MOVED_API else depth
+    except Exception as e:
+        logger.warning("[BROKER] Could not read queue depths: %s", e)
+    return depths
+
+
+def _queue_depth(connection, queue_name=INGESTION_QUEUE_NAME):
     try:
         declared = connection.default_channel.queue_declare(
-            queue=INGESTION_QUEUE_NAME, passive=True
+            queue=queue_name, passive=True
         )
     except ChannelError as e:
         # On Redis an empty queue has no key, so a passive declare reports
@@ -338,7 +358,7 @@ def _queue_depth(connection):
         # false healthy depth of zero.
         if _is_not_found(e):
             return 0
-        logger.warning("[BROKER] Could not read ingestion queue depth: %s", e)
+        logger.warning("[BROKER] Could not read %s queue depth: %s", queue_name, e)
         return None
     except AttributeError as e:
         # Structural backstop: default_channel or queue_declare moved — an
@@ -346,7 +366,7 @@ def _queue_depth(connection):
         logger.warning("[BROKER] Queue-depth API is not the tested one: %s", e)
         return _MOVED_API
     except Exception as e:
-        logger.warning("[BROKER] Could not read ingestion queue depth: %s", e)
+        logger.warning("[BROKER] Could not read %s queue depth: %s", queue_name, e)
         return None
     # message_count sums across kombu's priority-suffixed keys, which a raw
     # LLEN on the queue name would undercount
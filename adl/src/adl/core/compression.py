@@ -0,0 +1,66 @@
+"""
+TimescaleDB native compression of the observation hypertable.
+
+Migration ``0056`` turns compression on for ``core_observationrecord``,
+segmented by ``station_id, connection_id, parameter_id`` and ordered by
+``time DESC``: a segment is one series, which is what every read selects
+on and what compresses best. Chunks older than
+:attr:`~adl.core.models.AdlSettings.observation_compress_after_days` are
+compressed by TimescaleDB's background policy; the setting is applied to
+the policy whenever ADL Settings are saved (see
+:func:`set_observation_compression_policy`).
+
+The segment-by and order-by columns cover the table's
+``(time, station, connection, parameter)`` unique constraint, so both
+observation writers keep upserting with ``ON CONFLICT`` into compressed
+chunks: TimescaleDB (2.11 and later) decompresses only the segments the
+conflicting rows fall in. Late data and re-fetches therefore need no special
+path — and the stored-duplicate suppression in :mod:`adl.core.duplicates`
+keeps identical re-fetches from touching compressed segments at all.
+"""
+
+import logging
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+OBSERVATION_TABLE = "core_observationrecord"
+
+
+def timescaledb_available(cursor) -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+    return cursor.fetchone() is not None
+
+
+def set_observation_compression_policy(compress_after_days):
+    """
+    Compress observation chunks once they are ``compress_after_days`` old;
+    ``0`` removes the policy, leaving chunks compressed so far as they are.
+    Returns ``False`` when TimescaleDB is not available.
+    """
+    with connection.cursor() as cursor:
+        if not timescaledb_available(cursor):
+            return False
+        cursor.execute("SELECT remove_compression_policy(%s::regclass, if_exists => true)", [OBSERVATION_TABLE])
+        if compress_after_days:
+            cursor.execute(
+                "SELECT add_compression_policy(%s::regclass, compress_after => make_interval(days => %s))",
+                [OBSERVATION_TABLE, int(compress_after_days)],
+            )
+    return True
+
+
+def update_observation_compression_policy(sender, instance, **kwargs):
+    """``post_save`` receiver: apply the saved ADL Settings to the policy once committed."""
+    compress_after_days = instance.observation_compress_after_days
+
+    def apply():
+        try:
+            set_observation_compression_policy(compress_after_days)
+        except Exception:
+            logger.exception("Could not update the observation compression policy")
+
+    transaction.on_commit(apply)
@@ -13,7 +13,8 @@ def get_station_channel_records(dispatch_channel, station_id, connection_id):
     from adl.core.models import (
         StationChannelDispatchStatus,
         ObservationRecord,
-        HourlyObsAgg
+        HourlyObsAgg,
+        DailyObsAgg,
     )
     
     send_agg_data = dispatch_channel.send_aggregated_data
@@ -39,6 +40,14 @@ def get_station_channel_records(dispatch_channel, station_id, connection_id):
             filters.update({
                 f"{time_field}__lt": current_top_of_hour
             })
+        elif aggregation_period == "daily":
+            records_model = DailyObsAgg
+            time_field = "bucket"
+            # Daily buckets are UTC days; only whole days are sent
+            current_day_start = dj_timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            filters.update({
+                f"{time_field}__lt": current_day_start
+            })
     
     # get all records for the channel connection and station
     obs_records = records_model.objects.filter(**filters)
@@ -78,6 +87,19 @@ def get_station_channel_records(dispatch_channel, station_id, connection_id):
     return obs_records
 
 
+def get_channel_conversion_plan(parameter_mapping):
+    """
+    The compiled conversion from a mapping's ADL parameter unit to its channel
+    unit, or ``None`` when no conversion is needed — a blank channel unit
+    means "same as the parameter". Resolved once per mapping, not per value.
+    """
+    channel_unit = parameter_mapping.channel_unit
+    adl_parameter = parameter_mapping.parameter
+    if channel_unit is None or channel_unit.pk == adl_parameter.unit_id:
+        return None
+    return adl_parameter.get_conversion_plan_to_units(channel_unit)
+
+
 def get_station_dispatch_records(dispatch_channel, station_link):
     """Fetch and format dispatch records for a single station link."""
     parameter_mappings = dispatch_channel.get_parameter_mappings()
@@ -93,8 +115,9 @@ def get_station_dispatch_records(dispatch_channel, station_link):
             "adl_parameter": pm.parameter,
             "value_field": "value" if not send_agg_data else pm.aggregation_measure,
             "channel_unit": pm.channel_unit,
+            "conversion_plan": get_channel_conversion_plan(pm),
         }
-        for pm in parameter_mappings
+        for pm in parameter_mappings.select_related("parameter__unit", "channel_unit")
     }
 
     station_channel_records = get_station_channel_records(
@@ -117,9 +140,9 @@ def get_station_dispatch_records(dispatch_channel, station_link):
         for obs in station_record["observations"]:
             mapping = parameter_channel_mapping[obs.parameter_id]
             data_value = getattr(obs, mapping["value_field"])
-            channel_unit = mapping["channel_unit"]
-            if channel_unit != obs.parameter.unit:
-                data_value = mapping["adl_parameter"].convert_value_to_units(data_value, channel_unit)
+            conversion_plan = mapping["conversion_plan"]
+            if conversion_plan is not None and data_value is not None:
+                data_value = conversion_plan.convert(data_value)
             data_values[mapping["channel_parameter"]] = data_value
 
         records.append({
@@ -158,8 +181,9 @@ def get_dispatch_channel_data(dispatch_channel, station_link_ids=None):
             "channel_parameter": pm.channel_parameter,
             "adl_parameter": pm.parameter,
             "value_field": "value" if not send_agg_data else pm.aggregation_measure,
-            "channel_unit": pm.channel_unit
-        } for pm in parameter_mappings
+            "channel_unit": pm.channel_unit,
+            "conversion_plan": get_channel_conversion_plan(pm),
+        } for pm in parameter_mappings.select_related("parameter__unit", "channel_unit")
     }
     
     # get station links for the dispatch channel that are enabled to send data
@@ -218,12 +242,11 @@ def get_dispatch_channel_data(dispatch_channel, station_link_ids=None):
             for obs in obs_list:
                 key = parameter_channel_mapping[obs.parameter_id]["channel_parameter"]
                 data_value = getattr(obs, parameter_channel_mapping[obs.parameter_id]["value_field"])
-                channel_unit = parameter_channel_mapping[obs.parameter_id]["channel_unit"]
+                conversion_plan = parameter_channel_mapping[obs.parameter_id]["conversion_plan"]
                 
                 # convert value to channel unit if necessary
-                if channel_unit != obs.parameter.unit:
-                    adl_parameter = parameter_channel_mapping[obs.parameter_id]["adl_parameter"]
-                    data_value = adl_parameter.convert_value_to_units(data_value, channel_unit)
+                if conversion_plan is not None and data_value is not None:
+                    data_value = conversion_plan.convert(data_value)
                 
                 data_values[key] = data_value
             
@@ -0,0 +1,157 @@
+"""
+Suppression of re-fetched values that are already stored, before QC.
+
+Every run resumes at the latest saved timestamp, and many sources send a
+trailing overlap besides, so a share of each chunk — from a few percent to
+more than half, depending on the plugin — is values already in the
+hypertable. The writers in :mod:`adl.core.upsert` leave those rows
+untouched, but only after they have been through QC and the upsert's own
+comparison. A :class:`StoredValueIndex` is read once per save run, with one
+range query over the run's window, and lets
+:meth:`~adl.core.registries.Plugin._save_chunk` drop the identical values
+right after normalization. They are counted as unchanged, exactly as the
+writer would have counted them.
+
+A window too large to index whole (a backfill slice re-run over data that
+is already there) is read chunk by chunk instead, each query narrowed to the
+times the chunk holds.
+
+A stored value only stands in for a fresh QC pass when nothing QC depends on
+has changed since it was written: the row must be newer than its
+parameter's last edit (where QC checks are configured, and what the QC
+pipeline cache is keyed on), and parameters fed by a mapping with its own QC
+overrides are never suppressed. Removing the values from the chunk does not
+change QC for the rest: history is read from the table, where they are.
+"""
+
+import logging
+from datetime import timezone as py_tz
+
+import numpy as np
+
+from .normalization import datetime_to_epoch_us, epoch_us_to_datetime
+
+logger = logging.getLogger(__name__)
+
+#: The most stored values read at once, to keep memory bounded. A window
+#: holding more is read per chunk; a chunk spanning more is left to the
+#: writer, which still leaves its identical rows untouched.
+STORED_INDEX_MAX_ROWS = 50_000
+
+
+def _eligible_parameters(variable_mappings):
+    """``{parameter_id: modified_at}`` for the parameters suppression may apply to."""
+    eligible = {}
+    overridden = set()
+    for mapping in variable_mappings:
+        adl_param = getattr(mapping, "adl_parameter", None)
+        if adl_param is None:
+            continue
+        if hasattr(mapping, "qc_checks"):
+            overridden.add(adl_param.id)
+        eligible[adl_param.id] = adl_param.modified_at
+    return {param_id: modified_at for param_id, modified_at in eligible.items() if param_id not in overridden}
+
+
+class StoredValueIndex:
+    """
+    The values stored for one station link within ``[start_date, end_date]``,
+    keyed by ``(time in epoch microseconds, parameter_id)``. Loaded on first
+    use, so a run that saves nothing costs no query, and kept current with
+    what the run writes afterwards (:meth:`record_written`). When the window
+    holds more than :data:`STORED_INDEX_MAX_ROWS` values, each chunk reads
+    the values of its own time range instead.
+    """
+
+    def __init__(self, station_link, variable_mappings, start_date, end_date):
+        self.station_link = station_link
+        self.start_date = start_date
+        self.end_date = end_date
+        self._parameters = _eligible_parameters(variable_mappings)
+        self._values = None
+        self._per_chunk = False
+
+    def _load(self, start_date, end_date):
+        """
+        The eligible values stored within ``[start_date, end_date]``, or
+        ``None`` when there are more than :data:`STORED_INDEX_MAX_ROWS`.
+        """
+        from adl.core.models import ObservationRecord
+
+        connection = self.station_link.network_connection
+        queryset = ObservationRecord.objects.filter(
+            station=self.station_link.station,
+            connection=connection,
+            parameter_id__in=list(self._parameters),
+            is_daily=connection.is_daily_data,
+        ).order_by()
+        if start_date is not None:
+            queryset = queryset.filter(time__gte=start_date)
+        if end_date is not None:
+            queryset = queryset.filter(time__lte=end_date)
+        # Counted on the index before any value is read
+        if queryset[STORED_INDEX_MAX_ROWS:STORED_INDEX_MAX_ROWS + 1].exists():
+            return None
+
+        return {
+            (datetime_to_epoch_us(obs_time, py_tz.utc), parameter_id): value
+            for obs_time, parameter_id, value, modified_at in queryset.values_list(
+                "time", "parameter_id", "value", "modified_at"
+            )
+            # Written before the parameter's QC last changed: let QC run again
+            if modified_at >= self._parameters[parameter_id]
+        }
+
+    def _stored_values(self, normalized):
+        if not self._per_chunk and self._values is None:
+            self._values = self._load(self.start_date, self.end_date)
+            if self._values is None:
+                logger.debug("Reading stored values per chunk for station link %s: over %d in the window",
+                             self.station_link.id, STORED_INDEX_MAX_ROWS)
+                self._per_chunk = True
+        if not self._per_chunk:
+            return self._values
+
+        # Read fresh for each chunk, so nothing is kept that a write could
+        # make stale
+        times_us = normalized.times_us
+        stored = self._load(epoch_us_to_datetime(int(times_us.min())), epoch_us_to_datetime(int(times_us.max())))
+        if stored is None:
+            logger.debug("Not indexing stored values for a chunk of station link %s: over %d in its range",
+                         self.station_link.id, STORED_INDEX_MAX_ROWS)
+        return stored or {}
+
+    def duplicate_mask(self, normalized):
+        """
+        A boolean array over ``normalized``'s rows, true where the row's value
+        is already stored as is.
+        """
+        stored = self._stored_values(normalized) if self._parameters and len(normalized) else {}
+        if not stored:
+            return np.zeros(len(normalized), dtype=bool)
+
+        return np.fromiter(
+            (stored.get((time_us, parameter_id)) == value for time_us, parameter_id, value in zip(
+                normalized.times_us.tolist(), normalized.parameter_ids.tolist(), normalized.values.tolist()
+            )),
+            dtype=bool,
+            count=len(normalized),
+        )
+
+    def record_written(self, normalized):
+        """
+        Update the index with the rows of ``normalized`` just written, so a
+        later chunk of the run is compared with what is stored now. Without
+        it, a chunk re-sending the value stored before the run would be
+        suppressed after an earlier chunk had replaced that value.
+        """
+        # Not loaded yet, the load will read the rows; nothing indexed, or
+        # read per chunk, no entry can be stale
+        if not self._values:
+            return
+        parameters = self._parameters
+        for time_us, parameter_id, value in zip(
+                normalized.times_us.tolist(), normalized.parameter_ids.tolist(), normalized.values.tolist()
+        ):
+            if parameter_id in parameters:
+                self._values[(time_us, parameter_id)] = value
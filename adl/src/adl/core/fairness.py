@@ -0,0 +1,208 @@
+"""
+Per-connection caps on ingestion batches in flight on the shared queue.
+
+Every connection's batches go to the one ``adl`` queue, consumed in arrival
+order, so a connection with thousands of stations spawning a hundred batches
+a tick puts a small connection's one batch behind all of them. A connection
+with ``max_inflight_batches`` set only ever has that many batches queued or
+running: :func:`admit_batches` sends the first ones and holds the rest in
+Redis, and each batch that ends (:func:`release_batch_slot`) sends the next
+held one in its place. Other connections' batches therefore wait behind at
+most the sum of the caps, whatever the size of the networks.
+
+A slot is a member of a Redis sorted set scored with its expiry, so a batch
+that dies without releasing — a killed worker, a lost message — only holds
+its slot until the expiry, never for good. A new coordinator tick replaces
+whatever its previous tick still held: those batches covered the same
+stations, and the new plan supersedes them.
+
+Redis being unavailable fails open: batches are sent as if uncapped.
+"""
+
+import json
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# How long a slot outlives its batch's own time budget before it expires
+# unreleased, in multiples of that budget: a batch may legitimately sit in
+# the queue for a while before it starts
+SLOT_TTL_BUDGETS = 2
+
+# Drop expired slots, forget what the previous tick held, and take free slots
+# for as many of the new batches as fit. ARGV: now, cap, expiry, then a
+# (token, payload) pair per batch. Returns how many batches were admitted;
+# the rest are queued on the held list in order.
+_ADMIT_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+redis.call('DEL', KEYS[2])
+local free = tonumber(ARGV[2]) - redis.call('ZCARD', KEYS[1])
+local admitted = 0
+for i = 4, #ARGV, 2 do
+    if admitted < free then
+        redis.call('ZADD', KEYS[1], ARGV[3], ARGV[i])
+        admitted = admitted + 1
+    else
+        redis.call('RPUSH', KEYS[2], ARGV[i + 1])
+    end
+end
+return admitted
+"""
+
+# Free the finished batch's slot, drop expired ones, and hand free slots to
+# held batches. ARGV: token, now, expiry, cap. Returns the payloads to send.
+_RELEASE_SCRIPT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+local released = {}
+while redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[4]) do
+    local payload = redis.call('LPOP', KEYS[2])
+    if not payload then
+        break
+    end
+    redis.call('ZADD', KEYS[1], ARGV[3], cjson.decode(payload)['token'])
+    table.insert(released, payload)
+end
+return released
+"""
+
+
+def _slots_key(network_connection_id):
+    return f"adl:ingest:slots:{network_connection_id}"
+
+
+def _held_key(network_connection_id):
+    return f"adl:ingest:held:{network_connection_id}"
+
+
+def _slot_expiry(network_connection, now):
+    from .tasks import ingest_batch_budget_seconds
+
+    return now + SLOT_TTL_BUDGETS * ingest_batch_budget_seconds(network_connection)
+
+
+def _redis():
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+class BatchTicket:
+    """
+    One batch the coordinator wants sent: its stations, its soft limit, the
+    slot token it holds (``None`` when uncapped) and when it was planned.
+    """
+    __slots__ = ("station_link_ids", "soft_time_limit", "token", "queued_at")
+
+    def __init__(self, station_link_ids, soft_time_limit, token=None, queued_at=None):
+        self.station_link_ids = station_link_ids
+        self.soft_time_limit = soft_time_limit
+        self.token = token
+        self.queued_at = queued_at if queued_at is not None else time.time()
+
+    def to_json(self):
+        return json.dumps({
+            "station_link_ids": self.station_link_ids,
+            "soft_time_limit": self.soft_time_limit,
+            "token": self.token,
+            "queued_at": self.queued_at,
+        })
+
+    @classmethod
+    def from_json(cls, payload):
+        return cls(**json.loads(payload))
+
+
+def admit_batches(network_connection, tickets):
+    """
+    The tickets to send now. Without a cap that is all of them; with one,
+    as many as the connection has free slots, the rest held for
+    :func:`release_batch_slot` to send.
+    """
+    cap = network_connection.max_inflight_batches
+    if not cap:
+        return tickets
+
+    now = time.time()
+    args = [now, cap, _slot_expiry(network_connection, now)]
+    for ticket in tickets:
+        ticket.token = uuid.uuid4().hex
+        args.extend([ticket.token, ticket.to_json()])
+
+    try:
+        admitted = _redis().eval(_ADMIT_SCRIPT, 2, _slots_key(network_connection.id),
+                                 _held_key(network_connection.id), *args)
+    except Exception as e:
+        logger.warning("Could not reserve batch slots for connection %s, sending uncapped: %s",
+                       network_connection.name, e)
+        for ticket in tickets:
+            ticket.token = None
+        return tickets
+
+    return tickets[:int(admitted)]
+
+
+def release_batch_slot(network_connection, token):
+    """
+    Give back the slot a finished batch held, and return the held tickets
+    that take the free slots.
+    """
+    if not token:
+        return []
+
+    now = time.time()
+    try:
+        released = _redis().eval(
+            _RELEASE_SCRIPT, 2, _slots_key(network_connection.id), _held_key(network_connection.id),
+            token, now, _slot_expiry(network_connection, now), network_connection.max_inflight_batches or 0,
+        )
+    except Exception as e:
+        # The slot expires on its own
+        logger.warning("Could not release batch slot for connection %s: %s", network_connection.name, e)
+        return []
+
+    return [BatchTicket.from_json(payload) for payload in released]
+
+
+def held_batch_count(network_connection):
+    """Batches of the connection waiting for a slot, or ``None`` when Redis cannot say."""
+    try:
+        return _redis().llen(_held_key(network_connection.id))
+    except Exception:
+        return None
+
+
+_WAIT_KEY = "adl:ingest:batch_wait"
+
+
+def record_batch_wait(network_connection, wait_seconds):
+    """
+    Note how long a batch of the connection waited between being planned
+    and starting, for the monitoring pages and the queue-wait histogram.
+    """
+    from . import metrics
+
+    metrics.observe("adl_ingest_queue_wait_seconds", wait_seconds, connection=network_connection.name)
+    try:
+        _redis().hset(_WAIT_KEY, str(network_connection.id),
+                      json.dumps({"seconds": round(wait_seconds, 1), "at": time.time()}))
+    except Exception as e:
+        logger.warning("Could not record batch wait for connection %s: %s", network_connection.name, e)
+
+
+def latest_batch_waits(network_connection_ids):
+    """
+    ``{connection id: {"seconds": wait, "at": epoch}}`` for the latest batch
+    of each connection that has started one; empty when Redis cannot say.
+    """
+    ids = [str(network_connection_id) for network_connection_id in network_connection_ids]
+    if not ids:
+        return {}
+    try:
+        values = _redis().hmget(_WAIT_KEY, ids)
+    except Exception as e:
+        logger.warning("Could not read batch waits: %s", e)
+        return {}
+    return {int(key): json.loads(value) for key, value in zip(ids, values) if value is not None}
@@ -1,5 +1,6 @@
 from django import forms
 from django.utils.translation import gettext_lazy as _
+from wagtail.admin.forms import WagtailAdminModelForm
 
 from .models import Network
 from .utils import (
@@ -113,3 +114,29 @@ class StationIncludeForm(forms.Form):
         # Default checked (included) = all on this page that are NOT in excluded_ids
         initial_included = [str(sl.id) for sl in station_links_qs if sl.id not in excluded_ids]
         self.initial["included_ids"] = initial_included
+
+
+class BackfillJobForm(WagtailAdminModelForm):
+    # What a job covers is fixed once its slices have been planned; only how
+    # fast it runs can change
+    PLANNED_FIELDS = ("network_connection", "station_links", "start_date", "end_date", "slice_days")
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            for name in self.PLANNED_FIELDS:
+                if name in self.fields:
+                    self.fields[name].disabled = True
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        network_connection = cleaned_data.get("network_connection")
+        station_links = cleaned_data.get("station_links")
+        
+        if network_connection and station_links and not self.instance.pk:
+            foreign = [link for link in station_links if link.network_connection_id != network_connection.id]
+            if foreign:
+                self.add_error("station_links", _("These station links belong to another connection: %(links)s")
+                               % {"links": ", ".join(str(link) for link in foreign)})
+        
+        return cleaned_data
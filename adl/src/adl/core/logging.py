@@ -1,19 +1,170 @@
 import logging
+import os
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from typing import Optional
 
+from celery.signals import task_postrun
+from django.conf import settings
 from django_eventstream import send_event
 
 from .redaction import redact_secrets
 
 logger = logging.getLogger(__name__)
 
+# Stream events are handed to a background thread and sent in batches: at
+# most every STREAM_FLUSH_INTERVAL_SECONDS, sooner once STREAM_FLUSH_SIZE are
+# waiting. Errors and success lines are sent at once, together with everything
+# queued before them: the first so the live monitor never shows a failure out
+# of order, the second because it closes a task and nothing follows to carry it
+STREAM_FLUSH_INTERVAL_SECONDS = 0.5
+STREAM_FLUSH_SIZE = 50
+
+# At most this many events per task channel and flush; the excess is replaced
+# by one notice pointing at the worker log, which always has every line
+STREAM_MAX_EVENTS_PER_FLUSH = 100
+
+# How often a message recorded with TaskLogger.summarize is emitted, with the
+# count accumulated since
+SUMMARY_INTERVAL_SECONDS = 30
+
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "success": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+# The standard logger method of a level that is not one of its own
+_LOG_METHODS = {"success": "info"}
+
+
+def _stream_level():
+    """
+    The lowest level sent to the SSE stream, from ``ADL_LOG_STREAM_LEVEL``.
+
+    The stream is what the live monitor shows, so it keeps its own threshold:
+    a worker logging at ``WARNING`` still streams a task's info and success
+    lines.
+    """
+    level = getattr(settings, "ADL_LOG_STREAM_LEVEL", "INFO")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+class _StreamBuffer:
+    """
+    The process-wide queue of SSE log events waiting to be sent.
+
+    One buffer serves every :class:`TaskLogger` of the process. Under Celery's
+    prefork pool the buffer belongs to the child that created it; a fork
+    starts over with an empty queue and its own sender thread.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._condition = threading.Condition()
+        # Held from taking a batch until it is sent, so a flush from a task
+        # thread cannot overtake a batch the sender thread is still sending
+        self._sending = threading.Lock()
+        self._pending = deque()
+        self._sender = None
+
+    def _ensure_sender(self):
+        if self._pid != os.getpid():
+            self._reset()
+        if self._sender is None or not self._sender.is_alive():
+            self._sender = threading.Thread(target=self._run, name="adl-log-stream", daemon=True)
+            self._sender.start()
+
+    def put(self, channel, event):
+        self._ensure_sender()
+        with self._condition:
+            self._pending.append((channel, event))
+            if len(self._pending) >= STREAM_FLUSH_SIZE:
+                self._condition.notify()
+
+    def flush(self):
+        if self._pid != os.getpid():
+            self._reset()
+        self._send_pending()
+
+    def _send_pending(self):
+        with self._sending:
+            with self._condition:
+                pending, self._pending = self._pending, deque()
+            if pending:
+                _send_batch(pending)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if len(self._pending) < STREAM_FLUSH_SIZE:
+                    self._condition.wait(STREAM_FLUSH_INTERVAL_SECONDS)
+            self._send_pending()
+
+
+def _send_batch(pending):
+    sent = {}
+    suppressed = {}
+    for channel, event in pending:
+        if sent.get(channel, 0) >= STREAM_MAX_EVENTS_PER_FLUSH:
+            suppressed[channel] = suppressed.get(channel, 0) + 1
+            continue
+        sent[channel] = sent.get(channel, 0) + 1
+        _send(channel, event)
+
+    for channel, count in suppressed.items():
+        _send(channel, {
+            "message": f"{count} log lines not streamed; see the worker log for the full output",
+            "level": "warning",
+            "timestamp": datetime.now().isoformat(),
+            "task_id": channel[len("task-"):],
+        })
+
+
+def _send(channel, event):
+    try:
+        send_event(channel, 'log', event)
+        logger.debug(f"Sent log to stream: {channel}")
+    except Exception as e:
+        logger.debug(f"Could not send to event stream: {e}")
+
+
+_stream_buffer = _StreamBuffer()
+
+
+def flush_task_log_stream():
+    """Send every queued stream event now, from the calling thread."""
+    _stream_buffer.flush()
+
+
+# Prefork children leave with os._exit(), so an exit hook never runs; a task's
+# last lines are sent when the task ends instead
+@task_postrun.connect(weak=False)
+def _flush_after_task(**kwargs):
+    flush_task_log_stream()
+
 
 class TaskLogger:
     """
     Unified logger that sends to both standard logging and SSE via django-eventstream
+
+    The worker log and the stream each have their own threshold: the
+    standard logger's level, and ``ADL_LOG_STREAM_LEVEL`` for a logger with a
+    ``task_id`` (see :func:`_stream_level`). A message below both is dropped
+    before it is formatted. Stream events are queued and sent in batches by a
+    background thread (see :class:`_StreamBuffer`), and whatever is still
+    queued when a Celery task ends is sent then.
     """
-    
+
     def __init__(
             self,
             task_id: Optional[str] = None,
@@ -22,13 +173,26 @@ class TaskLogger:
         self.task_id = task_id
         self.plugin_label = plugin_label
         self.standard_logger = logging.getLogger(__name__)
-        
+        self.stream_level = _stream_level()
+        self._summaries = {}
+        self._summaries_lock = threading.Lock()
+
         if task_id:
             logger.debug(f"TaskLogger initialized: task_id={task_id}, plugin={plugin_label}")
-    
+
+    def is_enabled_for(self, level: str) -> bool:
+        """Whether a message at ``level`` goes to the worker log or the stream."""
+        return self._logs(level) or self._streams(level)
+
+    def _logs(self, level: str) -> bool:
+        return self.standard_logger.isEnabledFor(_LEVELS[level])
+
+    def _streams(self, level: str) -> bool:
+        return bool(self.task_id) and _LEVELS[level] >= self.stream_level
+
     def _send_to_stream(self, message: str, level: str = 'info'):
         """
-        Send log message to SSE stream via django-eventstream.
+        Queue a log message for the SSE stream via django-eventstream.
 
         Redacted on the way out, not on the way in: the local logger keeps
         the message a plugin actually wrote, while what leaves the process
@@ -39,62 +203,97 @@ class TaskLogger:
         if not self.task_id:
             return
 
-        message = redact_secrets(message)
-
-        try:
-            # Send event to task-specific channel
-            send_event(
-                f'task-{self.task_id}',  # Channel name
-                'log',  # Event type
-                {
-                    'message': message,
-                    'level': level,
-                    'timestamp': datetime.now().isoformat(),
-                    'task_id': self.task_id,
-                }
-            )
-            
-            logger.debug(f"Sent log to stream: task-{self.task_id}")
-        except Exception as e:
-            logger.debug(f"Could not send to event stream: {e}")
-    
+        event = {
+            'message': redact_secrets(message),
+            'level': level,
+            'timestamp': datetime.now().isoformat(),
+            'task_id': self.task_id,
+        }
+        _stream_buffer.put(f'task-{self.task_id}', event)
+        if level in ('error', 'success'):
+            _stream_buffer.flush()
+
     def _format_message(self, message: str) -> str:
         """Add plugin label prefix if available"""
         if self.plugin_label:
             return f"[{self.plugin_label}] {message}"
         return message
-    
+
     def _log(self, level: str, message: str, *args, **kwargs):
         """Internal method to log to both standard logger and stream"""
+        logs = self._logs(level)
+        streams = self._streams(level)
+        if not (logs or streams):
+            return
+
         formatted_msg = self._format_message(message)
-        
+
         if args:
             formatted_msg = formatted_msg % args
-        
-        # Always log to standard logger
-        log_method = getattr(self.standard_logger, level)
-        log_method(formatted_msg, **kwargs)
-        
-        # Send to event stream
-        self._send_to_stream(formatted_msg, level)
-    
+
+        if logs:
+            getattr(self.standard_logger, _LOG_METHODS.get(level, level))(formatted_msg, **kwargs)
+
+        if streams:
+            self._send_to_stream(formatted_msg, level)
+
     def debug(self, message: str, *args, **kwargs):
         self._log('debug', message, *args, **kwargs)
-    
+
     def info(self, message: str, *args, **kwargs):
         self._log('info', message, *args, **kwargs)
-    
+
     def warning(self, message: str, *args, **kwargs):
         self._log('warning', message, *args, **kwargs)
-    
+
     def error(self, message: str, *args, **kwargs):
         self._log('error', message, *args, **kwargs)
-    
+
+    def exception(self, message: str, *args, **kwargs):
+        """Log at error level with the current exception's traceback."""
+        kwargs.setdefault('exc_info', True)
+        self._log('error', message, *args, **kwargs)
+
     def success(self, message: str, *args, **kwargs):
         """Custom log level for successful operations"""
-        formatted_msg = self._format_message(message)
-        if args:
-            formatted_msg = formatted_msg % args
-        
-        self.standard_logger.info(formatted_msg, **kwargs)
-        self._send_to_stream(formatted_msg, 'success')
+        self._log('success', message, *args, **kwargs)
+
+    def summarize(self, level: str, message: str, *args, count: int = 1):
+        """
+        Record ``count`` more occurrences of a message that repeats, instead
+        of logging each one.
+
+        ``message`` takes the accumulated count as its first ``%`` argument,
+        followed by ``args``; occurrences with the same level, message and
+        ``args`` add up. The line is emitted once
+        :data:`SUMMARY_INTERVAL_SECONDS` have passed since the first
+        occurrence it covers, and by :meth:`flush_summaries`::
+
+            log.summarize("warning", "%d records rejected for station %s: %s",
+                          station.name, reason, count=rejected)
+        """
+        if not count or not self.is_enabled_for(level):
+            return
+
+        key = (level, message, args)
+        now = time.monotonic()
+        with self._summaries_lock:
+            total, since = self._summaries.get(key, (0, now))
+            total += count
+            if now - since < SUMMARY_INTERVAL_SECONDS:
+                self._summaries[key] = (total, since)
+                return
+            self._summaries.pop(key, None)
+        getattr(self, level)(message, total, *args)
+
+    def flush_summaries(self):
+        """Emit every pending :meth:`summarize` line with its count so far."""
+        with self._summaries_lock:
+            summaries, self._summaries = self._summaries, {}
+        for (level, message, args), (total, _) in summaries.items():
+            getattr(self, level)(message, total, *args)
+
+    def flush(self):
+        """Emit pending summaries and send every queued stream event now."""
+        self.flush_summaries()
+        flush_task_log_stream()
@@ -0,0 +1,138 @@
+from datetime import datetime, timezone as py_tz
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from adl.core.backfill import cancel_backfill_job, create_backfill_job, resume_failed_slices
+from adl.core.models import BackfillJob, NetworkConnection, StationLink
+from adl.core.retention import validate_backfill_start
+
+
+def _parse_date(value):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise CommandError(f"Invalid date '{value}': {e}")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=py_tz.utc)
+
+
+class Command(BaseCommand):
+    help = 'Request, follow, cancel or resume a historical backfill'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--connection',
+            type=int,
+            help='Id of the network connection to backfill',
+        )
+        parser.add_argument(
+            '--start-date',
+            type=str,
+            help='Start of the window (ISO 8601; UTC unless an offset is given)',
+        )
+        parser.add_argument(
+            '--end-date',
+            type=str,
+            help='End of the window (ISO 8601). Default: now',
+        )
+        parser.add_argument(
+            '--station-link',
+            type=int,
+            action='append',
+            help='Backfill only this station link (repeatable). Default: every enabled station link',
+        )
+        parser.add_argument(
+            '--slice-days',
+            type=int,
+            default=7,
+            help='Days of data one task fetches for one station. Default: 7',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Slices of this job that may run at the same time. Default: 4',
+        )
+        parser.add_argument(
+            '--status',
+            type=int,
+            metavar='JOB_ID',
+            help='Show the progress of a backfill job',
+        )
+        parser.add_argument(
+            '--cancel',
+            type=int,
+            metavar='JOB_ID',
+            help='Stop queueing the slices of a backfill job',
+        )
+        parser.add_argument(
+            '--resume',
+            type=int,
+            metavar='JOB_ID',
+            help='Retry the failed slices of a backfill job, or restart a cancelled one',
+        )
+
+    def get_job(self, job_id):
+        job = BackfillJob.objects.filter(id=job_id).select_related("network_connection").first()
+        if job is None:
+            raise CommandError(f"Backfill job {job_id} does not exist")
+        return job
+
+    def write_status(self, job):
+        job.refresh_from_db()
+        self.stdout.write(f"Backfill job {job.id} ({job}): {job.get_status_display()}")
+        self.stdout.write(f"  {job.progress_display()}")
+
+    def handle(self, *args, **options):
+        if options['status']:
+            self.write_status(self.get_job(options['status']))
+            return
+
+        if options['cancel']:
+            job = self.get_job(options['cancel'])
+            cancel_backfill_job(job)
+            self.write_status(job)
+            return
+
+        if options['resume']:
+            job = self.get_job(options['resume'])
+            reset = resume_failed_slices(job)
+            self.stdout.write(f"{reset} failed slice(s) queued again")
+            self.write_status(job)
+            return
+
+        if not options['connection'] or not options['start_date']:
+            raise CommandError("--connection and --start-date are required to request a backfill")
+
+        network_connection = NetworkConnection.objects.filter(id=options['connection']).first()
+        if network_connection is None:
+            raise CommandError(f"Network connection {options['connection']} does not exist")
+
+        start_date = _parse_date(options['start_date'])
+        end_date = _parse_date(options['end_date']) if options['end_date'] else datetime.now(py_tz.utc)
+        if start_date >= end_date:
+            raise CommandError("The start date must be before the end date")
+        try:
+            validate_backfill_start(network_connection, start_date)
+        except ValidationError as e:
+            raise CommandError(e.messages[0])
+
+        station_links = None
+        if options['station_link']:
+            station_links = list(StationLink.objects.filter(id__in=options['station_link'],
+                                                            network_connection=network_connection))
+            missing = set(options['station_link']) - {link.id for link in station_links}
+            if missing:
+                raise CommandError(f"Station links not on this connection: {sorted(missing)}")
+
+        job = create_backfill_job(
+            network_connection,
+            start_date,
+            end_date,
+            station_links=station_links,
+            slice_days=options['slice_days'],
+            max_concurrent_slices=options['concurrency'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Backfill job {job.id} queued"))
+        self.write_status(job)
@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from adl.core.benchmarks import (
+    DEFAULT_BASELINE_PATH,
+    DEFAULT_TOLERANCE,
+    SCENARIOS,
+    Workload,
+    compare_to_baseline,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark observation ingestion with a synthetic source and compare against a stored baseline'
+
+    def add_arguments(self, parser):
+        defaults = Workload()
+        parser.add_argument('--stations', type=int, default=defaults.stations,
+                            help=f'Stations in the workload. Default: {defaults.stations}')
+        parser.add_argument('--parameters', type=int, default=defaults.parameters,
+                            help=f'Parameters per record. Default: {defaults.parameters}')
+        parser.add_argument('--timestamps', type=int, default=defaults.timestamps,
+                            help=f'Records per station. Default: {defaults.timestamps}')
+        parser.add_argument('--seed', type=int, default=defaults.seed,
+                            help='Seed for the synthetic values')
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=list(SCENARIOS),
+            help='Run only this scenario (repeatable). Default: all',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(DEFAULT_BASELINE_PATH),
+            help=f'Baseline file. Default: {DEFAULT_BASELINE_PATH}',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store this run as the baseline instead of comparing against it',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help=f'Allowed throughput and memory regression, as a fraction. Default: {DEFAULT_TOLERANCE}',
+        )
+
+    def handle(self, *args, **options):
+        workload = Workload(
+            stations=options['stations'],
+            parameters=options['parameters'],
+            timestamps=options['timestamps'],
+            seed=options['seed'],
+        )
+
+        self.stdout.write(f"Workload: {workload}")
+        results = run_benchmarks(workload, options.get('scenario'))
+
+        self.stdout.write(
+            f"\n{'scenario':<20}{'records':>10}{'saved':>10}{'seconds':>10}{'records/s':>12}{'peak MB':>10}{'queries':>10}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result.scenario:<20}{result.source_records:>10}{result.saved_records:>10}{result.seconds:>10}"
+                f"{result.records_per_second:>12}{result.peak_rss_mb:>10}{result.queries:>10}"
+            )
+
+        if options['save_baseline']:
+            save_baseline(options['baseline'], workload, results)
+            self.stdout.write(self.style.SUCCESS(f"\nBaseline saved to {options['baseline']}"))
+            return
+
+        try:
+            baseline = load_baseline(options['baseline'])
+        except FileNotFoundError:
+            self.stdout.write(self.style.WARNING(
+                f"\nNo baseline at {options['baseline']}; run with --save-baseline to record one."
+            ))
+            return
+
+        regressions = compare_to_baseline(baseline, workload, results, options['tolerance'])
+        if regressions:
+            raise CommandError("Ingestion benchmark regressed:\n  " + "\n  ".join(regressions))
+
+        self.stdout.write(self.style.SUCCESS("\nNo regressions against the baseline."))
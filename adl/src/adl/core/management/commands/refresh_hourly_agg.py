@@ -1,20 +1,31 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import connection
-from datetime import datetime
+from django.utils import timezone as dj_timezone
+from datetime import datetime, timezone as py_tz
+
+from adl.core.aggregates import HOURLY_AGGREGATE, refresh_rollups
+from adl.core.retention import aggregate_refresh_floor
 
 class Command(BaseCommand):
-    help = 'Refresh hourly aggregate for all historical data'
+    help = 'Refresh hourly aggregate, and the daily and monthly rollups, for all historical data'
     
     def add_arguments(self, parser):
         parser.add_argument(
             '--start-date',
             type=str,
-            help='Start date (YYYY-MM-DD HH:MM:SS). Default: earliest observation',
+            help='Start date (YYYY-MM-DD HH:MM:SS, UTC). Default: earliest observation, or with '
+                 '--rollups-only the earliest hourly bucket',
         )
         parser.add_argument(
             '--end-date',
             type=str,
-            help='End date (YYYY-MM-DD HH:MM:SS). Default: now',
+            help='End date (YYYY-MM-DD HH:MM:SS, UTC). Default: now',
+        )
+        parser.add_argument(
+            '--rollups-only',
+            action='store_true',
+            help='Refresh only the daily and monthly rollups, from the hourly aggregate. Safe over data '
+                 'whose raw observations were deleted by retention',
         )
         parser.add_argument(
             '--dry-run',
@@ -25,8 +36,21 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         start_date = options.get('start_date')
         end_date = options.get('end_date')
+        try:
+            start_date = datetime.fromisoformat(start_date) if start_date else None
+            end_date = datetime.fromisoformat(end_date) if end_date else None
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+        if start_date and not start_date.tzinfo:
+            start_date = start_date.replace(tzinfo=py_tz.utc)
+        if end_date and not end_date.tzinfo:
+            end_date = end_date.replace(tzinfo=py_tz.utc)
         dry_run = options.get('dry_run', False)
         
+        if options.get('rollups_only'):
+            self.refresh_rollups_only(start_date, end_date, dry_run)
+            return
+        
         with connection.cursor() as cursor:
             # Get date range info
             if not start_date:
@@ -34,10 +58,20 @@ class Command(BaseCommand):
                     SELECT MIN(time) FROM core_observationrecord WHERE is_daily = false;
                 """)
                 result = cursor.fetchone()
-                start_date = result[0] if result[0] else datetime.now()
+                start_date = result[0] if result[0] else dj_timezone.now()
             
             if not end_date:
-                end_date = datetime.now()
+                end_date = dj_timezone.now()
+            
+            # Raw rows below the floor may be gone: refreshing there would
+            # empty hourly buckets that are now the only copy of the data
+            floor = aggregate_refresh_floor()
+            if floor is not None and start_date < floor:
+                raise CommandError(
+                    f"Raw observations before {floor:%Y-%m-%d %H:%M} may have been deleted by retention, and "
+                    f"refreshing the hourly aggregate there would empty its buckets. Start at or after that "
+                    f"date, or use --rollups-only to refresh the daily and monthly rollups."
+                )
             
             # Get record counts
             cursor.execute("""
@@ -71,6 +105,8 @@ class Command(BaseCommand):
             cursor.execute("""
                 CALL refresh_continuous_aggregate('obs_agg_1h', %s, %s);
             """, [start_date, end_date])
+            # The daily and monthly rollups are built on the hourly aggregate
+            refresh_rollups(cursor, start_date, end_date)
             duration = (datetime.now() - start_time).total_seconds()
             
             # Get result counts
@@ -82,4 +118,38 @@ class Command(BaseCommand):
             
             self.stdout.write(self.style.SUCCESS(f"Done! ({duration:.1f}s)"))
             self.stdout.write(f"Aggregated records created: {agg_count:,}")
-            self.stdout.write(f"Compression ratio: {raw_count/agg_count if agg_count else 0:.1f}x\n")
\ No newline at end of file
+            self.stdout.write(f"Compression ratio: {raw_count/agg_count if agg_count else 0:.1f}x\n")
+    
+    def refresh_rollups_only(self, start_date, end_date, dry_run):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT MIN(bucket), MAX(bucket) FROM {HOURLY_AGGREGATE};")
+            first_bucket, last_bucket = cursor.fetchone()
+            if first_bucket is None:
+                self.stdout.write("The hourly aggregate is empty; nothing to roll up.")
+                return
+            
+            start_date = start_date or first_bucket
+            end_date = end_date or dj_timezone.now()
+            
+            self.stdout.write(f"\nDate range: {start_date} to {end_date}")
+            self.stdout.write(f"Hourly buckets from {first_bucket} to {last_bucket}")
+            
+            if dry_run:
+                self.stdout.write(self.style.WARNING("\nDRY RUN - No changes made"))
+                return
+            
+            self.stdout.write("\nRefreshing rollups... ", ending='')
+            self.stdout.flush()
+            
+            start_time = datetime.now()
+            refresh_rollups(cursor, start_date, end_date)
+            duration = (datetime.now() - start_time).total_seconds()
+            
+            cursor.execute("""
+                SELECT COUNT(*) FROM obs_agg_1d
+                WHERE bucket BETWEEN %s AND %s;
+            """, [start_date, end_date])
+            daily_count = cursor.fetchone()[0]
+            
+            self.stdout.write(self.style.SUCCESS(f"Done! ({duration:.1f}s)"))
+            self.stdout.write(f"Daily rows: {daily_count:,}\n")
@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone as py_tz
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections as db_connections
+
+from adl.core.archive import replay_station_link
+from adl.core.exceptions import InstanceTypeDoesNotExist
+from adl.core.models import NetworkConnection, StationLink
+from adl.core.registries import plugin_registry
+from adl.core.retention import validate_backfill_start
+
+
+def _parse_date(value):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise CommandError(f"Invalid date '{value}': {e}")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=py_tz.utc)
+
+
+class Command(BaseCommand):
+    help = "Reprocess archived raw records of a connection without fetching them again"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--connection",
+            type=int,
+            required=True,
+            help="Id of the network connection to replay",
+        )
+        parser.add_argument(
+            "--start-date",
+            type=str,
+            help="Start of the window (ISO 8601; UTC unless an offset is given). Default: the oldest archived "
+                 "run that raw retention has not passed",
+        )
+        parser.add_argument(
+            "--end-date",
+            type=str,
+            help="End of the window (ISO 8601). Default: the newest archived run",
+        )
+        parser.add_argument(
+            "--station-link",
+            type=int,
+            action="append",
+            help="Replay only this station link (repeatable). Default: every station link of the connection",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Station links replayed at the same time. Default: 4",
+        )
+
+    def handle(self, *args, **options):
+        connection = NetworkConnection.objects.filter(id=options["connection"]).first()
+        if connection is None:
+            raise CommandError(f"Network connection {options['connection']} does not exist")
+
+        try:
+            plugin = plugin_registry.get(connection.plugin)
+        except InstanceTypeDoesNotExist:
+            raise CommandError(f"Plugin '{connection.plugin}' of connection {connection.name} is not installed")
+
+        start_date = _parse_date(options["start_date"]) if options["start_date"] else None
+        end_date = _parse_date(options["end_date"]) if options["end_date"] else None
+        if start_date and end_date and start_date >= end_date:
+            raise CommandError("--start-date must be before --end-date")
+        if start_date:
+            try:
+                validate_backfill_start(connection, start_date)
+            except ValidationError as e:
+                raise CommandError(e.messages[0])
+
+        station_links = StationLink.objects.filter(network_connection=connection)
+        if options["station_link"]:
+            station_links = station_links.filter(id__in=options["station_link"])
+        station_links = list(station_links)
+
+        def replay(station_link):
+            try:
+                return station_link, replay_station_link(plugin, station_link, start_date, end_date)
+            finally:
+                db_connections.close_all()
+
+        replayed = saved = 0
+        with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as executor:
+            for station_link, records in executor.map(replay, station_links):
+                if records is None:
+                    self.stdout.write(f"  {station_link}: nothing archived")
+                    continue
+                replayed += 1
+                saved += records
+                self.stdout.write(f"  {station_link}: {records} records")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Replayed {replayed} of {len(station_links)} station links of {connection.name}: {saved} records saved"
+        ))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from adl.core.aggregates import (
+    TEN_MINUTE_AGGREGATE,
+    aggregate_exists,
+    create_ten_minute_aggregate,
+    drop_ten_minute_aggregate,
+)
+from adl.core.compression import timescaledb_available
+from adl.core.models import DataParameter, ObservationRecord
+
+
+class Command(BaseCommand):
+    help = "Create or drop the optional 10-minute observation aggregate"
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group(required=True)
+        action.add_argument(
+            "--enable",
+            action="store_true",
+            help="Create the aggregate and its refresh policy. The policy fills in the last 90 days of "
+                 "stored data in the background",
+        )
+        action.add_argument(
+            "--disable",
+            action="store_true",
+            help="Drop the aggregate and everything it holds",
+        )
+        parser.add_argument(
+            "--refresh-days",
+            type=int,
+            default=None,
+            help="With --enable, aggregate this many days of stored data now instead of waiting for the policy",
+        )
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            if not timescaledb_available(cursor):
+                raise CommandError("TimescaleDB is not installed")
+
+            if options["disable"]:
+                drop_ten_minute_aggregate(cursor)
+                self.stdout.write(self.style.SUCCESS(f"Dropped {TEN_MINUTE_AGGREGATE}"))
+                return
+
+            if aggregate_exists(cursor, TEN_MINUTE_AGGREGATE):
+                self.stdout.write(f"{TEN_MINUTE_AGGREGATE} already exists")
+            else:
+                create_ten_minute_aggregate(cursor, ObservationRecord._meta.db_table,
+                                            DataParameter._meta.db_table)
+                self.stdout.write(self.style.SUCCESS(f"Created {TEN_MINUTE_AGGREGATE}"))
+
+            if options["refresh_days"]:
+                cursor.execute(
+                    "CALL refresh_continuous_aggregate(%s::regclass, now() - make_interval(days => %s), now())",
+                    [TEN_MINUTE_AGGREGATE, options["refresh_days"]],
+                )
+                self.stdout.write(f"Aggregated the last {options['refresh_days']} days")
@@ -0,0 +1,299 @@
+"""
+Operational metrics in the Prometheus text exposition format, served at
+``/metrics`` (see :func:`adl.core.views.metrics`).
+
+Ingestion and dispatch run in Celery worker processes and the endpoint in a
+web process, so the numbers have to meet somewhere. Recording is
+process-local and does no I/O: :func:`inc` and :func:`observe` add to an
+in-memory buffer, which is folded into one Redis hash (``HINCRBYFLOAT``) by a
+background thread every :data:`METRICS_FLUSH_INTERVAL_SECONDS`, after every
+Celery task and at process exit. Counters and histograms are therefore totals across every
+process since Redis was last emptied; a lost flush loses increments, never
+corrupts the totals.
+
+Two values are observed when the endpoint is scraped instead of recorded:
+ingestion lag (now minus the latest observation time saved per connection)
+and broker queue depth (:func:`adl.core.broker.get_queue_depths`).
+
+Labels carry connection and channel *names*, which is what dashboards group
+by; renaming a connection starts a new series.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+
+from celery.signals import task_postrun
+
+logger = logging.getLogger(__name__)
+
+METRICS_FLUSH_INTERVAL_SECONDS = 10
+
+_REDIS_KEY = "adl:metrics"
+_LATEST_OBSERVATION_KEY = "adl:metrics:latest_observation"
+
+# HSET the field only when the new value is larger
+_HSET_MAX_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]))
+if current == nil or tonumber(ARGV[2]) > current then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+"""
+
+_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_UPLOAD_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+_WAIT_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800)
+
+
+class _Metric:
+    __slots__ = ("name", "kind", "help", "labels", "buckets")
+
+    def __init__(self, name, kind, help, labels, buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+
+
+METRICS = {metric.name: metric for metric in (
+    _Metric("adl_ingest_records_saved_total", "counter",
+            "Observation records written (inserted, updated or found unchanged).",
+            ("connection",)),
+    _Metric("adl_ingest_duplicates_suppressed_total", "counter",
+            "Re-fetched values found already stored and skipped before QC.",
+            ("connection",)),
+    _Metric("adl_ingest_chunk_upsert_seconds", "histogram",
+            "Time to write one chunk of observation records.",
+            ("connection",), _LATENCY_BUCKETS),
+    _Metric("adl_ingest_qc_seconds", "histogram",
+            "Time to run QC over one chunk of observation records.",
+            ("connection",), _LATENCY_BUCKETS),
+    _Metric("adl_ingest_queue_wait_seconds", "histogram",
+            "Time from the coordinator planning a batch to the batch starting.",
+            ("connection",), _WAIT_BUCKETS),
+    _Metric("adl_dispatch_records_sent_total", "counter",
+            "Records sent by dispatch channels.",
+            ("channel",)),
+    _Metric("adl_dispatch_upload_seconds", "histogram",
+            "Time for a dispatch channel to send one station's records.",
+            ("channel",), _UPLOAD_BUCKETS),
+    _Metric("adl_lock_collisions_total", "counter",
+            "Runs skipped because the previous run of the same station was still going.",
+            ("direction", "name")),
+    _Metric("adl_ingest_lag_seconds", "gauge",
+            "Seconds since the latest observation time saved for the connection.",
+            ("connection",)),
+    _Metric("adl_queue_depth", "gauge",
+            "Messages waiting on the broker queue (excludes messages already prefetched by a worker).",
+            ("queue",)),
+)}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_string(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items())) + "}"
+
+
+def _with_le(series, bound):
+    le = f'le="{bound}"'
+    return "{" + le + "}" if not series else series[:-1] + "," + le + "}"
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class _MetricBuffer:
+    """
+    This process's increments since its last flush to Redis. A forked child
+    starts over with an empty buffer and a flusher thread of its own.
+    """
+    __slots__ = ("_pid", "_lock", "_increments", "_latest", "_flusher")
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._increments = {}
+        self._latest = {}
+        self._flusher = None
+
+    def _ensure_flusher(self):
+        if self._pid != os.getpid():
+            self._reset()
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._run, name="adl-metrics-flush", daemon=True)
+            self._flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL_SECONDS)
+            self.flush()
+
+    def add(self, fields):
+        self._ensure_flusher()
+        with self._lock:
+            for field, amount in fields:
+                self._increments[field] = self._increments.get(field, 0) + amount
+
+    def latest(self, field, value):
+        self._ensure_flusher()
+        with self._lock:
+            if value > self._latest.get(field, float("-inf")):
+                self._latest[field] = value
+
+    def flush(self):
+        if self._pid != os.getpid():
+            self._reset()
+        with self._lock:
+            increments, self._increments = self._increments, {}
+            latest, self._latest = self._latest, {}
+        if not increments and not latest:
+            return
+
+        try:
+            from django_redis import get_redis_connection
+
+            redis = get_redis_connection("default")
+            pipeline = redis.pipeline(transaction=False)
+            for field, amount in increments.items():
+                pipeline.hincrbyfloat(_REDIS_KEY, field, amount)
+            for field, value in latest.items():
+                pipeline.eval(_HSET_MAX_SCRIPT, 1, _LATEST_OBSERVATION_KEY, field, value)
+            pipeline.execute()
+        except Exception as e:
+            # Metrics never fail the work they measure
+            logger.warning("Could not flush metrics to Redis: %s", e)
+
+
+_buffer = _MetricBuffer()
+atexit.register(_buffer.flush)
+
+
+@task_postrun.connect(weak=False)
+def _flush_after_task(**kwargs):
+    _buffer.flush()
+
+
+def flush_metrics():
+    """Fold this process's buffered increments into Redis now."""
+    _buffer.flush()
+
+
+def inc(name, amount=1, /, **labels):
+    """Add ``amount`` to counter ``name``."""
+    if amount:
+        _buffer.add([(name + _label_string(labels), amount)])
+
+
+def observe(name, value, /, **labels):
+    """Record ``value`` (seconds) in histogram ``name``."""
+    series = _label_string(labels)
+    fields = [
+        (f"{name}_bucket{_with_le(series, _format_bound(bound))}", 1)
+        for bound in METRICS[name].buckets
+        if value <= bound
+    ]
+    fields += [
+        (f"{name}_bucket{_with_le(series, '+Inf')}", 1),
+        (f"{name}_sum{series}", value),
+        (f"{name}_count{series}", 1),
+    ]
+    _buffer.add(fields)
+
+
+def record_latest_observation(connection_name, observation_time):
+    """Note that ``observation_time`` was saved for the connection, for the lag gauge."""
+    if observation_time is not None:
+        _buffer.latest(_label_string({"connection": connection_name}), observation_time.timestamp())
+
+
+def _format_value(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _read_redis():
+    from django_redis import get_redis_connection
+
+    redis = get_redis_connection("default")
+    pipeline = redis.pipeline(transaction=False)
+    pipeline.hgetall(_REDIS_KEY)
+    pipeline.hgetall(_LATEST_OBSERVATION_KEY)
+    recorded, latest = pipeline.execute()
+
+    def decode(raw):
+        return {key.decode(): float(value) for key, value in raw.items()}
+
+    return decode(recorded), decode(latest)
+
+
+def _render_recorded(metric, recorded):
+    if metric.kind == "counter":
+        prefix = metric.name + "{"
+        return [
+            f"{field} {_format_value(value)}"
+            for field, value in sorted(recorded.items())
+            if field.startswith(prefix) or field == metric.name
+        ]
+
+    # Histograms are rendered series by series, buckets in bound order
+    count_prefix = f"{metric.name}_count"
+    lines = []
+    for count_field in sorted(field for field in recorded if field.startswith(count_prefix)):
+        series = count_field[len(count_prefix):]
+        for bound in [*map(_format_bound, metric.buckets), "+Inf"]:
+            field = f"{metric.name}_bucket{_with_le(series, bound)}"
+            lines.append(f"{field} {_format_value(recorded.get(field, 0))}")
+        lines.append(f"{metric.name}_sum{series} {_format_value(recorded.get(f'{metric.name}_sum{series}', 0))}")
+        lines.append(f"{count_field} {_format_value(recorded[count_field])}")
+    return lines
+
+
+def render_metrics():
+    """The current metrics as a Prometheus text exposition document."""
+    from .broker import get_queue_depths
+    from .tasks import BACKFILL_QUEUE_NAME, DISPATCH_QUEUE_NAME, INGESTION_QUEUE_NAME
+
+    # What this process has not flushed yet would otherwise be missing
+    _buffer.flush()
+    try:
+        recorded, latest = _read_redis()
+    except Exception as e:
+        logger.warning("Could not read metrics from Redis: %s", e)
+        recorded, latest = {}, {}
+
+    now = time.time()
+    samples = {
+        "adl_ingest_lag_seconds": [
+            f"adl_ingest_lag_seconds{series} {_format_value(max(0.0, round(now - value, 3)))}"
+            for series, value in sorted(latest.items())
+        ],
+        "adl_queue_depth": [
+            f"adl_queue_depth{_label_string({'queue': queue})} {depth}"
+            for queue, depth in get_queue_depths(
+                [INGESTION_QUEUE_NAME, DISPATCH_QUEUE_NAME, BACKFILL_QUEUE_NAME]
+            ).items()
+            if depth is not None
+        ],
+    }
+
+    lines = []
+    for metric in METRICS.values():
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        if metric.kind == "gauge":
+            lines.extend(samples[metric.name])
+        else:
+            lines.extend(_render_recorded(metric, recorded))
+    return "\n".join(lines) + "\n"
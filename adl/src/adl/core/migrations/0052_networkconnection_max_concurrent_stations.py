@@ -0,0 +1,19 @@
+# Generated by Django 6.0.7 on 2026-10-17 10:04
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0051_alter_networkconnection_ingest_timeout_seconds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='networkconnection',
+            name='max_concurrent_stations',
+            field=models.PositiveIntegerField(default=1, help_text='How many stations of a batch are fetched at the same time. Leave at 1 to process them one after another. Raise it for sources where most of a run is spent waiting on the network; the plugin must tolerate concurrent fetches.', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(16)], verbose_name='Concurrent Stations per Batch'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.7 on 2026-10-17 14:20
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0052_networkconnection_max_concurrent_stations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateTimeField(verbose_name='Start Date')),
+                ('end_date', models.DateTimeField(verbose_name='End Date')),
+                ('slice_days', models.PositiveIntegerField(default=7, help_text='How much time one task fetches for one station. Shorter slices checkpoint more often and spread better across workers.', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(366)], verbose_name='Slice Length (days)')),
+                ('max_concurrent_slices', models.PositiveIntegerField(default=4, help_text='How many slices of this job may run at the same time. Keep it within what the source allows.', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(64)], verbose_name='Concurrent Slices')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Completed with failed slices'), ('CANCELLED', 'Cancelled')], default='PENDING', max_length=20, verbose_name='Status')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('network_connection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='backfill_jobs', to='core.networkconnection', verbose_name='Network Connection')),
+                ('station_links', models.ManyToManyField(blank=True, help_text='Leave empty to backfill every enabled station link of the connection', related_name='+', to='core.stationlink', verbose_name='Station Links')),
+            ],
+            options={
+                'verbose_name': 'Backfill',
+                'verbose_name_plural': 'Backfills',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BackfillSlice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateTimeField()),
+                ('end_date', models.DateTimeField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('records_count', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slices', to='core.backfilljob')),
+                ('station_link', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='backfill_slices', to='core.stationlink')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'status', '-end_date'], name='backfill_slice_queue_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'station_link', 'start_date'), name='unique_backfill_slice')],
+            },
+        ),
+    ]
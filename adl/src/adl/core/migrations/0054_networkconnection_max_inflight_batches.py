@@ -0,0 +1,19 @@
+# Generated by Django 6.0.7 on 2026-10-17 15:05
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0053_backfilljob_backfillslice'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='networkconnection',
+            name='max_inflight_batches',
+            field=models.PositiveIntegerField(default=0, help_text="How many of this connection's batches may be queued or running on the shared ingestion queue at once; the rest wait their turn. Set it on large or slow networks so smaller connections never queue behind them. 0 means no limit.", validators=[django.core.validators.MaxValueValidator(64)], verbose_name='Batches in Flight'),
+        ),
+    ]
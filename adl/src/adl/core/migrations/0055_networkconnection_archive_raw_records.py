@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-17 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0054_networkconnection_max_inflight_batches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='networkconnection',
+            name='archive_raw_records',
+            field=models.BooleanField(default=False, help_text='Keep a compressed copy of everything the source returns, so the data can be reprocessed later without fetching it again. Uses disk space on the archive volume.', verbose_name='Archive Raw Records'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.7 on 2026-10-17 16:10
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def _has_timescaledb(schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+        return cursor.fetchone() is not None
+
+
+def forwards_enable_compression(apps, schema_editor):
+    if not _has_timescaledb(schema_editor):
+        return
+    tbl = apps.get_model("core", "ObservationRecord")._meta.db_table
+    # One segment per series; the segment-by and order-by columns cover the
+    # (time, station, connection, parameter) unique constraint, which keeps
+    # ON CONFLICT upserts working on compressed chunks
+    schema_editor.execute(f"""
+        ALTER TABLE {tbl} SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'station_id, connection_id, parameter_id',
+            timescaledb.compress_orderby = 'time DESC'
+        );
+        SELECT add_compression_policy('{tbl}', compress_after => INTERVAL '7 days', if_not_exists => true);
+    """)
+
+
+def backwards_disable_compression(apps, schema_editor):
+    if not _has_timescaledb(schema_editor):
+        return
+    tbl = apps.get_model("core", "ObservationRecord")._meta.db_table
+    schema_editor.execute(f"""
+        SELECT remove_compression_policy('{tbl}', if_exists => true);
+        SELECT decompress_chunk(chunk, true) FROM show_chunks('{tbl}') AS chunk;
+        ALTER TABLE {tbl} SET (timescaledb.compress = false);
+    """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0055_networkconnection_archive_raw_records'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adlsettings',
+            name='observation_compress_after_days',
+            field=models.PositiveIntegerField(default=7, help_text='Observation data older than this is stored compressed, which takes a fraction of the disk space and speeds up long-range queries. Late data can still be saved into compressed periods. 0 stops compressing further data.', validators=[django.core.validators.MaxValueValidator(3650)], verbose_name='Compress Observations After (days)'),
+        ),
+        migrations.RunPython(forwards_enable_compression, backwards_disable_compression),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.7 on 2026-10-17 17:05
+
+import adl.core.retention
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0056_observationrecord_compression'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataparameter',
+            name='raw_retention_days',
+            field=models.PositiveIntegerField(default=0, help_text="How long raw observations of this parameter are kept, on every connection. 0 uses each connection's setting. Hourly aggregates are kept.", validators=[adl.core.retention.validate_raw_retention_days], verbose_name='Keep Raw Data (days)'),
+        ),
+        migrations.AddField(
+            model_name='networkconnection',
+            name='raw_retention_days',
+            field=models.PositiveIntegerField(default=0, help_text='Delete raw observations of this connection once they are this many days old. 0 keeps them. Hourly aggregates are kept.', validators=[adl.core.retention.validate_raw_retention_days], verbose_name='Keep Raw Data (days)'),
+        ),
+    ]
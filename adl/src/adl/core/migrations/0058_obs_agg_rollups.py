@@ -0,0 +1,167 @@
+# Manually created on 2026-10-17 18:10
+from django.db import migrations, models
+
+from adl.core.aggregates import wrapper_view_sql
+
+
+def forwards_create_rollups(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    param_tbl = apps.get_model("core", "DataParameter")._meta.db_table
+    # Daily on hourly, monthly on daily. Sums and counts only, so each level
+    # combines the one below exactly; the wrapper views derive the averages.
+    # The hourly aggregate keeps means, not sine and cosine sums, so for now
+    # the daily ones are taken from the hourly means, weighted by count.
+    schema_editor.execute(f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS obs_agg_1d
+        WITH (timescaledb.continuous) AS
+        SELECT
+          station_id,
+          connection_id,
+          parameter_id,
+          time_bucket('1 day', bucket) AS bucket,
+          MIN(min_value)                                 AS min_value,
+          MAX(max_value)                                 AS max_value,
+          SUM(sum_value)                                 AS sum_value,
+          SUM(sin(radians(avg_value)) * records_count)   AS sin_sum,
+          SUM(cos(radians(avg_value)) * records_count)   AS cos_sum,
+          SUM(records_count)::bigint                     AS records_count
+        FROM obs_agg_1h
+        GROUP BY station_id, connection_id, parameter_id, time_bucket('1 day', bucket)
+        WITH NO DATA;
+
+        ALTER MATERIALIZED VIEW obs_agg_1d
+        SET (timescaledb.materialized_only = false);
+
+        CREATE INDEX IF NOT EXISTS obs_agg_1d_idx
+          ON obs_agg_1d (station_id, connection_id, parameter_id, bucket);
+
+        CREATE MATERIALIZED VIEW IF NOT EXISTS obs_agg_1mo
+        WITH (timescaledb.continuous) AS
+        SELECT
+          station_id,
+          connection_id,
+          parameter_id,
+          time_bucket('1 month', bucket) AS bucket,
+          MIN(min_value)              AS min_value,
+          MAX(max_value)              AS max_value,
+          SUM(sum_value)              AS sum_value,
+          SUM(sin_sum)                AS sin_sum,
+          SUM(cos_sum)                AS cos_sum,
+          SUM(records_count)::bigint  AS records_count
+        FROM obs_agg_1d
+        GROUP BY station_id, connection_id, parameter_id, time_bucket('1 month', bucket)
+        WITH NO DATA;
+
+        ALTER MATERIALIZED VIEW obs_agg_1mo
+        SET (timescaledb.materialized_only = false);
+
+        CREATE INDEX IF NOT EXISTS obs_agg_1mo_idx
+          ON obs_agg_1mo (station_id, connection_id, parameter_id, bucket);
+
+        {wrapper_view_sql("obs_agg_1d", param_tbl)}
+        {wrapper_view_sql("obs_agg_1mo", param_tbl)}
+
+        -- The daily window follows the hourly policy's 90 days, so late data
+        -- reaching the hourly aggregate reaches the rollups too
+        SELECT add_continuous_aggregate_policy(
+          'obs_agg_1d',
+          start_offset      => INTERVAL '90 days',
+          end_offset        => INTERVAL '1 day',
+          schedule_interval => INTERVAL '1 hour'
+        );
+        SELECT add_continuous_aggregate_policy(
+          'obs_agg_1mo',
+          start_offset      => INTERVAL '4 months',
+          end_offset        => INTERVAL '1 month',
+          schedule_interval => INTERVAL '1 day'
+        );
+    """)
+
+    print("\n" + "="*60)
+    print("IMPORTANT: Daily and monthly rollups created empty!")
+    print("The refresh policies fill in the last 90 days and 4 months. For the")
+    print("rest of the hourly aggregate's history run:")
+    print("python manage.py refresh_hourly_agg --rollups-only")
+    print("="*60 + "\n")
+
+
+def backwards_drop_rollups(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("""
+        DROP VIEW IF EXISTS obs_agg_1mo_v;
+        DROP MATERIALIZED VIEW IF EXISTS obs_agg_1mo;
+        DROP VIEW IF EXISTS obs_agg_1d_v;
+        DROP MATERIALIZED VIEW IF EXISTS obs_agg_1d;
+    """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0057_raw_retention_days'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards_create_rollups, backwards_drop_rollups),
+        migrations.CreateModel(
+            name='DailyObsAgg',
+            fields=[
+                ('id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('bucket', models.DateTimeField()),
+                ('min_value', models.FloatField(null=True)),
+                ('max_value', models.FloatField(null=True)),
+                ('avg_value', models.FloatField(null=True)),
+                ('sum_value', models.FloatField(null=True)),
+                ('records_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'obs_agg_1d_v',
+                'ordering': ['-bucket', 'station'],
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyObsAgg',
+            fields=[
+                ('id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('bucket', models.DateTimeField()),
+                ('min_value', models.FloatField(null=True)),
+                ('max_value', models.FloatField(null=True)),
+                ('avg_value', models.FloatField(null=True)),
+                ('sum_value', models.FloatField(null=True)),
+                ('records_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'obs_agg_1mo_v',
+                'ordering': ['-bucket', 'station'],
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TenMinuteObsAgg',
+            fields=[
+                ('id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('bucket', models.DateTimeField()),
+                ('min_value', models.FloatField(null=True)),
+                ('max_value', models.FloatField(null=True)),
+                ('avg_value', models.FloatField(null=True)),
+                ('sum_value', models.FloatField(null=True)),
+                ('records_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'obs_agg_10m_v',
+                'ordering': ['-bucket', 'station'],
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='dispatchchannel',
+            name='aggregation_period',
+            field=models.CharField(blank=True, choices=[('hourly', 'Hourly'), ('daily', 'Daily')], default='hourly', max_length=255, null=True, verbose_name='Aggregation Period'),
+        ),
+    ]
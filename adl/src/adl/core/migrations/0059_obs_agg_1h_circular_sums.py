@@ -0,0 +1,179 @@
+# Manually created on 2026-10-17 19:00
+import importlib
+import os
+
+from django.db import migrations
+
+from adl.core.aggregates import wrapper_view_sql
+
+# Set to rebuild even though raw data may have been deleted by retention:
+# hourly buckets whose raw rows are gone are lost with the old aggregate
+ALLOW_REBUILD_ENV = "ADL_ALLOW_HOURLY_AGGREGATE_REBUILD"
+
+
+def _check_no_expired_raw_data(apps):
+    NetworkConnection = apps.get_model("core", "NetworkConnection")
+    DataParameter = apps.get_model("core", "DataParameter")
+    retention_configured = (NetworkConnection.objects.filter(raw_retention_days__gt=0).exists()
+                            or DataParameter.objects.filter(raw_retention_days__gt=0).exists())
+    if retention_configured and not os.environ.get(ALLOW_REBUILD_ENV):
+        raise RuntimeError(
+            "This migration rebuilds the hourly aggregate from raw observations, and raw data retention is "
+            "configured: hourly data for periods whose raw rows were deleted would be lost. Set "
+            f"{ALLOW_REBUILD_ENV}=1 to rebuild anyway."
+        )
+
+
+def forwards_store_circular_sums(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    _check_no_expired_raw_data(apps)
+    tbl = apps.get_model("core", "ObservationRecord")._meta.db_table
+    param_tbl = apps.get_model("core", "DataParameter")._meta.db_table
+
+    # The rollups depend on the hourly aggregate and go first
+    schema_editor.execute("""
+        DROP VIEW IF EXISTS obs_agg_1mo_v;
+        DROP MATERIALIZED VIEW IF EXISTS obs_agg_1mo;
+        DROP VIEW IF EXISTS obs_agg_1d_v;
+        DROP MATERIALIZED VIEW IF EXISTS obs_agg_1d;
+        SELECT remove_continuous_aggregate_policy('obs_agg_1h', if_exists => true);
+        DROP VIEW IF EXISTS obs_agg_1h_v;
+        DROP MATERIALIZED VIEW IF EXISTS obs_agg_1h;
+        DROP FUNCTION IF EXISTS circular_mean_agg(double precision[]);
+    """)
+
+    # Sine and cosine sums instead of an array per bucket: no join, no
+    # array, and they add up exactly in the daily and monthly rollups. The
+    # wrapper views derive avg_value per the parameter's aggregation method
+    schema_editor.execute(f"""
+        CREATE MATERIALIZED VIEW obs_agg_1h
+        WITH (timescaledb.continuous) AS
+        SELECT
+          station_id,
+          connection_id,
+          parameter_id,
+          time_bucket('1 hour', time) AS bucket,
+          MIN(value)                 AS min_value,
+          MAX(value)                 AS max_value,
+          SUM(value)                 AS sum_value,
+          SUM(sin(radians(value)))   AS sin_sum,
+          SUM(cos(radians(value)))   AS cos_sum,
+          COUNT(*)                   AS records_count
+        FROM {tbl}
+        WHERE is_daily = false
+        GROUP BY station_id, connection_id, parameter_id, bucket
+        WITH NO DATA;
+
+        ALTER MATERIALIZED VIEW obs_agg_1h
+        SET (timescaledb.materialized_only = false);
+
+        CREATE INDEX IF NOT EXISTS obs_agg_1h_idx
+          ON obs_agg_1h (station_id, connection_id, parameter_id, bucket);
+
+        {wrapper_view_sql("obs_agg_1h", param_tbl)}
+
+        SELECT add_continuous_aggregate_policy(
+          'obs_agg_1h',
+          start_offset      => INTERVAL '90 days',
+          end_offset        => INTERVAL '1 hour',
+          schedule_interval => INTERVAL '5 minutes'
+        );
+
+        CREATE MATERIALIZED VIEW obs_agg_1d
+        WITH (timescaledb.continuous) AS
+        SELECT
+          station_id,
+          connection_id,
+          parameter_id,
+          time_bucket('1 day', bucket) AS bucket,
+          MIN(min_value)              AS min_value,
+          MAX(max_value)              AS max_value,
+          SUM(sum_value)              AS sum_value,
+          SUM(sin_sum)                AS sin_sum,
+          SUM(cos_sum)                AS cos_sum,
+          SUM(records_count)::bigint  AS records_count
+        FROM obs_agg_1h
+        GROUP BY station_id, connection_id, parameter_id, time_bucket('1 day', bucket)
+        WITH NO DATA;
+
+        ALTER MATERIALIZED VIEW obs_agg_1d
+        SET (timescaledb.materialized_only = false);
+
+        CREATE INDEX IF NOT EXISTS obs_agg_1d_idx
+          ON obs_agg_1d (station_id, connection_id, parameter_id, bucket);
+
+        CREATE MATERIALIZED VIEW obs_agg_1mo
+        WITH (timescaledb.continuous) AS
+        SELECT
+          station_id,
+          connection_id,
+          parameter_id,
+          time_bucket('1 month', bucket) AS bucket,
+          MIN(min_value)              AS min_value,
+          MAX(max_value)              AS max_value,
+          SUM(sum_value)              AS sum_value,
+          SUM(sin_sum)                AS sin_sum,
+          SUM(cos_sum)                AS cos_sum,
+          SUM(records_count)::bigint  AS records_count
+        FROM obs_agg_1d
+        GROUP BY station_id, connection_id, parameter_id, time_bucket('1 month', bucket)
+        WITH NO DATA;
+
+        ALTER MATERIALIZED VIEW obs_agg_1mo
+        SET (timescaledb.materialized_only = false);
+
+        CREATE INDEX IF NOT EXISTS obs_agg_1mo_idx
+          ON obs_agg_1mo (station_id, connection_id, parameter_id, bucket);
+
+        {wrapper_view_sql("obs_agg_1d", param_tbl)}
+        {wrapper_view_sql("obs_agg_1mo", param_tbl)}
+
+        SELECT add_continuous_aggregate_policy(
+          'obs_agg_1d',
+          start_offset      => INTERVAL '90 days',
+          end_offset        => INTERVAL '1 day',
+          schedule_interval => INTERVAL '1 hour'
+        );
+        SELECT add_continuous_aggregate_policy(
+          'obs_agg_1mo',
+          start_offset      => INTERVAL '4 months',
+          end_offset        => INTERVAL '1 month',
+          schedule_interval => INTERVAL '1 day'
+        );
+    """)
+
+    print("\n" + "="*60)
+    print("IMPORTANT: Hourly aggregate and its rollups rebuilt!")
+    print("The refresh policies fill in the last 90 days. For older data run:")
+    print("python manage.py refresh_hourly_agg")
+    print("="*60 + "\n")
+
+
+def backwards_restore_circular_mean(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("""
+        DROP VIEW IF EXISTS obs_agg_1mo_v;
+        DROP MATERIALIZED VIEW IF EXISTS obs_agg_1mo;
+        DROP VIEW IF EXISTS obs_agg_1d_v;
+        DROP MATERIALIZED VIEW IF EXISTS obs_agg_1d;
+    """)
+    # The array-based aggregate of 0034, then the rollups of 0058 over it
+    importlib.import_module(
+        "adl.core.migrations.0034_update_hourly_aggregate_with_circular_mean"
+    ).forwards_update_cagg(apps, schema_editor)
+    importlib.import_module(
+        "adl.core.migrations.0058_obs_agg_rollups"
+    ).forwards_create_rollups(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0058_obs_agg_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards_store_circular_sums, backwards_restore_circular_mean),
+    ]
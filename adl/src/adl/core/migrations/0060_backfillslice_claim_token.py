@@ -0,0 +1,23 @@
+# Generated by Django 6.0.7 on 2026-10-17 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0059_obs_agg_1h_circular_sums'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backfillslice',
+            name='claim_token',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='backfillslice',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
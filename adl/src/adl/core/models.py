@@ -29,8 +29,9 @@ from adl.core.registries import plugin_registry
 from .blocks import QCChecksStreamBlock
 from .dispatchers import get_dispatch_channel_data
 from .panels import IngestTimeoutBudgetPanel
+from .retention import validate_raw_retention_days
 from .dispatchers.wis2box import upload_to_wis2box, test_wis2box_connection
-from .units import units, validate_unit, TEMPERATURE_UNITS
+from .units import units, validate_unit, get_conversion_plan
 from .utils import (
     validate_as_integer,
     get_custom_unit_context_entries
@@ -265,9 +266,11 @@ class DataParameter(ClusterableModel):
     parameter.
 
     **Unit conversion** is performed by :meth:`convert_value_from_units` and
-    :meth:`convert_value_to_units` using pint. For conversions that are not
-    dimensionally straightforward (e.g. precipitation ``mm`` → ``kg/m²``),
-    set ``custom_unit_context`` to the appropriate pint context name.
+    :meth:`convert_value_to_units` through compiled, cached
+    :class:`~adl.core.units.ConversionPlan` objects built with pint. For
+    conversions that are not dimensionally straightforward (e.g.
+    precipitation ``mm`` → ``kg/m²``), set ``custom_unit_context`` to the
+    appropriate pint context name.
 
     **Aggregation** of stored observations into hourly summaries uses
     ``aggregation_method``. Use ``circular`` for angular variables like wind
@@ -347,6 +350,13 @@ class DataParameter(ClusterableModel):
         verbose_name=_("Quality Control Checks"),
         help_text=_("Configure automatic data quality validation rules for this parameter.")
     )
+    raw_retention_days = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Keep Raw Data (days)"),
+        help_text=_("How long raw observations of this parameter are kept, on every connection. "
+                    "0 uses each connection's setting. Hourly aggregates are kept."),
+        validators=[validate_raw_retention_days],
+    )
     
     panels = [
         FieldPanel("name"),
@@ -359,6 +369,7 @@ class DataParameter(ClusterableModel):
         FieldPanel("is_coded"),
         FieldPanel("wmo_code_table"),
         FieldPanel("qc_checks"),
+        FieldPanel("raw_retention_days"),
     ]
     
     class Meta:
@@ -387,37 +398,19 @@ class DataParameter(ClusterableModel):
                     )
                 })
     
+    def get_conversion_plan_from_units(self, from_unit):
+        """The compiled :class:`~adl.core.units.ConversionPlan` from ``from_unit`` to this parameter's unit."""
+        return get_conversion_plan(from_unit.symbol, self.unit.symbol, self.custom_unit_context)
+    
+    def get_conversion_plan_to_units(self, to_unit):
+        """The compiled :class:`~adl.core.units.ConversionPlan` from this parameter's unit to ``to_unit``."""
+        return get_conversion_plan(self.unit.symbol, to_unit.symbol, self.custom_unit_context)
+    
     def convert_value_from_units(self, value, from_unit):
-        if from_unit.symbol in TEMPERATURE_UNITS:
-            quantity = units.Quantity(value, from_unit.symbol)
-        else:
-            quantity = value * from_unit.pint_unit
-        # use custom unit context if set
-        # Useful for converting units that are not directly convertible  using pint,
-        # like precipitation (from mm -> kg/m²)
-        if self.custom_unit_context:
-            with units.context(self.custom_unit_context):
-                quantity_converted = quantity.to(self.unit.symbol)
-        else:
-            quantity_converted = quantity.to(self.unit.symbol)
-        
-        return quantity_converted.magnitude
+        return self.get_conversion_plan_from_units(from_unit).convert(value)
     
     def convert_value_to_units(self, value, to_unit):
-        if to_unit.symbol in TEMPERATURE_UNITS:
-            quantity = units.Quantity(value, self.unit.symbol)
-        else:
-            quantity = value * self.unit.pint_unit
-        # use custom unit context if set
-        # Useful for converting units that are not directly convertible  using pint,
-        # like precipitation (from mm -> kg/m²)
-        if self.custom_unit_context:
-            with units.context(self.custom_unit_context):
-                quantity_converted = quantity.to(to_unit.symbol)
-        else:
-            quantity_converted = quantity.to(to_unit.symbol)
-        
-        return quantity_converted.magnitude
+        return self.get_conversion_plan_to_units(to_unit).convert(value)
 
 
 @register_setting
@@ -442,11 +435,20 @@ class AdlSettings(ClusterableModel, BaseSiteSetting):
         verbose_name=_("Logo"),
         help_text=_("Displayed in the footer of widget display pages"),
     )
+    observation_compress_after_days = models.PositiveIntegerField(
+        default=7,
+        verbose_name=_("Compress Observations After (days)"),
+        help_text=_("Observation data older than this is stored compressed, which takes a fraction of the "
+                    "disk space and speeds up long-range queries. Late data can still be saved into "
+                    "compressed periods. 0 stops compressing further data."),
+        validators=[MaxValueValidator(3650)],
+    )
     
     panels = [
         FieldPanel("country", widget=CountrySelectWidget()),
         FieldPanel("organisation_name"),
         FieldPanel("logo"),
+        FieldPanel("observation_compress_after_days"),
     ]
     
     class Meta:
@@ -582,6 +584,27 @@ class NetworkConnection(PolymorphicModel, ClusterableModel):
                                       help_text=_("Default Timezone of the stations in this network connection"))
     batch_size = models.PositiveIntegerField(default=10, verbose_name=_("Processing Batch Size"),
                                              help_text=_("Number of stations to process in a single batch"))
+    max_concurrent_stations = models.PositiveIntegerField(default=1,
+                                                          verbose_name=_("Concurrent Stations per Batch"),
+                                                          help_text=_(
+                                                              "How many stations of a batch are fetched at the same "
+                                                              "time. Leave at 1 to process them one after another. "
+                                                              "Raise it for sources where most of a run is spent "
+                                                              "waiting on the network; the plugin must tolerate "
+                                                              "concurrent fetches."),
+                                                          validators=[
+                                                              MinValueValidator(1),
+                                                              MaxValueValidator(16)
+                                                          ])
+    max_inflight_batches = models.PositiveIntegerField(default=0,
+                                                       verbose_name=_("Batches in Flight"),
+                                                       help_text=_(
+                                                           "How many of this connection's batches may be queued or "
+                                                           "running on the shared ingestion queue at once; the rest "
+                                                           "wait their turn. Set it on large or slow networks so "
+                                                           "smaller connections never queue behind them. 0 means no "
+                                                           "limit."),
+                                                       validators=[MaxValueValidator(64)])
     ingest_timeout_seconds = models.PositiveIntegerField(default=300,
                                                          verbose_name=_("Ingestion Timeout in Seconds"),
                                                          help_text=_(
@@ -596,6 +619,15 @@ class NetworkConnection(PolymorphicModel, ClusterableModel):
                                                          ])
     is_daily_data = models.BooleanField(default=False, verbose_name=_("Is Daily Data"),
                                         help_text=_("Check to mark data from this connection as daily data"))
+    archive_raw_records = models.BooleanField(default=False, verbose_name=_("Archive Raw Records"),
+                                              help_text=_("Keep a compressed copy of everything the source returns, "
+                                                          "so the data can be reprocessed later without fetching "
+                                                          "it again. Uses disk space on the archive volume."))
+    raw_retention_days = models.PositiveIntegerField(default=0, verbose_name=_("Keep Raw Data (days)"),
+                                             help_text=_("Delete raw observations of this connection once they "
+                                                         "are this many days old. 0 keeps them. Hourly "
+                                                         "aggregates are kept."),
+                                             validators=[validate_raw_retention_days])
     sort_order = models.PositiveIntegerField(default=0, verbose_name=_("Sort Order"),
                                              help_text=_("Order in which the connections are displayed"))
     
@@ -608,10 +640,14 @@ class NetworkConnection(PolymorphicModel, ClusterableModel):
             FieldPanel("plugin_processing_enabled"),
             FieldPanel("plugin_processing_interval"),
             FieldPanel("batch_size"),
+            FieldPanel("max_concurrent_stations"),
+            FieldPanel("max_inflight_batches"),
             FieldPanel("ingest_timeout_seconds"),
             IngestTimeoutBudgetPanel(),
+            FieldPanel("archive_raw_records"),
         ], heading=_("Plugin Configuration")),
         FieldPanel("is_daily_data"),
+        FieldPanel("raw_retention_days"),
         FieldPanel("sort_order"),
     ]
     
@@ -968,10 +1004,9 @@ class ObservationRecord(TimescaleModel, ClusterableModel):
     as a timezone-aware UTC datetime.
     
     Each row is uniquely identified by ``(time, station, connection,
-    parameter)``. ADL's ingestion pipeline uses
-    ``bulk_create(update_conflicts=True)`` against this constraint, so
-    re-ingesting an already-stored window updates the existing value rather
-    than raising an error.
+    parameter)``. ADL's ingestion pipeline upserts against this constraint
+    (see :mod:`adl.core.upsert`), so re-ingesting an already-stored window
+    updates the existing value rather than raising an error.
     
     QC results are stored as a bitmask (:class:`QCBits`) and a status code
     (:class:`QCStatus`). A ``qc_status`` of ``NOT_EVALUATED`` means no QC
@@ -1047,19 +1082,11 @@ class QCMessage(models.Model):
         ]
 
 
-@register_snippet
-class HourlyObsAgg(models.Model):
+class ObservationAggregate(models.Model):
     """
-    Read-only TimescaleDB continuous aggregate view providing pre-computed
-    hourly summaries of :class:`ObservationRecord` data.
-    
-    Backed by the database view ``obs_agg_1h_v``. Not a managed Django model
-    — ADL does not create or migrate it directly; TimescaleDB maintains it
-    incrementally from the underlying ``ObservationRecord`` hypertable.
-    
-    Use this model instead of querying ``ObservationRecord`` directly whenever
-    you need hourly aggregates over large time ranges — it is significantly
-    faster because the aggregates are pre-computed.
+    Fields shared by the read-only views over the observation continuous
+    aggregates (see :mod:`adl.core.aggregates`). One row per station,
+    connection, parameter and bucket.
     
     The :attr:`time` property aliases ``bucket`` for API consistency with
     :class:`ObservationRecord`.
@@ -1077,12 +1104,9 @@ class HourlyObsAgg(models.Model):
     records_count = models.IntegerField()
     
     class Meta:
+        abstract = True
         managed = False
         ordering = ['-bucket', 'station']
-        db_table = 'obs_agg_1h_v'
-        indexes = [
-            models.Index(fields=['station', 'connection', 'parameter', 'bucket']),
-        ]
     
     def __str__(self):
         return f"{self.station.name} - {self.parameter.name} - {self.bucket} ({self.records_count} records)"
@@ -1092,6 +1116,61 @@ class HourlyObsAgg(models.Model):
         return self.bucket
 
 
+@register_snippet
+class HourlyObsAgg(ObservationAggregate):
+    """
+    Read-only TimescaleDB continuous aggregate view providing pre-computed
+    hourly summaries of :class:`ObservationRecord` data.
+    
+    Backed by the database view ``obs_agg_1h_v``. Not a managed Django model
+    — ADL does not create or migrate it directly; TimescaleDB maintains it
+    incrementally from the underlying ``ObservationRecord`` hypertable.
+    
+    Use this model instead of querying ``ObservationRecord`` directly whenever
+    you need hourly aggregates over large time ranges — it is significantly
+    faster because the aggregates are pre-computed.
+    """
+    
+    class Meta(ObservationAggregate.Meta):
+        db_table = 'obs_agg_1h_v'
+        indexes = [
+            models.Index(fields=['station', 'connection', 'parameter', 'bucket']),
+        ]
+
+
+@register_snippet
+class DailyObsAgg(ObservationAggregate):
+    """
+    Daily summaries, by UTC day, rolled up from :class:`HourlyObsAgg`.
+    Backed by the database view ``obs_agg_1d_v``.
+    """
+    
+    class Meta(ObservationAggregate.Meta):
+        db_table = 'obs_agg_1d_v'
+
+
+@register_snippet
+class MonthlyObsAgg(ObservationAggregate):
+    """
+    Monthly summaries rolled up from :class:`DailyObsAgg`. Backed by the
+    database view ``obs_agg_1mo_v``.
+    """
+    
+    class Meta(ObservationAggregate.Meta):
+        db_table = 'obs_agg_1mo_v'
+
+
+class TenMinuteObsAgg(ObservationAggregate):
+    """
+    Ten-minute summaries of :class:`ObservationRecord` data, backed by the
+    database view ``obs_agg_10m_v``. The aggregate is optional and absent
+    until created with ``manage.py ten_minute_aggregate --enable``.
+    """
+    
+    class Meta(ObservationAggregate.Meta):
+        db_table = 'obs_agg_10m_v'
+
+
 class DispatchChannel(PolymorphicModel, ClusterableModel):
     """
     Base class for outbound data channels that push stored observations to
@@ -1117,7 +1196,7 @@ class DispatchChannel(PolymorphicModel, ClusterableModel):
     
     AGGREGATION_PERIOD_CHOICES = (
         ("hourly", _("Hourly")),
-        # ("daily", _("Daily")),
+        ("daily", _("Daily")),
     )
     
     name = models.CharField(max_length=255, verbose_name=_("Name"))
@@ -1491,6 +1570,149 @@ class NetworkConnectionHeartbeat(models.Model):
         return f"{self.connection.name} - {self.last_run_at}"
 
 
+class BackfillJob(models.Model):
+    """
+    An operator's request to load a historical window for a connection.
+
+    The window is split into :class:`BackfillSlice` rows — one per station
+    link and ``slice_days`` of time — which run as separate tasks on the
+    backfill queue, at most ``max_concurrent_slices`` at a time, newest slice
+    first (see :mod:`adl.core.backfill`). The slices are the checkpoint: a
+    completed slice is never fetched again, so a job interrupted by a worker
+    restart or a failure resumes where it stopped.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", _("Pending")
+        RUNNING = "RUNNING", _("Running")
+        COMPLETED = "COMPLETED", _("Completed")
+        FAILED = "FAILED", _("Completed with failed slices")
+        CANCELLED = "CANCELLED", _("Cancelled")
+
+    network_connection = models.ForeignKey(NetworkConnection, on_delete=models.CASCADE,
+                                           related_name="backfill_jobs", verbose_name=_("Network Connection"))
+    station_links = models.ManyToManyField(StationLink, blank=True, related_name="+",
+                                           verbose_name=_("Station Links"),
+                                           help_text=_("Leave empty to backfill every enabled station link "
+                                                       "of the connection"))
+    start_date = models.DateTimeField(verbose_name=_("Start Date"))
+    end_date = models.DateTimeField(verbose_name=_("End Date"))
+    slice_days = models.PositiveIntegerField(default=7, validators=[MinValueValidator(1), MaxValueValidator(366)],
+                                             verbose_name=_("Slice Length (days)"),
+                                             help_text=_("How much time one task fetches for one station. Shorter "
+                                                         "slices checkpoint more often and spread better across "
+                                                         "workers."))
+    max_concurrent_slices = models.PositiveIntegerField(default=4,
+                                                        validators=[MinValueValidator(1), MaxValueValidator(64)],
+                                                        verbose_name=_("Concurrent Slices"),
+                                                        help_text=_("How many slices of this job may run at the "
+                                                                    "same time. Keep it within what the source "
+                                                                    "allows."))
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING,
+                              verbose_name=_("Status"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name=_("Started At"))
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name=_("Finished At"))
+
+    panels = [
+        FieldPanel("network_connection"),
+        FieldPanel("station_links"),
+        MultiFieldPanel([
+            FieldPanel("start_date"),
+            FieldPanel("end_date"),
+        ], heading=_("Window")),
+        FieldPanel("slice_days"),
+        FieldPanel("max_concurrent_slices"),
+    ]
+
+    class Meta:
+        verbose_name = _("Backfill")
+        verbose_name_plural = _("Backfills")
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.network_connection.name}: {self.start_date:%Y-%m-%d} to {self.end_date:%Y-%m-%d}"
+
+    def clean(self):
+        from .retention import validate_backfill_start
+
+        if self.start_date and self.end_date and self.start_date >= self.end_date:
+            raise ValidationError({"end_date": _("The end date must be after the start date.")})
+        if self.start_date and self.network_connection_id:
+            try:
+                validate_backfill_start(self.network_connection, self.start_date)
+            except ValidationError as e:
+                raise ValidationError({"start_date": e.messages})
+
+    @property
+    def is_active(self):
+        return self.status in (self.Status.PENDING, self.Status.RUNNING)
+
+    def progress(self):
+        """Slice counts by status, plus ``total`` and ``records``."""
+        counts = dict.fromkeys(BackfillSlice.Status.values, 0)
+        records = 0
+        for row in self.slices.values("status").annotate(count=models.Count("id"),
+                                                           records=models.Sum("records_count")):
+            counts[row["status"]] = row["count"]
+            records += row["records"] or 0
+        counts["total"] = sum(counts.values())
+        counts["records"] = records
+        return counts
+
+    def progress_display(self):
+        progress = self.progress()
+        if not progress["total"]:
+            return "-"
+        percent = 100 * progress[BackfillSlice.Status.COMPLETED] // progress["total"]
+        text = f"{progress[BackfillSlice.Status.COMPLETED]}/{progress['total']} slices ({percent}%)"
+        if progress[BackfillSlice.Status.FAILED]:
+            text += f", {progress[BackfillSlice.Status.FAILED]} failed"
+        return f"{text}, {progress['records']} records"
+
+    progress_display.short_description = _("Progress")
+
+
+class BackfillSlice(models.Model):
+    """
+    One station link's share of a :class:`BackfillJob` over one time range —
+    the unit a backfill task fetches, and its checkpoint.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", _("Pending")
+        RUNNING = "RUNNING", _("Running")
+        COMPLETED = "COMPLETED", _("Completed")
+        FAILED = "FAILED", _("Failed")
+
+    job = models.ForeignKey(BackfillJob, on_delete=models.CASCADE, related_name="slices")
+    station_link = models.ForeignKey(StationLink, on_delete=models.CASCADE, related_name="backfill_slices")
+    start_date = models.DateTimeField()
+    end_date = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    records_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    # Set each time the slice is claimed and sent to the backfill queue; only
+    # the task carrying the current token may run it
+    claim_token = models.UUIDField(blank=True, null=True, editable=False)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    # Set by the task once a worker starts the slice
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "station_link", "start_date"], name="unique_backfill_slice"),
+        ]
+        indexes = [
+            models.Index(fields=["job", "status", "-end_date"], name="backfill_slice_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.station_link_id}: {self.start_date} to {self.end_date} ({self.status})"
+
+
 def status_from_bits(bits: QCBits) -> int:
     if bits == QCBits(0):
         return QCStatus.PASS
@@ -0,0 +1,282 @@
+"""
+Columnar normalization of one chunk of raw plugin records.
+
+:meth:`~adl.core.registries.Plugin._save_chunk` receives up to
+:attr:`~adl.core.registries.Plugin.SAVE_CHUNK_SIZE` record dicts at a time.
+Validating, localising and keying them one record at a time made per-record
+Python overhead the dominant cost of a large backfill, so the chunk is
+normalized column-wise instead: a single pass pulls each record's
+``observation_time`` and its mapped source values out of the dict, and
+everything after that — window and future filtering, unit conversion and
+deduplication on ``(time, parameter)`` — runs as NumPy operations over the
+whole chunk. Rows are only materialised for the values that survive.
+
+Times are carried as integer microseconds since the Unix epoch (UTC). That is
+exact at the resolution a Python ``datetime`` has, so ordering and equality
+match what the database's ``timestamptz`` will see, whatever timezone the
+plugin reported in.
+
+Records that are dropped are never logged one by one: they are counted per
+reason (see :data:`REJECTION_REASONS`) and the caller logs one line per reason.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone as py_tz
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from .profiling import profile_stage
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=py_tz.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Lax datetime coercion for the rare plugin that yields an ISO string or a
+# unix timestamp instead of a datetime — the same coercion the per-record
+# pydantic model used to apply, without building a model per record
+_datetime_adapter = TypeAdapter(datetime)
+
+#: Why a record was dropped, keyed by the code counted in
+#: :attr:`NormalizedChunk.rejected`.
+REJECTION_REASONS = {
+    "missing_time": "missing observation_time",
+    "invalid_time": "observation_time is not a datetime",
+    "before_start": "timestamp before start_date",
+    "after_end": "timestamp after end_date",
+    "future": "timestamp in the future",
+}
+
+
+def datetime_to_epoch_us(value: datetime, tz) -> int:
+    """
+    Microseconds since the Unix epoch for ``value``.
+
+    A naive ``value`` is interpreted as wall time in ``tz`` (the station's
+    timezone), exactly as :func:`~adl.core.date_utils.make_record_timezone_aware`
+    does; an aware one is used as-is.
+    """
+    if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
+        value = value.replace(tzinfo=tz)
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+def epoch_us_to_datetime(value: int) -> datetime:
+    """The aware UTC datetime for ``value`` microseconds since the Unix epoch."""
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+def _coerce_observation_time(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return _datetime_adapter.validate_python(value)
+    except Exception:
+        return None
+
+
+class _SourceColumn:
+    """The values one variable mapping contributes to a chunk, sparse by record."""
+    __slots__ = ("mapping_index", "mapping", "source_name", "positions", "values")
+
+    def __init__(self, mapping_index, mapping, source_name):
+        self.mapping_index = mapping_index
+        self.mapping = mapping
+        self.source_name = source_name
+        self.positions = []
+        self.values = []
+
+
+class NormalizedChunk:
+    """
+    The values of one chunk that survived normalization, as parallel arrays
+    sorted by ``(time, parameter_id)`` with at most one entry per pair.
+
+    ``rejected`` counts dropped records by reason code; ``conversion_failures``
+    holds one ``(mapping, value_count, exception)`` per mapping whose values
+    could not be converted to the parameter's unit. ``earliest_us`` and
+    ``latest_us`` span every record that passed time validation — including
+    records that carried no mapped value — or are ``None`` when none did.
+    """
+    __slots__ = (
+        "times_us", "parameter_ids", "values", "mapping_indices",
+        "earliest_us", "latest_us", "rejected", "conversion_failures",
+    )
+
+    def __init__(self, times_us, parameter_ids, values, mapping_indices,
+                 earliest_us=None, latest_us=None, rejected=None, conversion_failures=None):
+        self.times_us = times_us
+        self.parameter_ids = parameter_ids
+        self.values = values
+        self.mapping_indices = mapping_indices
+        self.earliest_us = earliest_us
+        self.latest_us = latest_us
+        self.rejected = rejected if rejected is not None else Counter()
+        self.conversion_failures = conversion_failures or []
+
+    def __len__(self):
+        return len(self.times_us)
+
+    def time_range(self, tz=None) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """``(earliest, latest)`` as aware datetimes, localised to ``tz`` if given."""
+        bounds = []
+        for value in (self.earliest_us, self.latest_us):
+            if value is None:
+                bounds.append(None)
+                continue
+            moment = epoch_us_to_datetime(value)
+            bounds.append(moment.astimezone(tz) if tz is not None else moment)
+        return bounds[0], bounds[1]
+
+    def select(self, keep) -> "NormalizedChunk":
+        """
+        The chunk restricted to the rows where the boolean array ``keep`` is
+        true. The time span and the rejection counts are the whole chunk's.
+        """
+        return NormalizedChunk(
+            self.times_us[keep], self.parameter_ids[keep], self.values[keep], self.mapping_indices[keep],
+            earliest_us=self.earliest_us, latest_us=self.latest_us,
+            rejected=self.rejected, conversion_failures=self.conversion_failures,
+        )
+
+    def rows(self, variable_mappings: List) -> Iterator[Tuple[datetime, Any, float]]:
+        """Yield ``(utc_time, mapping, value)`` for every surviving value."""
+        for time_us, mapping_index, value in zip(
+                self.times_us.tolist(), self.mapping_indices.tolist(), self.values.tolist()
+        ):
+            yield epoch_us_to_datetime(time_us), variable_mappings[mapping_index], value
+
+
+def normalize_chunk(
+        records: List[Dict[str, Any]],
+        variable_mappings: List,
+        tz,
+        start_date: datetime,
+        end_date: datetime,
+        now: datetime,
+) -> NormalizedChunk:
+    """
+    Normalize one chunk of raw record dicts into a :class:`NormalizedChunk`.
+
+    Applies the rules :meth:`~adl.core.registries.Plugin.save_records`
+    documents: a record needs a datetime ``observation_time`` (naive means
+    station-local) inside ``[start_date, end_date]`` and not after ``now``;
+    a value is taken for each mapping with a parameter, a source name and a
+    source unit whose field holds an ``int`` or ``float``, and is converted
+    to the parameter's unit when the units differ. When a ``(time,
+    parameter)`` pair occurs more than once, the value from the later record
+    wins — and within one record, the later mapping.
+    """
+    record_count = len(records)
+    rejected = Counter()
+
+    columns = []
+    for mapping_index, mapping in enumerate(variable_mappings):
+        adl_param = getattr(mapping, "adl_parameter", None)
+        src_name = getattr(mapping, "source_parameter_name", None)
+        src_unit = getattr(mapping, "source_parameter_unit", None)
+        if adl_param and src_name and src_unit:
+            columns.append(_SourceColumn(mapping_index, mapping, str(src_name)))
+
+    times_us = np.zeros(record_count, dtype=np.int64)
+    has_time = np.zeros(record_count, dtype=bool)
+
+    # The one per-record pass: everything below it is array work
+    for position, record in enumerate(records):
+        obs_time = record.get("observation_time")
+        if obs_time is None:
+            rejected["missing_time"] += 1
+            continue
+
+        obs_time = _coerce_observation_time(obs_time)
+        if obs_time is None:
+            rejected["invalid_time"] += 1
+            continue
+
+        times_us[position] = datetime_to_epoch_us(obs_time, tz)
+        has_time[position] = True
+
+        for column in columns:
+            value = record.get(column.source_name)
+            if value is not None and isinstance(value, (int, float)):
+                column.positions.append(position)
+                column.values.append(value)
+
+    before_start = has_time & (times_us < datetime_to_epoch_us(start_date, tz))
+    after_end = has_time & ~before_start & (times_us > datetime_to_epoch_us(end_date, tz))
+    future = has_time & ~before_start & ~after_end & (times_us > datetime_to_epoch_us(now, tz))
+    keep = has_time & ~(before_start | after_end | future)
+
+    for reason, mask in (("before_start", before_start), ("after_end", after_end), ("future", future)):
+        count = int(np.count_nonzero(mask))
+        if count:
+            rejected[reason] = count
+
+    earliest_us = latest_us = None
+    if keep.any():
+        kept_times = times_us[keep]
+        earliest_us = int(kept_times.min())
+        latest_us = int(kept_times.max())
+
+    conversion_failures = []
+    parts = []
+    for column in columns:
+        if not column.positions:
+            continue
+
+        positions = np.asarray(column.positions, dtype=np.intp)
+        values = np.asarray(column.values, dtype=np.float64)
+        in_window = keep[positions]
+        positions, values = positions[in_window], values[in_window]
+        if not len(positions):
+            continue
+
+        adl_param = column.mapping.adl_parameter
+        src_unit = column.mapping.source_parameter_unit
+        if adl_param.unit != src_unit:
+            try:
+                with profile_stage("convert"):
+                    values = adl_param.get_conversion_plan_from_units(src_unit).convert_array(values)
+            except Exception as e:
+                conversion_failures.append((column.mapping, len(values), e))
+                continue
+
+        parts.append((
+            times_us[positions],
+            np.full(len(positions), adl_param.id, dtype=np.int64),
+            values,
+            np.full(len(positions), column.mapping_index, dtype=np.intp),
+            # Later record wins, then later mapping within a record
+            positions * len(variable_mappings) + column.mapping_index,
+        ))
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return NormalizedChunk(
+            empty, empty, np.empty(0, dtype=np.float64), np.empty(0, dtype=np.intp),
+            earliest_us, latest_us, rejected, conversion_failures,
+        )
+
+    all_times, all_params, all_values, all_mappings, all_ranks = (
+        np.concatenate(column) for column in zip(*parts)
+    )
+
+    # Sort by time, then parameter, then newest-first, and keep the first of
+    # every (time, parameter) run
+    order = np.lexsort((-all_ranks, all_params, all_times))
+    sorted_times = all_times[order]
+    sorted_params = all_params[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (sorted_times[1:] != sorted_times[:-1]) | (sorted_params[1:] != sorted_params[:-1])
+    survivors = order[first]
+
+    return NormalizedChunk(
+        all_times[survivors],
+        all_params[survivors],
+        all_values[survivors],
+        all_mappings[survivors],
+        earliest_us,
+        latest_us,
+        rejected,
+        conversion_failures,
+    )
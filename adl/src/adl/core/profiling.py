@@ -0,0 +1,123 @@
+"""
+Per-stage wall time and SQL cost of one ingestion run.
+
+:meth:`~adl.core.registries.Plugin.process_station` starts a
+:class:`StageProfile` for every run and stores the result on the run's
+:class:`~adl.monitoring.models.StationLinkActivityLog`. Code on the ingestion
+path marks the stage it is in with :func:`profile_stage`; the profile is found
+through a context variable, so nothing has to be passed down and code that
+runs outside a profiled run pays for one lookup.
+
+Stages are exclusive: entering one pauses the stage it was entered from, so
+the stage times add up to the run's profiled time, and every query is counted
+against the stage that issued it. Time and queries outside any named stage
+are recorded as ``other``.
+"""
+
+import contextvars
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+
+from django.db import connection
+
+OTHER_STAGE = "other"
+
+_current_profile = contextvars.ContextVar("adl_stage_profile", default=None)
+
+
+class StageProfile:
+    """
+    Wall time, query count and query time per stage, for the thread that
+    started it. Queries are seen through a Django ``execute_wrapper`` on that
+    thread's default connection; queries on other threads (a plugin's
+    pipelined source reads) are not counted.
+    """
+    __slots__ = ("_stages", "_current", "_since", "_exit_stack", "_token")
+
+    def __init__(self):
+        self._stages = {}
+        self._current = None
+        self._since = None
+        self._exit_stack = None
+        self._token = None
+
+    def _entry(self, stage):
+        entry = self._stages.get(stage)
+        if entry is None:
+            entry = self._stages[stage] = [0.0, 0, 0.0]
+        return entry
+
+    def _switch(self, stage):
+        now = time.perf_counter()
+        previous = self._current
+        if previous is not None:
+            self._entry(previous)[0] += now - self._since
+        self._current, self._since = stage, now
+        return previous
+
+    def _record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            entry = self._entry(self._current or OTHER_STAGE)
+            entry[1] += 1
+            entry[2] += time.perf_counter() - start
+
+    def start(self):
+        self._exit_stack = ExitStack()
+        self._exit_stack.enter_context(connection.execute_wrapper(self._record_query))
+        self._token = _current_profile.set(self)
+        self._switch(OTHER_STAGE)
+
+    def stop(self):
+        """Stop recording. Safe to call more than once."""
+        if self._exit_stack is None:
+            return
+        self._switch(None)
+        _current_profile.reset(self._token)
+        self._exit_stack.close()
+        self._exit_stack = self._token = None
+
+    @contextmanager
+    def stage(self, name):
+        previous = self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch(previous)
+
+    def as_dict(self):
+        """
+        ``{stage: {"ms": wall, "queries": count, "sql_ms": query time}}``,
+        times rounded to whole milliseconds. Stages with nothing recorded
+        are left out.
+        """
+        return {
+            stage: {"ms": round(wall * 1000), "queries": queries, "sql_ms": round(sql * 1000)}
+            for stage, (wall, queries, sql) in self._stages.items()
+            if queries or round(wall * 1000)
+        }
+
+
+def profile_stage(name):
+    """
+    Context manager attributing the time and queries inside it to stage
+    ``name`` of the run being profiled; does nothing outside one.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return nullcontext()
+    return profile.stage(name)
+
+
+def iter_in_stage(iterable, name):
+    """Iterate ``iterable``, attributing the time spent producing each item to ``name``."""
+    iterator = iter(iterable)
+    while True:
+        with profile_stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
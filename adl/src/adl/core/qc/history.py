@@ -0,0 +1,75 @@
+import bisect
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from adl.core.normalization import datetime_to_epoch_us, epoch_us_to_datetime
+
+
+class RollingHistory:
+    """
+    In-memory QC history for one ``(station, connection, parameter)`` over
+    one chunk.
+
+    Seeded once from the database with the stored values the chunk's time
+    span needs — the lookback before the chunk's first value plus every
+    stored value inside its span — and then advanced as the chunk is
+    checked in time order: each value is :meth:`add`-ed after its own check,
+    so a later value in the same chunk sees it as history even though
+    nothing has been upserted yet. A chunk value replaces a stored value at
+    the same time, exactly as the upsert will.
+
+    :meth:`before` answers in the shape
+    :meth:`~adl.core.registries.Plugin._get_recent_history_for_qc` always
+    has: at most ``limit`` dicts with ``value``, ``time`` and ``qc_status``,
+    newest first. :meth:`merge` serves the batch QC path instead, which
+    checks a whole chunk at once rather than advancing value by value.
+    """
+    __slots__ = ("limit", "_times", "_entries")
+
+    def __init__(self, limit: int, stored: Iterable[Dict[str, Any]] = ()):
+        self.limit = limit
+        self._times = []
+        self._entries = []
+        for entry in sorted(stored, key=lambda e: e["time"]):
+            self.add(entry["time"], entry["value"], entry["qc_status"])
+
+    def __len__(self):
+        return len(self._times)
+
+    def add(self, time: datetime, value: float, qc_status) -> None:
+        entry = {"value": value, "time": time, "qc_status": qc_status}
+        index = bisect.bisect_left(self._times, time)
+        if index < len(self._times) and self._times[index] == time:
+            self._entries[index] = entry
+        else:
+            self._times.insert(index, time)
+            self._entries.insert(index, entry)
+
+    def before(self, time: datetime) -> List[Dict[str, Any]]:
+        """The ``limit`` most recent entries strictly before ``time``, newest first."""
+        index = bisect.bisect_left(self._times, time)
+        return self._entries[max(0, index - self.limit):index][::-1]
+
+    def merge(self, times_us: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Merge a sorted batch of new values into the stored entries from the
+        batch's first time on.
+
+        Returns ``(times_us, values, positions)``: the merged series in time
+        order, with a new value replacing a stored one at the same time, and
+        the index of each new value within it. Times are epoch microseconds.
+        """
+        start = bisect.bisect_left(self._times, epoch_us_to_datetime(times_us[0]))
+        stored = self._entries[start:]
+        stored_times = np.array([datetime_to_epoch_us(e["time"], None) for e in stored], dtype=np.int64)
+        stored_values = np.array([e["value"] for e in stored], dtype=np.float64)
+
+        kept = ~np.isin(stored_times, times_us)
+        merged_times = np.concatenate([stored_times[kept], times_us])
+        merged_values = np.concatenate([stored_values[kept], values])
+        is_new = np.concatenate([np.zeros(int(kept.sum()), dtype=bool), np.ones(len(times_us), dtype=bool)])
+
+        order = np.argsort(merged_times, kind="stable")
+        return merged_times[order], merged_values[order], np.flatnonzero(is_new[order])
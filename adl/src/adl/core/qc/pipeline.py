@@ -1,7 +1,9 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Tuple
 
+import numpy as np
+
 from .validators import QCValidator, QCResult, QCContext, QCFlag
 
 logger = logging.getLogger(__name__)
@@ -104,9 +106,56 @@ class QCPipeline:
             individual_results=results
         )
     
-    def run_batch(self, observations: List[Tuple[float, QCContext]]) -> List['QCPipelineResult']:
-        """Run QC pipeline on multiple observations"""
-        return [self.run_single(value, context) for value, context in observations]
+    def run_batch(self, values, times, history: List[Dict[str, Any]] = None,
+                  context: Optional[QCContext] = None) -> 'QCPipelineBatchResult':
+        """
+        Run QC pipeline on a time-ordered batch of values for one parameter
+        
+        Gives the same outcome per value as calling :meth:`run_single` value by
+        value with a rolling history, but each validator sees the whole batch
+        at once through ``validate_batch``. See
+        :meth:`~adl.core.qc.validators.QCValidator.validate_batch` for the
+        arguments.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        times = np.asarray(times, dtype=np.int64)
+        size = len(values)
+        
+        passed = np.ones(size, dtype=bool)
+        stopped = np.zeros(size, dtype=bool)
+        total_weight = np.zeros(size, dtype=np.float64)
+        weighted_confidence = np.zeros(size, dtype=np.float64)
+        failures: Dict[int, List[Tuple[ValidatorConfig, QCResult]]] = {}
+        errors = []
+        
+        for validator_config in self.validators:
+            if not validator_config.enabled:
+                continue
+            
+            try:
+                result = validator_config.validator.validate_batch(values, times, history, context)
+            except Exception as e:
+                logger.error(f"Error in validator {validator_config.validator.validator_type}: {e}")
+                errors.append(f"{validator_config.validator.get_display_name()}: Validation error")
+                continue
+            
+            # Values stopped by an earlier fail-fast validator ignore the rest
+            active = ~stopped
+            failed = active & ~result.passed
+            passed &= ~failed
+            total_weight[active] += validator_config.weight
+            weighted_confidence[active] += result.confidence[active] * validator_config.weight
+            
+            for index in np.flatnonzero(failed).tolist():
+                failures.setdefault(index, []).append((validator_config, result.failures[index]))
+            
+            if validator_config.fail_fast:
+                stopped |= failed
+        
+        confidence = np.zeros(size, dtype=np.float64)
+        np.divide(weighted_confidence, total_weight, out=confidence, where=total_weight > 0)
+        
+        return QCPipelineBatchResult(passed=passed, confidence=confidence, failures=failures, errors=errors)
     
     def get_pipeline_summary(self) -> Dict[str, Any]:
         """Get summary information about the pipeline"""
@@ -150,6 +199,39 @@ class QCPipelineResult:
         ]
 
 
+@dataclass
+class QCPipelineBatchResult:
+    """
+    Result of running the pipeline over a batch of values
+    
+    ``passed`` and ``confidence`` hold one entry per value. ``failures`` maps
+    the index of each failed value to its failing validators and their
+    results; ``errors`` lists validators that raised for the whole batch.
+    """
+    passed: np.ndarray
+    confidence: np.ndarray
+    failures: Dict[int, List[Tuple[ValidatorConfig, QCResult]]] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    
+    def get_flags(self, index: int) -> set:
+        """Flags raised for the value at ``index``"""
+        flags = set()
+        for _, result in self.failures.get(index, []):
+            flags.update(result.flags)
+        return flags
+    
+    def get_summary_message(self, index: int) -> str:
+        """Human-readable summary for the value at ``index``, as in :class:`QCPipelineResult`"""
+        if self.passed[index]:
+            return "All QC checks passed"
+        messages = [
+            f"{vc.validator.get_display_name()}: {result.message}"
+            for vc, result in self.failures.get(index, [])
+            if result.message
+        ]
+        return "; ".join(messages + self.errors)
+
+
 class QCPipelineBuilder:
     """Builder pattern for creating QC pipelines"""
     
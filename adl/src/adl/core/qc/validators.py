@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field, replace
 from enum import Enum, auto
-from typing import Dict, Any, Optional, List, Set
+from itertools import islice
+from typing import Dict, Any, Optional, List, Set, Tuple
+
+import numpy as np
+
+from adl.core.normalization import datetime_to_epoch_us, epoch_us_to_datetime
 
 
 class QCFlag(Enum):
@@ -27,6 +33,39 @@ class QCResult:
             self.evidence = {}
 
 
+@dataclass
+class QCBatchResult:
+    """
+    Result of validating a batch of values.
+
+    ``passed`` and ``confidence`` hold one entry per value; ``failures``
+    holds the full :class:`QCResult` (flags, message, evidence) only for the
+    indices that failed, which are rare enough to build one by one.
+    """
+    passed: np.ndarray
+    confidence: np.ndarray
+    failures: Dict[int, QCResult] = field(default_factory=dict)
+
+    @classmethod
+    def all_passed(cls, size: int) -> 'QCBatchResult':
+        return cls(passed=np.ones(size, dtype=bool), confidence=np.ones(size, dtype=np.float64))
+
+
+def history_to_series(history: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert newest-first history dicts into oldest-first ``(values, times)``
+    arrays, with times as epoch microseconds and a missing value as ``NaN``.
+    """
+    entries = list(reversed(history or []))
+    values = np.array(
+        [np.nan if e.get('value') is None else e['value'] for e in entries], dtype=np.float64
+    )
+    times = np.array(
+        [datetime_to_epoch_us(e['time'], None) if e.get('time') else 0 for e in entries], dtype=np.int64
+    )
+    return values, times
+
+
 @dataclass
 class QCContext:
     """Context data available to QC validators"""
@@ -76,6 +115,59 @@ class QCValidator(ABC):
         """
         pass
     
+    def validate_batch(self, values, times, history: List[Dict[str, Any]] = None,
+                       context: Optional[QCContext] = None) -> QCBatchResult:
+        """
+        Validate a time-ordered batch of values for one parameter
+        
+        Each value is judged against the values before it: ``history`` and
+        then the batch's own earlier values, exactly as if :meth:`validate`
+        had been called value by value with a rolling ``recent_history``.
+        
+        This default implementation does just that, so any validator —
+        including custom ones registered in ``qc_validator_registry`` —
+        supports batches. The built-in validators override it with array
+        operations.
+        
+        Args:
+            values: Observation values, oldest first
+            times: Observation times as epoch microseconds (UTC), same length
+            history: Observations before ``values[0]``, newest first, in the
+                ``recent_history`` format
+            context: Station and parameter metadata shared by the batch; its
+                ``observation_time`` and ``recent_history`` are set per value
+            
+        Returns:
+            QCBatchResult with one pass flag and confidence per value
+        """
+        values = np.asarray(values, dtype=np.float64)
+        times = np.asarray(times, dtype=np.int64)
+        result = QCBatchResult.all_passed(len(values))
+        
+        requirements = self.get_history_requirements()
+        limit = requirements['limit'] if requirements['needed'] else 0
+        window = deque(islice(history or [], limit), maxlen=limit) if limit else None
+        template = context or QCContext(station_metadata={}, parameter_metadata={})
+        
+        for index, (value, time_us) in enumerate(zip(values.tolist(), times.tolist())):
+            obs_time = epoch_us_to_datetime(time_us)
+            value_context = replace(
+                template,
+                parameter_metadata={**template.parameter_metadata, 'observation_time': obs_time},
+                recent_history=list(window) if window is not None else [],
+            )
+            value_result = self.validate(value, value_context)
+            
+            result.passed[index] = value_result.passed
+            result.confidence[index] = value_result.confidence
+            if not value_result.passed:
+                result.failures[index] = value_result
+            
+            if window is not None:
+                window.appendleft({'value': value, 'time': obs_time, 'qc_status': None})
+        
+        return result
+    
     def validate_config(self) -> None:
         """Validate the configuration for this validator"""
         schema = self.get_config_schema()
@@ -144,28 +236,60 @@ class RangeValidator(QCValidator):
         if min_val is not None:
             failed = value < min_val if inclusive else value <= min_val
             if failed:
-                op = ">=" if inclusive else ">"
-                return QCResult(
-                    passed=False,
-                    flags={QCFlag.RANGE},
-                    message=f"Value {value} below minimum: must be {op} {min_val}",
-                    evidence={"min_value": min_val, "operator": op}
-                )
+                return self._below_minimum(value)
         
         # Check maximum
         if max_val is not None:
             failed = value > max_val if inclusive else value >= max_val
             if failed:
-                op = "<=" if inclusive else "<"
-                return QCResult(
-                    passed=False,
-                    flags={QCFlag.RANGE},
-                    message=f"Value {value} above maximum: must be {op} {max_val}",
-                    evidence={"max_value": max_val, "operator": op}
-                )
+                return self._above_maximum(value)
         
         return QCResult(passed=True, flags=set())
     
+    def validate_batch(self, values, times, history: List[Dict[str, Any]] = None,
+                       context: Optional[QCContext] = None) -> QCBatchResult:
+        min_val = self.config.get('min_value')
+        max_val = self.config.get('max_value')
+        inclusive = self.config.get('inclusive_bounds', True)
+        
+        values = np.asarray(values, dtype=np.float64)
+        result = QCBatchResult.all_passed(len(values))
+        
+        below = np.zeros(len(values), dtype=bool)
+        above = np.zeros(len(values), dtype=bool)
+        if min_val is not None:
+            below = values < min_val if inclusive else values <= min_val
+        if max_val is not None:
+            above = ~below & (values > max_val if inclusive else values >= max_val)
+        
+        result.passed = ~(below | above)
+        for index in np.flatnonzero(below).tolist():
+            result.failures[index] = self._below_minimum(values[index].item())
+        for index in np.flatnonzero(above).tolist():
+            result.failures[index] = self._above_maximum(values[index].item())
+        
+        return result
+    
+    def _below_minimum(self, value: float) -> QCResult:
+        min_val = self.config.get('min_value')
+        op = ">=" if self.config.get('inclusive_bounds', True) else ">"
+        return QCResult(
+            passed=False,
+            flags={QCFlag.RANGE},
+            message=f"Value {value} below minimum: must be {op} {min_val}",
+            evidence={"min_value": min_val, "operator": op}
+        )
+    
+    def _above_maximum(self, value: float) -> QCResult:
+        max_val = self.config.get('max_value')
+        op = "<=" if self.config.get('inclusive_bounds', True) else "<"
+        return QCResult(
+            passed=False,
+            flags={QCFlag.RANGE},
+            message=f"Value {value} above maximum: must be {op} {max_val}",
+            evidence={"max_value": max_val, "operator": op}
+        )
+    
     def get_config_schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
@@ -208,8 +332,8 @@ class StepValidator(QCValidator):
         if not context.recent_history:
             return QCResult(passed=True, flags=set())
         
-        # Get the most recent previous value
-        previous_obs = context.recent_history[-1]
+        # Get the most recent previous value (history is newest-first)
+        previous_obs = context.recent_history[0]
         previous_value = previous_obs.get('value')
         previous_time = previous_obs.get('time')
         current_time = context.parameter_metadata.get('observation_time')
@@ -227,26 +351,79 @@ class StepValidator(QCValidator):
         
         # Check absolute step change
         if max_step is not None and step_change > max_step:
-            return QCResult(
-                passed=False,
-                flags={QCFlag.STEP},
-                message=f"Step change {step_change:.2f} exceeds maximum {max_step}",
-                evidence={"step_change": step_change, "max_allowed": max_step}
-            )
+            return self._step_exceeded(step_change)
         
         # Check rate-based step change
         if max_step_per_minute is not None and time_diff_minutes > 0:
             rate = step_change / time_diff_minutes
             if rate > max_step_per_minute:
-                return QCResult(
-                    passed=False,
-                    flags={QCFlag.STEP},
-                    message=f"Rate of change {rate:.2f}/min exceeds maximum {max_step_per_minute}/min",
-                    evidence={"rate": rate, "max_rate": max_step_per_minute}
-                )
+                return self._rate_exceeded(rate)
         
         return QCResult(passed=True, flags=set())
     
+    def validate_batch(self, values, times, history: List[Dict[str, Any]] = None,
+                       context: Optional[QCContext] = None) -> QCBatchResult:
+        max_step = self.config.get('max_step_change')
+        max_step_per_minute = self.config.get('max_step_change_per_minute')
+        ignore_after_gap = self.config.get('ignore_after_gap_minutes', 30)
+        
+        values = np.asarray(values, dtype=np.float64)
+        times = np.asarray(times, dtype=np.int64)
+        result = QCBatchResult.all_passed(len(values))
+        if not len(values):
+            return result
+        
+        # Each value's predecessor: the newest history entry for the first,
+        # the batch's own previous value for the rest
+        newest_values, newest_times = history_to_series((history or [])[:1])
+        has_previous = np.ones(len(values), dtype=bool)
+        if not len(newest_values) or not newest_times[0]:
+            has_previous[0] = False
+            newest_values, newest_times = np.array([np.nan]), np.zeros(1, dtype=np.int64)
+        previous_values = np.concatenate([newest_values, values[:-1]])
+        previous_times = np.concatenate([newest_times, times[:-1]])
+        
+        minutes = (times - previous_times) / 60e6
+        step_changes = np.abs(values - previous_values)
+        checked = has_previous & ~np.isnan(previous_values) & (minutes <= ignore_after_gap)
+        
+        step_failed = np.zeros(len(values), dtype=bool)
+        if max_step is not None:
+            step_failed = checked & (step_changes > max_step)
+        
+        rate_failed = np.zeros(len(values), dtype=bool)
+        rates = np.zeros(len(values), dtype=np.float64)
+        if max_step_per_minute is not None:
+            timed = checked & ~step_failed & (minutes > 0)
+            np.divide(step_changes, minutes, out=rates, where=timed)
+            rate_failed = timed & (rates > max_step_per_minute)
+        
+        result.passed = ~(step_failed | rate_failed)
+        for index in np.flatnonzero(step_failed).tolist():
+            result.failures[index] = self._step_exceeded(step_changes[index].item())
+        for index in np.flatnonzero(rate_failed).tolist():
+            result.failures[index] = self._rate_exceeded(rates[index].item())
+        
+        return result
+    
+    def _step_exceeded(self, step_change: float) -> QCResult:
+        max_step = self.config.get('max_step_change')
+        return QCResult(
+            passed=False,
+            flags={QCFlag.STEP},
+            message=f"Step change {step_change:.2f} exceeds maximum {max_step}",
+            evidence={"step_change": step_change, "max_allowed": max_step}
+        )
+    
+    def _rate_exceeded(self, rate: float) -> QCResult:
+        max_step_per_minute = self.config.get('max_step_change_per_minute')
+        return QCResult(
+            passed=False,
+            flags={QCFlag.STEP},
+            message=f"Rate of change {rate:.2f}/min exceeds maximum {max_step_per_minute}/min",
+            evidence={"rate": rate, "max_rate": max_step_per_minute}
+        )
+    
     def get_config_schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
@@ -310,15 +487,55 @@ class PersistenceValidator(QCValidator):
             return QCResult(passed=True, flags=set())
         
         if identical_count >= max_identical:
-            return QCResult(
-                passed=False,
-                flags={QCFlag.PERSISTENCE},
-                message=f"Value {value} repeated {identical_count} times (max {max_identical})",
-                evidence={"identical_count": identical_count, "max_allowed": max_identical}
-            )
+            return self._persisted(value, identical_count)
         
         return QCResult(passed=True, flags=set())
     
+    def validate_batch(self, values, times, history: List[Dict[str, Any]] = None,
+                       context: Optional[QCContext] = None) -> QCBatchResult:
+        max_identical = self.config.get('max_identical_readings', 10)
+        tolerance = self.config.get('tolerance', 0.001)
+        allow_zero = self.config.get('allow_zero_persistence', True)
+        
+        values = np.asarray(values, dtype=np.float64)
+        result = QCBatchResult.all_passed(len(values))
+        if not len(values):
+            return result
+        
+        # A value fails when it sits within tolerance of each of the
+        # max_identical - 1 values before it: the run that ends at it is
+        # then at least max_identical long
+        run = max(max_identical - 1, 0)
+        history_values, _ = history_to_series((history or [])[:run])
+        series = np.concatenate([history_values, values])
+        positions = len(history_values) + np.arange(len(values))
+        
+        eligible = positions >= run
+        repeated = np.zeros(len(values), dtype=bool)
+        if run == 0:
+            repeated = eligible
+        elif eligible.any():
+            windows = np.lib.stride_tricks.sliding_window_view(series, run)[positions[eligible] - run]
+            repeated[eligible] = (np.abs(windows - values[eligible, None]) <= tolerance).all(axis=1)
+        
+        if allow_zero:
+            repeated &= np.abs(values) > tolerance
+        
+        result.passed = ~repeated
+        for index in np.flatnonzero(repeated).tolist():
+            result.failures[index] = self._persisted(values[index].item(), max(max_identical, 1))
+        
+        return result
+    
+    def _persisted(self, value: float, identical_count: int) -> QCResult:
+        max_identical = self.config.get('max_identical_readings', 10)
+        return QCResult(
+            passed=False,
+            flags={QCFlag.PERSISTENCE},
+            message=f"Value {value} repeated {identical_count} times (max {max_identical})",
+            evidence={"identical_count": identical_count, "max_allowed": max_identical}
+        )
+    
     def get_config_schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
@@ -387,18 +604,7 @@ class SpikeValidator(QCValidator):
             if stdev > 0:
                 z_score = abs(value - mean) / stdev
                 if z_score > threshold_multiplier:
-                    return QCResult(
-                        passed=False,
-                        flags={QCFlag.SPIKE},
-                        message=f"Value {value} is {z_score:.2f} standard deviations from mean {mean:.2f} (threshold: {threshold_multiplier})",
-                        evidence={
-                            "z_score": z_score,
-                            "mean": mean,
-                            "stdev": stdev,
-                            "threshold": threshold_multiplier,
-                            "sample_size": len(values)
-                        }
-                    )
+                    return self._spike(value, z_score, mean, stdev, len(values))
         
         except statistics.StatisticsError as e:
             # Not enough data or all values identical
@@ -406,6 +612,59 @@ class SpikeValidator(QCValidator):
         
         return QCResult(passed=True, flags=set())
     
+    def validate_batch(self, values, times, history: List[Dict[str, Any]] = None,
+                       context: Optional[QCContext] = None) -> QCBatchResult:
+        threshold_multiplier = self.config.get('threshold_multiplier', 3.0)
+        lookback_samples = self.config.get('lookback_samples', 20)
+        min_samples = self.config.get('min_samples', 5)
+        
+        values = np.asarray(values, dtype=np.float64)
+        result = QCBatchResult.all_passed(len(values))
+        if not len(values) or lookback_samples < 1:
+            return result
+        
+        # Row i of `windows` holds the lookback_samples values before
+        # values[i], NaN-padded where the series is shorter than that
+        history_values, _ = history_to_series((history or [])[:lookback_samples])
+        series = np.concatenate([np.full(lookback_samples, np.nan), history_values, values])
+        offset = len(history_values)
+        windows = np.lib.stride_tricks.sliding_window_view(series, lookback_samples)[offset:offset + len(values)]
+        
+        present = ~np.isnan(windows)
+        counts = present.sum(axis=1)
+        means = np.where(present, windows, 0.0).sum(axis=1) / np.maximum(counts, 1)
+        deviations = np.where(present, windows - means[:, None], 0.0)
+        stdevs = np.sqrt((deviations ** 2).sum(axis=1) / np.maximum(counts - 1, 1))
+        
+        checked = (counts >= min_samples) & (counts > 1) & (stdevs > 0)
+        z_scores = np.zeros(len(values), dtype=np.float64)
+        np.divide(np.abs(values - means), stdevs, out=z_scores, where=checked)
+        spiked = checked & (z_scores > threshold_multiplier)
+        
+        result.passed = ~spiked
+        for index in np.flatnonzero(spiked).tolist():
+            result.failures[index] = self._spike(
+                values[index].item(), z_scores[index].item(), means[index].item(),
+                stdevs[index].item(), int(counts[index])
+            )
+        
+        return result
+    
+    def _spike(self, value: float, z_score: float, mean: float, stdev: float, sample_size: int) -> QCResult:
+        threshold_multiplier = self.config.get('threshold_multiplier', 3.0)
+        return QCResult(
+            passed=False,
+            flags={QCFlag.SPIKE},
+            message=f"Value {value} is {z_score:.2f} standard deviations from mean {mean:.2f} (threshold: {threshold_multiplier})",
+            evidence={
+                "z_score": z_score,
+                "mean": mean,
+                "stdev": stdev,
+                "threshold": threshold_multiplier,
+                "sample_size": sample_size
+            }
+        )
+    
     def get_config_schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
@@ -20,20 +20,31 @@ re-raised, and a plugin can yield :data:`FLUSH` to persist at its own natural
 unit of work (a file, a page) instead of waiting for a chunk to fill.
 """
 
+import contextvars
+import queue
+import threading
 import time
+from contextlib import contextmanager
 from datetime import timedelta, datetime
 from datetime import timezone as py_tz
-from typing import Iterable, List, Dict, Any, Optional, Tuple, Generator
+from typing import AsyncIterator, Iterable, List, Dict, Any, Optional, Tuple, Generator
 
+import numpy as np
 from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db import connections as db_connections
 from django.utils import timezone as dj_timezone
 
+from .archive import archive_records
 from .classification import mark_failed, stamp_failure
-from .date_utils import make_record_timezone_aware
+from .duplicates import StoredValueIndex
+from . import metrics
 from .logging import TaskLogger
+from .normalization import REJECTION_REASONS, normalize_chunk, epoch_us_to_datetime
+from .profiling import StageProfile, iter_in_stage, profile_stage
+from .qc.history import RollingHistory
 from .registry import Registry, Instance
-from .validators import StationRecordModel
 
 
 class _FlushMarker:
@@ -66,6 +77,73 @@ class _FlushMarker:
 FLUSH = _FlushMarker()
 
 
+class _SourceFailure:
+    """Carries an exception raised by the source across the prefetch queue."""
+    __slots__ = ("exception",)
+
+    def __init__(self, exception):
+        self.exception = exception
+
+
+#: Put on the prefetch queue after the source's last item
+_SOURCE_EXHAUSTED = object()
+
+#: Default of the ``latest_saved_time`` argument of
+#: :meth:`Plugin.get_dates_for_station`: not resolved by the caller. ``None``
+#: is a resolved value — no observation saved yet.
+UNRESOLVED = object()
+
+# How far back the batch-wide latest-saved-time lookup first searches. Only
+# stations with nothing saved in this span are searched again without a bound
+LATEST_SAVED_TIME_HINT = timedelta(days=7)
+
+_LATEST_SAVED_TIMES_SQL = """
+    SELECT p.station_id, p.connection_id, latest.time
+    FROM unnest(%(station_ids)s::bigint[], %(connection_ids)s::bigint[]) AS p (station_id, connection_id)
+    CROSS JOIN LATERAL (
+        SELECT o.time
+        FROM core_observationrecord o
+        WHERE o.station_id = p.station_id
+          AND o.connection_id = p.connection_id
+          {time_bound}
+        ORDER BY o.time DESC
+        LIMIT 1
+    ) latest
+"""
+
+# How often a prefetch producer blocked on a full queue, or waiting for a
+# flush to be saved, checks whether the consumer has gone away, and how often
+# a consumer waiting on the producer checks whether its batch was cut off
+_PREFETCH_POLL_SECONDS = 0.5
+
+# The event a station run on a pool thread of a concurrent batch polls to
+# stop at the batch soft limit, which as a signal only reaches the main thread
+# (see station_cancellation)
+_station_cancelled = contextvars.ContextVar("adl_station_cancelled", default=None)
+
+
+@contextmanager
+def station_cancellation(cancelled):
+    """
+    Have the station runs inside this block stop once ``cancelled``, a
+    :class:`threading.Event`, is set, as though the soft time limit had been
+    raised in their thread: the save loop checks it between records (see
+    :meth:`Plugin._chunk_iterator`), so the buffered chunk is persisted, the
+    activity log finalised as timed out and the lock released before the
+    :exc:`~celery.exceptions.SoftTimeLimitExceeded` propagates.
+    """
+    token = _station_cancelled.set(cancelled)
+    try:
+        yield
+    finally:
+        _station_cancelled.reset(token)
+
+
+# The logger of a plugin instance on the current thread, when one was given
+# by Plugin.thread_task_context, as a (plugin, TaskLogger) pair
+_thread_task_logger = contextvars.ContextVar("adl_thread_task_logger", default=None)
+
+
 class _SaveTally:
     """Running totals over the chunks persisted for one station run.
 
@@ -73,17 +151,23 @@ class _SaveTally:
     can read what *was* saved when the save loop is cut short by an exception —
     the counts survive the ``raise`` where a return value would not.
     """
-    __slots__ = ("saved", "earliest", "latest", "chunks")
+    __slots__ = ("saved", "earliest", "latest", "chunks", "inserted", "updated", "unchanged")
 
     def __init__(self):
         self.saved = 0
         self.earliest = None
         self.latest = None
         self.chunks = 0
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
 
-    def add(self, saved_count, chunk_earliest, chunk_latest):
+    def add(self, saved_count, chunk_earliest, chunk_latest, inserted=0, updated=0, unchanged=0):
         self.chunks += 1
         self.saved += saved_count
+        self.inserted += inserted
+        self.updated += updated
+        self.unchanged += unchanged
         if chunk_earliest and (self.earliest is None or chunk_earliest < self.earliest):
             self.earliest = chunk_earliest
         if chunk_latest and (self.latest is None or chunk_latest > self.latest):
@@ -92,6 +176,9 @@ class _SaveTally:
     def as_tuple(self):
         return self.saved, self.earliest, self.latest
 
+    def describe_writes(self):
+        return f"{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged"
+
 
 def _sanitize_sources_count(value):
     """
@@ -147,14 +234,31 @@ class Plugin(Instance):
     #: (per file, per page) yield :data:`FLUSH` instead of lowering this.
     SAVE_CHUNK_SIZE = 500
     
+    #: How :meth:`_save_chunk` upserts a chunk: ``"bulk_create"`` or
+    #: ``"copy"`` (see :mod:`adl.core.upsert`). ``None`` defers to the
+    #: ``ADL_OBSERVATION_WRITER`` setting.
+    OBSERVATION_WRITER = None
+    
+    #: How many chunks of records a background thread may read from the
+    #: source ahead of the chunk being saved (see :meth:`_prefetch_iterator`).
+    #: ``0`` reads and saves in turn. ``None`` defers to the
+    #: ``ADL_INGEST_PIPELINE_DEPTH`` setting.
+    PIPELINE_DEPTH = None
+    
+    #: Whether :meth:`_save_chunk` drops values already stored as they are
+    #: before QC and the upsert (see :mod:`adl.core.duplicates`). Turn it off
+    #: for a source whose re-sent values should always be re-checked.
+    SUPPRESS_STORED_DUPLICATES = True
+    
     # ---------- Lifecycle ----------
     def __init__(self):
         super().__init__()
         if not self.label:
             raise ImproperlyConfigured("The label of a plugin must be set.")
         
-        # Initialize QC pipeline cache
+        # Initialize QC pipeline cache, shared by the threads of a concurrent batch
         self._qc_pipelines_cache = {}
+        self._qc_pipelines_lock = threading.Lock()
         
         self._task_logger = None
     
@@ -164,11 +268,16 @@ class Plugin(Instance):
     
         Creates a new logger on first call, keyed to :attr:`label`. Subsequent
         calls return the same instance unless :meth:`set_task_context` has been
-        called to replace it with a task-scoped logger.
+        called to replace it with a task-scoped logger. Inside
+        :meth:`thread_task_context`, the calling thread's own logger is
+        returned instead.
     
         :return: The active task logger.
         :rtype: TaskLogger
         """
+        thread_logger = _thread_task_logger.get()
+        if thread_logger is not None and thread_logger[0] is self:
+            return thread_logger[1]
         if self._task_logger is None:
             self._task_logger = TaskLogger(plugin_label=self.label)
         return self._task_logger
@@ -186,6 +295,28 @@ class Plugin(Instance):
         """
         self._task_logger = TaskLogger(task_id=task_id, plugin_label=self.label)
     
+    @contextmanager
+    def thread_task_context(self, task_id: str):
+        """
+        Give the calling thread a logger of its own, scoped to ``task_id``,
+        for the duration of the block.
+    
+        One plugin instance serves every thread of a concurrent batch. Through
+        the shared logger of :meth:`set_task_context`, the
+        :meth:`~adl.core.logging.TaskLogger.summarize` counts of all its
+        stations would add up, and each station's end would flush the others'.
+        The logger is carried by the context, so code the thread hands to an
+        event loop or a prefetch thread logs through it as well.
+    
+        :param task_id: The Celery task ID string for the current ingestion run.
+        :type task_id: str
+        """
+        token = _thread_task_logger.set((self, TaskLogger(task_id=task_id, plugin_label=self.label)))
+        try:
+            yield
+        finally:
+            _thread_task_logger.reset(token)
+    
     # ---------- URL exposure ----------
     def get_urls(self) -> list:
         """
@@ -226,7 +357,9 @@ class Plugin(Instance):
         :param station_link: The ``StationLink`` instance that was just processed.
         :param station_records: The raw record dicts as returned by
             :meth:`get_station_data` for this station.
-        :param saved_records: The ``ObservationRecord`` instances that were upserted.
+        :param saved_records: The ``ObservationRecord`` instances that were
+            inserted or changed. Rows whose stored value and QC state already
+            matched are left untouched and not included.
         :param qc_fail_results: Dict of QC failure messages keyed by UTC ISO
             timestamp string, or ``None`` if no QC checks are configured for this
             parameter.
@@ -237,8 +370,8 @@ class Plugin(Instance):
         
         qc_result_objects = []
         for record in saved_records:
-            utc_obs_time_key = dj_timezone.localtime(record.time, timezone=py_tz.utc).isoformat()
-            record_qc_results = qc_results.get(utc_obs_time_key)
+            utc_obs_time = dj_timezone.localtime(record.time, timezone=py_tz.utc).isoformat()
+            record_qc_results = qc_results.get(f"{utc_obs_time}_{record.parameter_id}")
             if record_qc_results:
                 for fail_result in record_qc_results:
                     check_type = fail_result.get("check_type")
@@ -343,9 +476,77 @@ class Plugin(Instance):
         .. warning::
             Records with a missing or non-:class:`datetime` ``observation_time``,
             timestamps outside ``[start_date, end_date]``, or future timestamps are
-            silently dropped by :meth:`save_records`. No exception is raised.
+            dropped by :meth:`save_records` and only counted in the task log. No
+            exception is raised.
+
+        .. note::
+            A plugin that implements :meth:`aget_station_data` instead does not
+            need to implement this method: the default drives the async
+            generator on a private event loop, so every synchronous entry path
+            (manual collection, backfills, the shell) keeps working.
             """
+        if self.has_async_source:
+            from .async_ingestion import iter_async_station_data
+            return iter_async_station_data(self, station_link, start_date, end_date)
+        raise NotImplementedError
+    
+    async def aget_station_data(
+            self,
+            station_link,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Optional async counterpart of :meth:`get_station_data`.
+
+        Implement it as an async generator, with the same arguments and the
+        same record dicts — :data:`FLUSH` included — as the synchronous
+        contract. For sources that spend most of a run waiting on HTTP this
+        is the cheaper contract: all stations of a batch are fetched
+        concurrently on one event loop (see :mod:`adl.core.async_ingestion`),
+        instead of one station after another, while records are still
+        normalized, checked and upserted by :meth:`save_records` exactly as
+        before, on up to the connection's ``max_concurrent_stations`` threads.
+
+        Make requests through :meth:`get_async_http_client`, which returns a
+        pooled client shared by every station of the batch::
+
+            async def aget_station_data(self, station_link, start_date=None, end_date=None):
+                client = self.get_async_http_client()
+                response = await client.get(url, params={"from": start_date.isoformat()})
+                response.raise_for_status()
+                for row in response.json()["rows"]:
+                    yield {"observation_time": parse(row["time"]), "te": row["te"]}
+                yield FLUSH
+
+        Code after a ``yield FLUSH`` runs once the records before it are in
+        the database, as it does for :meth:`get_station_data`. Blocking calls
+        (synchronous HTTP, ``time.sleep``) stall every station of the batch
+        and must not be used here.
+
+        :raises NotImplementedError: If not overridden — a plugin implements
+            this or :meth:`get_station_data`, not necessarily both.
+        """
         raise NotImplementedError
+
+    @property
+    def has_async_source(self) -> bool:
+        """Whether this plugin implements :meth:`aget_station_data`."""
+        return type(self).aget_station_data is not Plugin.aget_station_data
+
+    def get_async_http_client(self):
+        """
+        Return the shared ``httpx.AsyncClient`` for the current
+        :meth:`aget_station_data` run.
+
+        The client is owned by ADL: it is opened before the first station of
+        a batch is fetched and closed after the last, so do not close it or
+        use it outside :meth:`aget_station_data`.
+
+        :raises RuntimeError: If called outside :meth:`aget_station_data`.
+        """
+        from .async_ingestion import current_async_http_client
+        return current_async_http_client()
     
     # ---------- Date helpers ----------
     def get_default_end_date(self, station_link) -> datetime:
@@ -432,6 +633,64 @@ class Plugin(Instance):
         
         return latest_observation_time
     
+    @property
+    def resolves_latest_saved_time_in_batch(self) -> bool:
+        """
+        Whether a batch may resolve this plugin's resume points with
+        :meth:`get_latest_saved_times` — true unless
+        :meth:`get_start_date_from_db` is overridden, in which case every
+        station keeps calling the override.
+        """
+        return type(self).get_start_date_from_db is Plugin.get_start_date_from_db
+    
+    def get_latest_saved_times(self, station_links) -> Dict[int, Optional[datetime]]:
+        """
+        What :meth:`get_start_date_from_db` returns, for many station links
+        in one query.
+
+        A lateral join walks the ``(connection, station, -time)`` index once
+        per station link and stops at the first row, instead of one
+        ``ORDER BY time DESC LIMIT 1`` round-trip per station. The scan is
+        first bounded to :data:`LATEST_SAVED_TIME_HINT`, which prunes every
+        older hypertable chunk; only the links with nothing saved in that
+        span are looked up again without the bound.
+
+        :param station_links: ``StationLink`` instances; only ``id``,
+            ``station_id`` and ``network_connection_id`` are read.
+        :return: The latest saved time per station link ``id``, ``None`` for
+            a link with no observations.
+        :rtype: Dict[int, Optional[datetime]]
+        """
+        from django.db import connection as db_connection
+        
+        links_by_pair = {}
+        for station_link in station_links:
+            links_by_pair.setdefault(
+                (station_link.station_id, station_link.network_connection_id), []
+            ).append(station_link.id)
+        
+        latest_by_pair = {}
+        pending = list(links_by_pair)
+        with db_connection.cursor() as cursor:
+            for time_bound, since in (("AND o.time >= %(since)s", dj_timezone.now() - LATEST_SAVED_TIME_HINT),
+                                      ("", None)):
+                if not pending:
+                    break
+                cursor.execute(_LATEST_SAVED_TIMES_SQL.format(time_bound=time_bound), {
+                    "station_ids": [station_id for station_id, _ in pending],
+                    "connection_ids": [connection_id for _, connection_id in pending],
+                    "since": since,
+                })
+                for station_id, connection_id, latest in cursor.fetchall():
+                    latest_by_pair[(station_id, connection_id)] = latest
+                pending = [pair for pair in pending if pair not in latest_by_pair]
+        
+        return {
+            station_link_id: latest_by_pair.get(pair)
+            for pair, station_link_ids in links_by_pair.items()
+            for station_link_id in station_link_ids
+        }
+    
     @staticmethod
     def _get_station_first_collection_date(station_link) -> Optional[datetime]:
         """
@@ -442,7 +701,8 @@ class Plugin(Instance):
             return dj_timezone.localtime(date, timezone=station_link.timezone)
         return None
     
-    def get_dates_for_station(self, station_link, latest=False) -> Tuple[datetime, datetime]:
+    def get_dates_for_station(self, station_link, latest=False,
+                              latest_saved_time=UNRESOLVED) -> Tuple[datetime, datetime]:
         """
         Resolve the ``(start_date, end_date)`` window to pass to
         :meth:`get_station_data`.
@@ -481,6 +741,11 @@ class Plugin(Instance):
         :param latest: If ``True``, skip DB and first-collection-date lookups and
             always use the default start date. Defaults to ``False``.
         :type latest: bool
+        :param latest_saved_time: The latest saved observation time, already
+            resolved by the caller with :meth:`get_latest_saved_times`. Used
+            in place of :meth:`get_start_date_from_db` unless that method is
+            overridden.
+        :type latest_saved_time: datetime or None, optional
         :return: A ``(start_date, end_date)`` tuple, both timezone-aware and
             expressed in the station's local timezone.
         :rtype: Tuple[datetime, datetime]
@@ -489,7 +754,10 @@ class Plugin(Instance):
         if latest:
             start_date = self.get_default_start_date(station_link)
         else:
-            db_start = self.get_start_date_from_db(station_link)
+            if latest_saved_time is UNRESOLVED or not self.resolves_latest_saved_time_in_batch:
+                db_start = self.get_start_date_from_db(station_link)
+            else:
+                db_start = latest_saved_time
             floor = self._get_station_first_collection_date(station_link)
             
             if db_start and floor and floor > db_start:
@@ -525,15 +793,21 @@ class Plugin(Instance):
         connection dropping on item *n+1* does not throw away items *1..n*
         that were already fetched. Only the source's own exceptions are handled
         this way; an exception raised by the consumer while persisting a chunk
-        propagates untouched.
+        propagates untouched. A station cut off through
+        :func:`station_cancellation` is stopped the same way, before the next
+        record is read.
         """
         log = self.get_logger()
+        cancelled = _station_cancelled.get()
         chunk = []
         total = 0
         source = iter(iterable)
         interruption = None
 
         while True:
+            if cancelled is not None and cancelled.is_set():
+                interruption = SoftTimeLimitExceeded()
+                break
             try:
                 item = next(source)
             except StopIteration:
@@ -547,8 +821,8 @@ class Plugin(Instance):
 
             if item is FLUSH:
                 if chunk:
-                    log.info(f"Flush requested by source: yielding chunk of {len(chunk)} records "
-                             f"(total so far: {total})")
+                    log.debug("Flush requested by source: yielding chunk of %d records (total so far: %d)",
+                              len(chunk), total)
                     yield chunk
                     chunk = []
                 continue
@@ -557,14 +831,14 @@ class Plugin(Instance):
             total += 1
 
             if len(chunk) >= chunk_size:
-                log.info(f"Yielding chunk of {len(chunk)} records (total so far: {total})")
+                log.debug("Yielding chunk of %d records (total so far: %d)", len(chunk), total)
                 yield chunk
                 chunk = []
 
         if interruption is not None:
             if chunk:
                 log.warning(
-                    "Source raised %s after %d records; persisting the %d buffered "
+                    "Interrupted by %s after %d records; persisting the %d buffered "
                     "records before re-raising",
                     type(interruption).__name__, total, len(chunk),
                 )
@@ -572,143 +846,136 @@ class Plugin(Instance):
             raise interruption
 
         if chunk:
-            log.info(f"Yielding final chunk of {len(chunk)} records (total: {total})")
+            log.debug("Yielding final chunk of %d records (total: %d)", len(chunk), total)
             yield chunk
     
     # ---------- Persistence (Chunked) ----------
     
-    def _process_single_record(
-            self,
-            record: Dict[str, Any],
-            station_link,
-            station,
-            variable_mappings: List,
-            tz,
-            start_date,
-            end_date,
-            log: TaskLogger
-    ) -> Tuple[List[Any], Dict[str, List], Optional[datetime]]:
+    def _get_pipeline_depth(self) -> int:
+        depth = self.PIPELINE_DEPTH
+        if depth is None:
+            depth = getattr(settings, "ADL_INGEST_PIPELINE_DEPTH", 0)
+        return max(int(depth or 0), 0)
+
+    def _prefetch_iterator(self, iterable: Iterable, max_items: int) -> Generator:
         """
-        Validate one raw record dict and produce unsaved ``ObservationRecord``
-        objects for each variable mapping that resolves successfully.
-    
-        Returns ``([], {}, None)`` for any record that fails validation
-        (missing or invalid ``observation_time``, out-of-window timestamp,
-        future timestamp). Unit conversion failures on individual mappings are
-        also silently skipped.
+        Iterate ``iterable`` on a producer thread, up to ``max_items`` ahead
+        of the consumer, so the source is read while the previous chunk is
+        being saved instead of sitting idle.
+
+        What :meth:`_chunk_iterator` guarantees for a plain source holds here
+        too:
+
+        - The producer stops at :data:`FLUSH` until the consumer asks for
+          the next item — that is, until the chunk before the marker has
+          been saved — so code after ``yield FLUSH`` still runs with those
+          records in the database.
+        - An exception raised by the source is queued behind the items read
+          before it and re-raised only once they have been consumed.
+        - An exception raised in the consumer while it waits (the batch soft
+          limit, or its station being cut off through
+          :func:`station_cancellation`) first hands over whatever was already
+          read ahead, so it can be saved like any other buffered chunk.
+
+        When the consumer goes away early the producer closes the source and
+        exits. It never runs plugin code concurrently with itself, and closes
+        any database connection the source opened on its thread.
         """
-        from adl.core.models import ObservationRecord
-        
-        observation_records = []
-        qc_results = {}
-        
+        items = queue.Queue(maxsize=max_items)
+        stop = threading.Event()
+        flushed = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=_PREFETCH_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            source = iter(iterable)
+            try:
+                while True:
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        put(_SOURCE_EXHAUSTED)
+                        return
+                    except BaseException as e:
+                        put(_SourceFailure(e))
+                        return
+                    if not put(item):
+                        return
+                    if item is FLUSH:
+                        while not flushed.wait(_PREFETCH_POLL_SECONDS):
+                            if stop.is_set():
+                                return
+                        flushed.clear()
+            finally:
+                close = getattr(source, "close", None)
+                if close is not None:
+                    close()
+                db_connections.close_all()
+
+        def get():
+            # A producer stuck in a read must not keep a cut-off station
+            # from finishing: the consumer stops waiting and lets it be
+            cancelled = _station_cancelled.get()
+            while cancelled is not None:
+                try:
+                    return items.get(timeout=_PREFETCH_POLL_SECONDS)
+                except queue.Empty:
+                    if cancelled.is_set():
+                        raise SoftTimeLimitExceeded()
+            return items.get()
+
+        # The producer runs the source, so it sees the consumer's context
+        producer = threading.Thread(target=contextvars.copy_context().run, args=(produce,),
+                                    name="adl-prefetch", daemon=True)
+        producer.start()
         try:
-            rec = StationRecordModel(
-                observation_time=record.get("observation_time"),
-                values={k: v for k, v in record.items() if k != "observation_time"}
-            )
-        except Exception as e:
-            log.warning("Bad record for station %s: %s", station.name, e)
-            return [], {}, None
-        
-        obs_time = rec.observation_time
-        
-        if not obs_time:
-            log.warning("Missing observation_time for station %s.", station.name)
-            return [], {}, None
-        
-        if not isinstance(obs_time, datetime):
-            log.error(
-                "observation_time for station %s must be datetime, got %s: %r",
-                station.name, type(obs_time), obs_time
-            )
-            return [], {}, None
-        
-        # Normalize to aware station-local time
-        obs_time = make_record_timezone_aware(obs_time, tz)
-        
-        if obs_time < start_date:
-            log.warning(
-                "Rejected timestamp %s before start_date %s for station %s",
-                obs_time, start_date, station.name
-            )
-            return [], {}, None
-        
-        if obs_time > end_date:
-            log.warning(
-                "Rejected timestamp %s after end_date %s for station %s",
-                obs_time, end_date, station.name
-            )
-            return [], {}, None
+            while True:
+                try:
+                    item = get()
+                except BaseException:
+                    stop.set()
+                    while True:
+                        try:
+                            item = items.get_nowait()
+                        except queue.Empty:
+                            break
+                        if item is not FLUSH and item is not _SOURCE_EXHAUSTED \
+                                and not isinstance(item, _SourceFailure):
+                            yield item
+                    raise
+                if item is _SOURCE_EXHAUSTED:
+                    return
+                if isinstance(item, _SourceFailure):
+                    raise item.exception
+                yield item
+                if item is FLUSH:
+                    flushed.set()
+        finally:
+            stop.set()
+
+    def _get_observation_writer(self):
+        """
+        The :mod:`adl.core.upsert` writer function named by
+        :attr:`OBSERVATION_WRITER`, or by the ``ADL_OBSERVATION_WRITER``
+        setting when the plugin does not choose.
+        """
+        from adl.core import upsert
         
-        now = dj_timezone.now()
-        if obs_time > now:
-            log.warning(
-                "Rejected futuristic timestamp %s for station %s (now=%s)",
-                obs_time, station.name, now
+        writer = self.OBSERVATION_WRITER or upsert.get_default_observation_writer()
+        if writer == upsert.WRITER_COPY:
+            return upsert.copy_observations
+        if writer != upsert.WRITER_BULK_CREATE:
+            raise ImproperlyConfigured(
+                f"Unknown observation writer {writer!r}; expected one of {upsert.OBSERVATION_WRITERS}"
             )
-            
-            return [], {}, None
-        
-        for mapping in variable_mappings:
-            adl_param = getattr(mapping, "adl_parameter", None)
-            src_name = getattr(mapping, "source_parameter_name", None)
-            src_unit = getattr(mapping, "source_parameter_unit", None)
-            
-            if not (adl_param and src_name and src_unit):
-                continue
-            
-            src_name = str(src_name)
-            
-            if src_name not in rec.values:
-                continue
-            
-            value = rec.values.get(src_name)
-            
-            if value is None or not isinstance(value, (int, float)):
-                continue
-            
-            # Unit conversion
-            try:
-                if adl_param.unit != src_unit:
-                    value = adl_param.convert_value_from_units(value, src_unit)
-            except Exception as e:
-                log.warning(
-                    "Unit conversion failed for %s (%s→%s) on station %s: %s",
-                    adl_param.name, src_unit, adl_param.unit, station.name, e
-                )
-                continue
-            
-            time_key = dj_timezone.localtime(obs_time, timezone=py_tz.utc).isoformat()
-            utc_obs_key_with_param = f"{time_key}_{adl_param.id}"
-            
-            # QC checks
-            qc_bits, qc_status, qc_messages = self.perform_qc_checks_with_pipeline(
-                value=value,
-                variable_mapping=mapping,
-                adl_param=adl_param,
-                station_link=station_link,
-                obs_time=obs_time
-            )
-            
-            if qc_messages:
-                if utc_obs_key_with_param not in qc_results:
-                    qc_results[utc_obs_key_with_param] = []
-                qc_results[utc_obs_key_with_param].extend(qc_messages)
-            
-            observation_records.append(ObservationRecord(
-                station=station,
-                parameter=adl_param,
-                time=obs_time,
-                value=value,
-                connection=station_link.network_connection,
-                is_daily=station_link.network_connection.is_daily_data,
-                qc_status=qc_status,
-                qc_bits=int(qc_bits),
-                qc_version=1,
-            ))
-        
-        return observation_records, qc_results, obs_time
+        return upsert.bulk_create_observations
     
     def _save_chunk(
             self,
@@ -717,67 +984,109 @@ class Plugin(Instance):
             variable_mappings: List,
             start_date,
             end_date,
-            log: TaskLogger
-    ) -> Tuple[int, Optional[datetime], Optional[datetime]]:
+            log: TaskLogger,
+            stored_index: Optional[StoredValueIndex] = None,
+    ) -> Tuple[int, Optional[datetime], Optional[datetime], int, int, int]:
         """
         Process and bulk-upsert one chunk of raw records.
     
-        Deduplicates by ``(utc_time, parameter_id)`` before calling
-        ``bulk_create(update_conflicts=True)``, so re-fetching an overlapping
-        window is safe. Returns ``(saved_count, earliest_time, latest_time)``
-        for the chunk.
+        The chunk is normalized column-wise by
+        :func:`~adl.core.normalization.normalize_chunk`, which also
+        deduplicates by ``(time, parameter_id)`` before the upsert, so
+        re-fetching an overlapping window is safe. Dropped records are logged as one counted line per
+        reason rather than one line each. QC runs once per parameter over
+        the whole chunk (see :meth:`_perform_chunk_qc`) rather than once per
+        value, and the chunk is written by the writer
+        :attr:`OBSERVATION_WRITER` selects, which leaves rows whose stored
+        value and QC state already match untouched. With ``stored_index``,
+        values already stored as they are skip QC and the write altogether
+        and are counted as unchanged (see :mod:`adl.core.duplicates`). Returns
+        ``(saved_count, earliest_time, latest_time, inserted, updated,
+        unchanged)`` for the chunk, where ``saved_count`` is the sum of the
+        last three.
         """
-        from adl.core.models import ObservationRecord
-        
         station = station_link.station
+        connection = station_link.network_connection
         tz = station_link.timezone
         
-        all_observation_records = {}  # Dedupe by time+param
-        all_qc_results = {}
-        chunk_earliest = None
-        chunk_latest = None
+        with profile_stage("normalize"):
+            normalized = normalize_chunk(
+                chunk_records, variable_mappings, tz, start_date, end_date, now=dj_timezone.now()
+            )
         
-        for record in chunk_records:
-            obs_records, qc_results, obs_time = self._process_single_record(
-                record, station_link, station, variable_mappings, tz, start_date, end_date, log
+        # Summarized rather than logged per chunk: a source that keeps
+        # sending one bad value would otherwise repeat the line every chunk
+        for reason, count in normalized.rejected.items():
+            log.summarize(
+                "warning", "Rejected %d records for station %s: %s (window %s to %s)",
+                station.name, REJECTION_REASONS[reason], start_date, end_date, count=count
             )
-            
-            if obs_time:
-                if chunk_earliest is None or obs_time < chunk_earliest:
-                    chunk_earliest = obs_time
-                if chunk_latest is None or obs_time > chunk_latest:
-                    chunk_latest = obs_time
-            
-            # Merge into chunk collections (dedupe)
-            for obs_record in obs_records:
-                time_key = dj_timezone.localtime(obs_record.time, timezone=py_tz.utc).isoformat()
-                key = f"{time_key}_{obs_record.parameter_id}"
-                all_observation_records[key] = obs_record
-            
-            all_qc_results.update(qc_results)
         
-        if not all_observation_records:
-            return 0, chunk_earliest, chunk_latest
+        for mapping, count, error in normalized.conversion_failures:
+            adl_param = mapping.adl_parameter
+            log.summarize(
+                "warning", "Unit conversion failed for %d %s values (%s→%s) on station %s: %s",
+                adl_param.name, mapping.source_parameter_unit, adl_param.unit, station.name, str(error),
+                count=count
+            )
         
-        observation_records_list = list(all_observation_records.values())
+        chunk_earliest, chunk_latest = normalized.time_range(tz)
         
-        saved_records = ObservationRecord.objects.bulk_create(
-            observation_records_list,
-            update_conflicts=True,
-            update_fields=["value", "is_daily", "qc_status", "qc_bits", "qc_version"],
-            unique_fields=["time", "station", "connection", "parameter"],
-            batch_size=500  # Smaller batch for bulk_create itself
-        )
+        suppressed = 0
+        if stored_index is not None and len(normalized):
+            with profile_stage("dedup"):
+                duplicates = stored_index.duplicate_mask(normalized)
+                suppressed = int(duplicates.sum())
+                if suppressed:
+                    normalized = normalized.select(~duplicates)
+            metrics.inc("adl_ingest_duplicates_suppressed_total", suppressed, connection=connection.name)
+        
+        if not len(normalized):
+            return suppressed, chunk_earliest, chunk_latest, 0, 0, suppressed
+        
+        qc_started = time.monotonic()
+        with profile_stage("qc"):
+            qc_bits, qc_statuses, qc_messages = self._perform_chunk_qc(
+                station_link, normalized, variable_mappings, chunk_earliest, chunk_latest
+            )
+        metrics.observe("adl_ingest_qc_seconds", time.monotonic() - qc_started, connection=connection.name)
+        
+        with profile_stage("upsert"):
+            rows = []
+            all_qc_results = {}
+            for row, (obs_time, mapping, value) in enumerate(normalized.rows(variable_mappings)):
+                adl_param = mapping.adl_parameter
+                rows.append((obs_time, adl_param, value))
+                
+                if row in qc_messages:
+                    all_qc_results.setdefault(f"{obs_time.isoformat()}_{adl_param.id}", []).extend(qc_messages[row])
+            
+            write_observations = self._get_observation_writer()
+            upsert_started = time.monotonic()
+            written = write_observations(
+                station, connection, connection.is_daily_data, rows, qc_statuses, qc_bits
+            )
+            if stored_index is not None:
+                stored_index.record_written(normalized)
+        metrics.observe("adl_ingest_chunk_upsert_seconds", time.monotonic() - upsert_started,
+                        connection=connection.name)
+        metrics.inc("adl_ingest_records_saved_total", written.total + suppressed, connection=connection.name)
+        metrics.record_latest_observation(connection.name, chunk_latest)
         
-        if saved_records and all_qc_results:
-            self._create_qc_messages(saved_records, all_qc_results)
+        if written.records and all_qc_results:
+            with profile_stage("qc_messages"):
+                self._create_qc_messages(written.records, all_qc_results)
 
         try:
-            self.after_save_records(station_link, chunk_records, list(saved_records))
+            with profile_stage("after_save"):
+                self.after_save_records(station_link, chunk_records, list(written.records))
         except Exception:
             log.exception("after_save_records raised for station %s", station_link.station)
 
-        return len(saved_records), chunk_earliest, chunk_latest
+        return (
+            written.total + suppressed, chunk_earliest, chunk_latest,
+            written.inserted, written.updated, written.unchanged + suppressed,
+        )
     
     def save_records(
             self,
@@ -798,8 +1107,9 @@ class Plugin(Instance):
         For each record the method:
     
         1. Validates and normalizes ``observation_time`` to a timezone-aware
-           station-local datetime. Records with a missing, non-:class:`datetime`,
-           out-of-window, or future timestamp are silently dropped.
+           datetime. Records with a missing, non-:class:`datetime`,
+           out-of-window, or future timestamp are dropped; the task log gets
+           one counted warning per reason for the run, not one per record.
         2. Iterates the station link's variable mappings and looks up
            ``record[mapping.source_parameter_name]`` for each one.
         3. Converts the value from ``mapping.source_parameter_unit`` to the ADL
@@ -808,7 +1118,11 @@ class Plugin(Instance):
         5. Upserts an ``ObservationRecord`` row keyed on
            ``(time, station, connection, parameter)``, updating ``value``,
            ``is_daily``, ``qc_status``, ``qc_bits``, and ``qc_version`` on
-           conflict.
+           conflict — only when one of them differs from what is stored.
+    
+        The task log's summary line gives how many rows were inserted,
+        updated and left unchanged; :meth:`process_station` also records
+        those counts on the activity log.
     
         You do not normally need to override or call this method directly. It is
         called automatically by :meth:`process_station`.
@@ -827,7 +1141,8 @@ class Plugin(Instance):
             Defaults to :attr:`SAVE_CHUNK_SIZE`.
         :type chunk_size: int, optional
         :return: A three-tuple of ``(total_saved, earliest_time, latest_time)``
-            where ``total_saved`` is the number of rows upserted, and
+            where ``total_saved`` is the number of rows upserted (inserted,
+            updated or found already up to date), and
             ``earliest_time`` / ``latest_time`` are the observation timestamps of
             the first and last saved records, or ``None`` if no records were saved.
         :rtype: Tuple[int, Optional[datetime], Optional[datetime]]
@@ -847,11 +1162,11 @@ class Plugin(Instance):
             start_date,
             end_date,
             chunk_size: Optional[int] = None,
-    ) -> Generator[Tuple[int, Optional[datetime], Optional[datetime]], None, None]:
+    ) -> Generator[Tuple[int, Optional[datetime], Optional[datetime], int, int, int], None, None]:
         """
         The chunk-by-chunk engine behind :meth:`save_records`.
 
-        Yields ``(saved_count, earliest_time, latest_time)`` for each chunk
+        Yields :meth:`_save_chunk`'s result tuple for each chunk
         *after* it has been upserted, so a caller accumulating the results
         holds an accurate total at every point — including the moment the
         source raises and the exception comes out of this generator. That is
@@ -872,14 +1187,23 @@ class Plugin(Instance):
             return
 
         chunk_size = chunk_size or self.SAVE_CHUNK_SIZE
+        stored_index = None
+        if self.SUPPRESS_STORED_DUPLICATES:
+            stored_index = StoredValueIndex(station_link, variable_mappings, start_date, end_date)
         tally = _SaveTally()
         exhausted = False
 
+        pipeline_depth = self._get_pipeline_depth()
+        if pipeline_depth:
+            station_records = self._prefetch_iterator(station_records, pipeline_depth * chunk_size)
+
         try:
-            # Process in chunks - works with both generators and lists
-            for chunk in self._chunk_iterator(station_records, chunk_size):
+            # Process in chunks - works with both generators and lists. Time
+            # spent waiting for the next chunk is the source's
+            for chunk in iter_in_stage(self._chunk_iterator(station_records, chunk_size), "fetch"):
                 chunk_result = self._save_chunk(
-                    station_link, chunk, variable_mappings, start_date, end_date, log
+                    station_link, chunk, variable_mappings, start_date, end_date, log,
+                    stored_index=stored_index,
                 )
                 tally.add(*chunk_result)
                 log.debug(
@@ -896,15 +1220,20 @@ class Plugin(Instance):
             # failed before yielding anything is reported by the caller.
             if tally.saved:
                 log.info(
-                    "Saved %d total records for station %s in %d chunks",
-                    tally.saved, station.name, tally.chunks
+                    "Saved %d total records for station %s in %d chunks (%s)",
+                    tally.saved, station.name, tally.chunks, tally.describe_writes()
                 )
             elif exhausted:
                 log.warning("No valid observation records for station %s.", station.name)
+            log.flush_summaries()
+            if pipeline_depth:
+                # Stops the producer thread when saving failed part-way
+                station_records.close()
     
     # ---------- Orchestration ----------
     def process_station(self, station_link, initial_start_date=None, initial_end_date=None,
-                        bypass_lock=False) -> int:
+                        bypass_lock=False, record_source=None, latest_saved_time=UNRESOLVED,
+                        raise_errors=False, archive_raw=True, backfill=False) -> int:
         """
         Run the full ingestion pipeline for a single station link.
 
@@ -941,6 +1270,26 @@ class Plugin(Instance):
         :param bypass_lock: Skip lock acquisition entirely. Only for deliberate
             backfills, where running alongside a scheduled pull is intended.
         :type bypass_lock: bool, optional
+        :param record_source: Callable used in place of
+            :meth:`get_station_data`, with the same signature. The async batch
+            runner passes one that bridges to :meth:`aget_station_data` on its
+            shared event loop.
+        :type record_source: callable, optional
+        :param latest_saved_time: Passed on to :meth:`get_dates_for_station`;
+            the batch task resolves it for all of its stations at once.
+        :type latest_saved_time: datetime or None, optional
+        :param raise_errors: Re-raise a fetch or save error once the activity
+            log is finalised, instead of only recording it. The backfill slice
+            task uses this to tell a failed slice from an empty one.
+        :type raise_errors: bool, optional
+        :param archive_raw: Write the fetched records to the raw archive when
+            the connection keeps one (see :mod:`adl.core.archive`). A replay
+            from the archive passes ``False``.
+        :type archive_raw: bool, optional
+        :param backfill: Mark the activity log as a backfill slice's run, so
+            the stale-run sweep gives it the slice's time budget rather than
+            the connection's batch budget.
+        :type backfill: bool, optional
         :return: The number of ``ObservationRecord`` rows upserted, or ``0`` if
             no data was available, the station was locked, or an error occurred.
         :rtype: int
@@ -958,6 +1307,8 @@ class Plugin(Instance):
             lock_ttl = ingest_batch_budget_seconds(station_link.network_connection)
             if not cache.add(lock_key, "locked", timeout=lock_ttl):
                 log.warning("Station link %s is still processing. Skipping...", station_link)
+                metrics.inc("adl_lock_collisions_total", direction="pull",
+                            name=station_link.network_connection.name)
                 StationLinkActivityLog.objects.create(
                     time=dj_timezone.now(),
                     station_link=station_link,
@@ -969,10 +1320,12 @@ class Plugin(Instance):
                 return 0
 
         start = time.monotonic()
+        profile = StageProfile()
         activity_log = StationLinkActivityLog.objects.create(
             time=dj_timezone.now(),
             station_link=station_link,
             direction='pull',
+            is_backfill=backfill or None,
         )
 
         # Accumulated chunk by chunk, so the numbers survive an exception out
@@ -986,7 +1339,11 @@ class Plugin(Instance):
         station_link.adl_sources_count = None
 
         try:
-            start_date, end_date = self.get_dates_for_station(station_link)
+            profile.start()
+            with profile_stage("window"):
+                start_date, end_date = self.get_dates_for_station(
+                    station_link, latest_saved_time=latest_saved_time
+                )
             
             if initial_start_date:
                 start_date = initial_start_date
@@ -996,11 +1353,12 @@ class Plugin(Instance):
             log.info("Fetching %s from %s to %s.", station_link, start_date, end_date)
             
             # Get station data - should be a generator for memory efficiency
-            station_records = self.get_station_data(
-                station_link,
-                start_date=start_date,
-                end_date=end_date
-            )
+            with profile_stage("fetch"):
+                station_records = (record_source or self.get_station_data)(
+                    station_link,
+                    start_date=start_date,
+                    end_date=end_date
+                )
             
             if station_records is None:
                 # Converged with the empty-iterable case: both fall through to
@@ -1008,6 +1366,11 @@ class Plugin(Instance):
                 # reaches COMPLETED instead of resting at STARTED.
                 station_records = []
 
+            if archive_raw and getattr(station_link.network_connection, "archive_raw_records", False):
+                station_records = archive_records(
+                    station_link, station_records, start_date, end_date, run_id=activity_log.id
+                )
+
             # Chunked save - handles generators efficiently. Consumed chunk
             # by chunk (rather than through save_records) so that if the
             # source raises part-way, the tally still holds what was
@@ -1048,9 +1411,16 @@ class Plugin(Instance):
             error_msg = mark_failed(activity_log, e)
             log.error("Error processing station %s: %s (%d records saved before the failure)",
                       station_link, error_msg, tally.saved)
+            if raise_errors:
+                raise
         finally:
+            profile.stop()
             activity_log.duration_ms = (time.monotonic() - start) * 1000
+            activity_log.stage_profile = profile.as_dict() or None
             activity_log.records_count = tally.saved
+            activity_log.inserted_count = tally.inserted
+            activity_log.updated_count = tally.updated
+            activity_log.unchanged_count = tally.unchanged
             if tally.saved:
                 # Set on every terminal path, not only the clean one: a run
                 # cut short still saved a real range, and the log should say so
@@ -1106,7 +1476,7 @@ class Plugin(Instance):
     
     # ---------- QC Methods (unchanged) ----------
     def perform_qc_checks_with_pipeline(self, value: float, variable_mapping, adl_param, station_link,
-                                        obs_time: datetime):
+                                        obs_time: datetime, recent_history: Optional[List[Dict]] = None):
         """
         Run the configured QC pipeline against a single observation value.
     
@@ -1133,6 +1503,11 @@ class Plugin(Instance):
         :param obs_time: The timezone-aware observation timestamp, used to fetch
             recent history for checks that require it (e.g. step, persistence).
         :type obs_time: datetime
+        :param recent_history: History already known for this value, newest
+            first, as :meth:`_get_recent_history_for_qc` returns it. When
+            given, no history query is made — for example the
+            :meth:`~adl.core.qc.history.RollingHistory.before` window of a
+            prefetched history.
         :return: A three-tuple of ``(qc_bits, qc_status, qc_messages)`` where
             ``qc_bits`` is a :class:`~adl.core.models.QCBits` flag value,
             ``qc_status`` is a :class:`~adl.core.models.QCStatus` choice, and
@@ -1141,55 +1516,33 @@ class Plugin(Instance):
         """
         
         from adl.core.models import QCBits, QCStatus
-        from adl.core.qc.config import QCConfigConverter, build_qc_context
-        from adl.core.qc.validators import QCFlag
+        from adl.core.qc.config import build_qc_context
         
         log = self.get_logger()
         
-        if hasattr(variable_mapping, "qc_checks"):
-            qc_checks = variable_mapping.qc_checks
-        else:
-            qc_checks = adl_param.qc_checks
-        
-        if not qc_checks:
+        pipeline = self._get_qc_pipeline(variable_mapping, adl_param)
+        if pipeline is None:
             return QCBits(0), QCStatus.NOT_EVALUATED, []
         
-        # Create cache key with parameter version
-        cache_key = f"{adl_param.id}_{adl_param.modified_at.timestamp()}"
-        
-        # Get or create pipeline
-        if cache_key not in self._qc_pipelines_cache:
-            old_keys = [k for k in self._qc_pipelines_cache.keys() if k.startswith(f"{adl_param.id}_")]
-            for old_key in old_keys:
-                del self._qc_pipelines_cache[old_key]
-            
-            try:
-                pipeline = QCConfigConverter.streamfield_to_pipeline(qc_checks)
-                self._qc_pipelines_cache[cache_key] = pipeline
-                log.debug(f"Created QC pipeline for parameter {adl_param.name}")
-            except Exception as e:
-                log.error(f"Error creating QC pipeline for parameter {adl_param.name}: {e}")
-                return QCBits(0), QCStatus.NOT_EVALUATED, []
-        
-        pipeline = self._qc_pipelines_cache[cache_key]
-        
         # Determine history requirements from pipeline
         history_requirements = self._get_pipeline_history_requirements(pipeline)
         
-        # Only fetch history if needed
-        recent_history = []
-        if history_requirements['needed']:
+        # Only fetch history if needed, and only if the caller has not
+        # already supplied it from a prefetched window
+        if not history_requirements['needed']:
+            recent_history = []
+        elif recent_history is None:
             recent_history = self._get_recent_history_for_qc(
                 station_link,
                 adl_param,
                 obs_time,
                 limit=history_requirements['limit']
             )
-            
-            # Check if we have minimum required history
-            if len(recent_history) < history_requirements['min_required']:
-                log.debug(f"Insufficient history for {adl_param.name}: "
-                          f"got {len(recent_history)}, need {history_requirements['min_required']}")
+        
+        # Check if we have minimum required history
+        if len(recent_history) < history_requirements['min_required']:
+            log.debug(f"Insufficient history for {adl_param.name}: "
+                      f"got {len(recent_history)}, need {history_requirements['min_required']}")
         
         # Build QC context
         mock_observation_record = {'observation_time': obs_time}
@@ -1206,12 +1559,7 @@ class Plugin(Instance):
         qc_messages = []
         
         # Map QC flags to QC bits
-        flag_to_bit_mapping = {
-            QCFlag.RANGE: QCBits.RANGE,
-            QCFlag.STEP: QCBits.STEP,
-            QCFlag.PERSISTENCE: QCBits.PERSISTENCE,
-            QCFlag.SPIKE: QCBits.SPIKE,
-        }
+        flag_to_bit_mapping = self._get_qc_flag_bits()
         
         # Set QC bits based on failed flags
         for flag in pipeline_result.flags:
@@ -1240,6 +1588,196 @@ class Plugin(Instance):
         
         return qc_bits, qc_status, qc_messages
     
+    def perform_qc_checks_batch(self, values, times_us, variable_mapping, adl_param, station_link,
+                                qc_history: Optional[RollingHistory] = None):
+        """
+        Run the configured QC pipeline over a time-ordered batch of values for
+        one parameter.
+    
+        The batch counterpart of :meth:`perform_qc_checks_with_pipeline`, with
+        the same outcome per value: each value is checked against the stored
+        history and the batch's own earlier values. Validators see the whole
+        batch at once through
+        :meth:`~adl.core.qc.pipeline.QCPipeline.run_batch`.
+    
+        :param values: Converted values, oldest first.
+        :param times_us: Observation times as epoch microseconds (UTC), sorted
+            and unique.
+        :param variable_mapping: The variable mapping, for QC overrides.
+        :param adl_param: The :class:`~adl.core.models.DataParameter`.
+        :param station_link: The ``StationLink`` instance.
+        :param qc_history: Prefetched history covering the batch's span. When
+            omitted and the pipeline needs history, it is fetched here with
+            :meth:`_prefetch_qc_history`.
+        :return: A three-tuple of ``(qc_bits, qc_status, qc_messages)``: two
+            integer arrays with one entry per value, and a dict mapping the
+            index of each failed value to its list of failure message dicts.
+        """
+        from adl.core.models import QCStatus
+        from adl.core.qc.config import build_qc_context
+        
+        log = self.get_logger()
+        
+        values = np.asarray(values, dtype=np.float64)
+        times_us = np.asarray(times_us, dtype=np.int64)
+        size = len(values)
+        qc_bits = np.zeros(size, dtype=np.int64)
+        qc_status = np.full(size, int(QCStatus.NOT_EVALUATED), dtype=np.int64)
+        
+        pipeline = self._get_qc_pipeline(variable_mapping, adl_param)
+        if pipeline is None or not size:
+            return qc_bits, qc_status, {}
+        
+        history_requirements = self._get_pipeline_history_requirements(pipeline)
+        
+        # Stored values inside the batch's span are checked alongside it, so
+        # that each batch value sees them as history; only the batch's own
+        # positions are kept
+        history = []
+        series_values, series_times, positions = values, times_us, np.arange(size)
+        if history_requirements['needed']:
+            if qc_history is None:
+                qc_history = self._prefetch_qc_history(
+                    station_link, adl_param,
+                    epoch_us_to_datetime(times_us[0]), epoch_us_to_datetime(times_us[-1]),
+                    history_requirements['limit'],
+                )
+            history = qc_history.before(epoch_us_to_datetime(times_us[0]))
+            series_times, series_values, positions = qc_history.merge(times_us, values)
+        
+        context = build_qc_context({'observation_time': None}, adl_param, station_link)
+        
+        try:
+            pipeline_result = pipeline.run_batch(series_values, series_times, history, context)
+        except Exception as e:
+            log.error(f"Error running QC pipeline for {adl_param.name}: {e}")
+            return qc_bits, qc_status, {}
+        
+        flag_to_bit_mapping = self._get_qc_flag_bits()
+        qc_status[:] = int(QCStatus.PASS)
+        qc_messages = {}
+        
+        for index, position in enumerate(positions.tolist()):
+            if pipeline_result.passed[position]:
+                continue
+            
+            qc_status[index] = int(QCStatus.SUSPECT)
+            summary_message = pipeline_result.get_summary_message(position)
+            messages = []
+            for flag in pipeline_result.get_flags(position):
+                if flag in flag_to_bit_mapping:
+                    qc_bits[index] |= int(flag_to_bit_mapping[flag])
+                    messages.append({
+                        "check_type": flag_to_bit_mapping[flag],
+                        "reason": summary_message,
+                    })
+            if messages:
+                qc_messages[index] = messages
+        
+        log.debug(f"QC results for {size} {adl_param.name} values: "
+                  f"{size - int(np.count_nonzero(qc_status == int(QCStatus.PASS)))} suspect")
+        
+        return qc_bits, qc_status, qc_messages
+    
+    def _perform_chunk_qc(self, station_link, normalized, variable_mappings,
+                          start_time: datetime, end_time: datetime):
+        """
+        Run QC over every value of a normalized chunk, one
+        :meth:`perform_qc_checks_batch` call per parameter, with the history
+        for all of them prefetched by :meth:`_prefetch_chunk_qc_histories`.
+    
+        Returns ``(qc_bits, qc_status, qc_messages)`` aligned with the chunk's
+        rows, ``qc_messages`` keyed by row index.
+        """
+        from adl.core.models import QCStatus
+        
+        size = len(normalized)
+        qc_bits = np.zeros(size, dtype=np.int64)
+        qc_status = np.full(size, int(QCStatus.NOT_EVALUATED), dtype=np.int64)
+        qc_messages = {}
+        
+        qc_histories = self._prefetch_chunk_qc_histories(
+            station_link, normalized, variable_mappings, start_time, end_time
+        )
+        
+        # Rows are sorted by time, so each parameter's rows are too. The
+        # pipeline is cached per parameter, so the first row's mapping
+        # stands for the rest
+        for param_id in np.unique(normalized.parameter_ids).tolist():
+            rows = np.flatnonzero(normalized.parameter_ids == param_id)
+            mapping = variable_mappings[int(normalized.mapping_indices[rows[0]])]
+            
+            param_bits, param_status, param_messages = self.perform_qc_checks_batch(
+                normalized.values[rows],
+                normalized.times_us[rows],
+                variable_mapping=mapping,
+                adl_param=mapping.adl_parameter,
+                station_link=station_link,
+                qc_history=qc_histories.get(param_id),
+            )
+            
+            qc_bits[rows] = param_bits
+            qc_status[rows] = param_status
+            for index, messages in param_messages.items():
+                qc_messages[int(rows[index])] = messages
+        
+        return qc_bits.tolist(), qc_status.tolist(), qc_messages
+    
+    @staticmethod
+    def _get_qc_flag_bits():
+        """Map each :class:`~adl.core.qc.validators.QCFlag` stored on records to its QC bit."""
+        from adl.core.models import QCBits
+        from adl.core.qc.validators import QCFlag
+        
+        return {
+            QCFlag.RANGE: QCBits.RANGE,
+            QCFlag.STEP: QCBits.STEP,
+            QCFlag.PERSISTENCE: QCBits.PERSISTENCE,
+            QCFlag.SPIKE: QCBits.SPIKE,
+        }
+    
+    def _get_qc_pipeline(self, variable_mapping, adl_param):
+        """
+        Return the cached QC pipeline for ``variable_mapping``, or ``None`` when
+        no checks are configured or the pipeline cannot be built.
+    
+        QC checks come from ``variable_mapping.qc_checks`` if present, falling
+        back to ``adl_param.qc_checks``. Pipelines are cached per
+        ``(parameter_id, modified_at)``; older versions of the same parameter's
+        pipeline are evicted when it changes.
+        """
+        from adl.core.qc.config import QCConfigConverter
+        
+        log = self.get_logger()
+        
+        if hasattr(variable_mapping, "qc_checks"):
+            qc_checks = variable_mapping.qc_checks
+        else:
+            qc_checks = adl_param.qc_checks
+        
+        if not qc_checks:
+            return None
+        
+        # Create cache key with parameter version
+        cache_key = f"{adl_param.id}_{adl_param.modified_at.timestamp()}"
+        
+        # Get or create pipeline
+        with self._qc_pipelines_lock:
+            if cache_key not in self._qc_pipelines_cache:
+                old_keys = [k for k in self._qc_pipelines_cache.keys() if k.startswith(f"{adl_param.id}_")]
+                for old_key in old_keys:
+                    del self._qc_pipelines_cache[old_key]
+                
+                try:
+                    pipeline = QCConfigConverter.streamfield_to_pipeline(qc_checks)
+                    self._qc_pipelines_cache[cache_key] = pipeline
+                    log.debug(f"Created QC pipeline for parameter {adl_param.name}")
+                except Exception as e:
+                    log.error(f"Error creating QC pipeline for parameter {adl_param.name}: {e}")
+                    return None
+            
+            return self._qc_pipelines_cache[cache_key]
+    
     def _get_pipeline_history_requirements(self, pipeline) -> Dict[str, Any]:
         """
         Inspect all enabled validators in ``pipeline`` and return the aggregate
@@ -1305,6 +1843,69 @@ class Plugin(Instance):
             log.warning(f"Error getting recent history for QC: {e}")
             return []
 
+    
+    def _prefetch_chunk_qc_histories(self, station_link, normalized, variable_mappings,
+                                     start_time: datetime, end_time: datetime) -> Dict[int, RollingHistory]:
+        """
+        Prefetch a :class:`~adl.core.qc.history.RollingHistory` for every
+        parameter in ``normalized`` whose QC pipeline needs history, keyed by
+        parameter id. When several mappings feed one parameter the largest
+        lookback wins. Parameters without history-dependent checks are left
+        out, so they cost no query at all.
+        """
+        chunk_parameter_ids = set(normalized.parameter_ids.tolist())
+        
+        limits = {}
+        params = {}
+        for mapping in variable_mappings:
+            adl_param = getattr(mapping, "adl_parameter", None)
+            if adl_param is None or adl_param.id not in chunk_parameter_ids:
+                continue
+            
+            pipeline = self._get_qc_pipeline(mapping, adl_param)
+            if pipeline is None:
+                continue
+            
+            requirements = self._get_pipeline_history_requirements(pipeline)
+            if requirements['needed']:
+                limits[adl_param.id] = max(limits.get(adl_param.id, 0), requirements['limit'])
+                params[adl_param.id] = adl_param
+        
+        return {
+            param_id: self._prefetch_qc_history(station_link, params[param_id], start_time, end_time, limit)
+            for param_id, limit in limits.items()
+        }
+    
+    def _prefetch_qc_history(self, station_link, adl_param, start_time: datetime, end_time: datetime,
+                             limit: int) -> RollingHistory:
+        """
+        Load the QC history one chunk needs for ``(station, connection,
+        parameter)`` in a single query: the ``limit`` stored values before
+        ``start_time`` plus every stored value in ``[start_time, end_time]``.
+    
+        :meth:`perform_qc_checks_batch` checks the chunk against the returned
+        :class:`~adl.core.qc.history.RollingHistory` instead of calling
+        :meth:`_get_recent_history_for_qc` once per value. Like that
+        method, a query error yields an empty history rather than aborting QC.
+        """
+        from adl.core.models import ObservationRecord
+        
+        log = self.get_logger()
+        
+        series = ObservationRecord.objects.filter(
+            station=station_link.station,
+            connection=station_link.network_connection,
+            parameter=adl_param,
+        ).values('time', 'value', 'qc_status')
+        
+        try:
+            lookback = series.filter(time__lt=start_time).order_by('-time')[:limit]
+            in_span = series.filter(time__gte=start_time, time__lte=end_time)
+            return RollingHistory(limit, lookback.union(in_span, all=True))
+        except Exception as e:
+            log.warning(f"Error prefetching QC history for {adl_param.name}: {e}")
+            return RollingHistory(limit)
+
 
 class PluginRegistry(Registry):
     """
@@ -0,0 +1,249 @@
+"""
+Retention of raw observation rows, per connection and per parameter.
+
+``NetworkConnection.raw_retention_days`` bounds how long a connection's raw
+:class:`~adl.core.models.ObservationRecord` rows are kept;
+``DataParameter.raw_retention_days``, when set, replaces it for that
+parameter on every connection. ``0`` keeps rows for good. The daily
+:func:`apply_raw_retention` task enforces both:
+
+1. Whole chunks are dropped with ``drop_chunks`` when every row they can
+   hold has expired: only when each connection has a retention, and only
+   below the longest retention configured anywhere. Dropping a chunk writes
+   no WAL per row and leaves nothing to vacuum.
+2. What expires above that line — the edges — goes with set-based
+   ``DELETE`` statements, one connection or parameter at a time and in
+   bounded time windows, so no single transaction grows with the backlog.
+3. QC messages left without their observation are deleted.
+
+The ``obs_agg_1h`` continuous aggregate outlives the raw rows. Dropping
+chunks leaves it untouched, but a ``DELETE`` is recorded as an invalidation,
+and refreshing a range whose raw rows are gone would empty its buckets. So:
+
+- A retention may not be shorter than :data:`RAW_RETENTION_MIN_DAYS`, which
+  is longer than the aggregate's refresh policy window. The policy therefore
+  never re-reads a range once raw rows have gone from it.
+- Each pass refreshes the aggregate over the band that has just become
+  old enough to lose rows, and only that band, before deleting. Ranges from
+  earlier passes are never refreshed again. How far the bands have reached
+  is kept in the cache. If that is lost, the next pass refreshes one day
+  only.
+- Rows loaded below that line would be deleted without the aggregate ever
+  covering them, so a backfill may not reach below it
+  (:func:`backfill_floor`): a job starting earlier is refused, and a slice
+  that ends up below it as the line moves is cut short or skipped. A replay
+  of the raw archive is held to the same line. A
+  backfill above the line, older than the policy window, is materialized by
+  a later band before its rows go.
+
+A manual refresh of the hourly aggregate over expired data would empty
+those buckets: ``refresh_hourly_agg`` refuses to start below
+:func:`aggregate_refresh_floor`, and ``refresh_hourly_agg --rollups-only``
+rebuilds the daily and monthly rollups from the hourly aggregate alone.
+History loaded before retention was first configured should be refreshed
+before turning it on.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.utils import timezone as dj_timezone
+from django.utils.translation import gettext_lazy as _
+
+from .aggregates import TEN_MINUTE_AGGREGATE, aggregate_exists, refresh_rollups
+
+logger = logging.getLogger(__name__)
+
+OBSERVATION_TABLE = "core_observationrecord"
+
+#: The start offset of the ``obs_agg_1h`` refresh policy (migration 0022)
+HOURLY_AGGREGATE_REFRESH_WINDOW_DAYS = 90
+
+#: The shortest retention allowed: past the aggregate's refresh window
+RAW_RETENTION_MIN_DAYS = HOURLY_AGGREGATE_REFRESH_WINDOW_DAYS + 1
+
+#: How much data one edge ``DELETE`` covers
+DELETE_WINDOW = timedelta(days=1)
+
+
+def validate_raw_retention_days(value):
+    if value and value < RAW_RETENTION_MIN_DAYS:
+        raise ValidationError(
+            _("Keep raw data for at least %(days)s days, or 0 to keep it for good: the hourly aggregate is "
+              "still rebuilt from the last %(window)s days."),
+            params={"days": RAW_RETENTION_MIN_DAYS, "window": HOURLY_AGGREGATE_REFRESH_WINDOW_DAYS},
+        )
+
+
+class RetentionPlan:
+    """
+    The cutoffs one retention pass enforces: per connection (for the
+    parameters without their own), per parameter, and the line below which
+    whole chunks may go (``None`` when some connection keeps its data).
+    """
+    __slots__ = ("connection_cutoffs", "parameter_cutoffs", "chunk_cutoff")
+
+    def __init__(self, connection_cutoffs, parameter_cutoffs, chunk_cutoff):
+        self.connection_cutoffs = connection_cutoffs
+        self.parameter_cutoffs = parameter_cutoffs
+        self.chunk_cutoff = chunk_cutoff
+
+    @property
+    def latest_cutoff(self):
+        cutoffs = [*self.connection_cutoffs.values(), *self.parameter_cutoffs.values()]
+        return max(cutoffs) if cutoffs else None
+
+
+def plan_raw_retention(now=None):
+    from .models import DataParameter, NetworkConnection
+
+    now = now or dj_timezone.now()
+    connection_days = dict(NetworkConnection.objects.values_list("id", "raw_retention_days"))
+    parameter_days = dict(
+        DataParameter.objects.filter(raw_retention_days__gt=0).values_list("id", "raw_retention_days")
+    )
+
+    chunk_cutoff = None
+    if connection_days and all(connection_days.values()):
+        chunk_cutoff = now - timedelta(days=max([*connection_days.values(), *parameter_days.values()]))
+
+    return RetentionPlan(
+        {connection_id: now - timedelta(days=days) for connection_id, days in connection_days.items() if days},
+        {parameter_id: now - timedelta(days=days) for parameter_id, days in parameter_days.items()},
+        chunk_cutoff,
+    )
+
+
+REFRESHED_UNTIL_CACHE_KEY = "adl:retention:agg_refreshed_until"
+
+
+def _refresh_expiring_band(cursor, until):
+    """
+    Materialize ``obs_agg_1h`` (and ``obs_agg_10m`` when enabled) between the
+    end of the previous pass's band and ``until``, then the rollups built on
+    it. The watermark only moves forward.
+    """
+    from django.core.cache import cache
+
+    refreshed_until = cache.get(REFRESHED_UNTIL_CACHE_KEY)
+    if refreshed_until is not None and refreshed_until >= until:
+        return
+    start = refreshed_until if refreshed_until is not None else until - timedelta(days=1)
+    # Outside any transaction: refresh_continuous_aggregate refuses to run in one
+    cursor.execute("CALL refresh_continuous_aggregate('obs_agg_1h', %s, %s)", [start, until])
+    if aggregate_exists(cursor, TEN_MINUTE_AGGREGATE):
+        cursor.execute("CALL refresh_continuous_aggregate(%s::regclass, %s, %s)",
+                       [TEN_MINUTE_AGGREGATE, start, until])
+    refresh_rollups(cursor, start, until)
+    cache.set(REFRESHED_UNTIL_CACHE_KEY, until, timeout=None)
+
+
+def aggregate_refresh_floor(now=None):
+    """
+    How far the expiring bands have refreshed the aggregate, or ``None`` when
+    no retention is configured. Below it raw rows may be gone, so
+    ``obs_agg_1h`` must not be refreshed there; the rollups built on it still
+    can be.
+    """
+    from django.core.cache import cache
+
+    refreshed_until = cache.get(REFRESHED_UNTIL_CACHE_KEY)
+    latest_cutoff = plan_raw_retention(now).latest_cutoff
+    if latest_cutoff is None:
+        return None
+    return refreshed_until if refreshed_until is not None else latest_cutoff
+
+
+def backfill_floor(network_connection, now=None):
+    """
+    The oldest time a backfill of ``network_connection`` may load, or
+    ``None`` when none of its rows ever expire.
+
+    That is the :func:`aggregate_refresh_floor`: rows loaded at or above it
+    are materialized by a later band before they go, rows below it never
+    would be. A parameter's own retention reaches every connection, so one
+    is enough for the floor to apply.
+    """
+    from .models import DataParameter
+
+    if not network_connection.raw_retention_days and \
+            not DataParameter.objects.filter(raw_retention_days__gt=0).exists():
+        return None
+    return aggregate_refresh_floor(now)
+
+
+def validate_backfill_start(network_connection, start_date):
+    floor = backfill_floor(network_connection)
+    if floor is not None and start_date < floor:
+        raise ValidationError(
+            _("Backfill from %(floor)s or later: older raw data expires before the hourly aggregate can "
+              "cover it."),
+            params={"floor": floor.strftime("%Y-%m-%d %H:%M")},
+        )
+
+
+def _delete_in_windows(cursor, predicate, params, cutoff):
+    deleted = 0
+    while True:
+        cursor.execute(f"SELECT min(time) FROM {OBSERVATION_TABLE} WHERE {predicate} AND time < %s",
+                       [*params, cutoff])
+        oldest = cursor.fetchone()[0]
+        if oldest is None:
+            return deleted
+        cursor.execute(
+            f"DELETE FROM {OBSERVATION_TABLE} WHERE {predicate} AND time >= %s AND time < %s",
+            [*params, oldest, min(oldest + DELETE_WINDOW, cutoff)],
+        )
+        deleted += cursor.rowcount
+
+
+def apply_raw_retention(now=None):
+    """
+    Enforce the configured retentions once. Returns ``(chunks dropped, rows
+    deleted, QC messages deleted)``.
+    """
+    plan = plan_raw_retention(now)
+    latest_cutoff = plan.latest_cutoff
+    if latest_cutoff is None or connection.vendor != "postgresql":
+        return 0, 0, 0
+
+    with connection.cursor() as cursor:
+        _refresh_expiring_band(cursor, latest_cutoff)
+
+        chunks_dropped = 0
+        if plan.chunk_cutoff is not None:
+            cursor.execute("SELECT count(*) FROM drop_chunks(%s::regclass, older_than => %s)",
+                           [OBSERVATION_TABLE, plan.chunk_cutoff])
+            chunks_dropped = cursor.fetchone()[0]
+
+        overridden = list(plan.parameter_cutoffs)
+        rows_deleted = 0
+        for connection_id, cutoff in plan.connection_cutoffs.items():
+            if overridden:
+                rows_deleted += _delete_in_windows(
+                    cursor, "connection_id = %s AND NOT (parameter_id = ANY(%s))", [connection_id, overridden],
+                    cutoff,
+                )
+            else:
+                rows_deleted += _delete_in_windows(cursor, "connection_id = %s", [connection_id], cutoff)
+        for parameter_id, cutoff in plan.parameter_cutoffs.items():
+            rows_deleted += _delete_in_windows(cursor, "parameter_id = %s", [parameter_id], cutoff)
+
+        cursor.execute(
+            f"""
+            DELETE FROM core_qcmessage q
+            WHERE q.obs_time < %s
+              AND NOT EXISTS (
+                SELECT 1 FROM {OBSERVATION_TABLE} o
+                WHERE o.time = q.obs_time AND o.station_id = q.station_id AND o.parameter_id = q.parameter_id
+              )
+            """,
+            [latest_cutoff],
+        )
+        qc_messages_deleted = cursor.rowcount
+
+    logger.info("[RETENTION] Dropped %d chunks, deleted %d rows and %d QC messages",
+                chunks_dropped, rows_deleted, qc_messages_deleted)
+    return chunks_dropped, rows_deleted, qc_messages_deleted
@@ -1,24 +1,29 @@
 import json
 import logging
+import math
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import timedelta
 
 from celery import shared_task
 from celery.exceptions import SoftTimeLimitExceeded
 from celery.schedules import crontab
 from celery_singleton import Singleton
 from django.core.cache import cache
+from django.db import connection, connections as db_connections
 from django_celery_beat.models import IntervalSchedule, PeriodicTask
-from more_itertools import chunked
 
 from django.utils import timezone as dj_timezone
 
 from adl.config.celery import app
 from adl.monitoring.models import StationLinkActivityLog
+from .batching import plan_ingest_batches
 from .broker_connection import bounded_broker_connection, bounded_inspect
 from .classification import mark_failed, stamp_failure
 from .dispatchers import get_station_dispatch_records
+from .fairness import BatchTicket, admit_batches, record_batch_wait, release_batch_slot
+from . import metrics
 from .logging import TaskLogger
 from .redaction import redact_secrets
 from .utils import get_object_or_none
@@ -32,6 +37,10 @@ DISPATCH_QUEUE_NAME = "dispatch"
 # The queue the ingestion coordinator and its batches run on
 INGESTION_QUEUE_NAME = "adl"
 
+# Historical backfill slices run on their own queue/worker, so a backfill can
+# never hold up scheduled ingestion. See adl.core.backfill
+BACKFILL_QUEUE_NAME = "backfill"
+
 # The registered name of the ingestion coordinator task. Beat schedule entries
 # for a connection are resolved by this plus their args — see
 # find_connection_schedule_entries
@@ -58,6 +67,10 @@ DISPATCH_LOCK_TTL_MARGIN_SECONDS = 60
 INGEST_TIME_LIMIT_GRACE_SECONDS = 30
 INGEST_LOCK_TTL_MARGIN_SECONDS = 60
 
+# How much longer than its estimated duration a batch is allowed to run
+# before its soft limit, when the estimate exceeds the per-station budget
+BATCH_COST_HEADROOM = 2
+
 # Stations per ingestion batch when the connection does not say. Mirrors the
 # model field's own default, for the rows where 0 was saved
 DEFAULT_INGEST_BATCH_SIZE = 10
@@ -96,16 +109,29 @@ def effective_ingest_batch_size(network_connection):
     return network_connection.batch_size or DEFAULT_INGEST_BATCH_SIZE
 
 
-def ingest_batch_soft_limit_seconds(network_connection, station_count):
+def ingest_batch_soft_limit_seconds(network_connection, station_count, expected_seconds=None):
     """
     Soft time limit for one batch of ``station_count`` stations: the per-station
     budget multiplied out, then clamped to the connection's own beat interval so
     a batch can never outlive its own tick and overlap the next coordinator run.
+
+    ``expected_seconds`` is the batch's estimated duration from recent runs
+    (see :mod:`adl.core.batching`). A batch expected to need more than its
+    per-station share, with :data:`BATCH_COST_HEADROOM` to spare, is given
+    that much — but never more than a full batch's limit, which is what
+    :func:`ingest_batch_budget_seconds` sizes the station locks for.
     """
-    return min(
+    limit = min(
         station_count * network_connection.ingest_timeout_seconds,
         network_connection.plugin_processing_interval * 60,
     )
+    if expected_seconds:
+        full_batch_limit = min(
+            effective_ingest_batch_size(network_connection) * network_connection.ingest_timeout_seconds,
+            network_connection.plugin_processing_interval * 60,
+        )
+        limit = max(limit, min(full_batch_limit, math.ceil(expected_seconds * BATCH_COST_HEADROOM)))
+    return limit
 
 
 def ingest_batch_budget_seconds(network_connection):
@@ -220,6 +246,16 @@ def setup_periodic_tasks(sender, **kwargs):
         sweep_stale_activity_logs.s(),
         name="sweep-stale-activity-logs-every-5-minutes",
     )
+    sender.add_periodic_task(
+        300.0,
+        resume_backfill_jobs.s(),
+        name="resume-backfill-jobs-every-5-minutes",
+    )
+    sender.add_periodic_task(
+        crontab(hour=1, minute=30),
+        apply_raw_retention.s(),
+        name="apply-raw-retention-daily",
+    )
 
 
 def stamp_connection_heartbeat(network_connection, station_links_enabled, batches_spawned, task_id,
@@ -312,28 +348,24 @@ def run_network_plugin(self, network_id, manual=False):
     log.info("Found %d enabled station links. Batch size: %d",
              len(station_link_ids), batch_size)
     
-    batch_count = 0
-    spawned_tasks = []
+    tickets = []
+    for batch in plan_ingest_batches(station_link_ids, batch_size):
+        log.info("Planned batch %d with %d station links (expected %.0fs): %s",
+                 len(tickets) + 1, len(batch.station_link_ids), batch.expected_seconds, batch.station_link_ids)
+        soft_time_limit = ingest_batch_soft_limit_seconds(network_connection, len(batch.station_link_ids),
+                                                          expected_seconds=batch.expected_seconds)
+        tickets.append(BatchTicket(batch.station_link_ids, soft_time_limit))
+
+    batch_count = len(tickets)
+    admitted = admit_batches(network_connection, tickets)
+    if len(admitted) < batch_count:
+        log.info("Holding %d of %d batches until the connection's %d in-flight slots free up",
+                 batch_count - len(admitted), batch_count, network_connection.max_inflight_batches)
+
+    spawned_tasks = [_send_station_link_batch(network_id, ticket).id for ticket in admitted]
 
-    for batch in chunked(station_link_ids, batch_size):
-        batch_count += 1
-        batch_list = list(batch)
-
-        log.info("Spawning batch %d with %d station links: %s",
-                 batch_count, len(batch_list), batch_list)
-
-        soft_time_limit = ingest_batch_soft_limit_seconds(network_connection, len(batch_list))
-        task = process_station_link_batch.apply_async(
-            args=[network_id, batch_list],
-            queue=INGESTION_QUEUE_NAME,
-            soft_time_limit=soft_time_limit,
-            time_limit=soft_time_limit + INGEST_TIME_LIMIT_GRACE_SECONDS,
-        )
-
-        spawned_tasks.append(task.id)
-    
     log.success("Successfully spawned %d batch tasks for connection %s",
-                batch_count, network_connection.name)
+                len(spawned_tasks), network_connection.name)
 
     stamp_connection_heartbeat(
         network_connection,
@@ -353,11 +385,27 @@ def run_network_plugin(self, network_id, manual=False):
     }
 
 
+def _send_station_link_batch(network_id, ticket):
+    return process_station_link_batch.apply_async(
+        args=[network_id, ticket.station_link_ids],
+        kwargs={"slot_token": ticket.token, "queued_at": ticket.queued_at},
+        queue=INGESTION_QUEUE_NAME,
+        soft_time_limit=ticket.soft_time_limit,
+        time_limit=ticket.soft_time_limit + INGEST_TIME_LIMIT_GRACE_SECONDS,
+    )
+
+
 @shared_task(bind=True, name=INGESTION_BATCH_TASK_NAME)
-def process_station_link_batch(self, network_id, station_link_ids):
-    from adl.core.registries import plugin_registry
+def process_station_link_batch(self, network_id, station_link_ids, slot_token=None, queued_at=None):
+    """
+    Ingest one batch of a connection's station links.
+
+    ``slot_token`` is the in-flight slot the batch holds when its connection
+    caps batches in flight (see :mod:`adl.core.fairness`); it is given back,
+    and the next held batch sent, however the batch ends. ``queued_at`` is
+    when the coordinator planned the batch, for the queue-wait figures.
+    """
     from .models import NetworkConnection
-    from .models import StationLink
     
     # Create task logger for this batch task
     task_id = self.request.id
@@ -374,7 +422,21 @@ def process_station_link_batch(self, network_id, station_link_ids):
     if not network_connection:
         log.error("Network Connection with id %d does not exist. Skipping...", network_id)
         return
-    
+
+    if queued_at is not None:
+        record_batch_wait(network_connection, max(0.0, time.time() - queued_at))
+
+    try:
+        return _run_station_link_batch(network_connection, station_link_ids, task_id, log)
+    finally:
+        for ticket in release_batch_slot(network_connection, slot_token):
+            _send_station_link_batch(network_id, ticket)
+
+
+def _run_station_link_batch(network_connection, station_link_ids, task_id, log):
+    from adl.core.registries import plugin_registry
+
+    network_id = network_connection.id
     network_plugin_type = network_connection.plugin
     plugin = plugin_registry.get(network_plugin_type)
     
@@ -384,49 +446,27 @@ def process_station_link_batch(self, network_id, station_link_ids):
     log.info("Using plugin: %s for network connection: %s",
              plugin.label, network_connection.name)
     
-    total_processed = 0
-    total_records = 0
-    errors = 0
-
-    for station_link_id in station_link_ids:
-        station_link = get_object_or_none(StationLink, id=station_link_id)
-
-        if not station_link:
-            log.error("Station link with id %d does not exist. Skipping...", station_link_id)
-            continue
-
-        start = time.monotonic()
-        log.info("Processing station link: %s (ID: %d)", station_link, station_link_id)
-
-        try:
-            # Per-station locking (and the SKIPPED trace on collision) lives
-            # inside process_station, beside the activity log
-            saved_records_count = plugin.process_station(station_link)
-
-            if saved_records_count > 0:
-                log.success("Processed %d records for station link %s",
-                            saved_records_count, station_link)
-                total_records += saved_records_count
-            else:
-                log.info("No new records for station link %s", station_link)
-            total_processed += 1
-        except SoftTimeLimitExceeded:
-            # Swallowed here, the batch soft limit would be decorative: the
-            # loop would roll on until the hard limit SIGKILLs the worker
-            log.error("Batch soft time limit exceeded while processing station link %s",
-                      station_link)
-            raise
-        except Exception as e:
-            # The interpolated text is redacted, the traceback deliberately is
-            # not: this line goes only to the worker's own log, where the
-            # traceback is the reason to keep the entry at all. The redaction
-            # is what keeps a shipped-off log line from carrying the token.
-            log.error("Error processing station link %s: %s", station_link, redact_secrets(e), exc_info=True)
-            errors += 1
-
-        finally:
-            duration_ms = (time.monotonic() - start) * 1000
-            log.info("Station link %s completed in %.2fms", station_link, duration_ms)
+    station_links = load_station_link_bundle(station_link_ids, network_connection)
+    latest_saved_times = resolve_batch_latest_saved_times(plugin, station_link_ids)
+    batch_kwargs = {"station_links": station_links, "latest_saved_times": latest_saved_times}
+
+    concurrency = effective_max_concurrent_stations(network_connection, len(station_link_ids))
+    if plugin.has_async_source:
+        from .async_ingestion import run_async_station_batch
+        log.info("Fetching %d station links on one event loop, saving up to %d at a time",
+                 len(station_link_ids), concurrency)
+        outcomes = run_async_station_batch(plugin, station_link_ids, task_id, concurrency, log, **batch_kwargs)
+    elif concurrency > 1:
+        log.info("Processing up to %d station links concurrently", concurrency)
+        outcomes = _process_stations_concurrently(plugin, station_link_ids, task_id, concurrency, log,
+                                                  **batch_kwargs)
+    else:
+        outcomes = [_process_batch_station(plugin, station_link_id, log, **batch_kwargs)
+                    for station_link_id in station_link_ids]
+
+    total_processed = sum(1 for outcome in outcomes if outcome.processed)
+    total_records = sum(outcome.records for outcome in outcomes)
+    errors = sum(1 for outcome in outcomes if outcome.error)
 
     # Summary
     log.success(
@@ -444,6 +484,257 @@ def process_station_link_batch(self, network_id, station_link_ids):
     }
 
 
+def effective_max_concurrent_stations(network_connection, station_count):
+    """
+    How many stations of a ``station_count``-station batch run at once.
+
+    Never more than the batch holds, and never less than one: 0 and ``None``
+    mean "unset", as they do for :func:`effective_ingest_batch_size`.
+    """
+    configured = getattr(network_connection, "max_concurrent_stations", None) or 1
+    return max(1, min(configured, station_count))
+
+
+@dataclass(frozen=True)
+class BatchStationOutcome:
+    """What one station contributed to its batch's summary."""
+    processed: bool = False
+    records: int = 0
+    error: bool = False
+
+
+def _variable_mapping_prefetches(station_link_model):
+    """
+    Prefetch lookups for the variable mappings of one ``StationLink``
+    subclass, each with its parameter, the parameter's unit and its source
+    unit joined in.
+
+    Mappings are plugin models, so they are found by shape rather than by
+    name: every one-to-many relation into the link whose model has an
+    ``adl_parameter`` foreign key — the attribute
+    :meth:`~adl.core.registries.Plugin.save_records` reads.
+    """
+    from django.core.exceptions import FieldDoesNotExist
+    from django.db.models import Prefetch
+    from .models import DataParameter, Unit
+
+    prefetches = []
+    for relation in station_link_model._meta.related_objects:
+        if not relation.one_to_many:
+            continue
+        mapping_model = relation.related_model
+        try:
+            mapping_model._meta.get_field("adl_parameter")
+        except FieldDoesNotExist:
+            continue
+
+        joins = []
+        for field in mapping_model._meta.concrete_fields:
+            if not field.many_to_one or field is relation.field:
+                continue
+            if field.related_model is DataParameter:
+                joins.append(f"{field.name}__unit")
+            elif field.related_model is Unit:
+                joins.append(field.name)
+
+        prefetches.append(Prefetch(
+            relation.get_accessor_name(),
+            queryset=mapping_model._default_manager.select_related(*joins),
+        ))
+    return prefetches
+
+
+def load_station_link_bundle(station_link_ids, network_connection=None):
+    """
+    Every station link of a batch as its concrete subclass, keyed by id, with
+    what ingesting it reads already loaded: the station, the connection, and
+    the variable mappings with their parameters and units.
+
+    Loaded one station at a time, each of those is a lazy query of its own —
+    per station, and per mapping for the parameter and its unit. Here the cost
+    is one query for the links, one per ``StationLink`` subclass present (to
+    load the concrete rows) and one per subclass and mapping relation,
+    however many stations the batch holds.
+    :meth:`~adl.core.registries.Plugin.process_station` and the QC context
+    read the cached relations, and a plugin whose ``get_variable_mappings``
+    returns ``self.<relation>.all()`` gets the prefetched rows.
+
+    ``network_connection`` is the batch's (concrete) connection; links that
+    belong to it share the instance rather than load their own.
+    """
+    from collections import defaultdict
+    from django.db.models import prefetch_related_objects
+    from .models import StationLink
+
+    station_links = list(StationLink.objects.filter(id__in=station_link_ids).select_related("station"))
+
+    by_model = defaultdict(list)
+    for station_link in station_links:
+        by_model[type(station_link)].append(station_link)
+        if network_connection is not None and station_link.network_connection_id == network_connection.id:
+            station_link.network_connection = network_connection
+
+    for station_link_model, links in by_model.items():
+        prefetches = _variable_mapping_prefetches(station_link_model)
+        if prefetches:
+            prefetch_related_objects(links, *prefetches)
+
+    return {station_link.id: station_link for station_link in station_links}
+
+
+def resolve_batch_latest_saved_times(plugin, station_link_ids):
+    """
+    The latest saved observation time of every station link in a batch, in
+    one query (see :meth:`~adl.core.registries.Plugin.get_latest_saved_times`).
+
+    Empty when the plugin overrides ``get_start_date_from_db``: each station
+    then resolves its own start date through the override, as before.
+    """
+    from .models import StationLink
+
+    if not plugin.resolves_latest_saved_time_in_batch:
+        return {}
+
+    station_links = StationLink.objects.non_polymorphic().filter(
+        id__in=station_link_ids
+    ).only("id", "station_id", "network_connection_id")
+    return plugin.get_latest_saved_times(station_links)
+
+
+def _process_batch_station(plugin, station_link_id, log, station_links=None, latest_saved_times=None,
+                           **process_kwargs):
+    """
+    Run one station of a batch and fold its result into a
+    :class:`BatchStationOutcome`. ``process_kwargs`` are passed on to
+    :meth:`~adl.core.registries.Plugin.process_station`, together with the
+    station's entry of ``latest_saved_times`` when there is one. The station
+    link is taken from ``station_links`` (see :func:`load_station_link_bundle`)
+    when given, and loaded on its own otherwise.
+
+    Everything except :exc:`SoftTimeLimitExceeded` is caught and counted, so
+    one failing station never stops its siblings. The soft limit propagates:
+    swallowed here, the batch soft limit would be decorative — the batch would
+    roll on until the hard limit SIGKILLs the worker.
+    """
+    from .models import StationLink
+
+    if station_links is not None:
+        station_link = station_links.get(station_link_id)
+    else:
+        station_link = get_object_or_none(StationLink, id=station_link_id)
+
+    if not station_link:
+        log.error("Station link with id %d does not exist. Skipping...", station_link_id)
+        return BatchStationOutcome()
+
+    if latest_saved_times and station_link_id in latest_saved_times:
+        process_kwargs["latest_saved_time"] = latest_saved_times[station_link_id]
+
+    start = time.monotonic()
+    log.info("Processing station link: %s (ID: %d)", station_link, station_link_id)
+
+    try:
+        # Per-station locking (and the SKIPPED trace on collision) lives
+        # inside process_station, beside the activity log
+        saved_records_count = plugin.process_station(station_link, **process_kwargs)
+
+        if saved_records_count > 0:
+            log.success("Processed %d records for station link %s",
+                        saved_records_count, station_link)
+        else:
+            log.info("No new records for station link %s", station_link)
+        return BatchStationOutcome(processed=True, records=saved_records_count)
+    except SoftTimeLimitExceeded:
+        log.error("Batch soft time limit exceeded while processing station link %s",
+                  station_link)
+        raise
+    except Exception as e:
+        # The interpolated text is redacted, the traceback deliberately is
+        # not: this line goes only to the worker's own log, where the
+        # traceback is the reason to keep the entry at all. The redaction
+        # is what keeps a shipped-off log line from carrying the token.
+        log.error("Error processing station link %s: %s", station_link, redact_secrets(e), exc_info=True)
+        return BatchStationOutcome(error=True)
+    finally:
+        duration_ms = (time.monotonic() - start) * 1000
+        log.info("Station link %s completed in %.2fms", station_link, duration_ms)
+
+
+class _StationThreads:
+    """
+    The cut-off shared by the pool threads of one concurrent batch.
+
+    Celery delivers the soft time limit as a signal, and signals only ever
+    reach the main thread. To give every in-flight station the same cut-off a
+    serial batch gives its one current station — buffered chunk saved,
+    activity log finalised as timed out, lock released — each thread runs its
+    station under :func:`~adl.core.registries.station_cancellation` and stops
+    itself once :attr:`cancelled` is set. The check is made between records,
+    so a thread blocked in a socket read of a synchronous source is cut off
+    once the read returns or times out.
+    """
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+
+def _process_station_in_thread(plugin, station_link_id, task_id, threads, **process_kwargs):
+    # Each pool thread logs through TaskLoggers of its own, its plugin's
+    # included, and gets its own Django database connection, which is closed
+    # again before the thread goes back to the pool so an idle worker never
+    # holds one open
+    from .registries import station_cancellation
+
+    if threads.cancelled.is_set():
+        return BatchStationOutcome()
+
+    log = TaskLogger(task_id=task_id, plugin_label="BatchProcessor")
+    try:
+        with plugin.thread_task_context(task_id), station_cancellation(threads.cancelled):
+            return _process_batch_station(plugin, station_link_id, log, **process_kwargs)
+    finally:
+        db_connections.close_all()
+
+
+def _process_stations_concurrently(plugin, station_link_ids, task_id, concurrency, log, **process_kwargs):
+    """
+    Run a batch's stations on a pool of ``concurrency`` threads.
+
+    Each station still goes through :meth:`~adl.core.registries.Plugin.process_station`,
+    so its lock and activity log behave exactly as in a serial batch. On the
+    batch soft limit the batch is cut off (see :func:`_cut_off_stations`) and
+    the limit is re-raised.
+    """
+    threads = _StationThreads()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="adl-station")
+    futures = [
+        executor.submit(_process_station_in_thread, plugin, station_link_id, task_id, threads, **process_kwargs)
+        for station_link_id in station_link_ids
+    ]
+
+    try:
+        outcomes = [future.result() for future in futures]
+        executor.shutdown(wait=True)
+        return outcomes
+    except SoftTimeLimitExceeded:
+        _cut_off_stations(threads, executor, futures, log)
+        raise
+
+
+def _cut_off_stations(threads, executor, futures, log):
+    """
+    Stop a concurrent batch at its soft limit: cancel the stations not yet
+    started, tell the ones in flight to stop (see :class:`_StationThreads`)
+    and wait for them to finalise their activity logs, so that no station
+    thread is still writing when the caller re-raises.
+    """
+    threads.cancelled.set()
+    in_flight = sum(1 for future in futures if future.running())
+    log.error("Batch soft time limit exceeded with %d station links in flight", in_flight)
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
 @app.on_after_finalize.connect
 def setup_network_plugin_processing_tasks(sender, **kwargs):
     from .models import NetworkConnection
@@ -700,6 +991,7 @@ def dispatch_station(self, channel_id, station_link_id):
     if not cache.add(lock_key, "locked", timeout=lock_ttl):
         logger.warning("[DISPATCH] Station %s on channel %s still dispatching. Skipping...",
                        station_link, channel.name)
+        metrics.inc("adl_lock_collisions_total", direction="push", name=channel.name)
         StationLinkActivityLog.objects.create(
             time=dj_timezone.now(),
             station_link=station_link,
@@ -729,7 +1021,10 @@ def dispatch_station(self, channel_id, station_link_id):
             log.status = StationLinkActivityLog.ActivityStatus.COMPLETED
             return {"records_sent": 0}
 
+        upload_started = time.monotonic()
         num_sent, last_sent_obs_time = channel.send_station_data(station_link, data_records)
+        metrics.observe("adl_dispatch_upload_seconds", time.monotonic() - upload_started, channel=channel.name)
+        metrics.inc("adl_dispatch_records_sent_total", num_sent, channel=channel.name)
 
         previous_sent_obs_time = None
         if num_sent > 0 and last_sent_obs_time:
@@ -796,41 +1091,61 @@ def sweep_stale_activity_logs():
     The pull side uses the batch bound rather than ``ingest_timeout_seconds``
     (see :func:`ingest_batch_budget_seconds`): a station is allowed to run for
     the whole batch budget, and sweeping at the per-station number would declare
-    live runs dead — the inverse of this task's purpose.
+    live runs dead — the inverse of this task's purpose. For the same reason
+    the pull of a backfill slice is held to the slice's own budget instead
+    (see :func:`~adl.core.backfill.backfill_slice_budget_seconds`).
     """
-    from .models import DispatchChannel  # noqa: F401  (FK target must be loaded)
+    from .backfill import backfill_slice_budget_seconds
+    from .models import DispatchChannel, NetworkConnection, StationLink
 
     now = dj_timezone.now()
-    swept = 0
-
-    push_candidates = StationLinkActivityLog.objects.filter(
-        direction="push",
-        status=StationLinkActivityLog.ActivityStatus.STARTED,
-        dispatch_channel__isnull=False,
-    ).select_related("dispatch_channel")
-
-    pull_candidates = StationLinkActivityLog.objects.filter(
-        direction="pull",
-        status=StationLinkActivityLog.ActivityStatus.STARTED,
-    ).select_related("station_link__network_connection")
-
+    log_table = StationLinkActivityLog._meta.db_table
+    started = StationLinkActivityLog.ActivityStatus.STARTED.value
+    failed = StationLinkActivityLog.ActivityStatus.FAILED.value
+
+    # One UPDATE per side, backfill slices apart, each row's threshold
+    # computed in SQL. The first two budget expressions are
+    # dispatch_timeout_budget_seconds and ingest_batch_budget_seconds spelled
+    # out; change them together.
     sides = (
-        (push_candidates,
-         lambda log: dispatch_timeout_budget_seconds(log.dispatch_channel),
+        (f"""
+         FROM {DispatchChannel._meta.db_table} c
+         WHERE l.dispatch_channel_id = c.id AND l.direction = 'push'
+           AND l.time < %s - make_interval(secs => c.dispatch_timeout_seconds + %s)
+         """,
+         [DISPATCH_TIME_LIMIT_GRACE_SECONDS + DISPATCH_LOCK_TTL_MARGIN_SECONDS],
          "Dispatch worker died mid-dispatch (no completion recorded)"),
-        (pull_candidates,
-         lambda log: ingest_batch_budget_seconds(log.station_link.network_connection),
+        (f"""
+         FROM {StationLink._meta.db_table} s
+         JOIN {NetworkConnection._meta.db_table} n ON n.id = s.network_connection_id
+         WHERE l.station_link_id = s.id AND l.direction = 'pull' AND l.is_backfill IS NOT TRUE
+           AND l.time < %s - make_interval(secs => LEAST(
+               COALESCE(NULLIF(n.batch_size, 0), %s) * n.ingest_timeout_seconds,
+               n.plugin_processing_interval * 60
+           ) + %s)
+         """,
+         [DEFAULT_INGEST_BATCH_SIZE, INGEST_TIME_LIMIT_GRACE_SECONDS + INGEST_LOCK_TTL_MARGIN_SECONDS],
          "Ingestion worker died mid-run (no completion recorded)"),
+        ("""
+         WHERE l.direction = 'pull' AND l.is_backfill
+           AND l.time < %s - make_interval(secs => %s)
+         """,
+         [backfill_slice_budget_seconds()],
+         "Backfill worker died mid-slice (no completion recorded)"),
     )
 
-    for candidates, threshold_seconds, message in sides:
-        for log in candidates:
-            if log.time < now - timedelta(seconds=threshold_seconds(log)):
-                log.status = StationLinkActivityLog.ActivityStatus.FAILED
-                log.success = False
-                log.message = message
-                log.save(update_fields=["status", "success", "message"])
-                swept += 1
+    swept = 0
+    with connection.cursor() as cursor:
+        for join_and_threshold, budget_params, message in sides:
+            cursor.execute(
+                f"""
+                UPDATE {log_table} l SET status = %s, success = false, message = %s
+                {join_and_threshold}
+                  AND l.status = %s
+                """,
+                [failed, message, now, *budget_params, started],
+            )
+            swept += cursor.rowcount
 
     if swept:
         logger.warning("[SWEEP] Swept %d stale activity log(s) to FAILED", swept)
@@ -846,6 +1161,63 @@ def sweep_stale_activity_logs():
     return swept
 
 
+@shared_task(bind=True, name="adl.core.tasks.run_backfill_slice")
+def run_backfill_slice(self, slice_id, claim_token=None):
+    """
+    Fetch one :class:`~adl.core.models.BackfillSlice`, then queue the job's
+    next slices. Queued only by :func:`adl.core.backfill.fill_backfill_job`,
+    which has already marked the slice RUNNING under ``claim_token``.
+
+    The slice is started by stamping ``started_at`` under that token, in one
+    update. A task whose claim has since been given back and claimed again
+    — or that is delivered a second time — matches nothing and exits, so a
+    slice never runs twice at once.
+    """
+    from .backfill import fill_backfill_job, run_slice
+    from .models import BackfillSlice
+
+    started = BackfillSlice.objects.filter(
+        id=slice_id, status=BackfillSlice.Status.RUNNING, claim_token=claim_token, started_at__isnull=True,
+    ).update(started_at=dj_timezone.now())
+    if not started:
+        # Requeued, claimed again or its job deleted while this task waited
+        return None
+
+    backfill_slice = BackfillSlice.objects.get(id=slice_id)
+    run_slice(backfill_slice, task_id=self.request.id)
+    fill_backfill_job(backfill_slice.job_id)
+    return {"slice_id": slice_id, "status": backfill_slice.status, "records": backfill_slice.records_count}
+
+
+@shared_task(name="adl.core.tasks.resume_backfill_jobs")
+def resume_backfill_jobs():
+    """
+    Fill every active backfill job. A job normally fills itself as its
+    slices finish; this picks up the ones whose in-flight slices all died
+    with their worker, once those slices have gone stale.
+    """
+    from .backfill import fill_backfill_job
+    from .models import BackfillJob
+
+    active = BackfillJob.objects.filter(
+        status__in=[BackfillJob.Status.PENDING, BackfillJob.Status.RUNNING]
+    ).values_list("id", flat=True)
+    for job_id in active:
+        fill_backfill_job(job_id)
+
+
+@app.task(base=Singleton)
+def apply_raw_retention():
+    """
+    Delete raw observations older than their connection's or parameter's
+    retention. A singleton: two passes at once would both refresh and delete
+    the same band. See :mod:`adl.core.retention`.
+    """
+    from .retention import apply_raw_retention as apply
+
+    apply()
+
+
 def create_or_update_dispatch_channel_periodic_tasks(dispatch_channel):
     _write_periodic_task(
         DISPATCH_TASK_NAME,
@@ -4,7 +4,8 @@ from django.conf import settings
 from django.test import TestCase
 from django.utils import timezone as dj_tz
 
-from adl.core.tasks import sweep_stale_activity_logs
+from adl.core.backfill import backfill_slice_budget_seconds
+from adl.core.tasks import ingest_batch_budget_seconds, sweep_stale_activity_logs
 from adl.monitoring.models import StationLinkActivityLog
 from .factories import NetworkConnectionFactory, StationLinkFactory, Wis2BoxUploadFactory
 
@@ -17,13 +18,14 @@ class ActivityLogSweepTestCase(TestCase):
 
     def _make_log(self, direction, age_seconds,
                   status=StationLinkActivityLog.ActivityStatus.STARTED,
-                  link=None, channel=None):
+                  link=None, channel=None, is_backfill=None):
         return StationLinkActivityLog.objects.create(
             time=dj_tz.now() - timedelta(seconds=age_seconds),
             station_link=link or self.link,
             direction=direction,
             dispatch_channel=(channel or self.channel) if direction == "push" else None,
             status=status,
+            is_backfill=is_backfill,
         )
 
 
@@ -136,6 +138,23 @@ class SweepThresholdTests(ActivityLogSweepTestCase):
         self.assertEqual(stale_for_short.status, StationLinkActivityLog.ActivityStatus.FAILED)
         self.assertEqual(fresh_for_long.status, StationLinkActivityLog.ActivityStatus.STARTED)
 
+    def test_pull_threshold_matches_the_python_budget(self):
+        # batch_size 0 means the default batch, in SQL as in Python
+        network_connection = NetworkConnectionFactory(
+            ingest_timeout_seconds=60, batch_size=0, plugin_processing_interval=30)
+        link = StationLinkFactory(network_connection=network_connection)
+        budget = ingest_batch_budget_seconds(network_connection)
+        inside = self._make_log("pull", age_seconds=budget - 30, link=link)
+        past = self._make_log("pull", age_seconds=budget + 30, link=link)
+
+        swept = sweep_stale_activity_logs()
+
+        self.assertEqual(swept, 1)
+        inside.refresh_from_db()
+        past.refresh_from_db()
+        self.assertEqual(inside.status, StationLinkActivityLog.ActivityStatus.STARTED)
+        self.assertEqual(past.status, StationLinkActivityLog.ActivityStatus.FAILED)
+
     def test_pull_row_past_the_per_station_budget_is_left_running(self):
         # Regression for #209: a station may legitimately occupy the whole
         # batch budget, so a row older than the per-station number but inside
@@ -154,6 +173,23 @@ class SweepThresholdTests(ActivityLogSweepTestCase):
         self.assertEqual(live.status, StationLinkActivityLog.ActivityStatus.STARTED)
         self.assertIsNone(live.message)
 
+    def test_backfill_pull_is_held_to_the_slice_budget(self):
+        # A slice may run far past the connection's batch bound (990s here)
+        link = StationLinkFactory(
+            network_connection=NetworkConnectionFactory(
+                ingest_timeout_seconds=300, batch_size=10, plugin_processing_interval=15))
+        budget = backfill_slice_budget_seconds()
+        inside = self._make_log("pull", age_seconds=budget - 30, link=link, is_backfill=True)
+        past = self._make_log("pull", age_seconds=budget + 30, link=link, is_backfill=True)
+
+        swept = sweep_stale_activity_logs()
+
+        self.assertEqual(swept, 1)
+        inside.refresh_from_db()
+        past.refresh_from_db()
+        self.assertEqual(inside.status, StationLinkActivityLog.ActivityStatus.STARTED)
+        self.assertEqual(past.status, StationLinkActivityLog.ActivityStatus.FAILED)
+
 
 class SweepQueueRoutingTests(TestCase):
     def test_sweep_is_not_routed_to_the_ingestion_queue(self):
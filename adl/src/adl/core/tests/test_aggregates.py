@@ -0,0 +1,87 @@
+import math
+from datetime import datetime, timedelta, timezone as py_tz
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from adl.core.models import DailyObsAgg, HourlyObsAgg, ObservationRecord
+from .factories import DataParameterFactory, StationLinkFactory
+
+BASE_TIME = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+
+
+class CircularAggregateTests(TestCase):
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("The aggregates are TimescaleDB views")
+        self.link = StationLinkFactory()
+        self.direction = DataParameterFactory(name="wind_direction", aggregation_method="circular")
+
+    def observe(self, minutes, value):
+        ObservationRecord.objects.create(
+            station=self.link.station,
+            connection=self.link.network_connection,
+            parameter=self.direction,
+            value=value,
+            time=BASE_TIME + timedelta(minutes=minutes),
+        )
+
+    def test_the_hourly_mean_wraps_around_north(self):
+        self.observe(0, 350.0)
+        self.observe(30, 10.0)
+
+        mean = HourlyObsAgg.objects.get(parameter=self.direction).avg_value
+
+        self.assertAlmostEqual(min(mean, 360 - mean), 0.0, places=6)
+
+    def test_the_daily_mean_combines_hours_exactly(self):
+        # Two spread-out values in the first hour, one in the second: the
+        # daily mean must come from all three, not from the two hourly means
+        self.observe(0, 350.0)
+        self.observe(30, 10.0)
+        self.observe(60, 90.0)
+
+        mean = DailyObsAgg.objects.get(parameter=self.direction).avg_value
+
+        radians = [math.radians(v) for v in (350.0, 10.0, 90.0)]
+        expected = math.degrees(math.atan2(sum(map(math.sin, radians)), sum(map(math.cos, radians))))
+        self.assertAlmostEqual(mean, expected, places=6)
+
+    def test_standard_parameters_keep_the_arithmetic_mean(self):
+        self.direction.aggregation_method = "standard"
+        self.direction.save()
+        self.observe(0, 350.0)
+        self.observe(30, 10.0)
+
+        self.assertAlmostEqual(HourlyObsAgg.objects.get(parameter=self.direction).avg_value, 180.0)
+
+
+class RefreshHourlyAggCommandTests(TestCase):
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("The aggregates are TimescaleDB views")
+
+    def test_the_hourly_aggregate_is_not_refreshed_below_the_retention_floor(self):
+        floor = BASE_TIME + timedelta(days=30)
+        with patch("adl.core.management.commands.refresh_hourly_agg.aggregate_refresh_floor",
+                   return_value=floor):
+            with self.assertRaisesMessage(CommandError, "--rollups-only"):
+                call_command("refresh_hourly_agg", "--start-date", BASE_TIME.isoformat(), stdout=StringIO())
+
+    def test_rollups_only_leaves_the_hourly_aggregate_alone(self):
+        link = StationLinkFactory()
+        ObservationRecord.objects.create(station=link.station, connection=link.network_connection,
+                                         parameter=DataParameterFactory(), value=1.0, time=BASE_TIME)
+
+        with patch("adl.core.management.commands.refresh_hourly_agg.refresh_rollups") as refresh_rollups, \
+                patch("adl.core.management.commands.refresh_hourly_agg.aggregate_refresh_floor") as floor:
+            call_command("refresh_hourly_agg", "--rollups-only", "--start-date", BASE_TIME.isoformat(),
+                         stdout=StringIO())
+
+        self.assertEqual(refresh_rollups.call_args.args[1], BASE_TIME)
+        # The floor only guards refreshes of the hourly aggregate
+        floor.assert_not_called()
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone as py_tz
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from adl.core.models import ObservationRecord
+from adl.core.registries import FLUSH, Plugin, plugin_registry
+from adl.core.tasks import process_station_link_batch
+from .factories import (
+    CelsiusUnitFactory,
+    DataParameterFactory,
+    NetworkConnectionFactory,
+    StationLinkFactory,
+)
+from .helpers import make_test_plugin, make_mapping
+
+WINDOW_START = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+WINDOW_END = datetime(2025, 1, 2, 0, 0, tzinfo=py_tz.utc)
+
+
+def make_async_plugin(fetch):
+    class _AsyncPlugin(Plugin):
+        type = "test_async_plugin"
+        label = "Test Async Plugin"
+
+        async def aget_station_data(self, station_link, start_date=None, end_date=None):
+            async for record in fetch(self, station_link):
+                yield record
+
+    return _AsyncPlugin()
+
+
+class AsyncContractTests(SimpleTestCase):
+    def test_only_plugins_implementing_the_async_contract_have_an_async_source(self):
+        async def fetch(plugin, station_link):
+            yield {}
+
+        self.assertFalse(make_test_plugin().has_async_source)
+        self.assertTrue(make_async_plugin(fetch).has_async_source)
+
+    def test_the_shared_client_only_exists_inside_a_fetch(self):
+        with self.assertRaises(RuntimeError):
+            make_test_plugin().get_async_http_client()
+
+
+class AsyncSourceProcessStationTests(TestCase):
+    """Outside a batch the default get_station_data drives the generator."""
+
+    def setUp(self):
+        self.link = StationLinkFactory()
+        unit = CelsiusUnitFactory()
+        param = DataParameterFactory(name="air_temperature", unit=unit)
+        mapping = make_mapping(param, unit, source_name="temp")
+        self.link.get_variable_mappings = lambda: [mapping]
+
+    def test_records_are_saved_and_flush_persists_before_the_generator_resumes(self):
+        events = []
+
+        async def fetch(plugin, station_link):
+            self.assertIsNotNone(plugin.get_async_http_client())
+            for hour in range(2):
+                await asyncio.sleep(0)
+                yield {"observation_time": WINDOW_START + timedelta(hours=hour), "temp": 20.0 + hour}
+                yield FLUSH
+                events.append("resumed")
+
+        plugin = make_async_plugin(fetch)
+        original_save_chunk = plugin._save_chunk
+
+        def save_chunk(*args, **kwargs):
+            events.append("saved")
+            return original_save_chunk(*args, **kwargs)
+
+        with patch.object(type(plugin), "get_dates_for_station", return_value=(WINDOW_START, WINDOW_END)), \
+                patch.object(plugin, "_save_chunk", side_effect=save_chunk):
+            saved = plugin.process_station(self.link, bypass_lock=True)
+
+        self.assertEqual(saved, 2)
+        self.assertEqual(ObservationRecord.objects.count(), 2)
+        self.assertEqual(events, ["saved", "resumed", "saved", "resumed"])
+
+
+class AsyncBatchTests(TransactionTestCase):
+    def setUp(self):
+        # One save thread: the fetches must overlap regardless
+        self.connection = NetworkConnectionFactory(max_concurrent_stations=1)
+        self.links = [StationLinkFactory(network_connection=self.connection) for _ in range(2)]
+
+    def run_batch(self, plugin, process_station):
+        with patch.object(plugin_registry, "get", return_value=plugin), \
+                patch.object(type(plugin), "get_dates_for_station", return_value=(WINDOW_START, WINDOW_END)), \
+                patch.object(plugin, "process_station", side_effect=process_station):
+            return process_station_link_batch(self.connection.id, [link.id for link in self.links])
+
+    def test_a_batch_fetches_all_its_stations_on_one_loop_at_once(self):
+        started = set()
+
+        async def fetch(plugin, station_link):
+            # Neither station yields until both are being fetched
+            started.add(station_link.id)
+            while len(started) < len(self.links):
+                await asyncio.sleep(0.01)
+            yield {"station": station_link.id}
+
+        def process_station(station_link, record_source, initial_start_date, initial_end_date, **kwargs):
+            return len(list(record_source(station_link, initial_start_date, initial_end_date)))
+
+        result = self.run_batch(make_async_plugin(fetch), process_station)
+
+        self.assertEqual(result["processed"], 2)
+        self.assertEqual(result["total_records"], 2)
+
+    def test_a_fetch_resumes_after_a_flush_once_its_records_are_read(self):
+        events = []
+
+        async def fetch(plugin, station_link):
+            yield {"station": station_link.id}
+            yield FLUSH
+            events.append(("resumed", station_link.id))
+            yield {"station": station_link.id}
+
+        def process_station(station_link, record_source, initial_start_date, initial_end_date, **kwargs):
+            records = record_source(station_link, initial_start_date, initial_end_date)
+            next(records)
+            self.assertIs(next(records), FLUSH)
+            time.sleep(0.05)
+            events.append(("saved", station_link.id))
+            return len([record for record in records if record is not FLUSH]) + 1
+
+        result = self.run_batch(make_async_plugin(fetch), process_station)
+
+        self.assertEqual(result["total_records"], 4)
+        for link in self.links:
+            self.assertLess(events.index(("saved", link.id)), events.index(("resumed", link.id)))
+
+    def test_a_failing_fetch_fails_only_its_own_station(self):
+        failing = self.links[0].id
+
+        async def fetch(plugin, station_link):
+            if station_link.id == failing:
+                raise ConnectionError("source unreachable")
+            yield {"station": station_link.id}
+
+        def process_station(station_link, record_source, initial_start_date, initial_end_date, **kwargs):
+            return len(list(record_source(station_link, initial_start_date, initial_end_date)))
+
+        result = self.run_batch(make_async_plugin(fetch), process_station)
+
+        self.assertEqual((result["processed"], result["errors"]), (1, 1))
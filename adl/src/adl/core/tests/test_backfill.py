@@ -0,0 +1,220 @@
+import uuid
+from datetime import datetime, timedelta, timezone as py_tz
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone as dj_timezone
+
+from adl.core import backfill
+from adl.core.backfill import MAX_SLICE_ATTEMPTS, create_backfill_job, fill_backfill_job, plan_slices, run_slice
+from adl.core.models import BackfillJob, BackfillSlice
+from adl.core.registries import plugin_registry
+from adl.core.tasks import run_backfill_slice
+from .factories import NetworkConnectionFactory, StationLinkFactory
+from .helpers import make_test_plugin
+
+START = datetime(2024, 1, 1, tzinfo=py_tz.utc)
+
+
+class PlanSlicesTests(SimpleTestCase):
+    def test_slices_cover_the_window_newest_first(self):
+        slices = plan_slices(START, START + timedelta(days=10), 4)
+
+        self.assertEqual(slices, [
+            (START + timedelta(days=6), START + timedelta(days=10)),
+            (START + timedelta(days=2), START + timedelta(days=6)),
+            (START, START + timedelta(days=2)),
+        ])
+
+
+class BackfillJobTests(TestCase):
+    def setUp(self):
+        self.connection = NetworkConnectionFactory()
+        self.links = [StationLinkFactory(network_connection=self.connection) for _ in range(2)]
+        StationLinkFactory(network_connection=self.connection, enabled=False)
+
+        patcher = patch("adl.core.tasks.run_backfill_slice.apply_async")
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_job(self, **options):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_backfill_job(self.connection, START, START + timedelta(days=21), slice_days=7,
+                                       **options)
+
+    def queued_slices(self):
+        return [call.kwargs["args"][0] for call in self.apply_async.call_args_list]
+
+    def test_newest_slices_are_queued_first_up_to_the_cap(self):
+        job = self.create_job(max_concurrent_slices=2)
+
+        # 3 ranges x 2 enabled links
+        self.assertEqual(job.slices.count(), 6)
+        queued = BackfillSlice.objects.filter(id__in=self.queued_slices())
+        self.assertEqual(len(queued), 2)
+        self.assertTrue(all(s.end_date == START + timedelta(days=21) for s in queued))
+        self.assertTrue(all(s.status == BackfillSlice.Status.RUNNING for s in queued))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackfillJob.Status.RUNNING)
+
+    def test_a_finished_slice_makes_room_for_the_next(self):
+        job = self.create_job(max_concurrent_slices=2)
+        job.slices.filter(id=self.queued_slices()[0]).update(status=BackfillSlice.Status.COMPLETED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            claimed = fill_backfill_job(job.id)
+
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(job.slices.filter(status=BackfillSlice.Status.RUNNING).count(), 2)
+
+    def test_the_job_closes_when_no_slice_is_left(self):
+        job = self.create_job()
+        job.slices.update(status=BackfillSlice.Status.COMPLETED)
+        job.slices.filter(id=job.slices.first().id).update(status=BackfillSlice.Status.FAILED)
+
+        fill_backfill_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackfillJob.Status.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_a_slice_stranded_by_a_dead_worker_is_requeued(self):
+        job = self.create_job(max_concurrent_slices=1)
+        stranded = job.slices.get(status=BackfillSlice.Status.RUNNING)
+        job.slices.filter(id=stranded.id).update(started_at=START)
+
+        with patch.object(backfill, "backfill_slice_budget_seconds", return_value=60):
+            fill_backfill_job(job.id)
+
+        stranded.refresh_from_db()
+        self.assertEqual(stranded.status, BackfillSlice.Status.RUNNING)
+        self.assertEqual(stranded.attempts, 2)
+
+    def test_a_queued_slice_is_not_requeued_before_a_worker_starts_it(self):
+        job = self.create_job(max_concurrent_slices=2)
+        queued = job.slices.filter(status=BackfillSlice.Status.RUNNING).first()
+        # Past one run budget, but within the wait for the slices ahead of it
+        job.slices.filter(id=queued.id).update(claimed_at=dj_timezone.now() - timedelta(seconds=90))
+
+        with patch.object(backfill, "backfill_slice_budget_seconds", return_value=60):
+            fill_backfill_job(job.id)
+
+        claim_token = queued.claim_token
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.claim_token, queued.attempts),
+                         (BackfillSlice.Status.RUNNING, claim_token, 1))
+
+    def test_a_queued_slice_never_started_is_claimed_again(self):
+        job = self.create_job(max_concurrent_slices=1)
+        lost = job.slices.get(status=BackfillSlice.Status.RUNNING)
+        job.slices.filter(id=lost.id).update(claimed_at=START)
+
+        with patch.object(backfill, "backfill_slice_budget_seconds", return_value=60):
+            fill_backfill_job(job.id)
+
+        claim_token = lost.claim_token
+        lost.refresh_from_db()
+        self.assertEqual(lost.status, BackfillSlice.Status.RUNNING)
+        self.assertNotEqual(lost.claim_token, claim_token)
+
+    def test_a_cancelled_job_queues_nothing(self):
+        job = self.create_job(max_concurrent_slices=1)
+        backfill.cancel_backfill_job(job)
+        self.apply_async.reset_mock()
+
+        self.assertEqual(fill_backfill_job(job.id), [])
+
+
+class RunSliceTests(TestCase):
+    def setUp(self):
+        self.plugin = make_test_plugin()
+        self.link = StationLinkFactory()
+        self.job = BackfillJob.objects.create(network_connection=self.link.network_connection,
+                                              start_date=START, end_date=START + timedelta(days=7))
+        self.slice = BackfillSlice.objects.create(job=self.job, station_link=self.link, start_date=START,
+                                                  end_date=START + timedelta(days=7),
+                                                  status=BackfillSlice.Status.RUNNING, attempts=1)
+        patcher = patch.object(plugin_registry, "get", return_value=self.plugin)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_the_slice_window_replaces_the_resumed_one_and_skips_the_lock(self):
+        with patch.object(type(self.plugin), "process_station", return_value=12) as process_station:
+            run_slice(self.slice)
+
+        kwargs = process_station.call_args.kwargs
+        self.assertEqual((kwargs["initial_start_date"], kwargs["initial_end_date"]),
+                         (START, START + timedelta(days=7)))
+        self.assertTrue(kwargs["bypass_lock"])
+        self.assertTrue(kwargs["backfill"])
+        self.slice.refresh_from_db()
+        self.assertEqual(self.slice.status, BackfillSlice.Status.COMPLETED)
+        self.assertEqual(self.slice.records_count, 12)
+
+    def test_a_slice_reaching_below_the_retention_floor_is_cut_short(self):
+        floor = START + timedelta(days=3)
+        with patch("adl.core.retention.backfill_floor", return_value=floor), \
+                patch.object(type(self.plugin), "process_station", return_value=5) as process_station:
+            run_slice(self.slice)
+
+        self.assertEqual(process_station.call_args.kwargs["initial_start_date"], floor)
+
+    def test_a_slice_wholly_below_the_retention_floor_is_skipped(self):
+        with patch("adl.core.retention.backfill_floor", return_value=START + timedelta(days=30)), \
+                patch.object(type(self.plugin), "process_station") as process_station:
+            run_slice(self.slice)
+
+        process_station.assert_not_called()
+        self.slice.refresh_from_db()
+        self.assertEqual(self.slice.status, BackfillSlice.Status.COMPLETED)
+        self.assertEqual(self.slice.records_count, 0)
+
+    def test_a_failed_slice_is_retried_until_it_runs_out_of_attempts(self):
+        with patch.object(type(self.plugin), "get_station_data", side_effect=RuntimeError("source down")):
+            run_slice(self.slice)
+            self.assertEqual(self.slice.status, BackfillSlice.Status.PENDING)
+
+            self.slice.attempts = MAX_SLICE_ATTEMPTS
+            run_slice(self.slice)
+
+        self.slice.refresh_from_db()
+        self.assertEqual(self.slice.status, BackfillSlice.Status.FAILED)
+        self.assertIn("source down", self.slice.error)
+
+
+class RunBackfillSliceTaskTests(TestCase):
+    def setUp(self):
+        link = StationLinkFactory()
+        job = BackfillJob.objects.create(network_connection=link.network_connection,
+                                         start_date=START, end_date=START + timedelta(days=7))
+        self.claim_token = uuid.uuid4()
+        self.slice = BackfillSlice.objects.create(job=job, station_link=link, start_date=START,
+                                                  end_date=START + timedelta(days=7),
+                                                  status=BackfillSlice.Status.RUNNING, attempts=1,
+                                                  claim_token=self.claim_token)
+        for name in ("run_slice", "fill_backfill_job"):
+            patcher = patch.object(backfill, name)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def test_the_slice_is_started_when_a_worker_picks_it_up(self):
+        run_backfill_slice(self.slice.id, str(self.claim_token))
+
+        self.run_slice.assert_called_once()
+        self.slice.refresh_from_db()
+        self.assertIsNotNone(self.slice.started_at)
+
+    def test_a_task_holding_an_old_claim_does_nothing(self):
+        self.assertIsNone(run_backfill_slice(self.slice.id, str(uuid.uuid4())))
+
+        self.run_slice.assert_not_called()
+        self.slice.refresh_from_db()
+        self.assertIsNone(self.slice.started_at)
+
+    def test_a_slice_delivered_twice_runs_once(self):
+        run_backfill_slice(self.slice.id, str(self.claim_token))
+        run_backfill_slice(self.slice.id, str(self.claim_token))
+
+        self.run_slice.assert_called_once()
+
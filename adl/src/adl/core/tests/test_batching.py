@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone as dj_tz
+
+from adl.core.batching import estimate_station_seconds, pack_batches, plan_ingest_batches
+from adl.core.tasks import ingest_batch_soft_limit_seconds
+from adl.monitoring.models import StationLinkActivityLog
+from .factories import NetworkConnectionFactory, StationLinkFactory
+
+
+class PackBatchesTests(SimpleTestCase):
+    def test_slow_stations_are_spread_across_batches(self):
+        costs = {1: 300, 2: 280, 3: 260, 4: 5, 5: 5, 6: 5}
+
+        batches = pack_batches([1, 2, 3, 4, 5, 6], 3, costs)
+
+        self.assertEqual(len(batches), 2)
+        self.assertTrue(all(len(batch.station_link_ids) <= 3 for batch in batches))
+        expected = sorted(batch.expected_seconds for batch in batches)
+        # Id order would have put 300 + 280 + 260 in one batch
+        self.assertLess(expected[1], 600)
+
+    def test_stations_without_history_are_costed_at_the_median(self):
+        batches = pack_batches([1, 2, 3, 4], 2, {1: 100, 2: 10, 3: 20})
+
+        self.assertEqual(sum(batch.expected_seconds for batch in batches), 100 + 10 + 20 + 20)
+
+
+class EstimateStationSecondsTests(TestCase):
+    def setUp(self):
+        self.link = StationLinkFactory()
+
+    def run_log(self, duration_s, records, minutes_ago=15, status=StationLinkActivityLog.ActivityStatus.COMPLETED):
+        StationLinkActivityLog.objects.create(
+            time=dj_tz.now() - timedelta(minutes=minutes_ago),
+            station_link=self.link,
+            direction="pull",
+            status=status,
+            duration_ms=duration_s * 1000,
+            records_count=records,
+        )
+
+    def test_the_median_of_recent_runs_without_catch_up_runs(self):
+        for minutes_ago, seconds in ((15, 10), (30, 12), (45, 14)):
+            self.run_log(seconds, 100, minutes_ago=minutes_ago)
+        self.run_log(900, 50_000, minutes_ago=60)
+        self.run_log(1, 0, status=StationLinkActivityLog.ActivityStatus.SKIPPED)
+
+        self.assertEqual(estimate_station_seconds([self.link.id]), {self.link.id: 12})
+
+    def test_no_history_keeps_id_ordered_batches(self):
+        batches = plan_ingest_batches([3, 1, 2], 2)
+
+        self.assertEqual([batch.station_link_ids for batch in batches], [[3, 1], [2]])
+        self.assertFalse(any(batch.expected_seconds for batch in batches))
+
+
+class EstimatedSoftLimitTests(TestCase):
+    def test_a_slow_batch_gets_more_time_up_to_a_full_batch_limit(self):
+        connection = NetworkConnectionFactory(
+            plugin_processing_interval=30, ingest_timeout_seconds=60, batch_size=10
+        )
+
+        self.assertEqual(ingest_batch_soft_limit_seconds(connection, 2), 120)
+        self.assertEqual(ingest_batch_soft_limit_seconds(connection, 2, expected_seconds=100), 200)
+        self.assertEqual(ingest_batch_soft_limit_seconds(connection, 2, expected_seconds=30), 120)
+        self.assertEqual(ingest_batch_soft_limit_seconds(connection, 2, expected_seconds=5000), 600)
@@ -0,0 +1,71 @@
+from dataclasses import asdict, replace
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, TestCase
+
+from adl.core.benchmarks import (
+    BenchmarkResult,
+    SyntheticPlugin,
+    Workload,
+    compare_to_baseline,
+    run_scenario,
+)
+from adl.core.registries import plugin_registry
+
+WORKLOAD = Workload(stations=2, parameters=2, timestamps=50)
+
+
+def result(**overrides):
+    values = dict(scenario="batch", source_records=100, saved_records=96, seconds=1.0,
+                  records_per_second=1000.0, peak_rss_mb=200.0, queries=40)
+    return BenchmarkResult(**(values | overrides))
+
+
+class SyntheticPluginTests(SimpleTestCase):
+    def test_the_workload_is_reproducible_and_has_its_edge_cases(self):
+        workload = replace(WORKLOAD, duplicate_fraction=0.5, out_of_window_fraction=0.5)
+        mappings = [SimpleNamespace(source_parameter_name="p0", source_parameter_unit=SimpleNamespace(symbol="K"))]
+        plugin = SyntheticPlugin(workload, mappings)
+        link = SimpleNamespace(id=1)
+
+        records = list(plugin.get_station_data(link))
+
+        self.assertEqual(records, list(plugin.get_station_data(link)))
+        self.assertGreater(len(records), workload.timestamps)
+        start, _ = workload.window
+        self.assertTrue(any(record["observation_time"] < start for record in records))
+        self.assertTrue(all(record["p0"] > 200 for record in records))
+
+
+class CompareToBaselineTests(SimpleTestCase):
+    def baseline(self, **overrides):
+        return {"workload": asdict(WORKLOAD), "results": {"batch": asdict(result(**overrides))}}
+
+    def test_results_within_tolerance_pass(self):
+        regressions = compare_to_baseline(
+            self.baseline(), WORKLOAD, [result(records_per_second=850.0, peak_rss_mb=230.0)],
+        )
+        self.assertEqual(regressions, [])
+
+    def test_slower_larger_or_chattier_runs_fail(self):
+        regressions = compare_to_baseline(
+            self.baseline(), WORKLOAD, [result(records_per_second=700.0, peak_rss_mb=300.0, queries=41)],
+        )
+        self.assertEqual(len(regressions), 3)
+
+    def test_a_different_workload_is_not_compared(self):
+        regressions = compare_to_baseline(self.baseline(), replace(WORKLOAD, stations=3), [result()])
+        self.assertEqual(len(regressions), 1)
+
+
+class RunScenarioTests(TestCase):
+    def test_save_records_scenario_leaves_nothing_behind(self):
+        from adl.core.models import ObservationRecord, Station
+
+        benchmark = run_scenario("save_records", WORKLOAD)
+
+        self.assertGreater(benchmark.saved_records, 0)
+        self.assertGreater(benchmark.queries, 0)
+        self.assertFalse(Station.objects.filter(station_id__startswith="BENCH-").exists())
+        self.assertFalse(ObservationRecord.objects.exists())
+        self.assertNotIn(SyntheticPlugin.type, plugin_registry.registry)
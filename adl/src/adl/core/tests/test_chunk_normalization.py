@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, timezone as py_tz
+from types import SimpleNamespace
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase, TestCase
+
+from adl.core.models import ObservationRecord
+from adl.core.normalization import normalize_chunk, datetime_to_epoch_us
+from .factories import (
+    StationLinkFactory,
+    DataParameterFactory,
+    KelvinUnitFactory,
+    CelsiusUnitFactory,
+)
+from .helpers import make_test_plugin, make_mapping
+
+NAIROBI = ZoneInfo("Africa/Nairobi")
+WINDOW_START = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+WINDOW_END = datetime(2025, 1, 2, 0, 0, tzinfo=py_tz.utc)
+NOW = datetime(2025, 6, 1, 0, 0, tzinfo=py_tz.utc)
+
+
+def _mapping(param_id, source_name):
+    # Same unit object on both sides, so no conversion is attempted
+    unit = SimpleNamespace(symbol="degC")
+    param = SimpleNamespace(id=param_id, name=source_name, unit=unit)
+    return SimpleNamespace(adl_parameter=param, source_parameter_name=source_name, source_parameter_unit=unit)
+
+
+class NormalizeChunkTests(SimpleTestCase):
+    def normalize(self, records, mappings, now=NOW):
+        return normalize_chunk(records, mappings, NAIROBI, WINDOW_START, WINDOW_END, now)
+
+    def test_naive_times_are_station_local(self):
+        chunk = self.normalize(
+            [{"observation_time": datetime(2025, 1, 1, 12, 0), "t": 1.0}],
+            [_mapping(1, "t")],
+        )
+
+        (obs_time, _, value), = chunk.rows([_mapping(1, "t")])
+        self.assertEqual(obs_time, datetime(2025, 1, 1, 9, 0, tzinfo=py_tz.utc))
+        self.assertEqual(value, 1.0)
+
+    def test_later_record_wins_a_duplicate_time_and_parameter(self):
+        # The naive Nairobi time and the aware UTC time are the same instant
+        records = [
+            {"observation_time": datetime(2025, 1, 1, 12, 0), "t": 1.0},
+            {"observation_time": datetime(2025, 1, 1, 9, 0, tzinfo=py_tz.utc), "t": 2.0},
+        ]
+        chunk = self.normalize(records, [_mapping(1, "t")])
+
+        self.assertEqual(len(chunk), 1)
+        self.assertEqual(chunk.values.tolist(), [2.0])
+
+    def test_rejections_are_counted_by_reason(self):
+        records = [
+            {"t": 1.0},
+            {"observation_time": "not a time", "t": 1.0},
+            {"observation_time": WINDOW_START - timedelta(hours=1), "t": 1.0},
+            {"observation_time": WINDOW_END + timedelta(hours=1), "t": 1.0},
+            {"observation_time": WINDOW_START + timedelta(hours=1), "t": 1.0},
+        ]
+        chunk = self.normalize(records, [_mapping(1, "t")], now=WINDOW_START)
+
+        self.assertEqual(len(chunk), 0)
+        self.assertEqual(dict(chunk.rejected), {
+            "missing_time": 1,
+            "invalid_time": 1,
+            "before_start": 1,
+            "after_end": 1,
+            "future": 1,
+        })
+
+    def test_non_numeric_values_are_skipped_without_dropping_the_record(self):
+        records = [{"observation_time": WINDOW_START + timedelta(hours=1), "t": "oops", "rh": 80}]
+        mappings = [_mapping(1, "t"), _mapping(2, "rh")]
+        chunk = self.normalize(records, mappings)
+
+        self.assertEqual(chunk.parameter_ids.tolist(), [2])
+        self.assertEqual(chunk.values.tolist(), [80.0])
+        self.assertEqual(chunk.earliest_us, datetime_to_epoch_us(WINDOW_START + timedelta(hours=1), NAIROBI))
+
+    def test_output_is_sorted_by_time(self):
+        records = [
+            {"observation_time": WINDOW_START + timedelta(hours=h), "t": float(h)}
+            for h in (5, 1, 3)
+        ]
+        chunk = self.normalize(records, [_mapping(1, "t")])
+
+        self.assertEqual(chunk.values.tolist(), [1.0, 3.0, 5.0])
+        earliest, latest = chunk.time_range()
+        self.assertEqual((earliest, latest), (WINDOW_START + timedelta(hours=1), WINDOW_START + timedelta(hours=5)))
+
+
+class SaveChunkNormalizationTests(TestCase):
+    def setUp(self):
+        self.plugin = make_test_plugin()
+        self.link = StationLinkFactory()
+        self.param_temp = DataParameterFactory(name="air_temperature", unit=CelsiusUnitFactory())
+        mapping = make_mapping(self.param_temp, KelvinUnitFactory())
+        self.link.get_variable_mappings = lambda: [mapping]
+
+    def test_rejected_records_are_logged_once_per_reason(self):
+        records = [
+            {"observation_time": WINDOW_START - timedelta(hours=h), "temp_K": 293.15}
+            for h in range(1, 6)
+        ]
+
+        with patch.object(self.plugin.get_logger(), "warning") as warning:
+            saved, _, _ = self.plugin.save_records(self.link, records, WINDOW_START, WINDOW_END)
+
+        self.assertEqual(saved, 0)
+        rejection_lines = [c for c in warning.call_args_list if c.args[0].startswith("Rejected")]
+        self.assertEqual(len(rejection_lines), 1)
+        self.assertEqual(rejection_lines[0].args[1], 5)
+
+    def test_a_column_is_converted_and_saved(self):
+        records = [
+            {"observation_time": WINDOW_START + timedelta(hours=h), "temp_K": 273.15 + h}
+            for h in range(3)
+        ]
+
+        saved, _, _ = self.plugin.save_records(self.link, records, WINDOW_START, WINDOW_END)
+
+        self.assertEqual(saved, 3)
+        values = list(ObservationRecord.objects.order_by("time").values_list("value", flat=True))
+        for expected, value in zip([0.0, 1.0, 2.0], values):
+            self.assertAlmostEqual(value, expected, delta=0.01)
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from wagtail.models import Site
+
+from adl.core.compression import OBSERVATION_TABLE, set_observation_compression_policy, timescaledb_available
+from adl.core.models import AdlSettings
+
+
+class CompressionPolicyTests(TestCase):
+    def compress_after(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT config ->> 'compress_after' FROM timescaledb_information.jobs
+                WHERE proc_name = 'policy_compression' AND hypertable_name = %s
+                """,
+                [OBSERVATION_TABLE],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def test_the_policy_follows_the_configured_age(self):
+        with connection.cursor() as cursor:
+            if not timescaledb_available(cursor):
+                self.skipTest("TimescaleDB is not installed")
+
+        self.assertTrue(set_observation_compression_policy(3))
+        self.assertEqual(self.compress_after(), "3 days")
+
+        set_observation_compression_policy(0)
+        self.assertIsNone(self.compress_after())
+
+    def test_saving_adl_settings_applies_the_age_on_commit(self):
+        adl_settings = AdlSettings.for_site(Site.objects.get(is_default_site=True))
+        adl_settings.observation_compress_after_days = 30
+
+        with patch("adl.core.compression.set_observation_compression_policy") as set_policy:
+            with self.captureOnCommitCallbacks(execute=True):
+                adl_settings.save()
+
+        set_policy.assert_called_once_with(30)
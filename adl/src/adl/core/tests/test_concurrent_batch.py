@@ -0,0 +1,122 @@
+"""
+Opt-in concurrency inside an ingestion batch.
+
+With ``max_concurrent_stations`` above 1 a batch runs its stations on a
+thread pool. The pool threads use their own database connections, so these
+tests commit their fixtures (``TransactionTestCase``) for the threads to see.
+"""
+
+import signal
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.test import SimpleTestCase, TransactionTestCase
+
+from adl.core.registries import plugin_registry
+from adl.core.tasks import effective_max_concurrent_stations, process_station_link_batch
+from .factories import NetworkConnectionFactory, StationLinkFactory
+from .helpers import make_test_plugin
+
+
+class EffectiveMaxConcurrentStationsTests(SimpleTestCase):
+    def test_never_more_threads_than_stations(self):
+        connection = SimpleNamespace(max_concurrent_stations=8)
+
+        self.assertEqual(effective_max_concurrent_stations(connection, 3), 3)
+
+    def test_unset_means_serial(self):
+        for configured in (0, None):
+            with self.subTest(configured=configured):
+                connection = SimpleNamespace(max_concurrent_stations=configured)
+                self.assertEqual(effective_max_concurrent_stations(connection, 5), 1)
+
+
+class ConcurrentBatchTests(TransactionTestCase):
+    def setUp(self):
+        self.plugin = make_test_plugin()
+        self.connection = NetworkConnectionFactory(max_concurrent_stations=2)
+        self.links = [StationLinkFactory(network_connection=self.connection) for _ in range(3)]
+
+        patcher = patch.object(plugin_registry, "get", return_value=self.plugin)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_batch(self):
+        return process_station_link_batch(self.connection.id, [link.id for link in self.links])
+
+    def test_stations_overlap_and_results_are_summed(self):
+        # Two stations must be in flight together to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        failing = self.links[2].id
+
+        def process_station(station_link, **kwargs):
+            if station_link.id == failing:
+                raise ConnectionError("source unreachable")
+            barrier.wait()
+            return 10
+
+        with patch.object(self.plugin, "process_station", side_effect=process_station):
+            result = self.run_batch()
+
+        self.assertEqual(result["processed"], 2)
+        self.assertEqual(result["total_records"], 20)
+        self.assertEqual(result["errors"], 1)
+
+    def test_each_station_logs_through_a_plugin_logger_of_its_own(self):
+        barrier = threading.Barrier(2, timeout=5)
+        loggers = []
+
+        def process_station(station_link, **kwargs):
+            barrier.wait()
+            loggers.append(self.plugin.get_logger())
+            return 0
+
+        self.links = self.links[:2]
+        with patch.object(self.plugin, "process_station", side_effect=process_station):
+            self.run_batch()
+
+        self.assertEqual(len(set(map(id, loggers))), 2)
+        self.assertNotIn(self.plugin.get_logger(), loggers)
+
+    def test_soft_time_limit_stops_in_flight_stations(self):
+        started = threading.Barrier(3, timeout=5)
+        interrupted = []
+
+        def endless_source():
+            while True:
+                time.sleep(0.01)
+                yield {}
+
+        def process_station(station_link, **kwargs):
+            started.wait()
+            try:
+                # The save loop is where a cut-off station stops itself
+                for _ in self.plugin._chunk_iterator(endless_source(), 1000):
+                    pass
+            except SoftTimeLimitExceeded:
+                interrupted.append(station_link.id)
+                raise
+
+        def soft_limit(signum, frame):
+            raise SoftTimeLimitExceeded()
+
+        # Celery delivers the soft limit the same way: a signal on the main thread
+        previous = signal.signal(signal.SIGALRM, soft_limit)
+        self.addCleanup(signal.signal, signal.SIGALRM, previous)
+
+        def arm_once_running():
+            started.wait()
+            signal.setitimer(signal.ITIMER_REAL, 0.05)
+
+        threading.Thread(target=arm_once_running).start()
+
+        with patch.object(self.plugin, "process_station", side_effect=process_station):
+            with self.assertRaises(SoftTimeLimitExceeded):
+                self.run_batch()
+
+        # Both in-flight stations had stopped by the time the limit was
+        # re-raised; the third was never started
+        self.assertCountEqual(interrupted, [self.links[0].id, self.links[1].id])
@@ -125,3 +125,30 @@ class DispatchRecordCapTests(DispatchRecordFetchTestCase):
 
         expected = [BASE_TIME + timedelta(hours=h) for h in range(5)]
         self.assertEqual(delivered, expected)  # complete, ordered, no duplicates
+
+
+class DailyAggregateDispatchTests(DispatchRecordFetchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.channel = self.make_channel(send_aggregated_data=True, aggregation_period="daily")
+        self.map_parameter(self.param, channel=self.channel)
+
+    def test_daily_channels_send_one_record_per_day(self):
+        for h in range(48):
+            self.seed_observations(hours=[h], value=float(h % 24))
+
+        records = get_station_dispatch_records(self.channel, self.link)
+
+        self.assertEqual(self.record_times(records), [BASE_TIME, BASE_TIME + timedelta(days=1)])
+        self.assertEqual([r["values"]["air_temperature"] for r in records], [11.5, 11.5])
+
+    def test_circular_parameters_average_as_angles(self):
+        direction = DataParameterFactory(name="wind_direction", aggregation_method="circular")
+        self.map_parameter(direction, channel=self.channel)
+        self.seed_observations(hours=[0], param=direction, value=350.0)
+        self.seed_observations(hours=[1], param=direction, value=10.0)
+
+        records = get_station_dispatch_records(self.channel, self.link)
+
+        mean = records[0]["values"]["wind_direction"]
+        self.assertAlmostEqual(min(mean, 360 - mean), 0.0, places=6)
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone as py_tz
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from adl.core import duplicates
+from adl.core.models import ObservationRecord
+from .factories import StationLinkFactory, DataParameterFactory, CelsiusUnitFactory
+from .helpers import make_test_plugin, make_mapping
+
+WINDOW_START = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+WINDOW_END = datetime(2025, 1, 2, 0, 0, tzinfo=py_tz.utc)
+
+
+class StoredDuplicateSuppressionTests(TestCase):
+    def setUp(self):
+        self.plugin = make_test_plugin()
+        self.link = StationLinkFactory()
+        unit = CelsiusUnitFactory()
+        self.param = DataParameterFactory(name="air_temperature", unit=unit)
+        self.mapping = make_mapping(self.param, unit, source_name="temp")
+        self.link.get_variable_mappings = lambda: [self.mapping]
+
+    def records(self, *values):
+        return [
+            {"observation_time": WINDOW_START + timedelta(hours=h), "temp": value}
+            for h, value in enumerate(values)
+        ]
+
+    def save(self, records):
+        return self.plugin.save_records(self.link, records, WINDOW_START, WINDOW_END)
+
+    def qc_checked_values(self, records):
+        original = type(self.plugin).perform_qc_checks_batch
+        checked = []
+
+        def spy(plugin, values, *args, **kwargs):
+            checked.extend(values.tolist())
+            return original(plugin, values, *args, **kwargs)
+
+        with patch.object(type(self.plugin), "perform_qc_checks_batch", spy):
+            saved, _, _ = self.save(records)
+        return saved, checked
+
+    def test_stored_values_skip_qc_and_count_as_saved(self):
+        self.save(self.records(1.0, 2.0))
+
+        saved, checked = self.qc_checked_values(self.records(1.0, 5.0, 3.0))
+
+        self.assertEqual(saved, 3)
+        self.assertEqual(checked, [5.0, 3.0])
+        values = list(ObservationRecord.objects.order_by("time").values_list("value", flat=True))
+        self.assertEqual(values, [1.0, 5.0, 3.0])
+
+    def test_values_stored_before_the_parameter_changed_are_checked_again(self):
+        self.save(self.records(1.0, 2.0))
+        self.param.save()
+
+        _, checked = self.qc_checked_values(self.records(1.0, 2.0))
+
+        self.assertEqual(checked, [1.0, 2.0])
+
+    def test_a_mapping_with_its_own_qc_checks_is_never_suppressed(self):
+        self.mapping.qc_checks = []
+        self.save(self.records(1.0, 2.0))
+
+        _, checked = self.qc_checked_values(self.records(1.0, 2.0))
+
+        self.assertEqual(checked, [1.0, 2.0])
+
+    def test_a_window_too_large_to_index_is_left_to_the_writer(self):
+        self.save(self.records(1.0, 2.0))
+
+        with patch.object(duplicates, "STORED_INDEX_MAX_ROWS", 1):
+            saved, checked = self.qc_checked_values(self.records(1.0, 2.0))
+
+        self.assertEqual((saved, checked), (2, [1.0, 2.0]))
+
+    def test_a_window_too_large_to_index_is_read_per_chunk(self):
+        records = self.records(1.0, 2.0, 3.0, 4.0)
+        self.save(records)
+
+        with patch.object(duplicates, "STORED_INDEX_MAX_ROWS", 2), \
+                patch.object(self.plugin, "SAVE_CHUNK_SIZE", 2):
+            saved, checked = self.qc_checked_values(records)
+
+        self.assertEqual((saved, checked), (4, []))
+
+    def test_plugins_can_turn_suppression_off(self):
+        self.save(self.records(1.0, 2.0))
+        self.plugin.SUPPRESS_STORED_DUPLICATES = False
+
+        _, checked = self.qc_checked_values(self.records(1.0, 2.0))
+
+        self.assertEqual(checked, [1.0, 2.0])
+
+    def test_a_value_an_earlier_chunk_replaced_is_written_back(self):
+        self.save(self.records(1.0))
+
+        # The first chunk replaces the stored 1.0, the second sends it again
+        records = self.records(5.0) + self.records(1.0)
+        self.plugin.save_records(self.link, records, WINDOW_START, WINDOW_END, chunk_size=1)
+
+        self.assertEqual(list(ObservationRecord.objects.values_list("value", flat=True)), [1.0])
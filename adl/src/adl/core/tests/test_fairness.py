@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from adl.core import fairness
+from adl.core.fairness import BatchTicket, admit_batches, release_batch_slot
+from adl.core.tasks import process_station_link_batch, run_network_plugin
+from .factories import NetworkConnectionFactory, StationLinkFactory
+
+
+class AdmitBatchesTests(TestCase):
+    def tickets(self, count):
+        return [BatchTicket([i], 60) for i in range(count)]
+
+    def test_an_uncapped_connection_sends_everything_without_touching_redis(self):
+        connection = NetworkConnectionFactory(max_inflight_batches=0)
+        tickets = self.tickets(3)
+
+        with patch.object(fairness, "_redis") as redis:
+            self.assertEqual(admit_batches(connection, tickets), tickets)
+
+        redis.assert_not_called()
+        self.assertTrue(all(ticket.token is None for ticket in tickets))
+
+    def test_a_capped_connection_sends_only_what_redis_admits(self):
+        connection = NetworkConnectionFactory(max_inflight_batches=2)
+        tickets = self.tickets(5)
+
+        with patch.object(fairness, "_redis") as redis:
+            redis.return_value.eval.return_value = 2
+            admitted = admit_batches(connection, tickets)
+
+        self.assertEqual(admitted, tickets[:2])
+        self.assertTrue(all(ticket.token for ticket in tickets))
+        # Every ticket's payload went to the script, in plan order
+        args = redis.return_value.eval.call_args.args
+        self.assertEqual(BatchTicket.from_json(args[-1]).station_link_ids, [4])
+
+    def test_redis_being_down_sends_everything_uncapped(self):
+        connection = NetworkConnectionFactory(max_inflight_batches=2)
+        tickets = self.tickets(3)
+
+        with patch.object(fairness, "_redis", side_effect=ConnectionError("redis down")):
+            admitted = admit_batches(connection, tickets)
+
+        self.assertEqual(admitted, tickets)
+        self.assertTrue(all(ticket.token is None for ticket in tickets))
+
+    def test_a_release_hands_back_the_held_tickets(self):
+        connection = NetworkConnectionFactory(max_inflight_batches=1)
+        held = BatchTicket([7, 8], 120, token="abc", queued_at=1000.0)
+
+        with patch.object(fairness, "_redis") as redis:
+            redis.return_value.eval.return_value = [held.to_json()]
+            released = release_batch_slot(connection, "finished")
+
+        self.assertEqual(len(released), 1)
+        self.assertEqual((released[0].station_link_ids, released[0].token), ([7, 8], "abc"))
+
+
+class CappedIngestionTests(TestCase):
+    def setUp(self):
+        self.connection = NetworkConnectionFactory(max_inflight_batches=1, batch_size=1)
+        self.links = [StationLinkFactory(network_connection=self.connection) for _ in range(3)]
+
+    def test_the_coordinator_sends_only_admitted_batches_with_their_slot(self):
+        with patch.object(fairness, "_redis") as redis, \
+                patch("adl.core.tasks.process_station_link_batch.apply_async") as apply_async:
+            redis.return_value.eval.return_value = 1
+            run_network_plugin(self.connection.id)
+
+        apply_async.assert_called_once()
+        kwargs = apply_async.call_args.kwargs["kwargs"]
+        self.assertTrue(kwargs["slot_token"])
+        self.assertIsNotNone(kwargs["queued_at"])
+
+    def test_a_failing_batch_still_sends_the_next_held_one(self):
+        held = BatchTicket([self.links[1].id], 60, token="next")
+
+        with patch("adl.core.tasks._run_station_link_batch", side_effect=RuntimeError("boom")), \
+                patch("adl.core.tasks.release_batch_slot", return_value=[held]) as release, \
+                patch("adl.core.tasks.process_station_link_batch.apply_async") as apply_async:
+            with self.assertRaises(RuntimeError):
+                process_station_link_batch(self.connection.id, [self.links[0].id], slot_token="mine")
+
+        self.assertEqual(release.call_args.args[1], "mine")
+        self.assertEqual(apply_async.call_args.kwargs["args"], [self.connection.id, [self.links[1].id]])
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils import timezone as dj_timezone
+
+from adl.core.models import ObservationRecord
+from adl.core.registries import LATEST_SAVED_TIME_HINT
+from adl.core.tasks import resolve_batch_latest_saved_times
+from .factories import (
+    CelsiusUnitFactory,
+    DataParameterFactory,
+    NetworkConnectionFactory,
+    StationLinkFactory,
+)
+from .helpers import make_test_plugin
+
+
+def make_offset_plugin():
+    plugin = make_test_plugin()
+
+    class _OffsetPlugin(type(plugin)):
+        def get_start_date_from_db(self, station_link):
+            start_date = super().get_start_date_from_db(station_link)
+            if start_date:
+                start_date += timedelta(minutes=1)
+            return start_date
+
+    return _OffsetPlugin()
+
+
+class LatestSavedTimesTests(TestCase):
+    def setUp(self):
+        self.plugin = make_test_plugin()
+        self.connection = NetworkConnectionFactory()
+        self.param = DataParameterFactory(unit=CelsiusUnitFactory())
+        self.now = dj_timezone.now().replace(microsecond=0)
+
+        self.recent = StationLinkFactory(network_connection=self.connection)
+        self.stale = StationLinkFactory(network_connection=self.connection)
+        self.empty = StationLinkFactory(network_connection=self.connection)
+        self.observe(self.recent, self.now - timedelta(hours=1))
+        self.observe(self.recent, self.now - timedelta(hours=2))
+        self.observe(self.stale, self.now - LATEST_SAVED_TIME_HINT - timedelta(days=30))
+
+    def observe(self, station_link, time):
+        ObservationRecord.objects.create(
+            station=station_link.station,
+            connection=station_link.network_connection,
+            parameter=self.param,
+            value=1.0,
+            time=time,
+        )
+
+    def test_matches_the_per_station_lookup(self):
+        links = [self.recent, self.stale, self.empty]
+
+        # One bounded pass, one unbounded pass for the two links it missed
+        with self.assertNumQueries(2):
+            latest = self.plugin.get_latest_saved_times(links)
+
+        self.assertEqual(latest, {link.id: self.plugin.get_start_date_from_db(link) for link in links})
+        self.assertIsNone(latest[self.empty.id])
+
+    def test_recent_stations_need_no_unbounded_pass(self):
+        with self.assertNumQueries(1):
+            latest = self.plugin.get_latest_saved_times([self.recent])
+
+        self.assertEqual(latest, {self.recent.id: self.now - timedelta(hours=1)})
+
+    def test_a_resolved_time_replaces_the_per_station_query(self):
+        resolved = self.now - timedelta(hours=3)
+
+        with patch.object(self.plugin, "get_start_date_from_db") as per_station:
+            start, _ = self.plugin.get_dates_for_station(self.recent, latest_saved_time=resolved)
+
+        per_station.assert_not_called()
+        self.assertEqual(start, resolved)
+
+    def test_an_overridden_start_date_lookup_is_still_called(self):
+        plugin = make_offset_plugin()
+
+        self.assertFalse(plugin.resolves_latest_saved_time_in_batch)
+        self.assertEqual(resolve_batch_latest_saved_times(plugin, [self.recent.id]), {})
+
+        start, _ = plugin.get_dates_for_station(self.recent, latest_saved_time=None)
+
+        self.assertEqual(start, self.now - timedelta(hours=1) + timedelta(minutes=1))
+
+    def test_the_batch_resolves_every_station_at_once(self):
+        latest = resolve_batch_latest_saved_times(self.plugin, [self.recent.id, self.empty.id])
+
+        self.assertEqual(latest, {self.recent.id: self.now - timedelta(hours=1), self.empty.id: None})
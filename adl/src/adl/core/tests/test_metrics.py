@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from adl.core import metrics
+
+
+class MetricBufferTests(SimpleTestCase):
+    def setUp(self):
+        self.buffer = metrics._MetricBuffer()
+        patcher = patch.object(metrics, "_buffer", self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def pending(self):
+        return dict(self.buffer._increments)
+
+    def test_increments_add_up_per_series(self):
+        metrics.inc("adl_ingest_records_saved_total", 3, connection="TAHMO")
+        metrics.inc("adl_ingest_records_saved_total", 2, connection="TAHMO")
+        metrics.inc("adl_ingest_records_saved_total", 0, connection="FTP")
+
+        self.assertEqual(self.pending(), {'adl_ingest_records_saved_total{connection="TAHMO"}': 5})
+
+    def test_an_observation_lands_in_every_bucket_it_fits(self):
+        metrics.observe("adl_ingest_qc_seconds", 0.3, connection="TAHMO")
+
+        pending = self.pending()
+        self.assertNotIn('adl_ingest_qc_seconds_bucket{connection="TAHMO",le="0.25"}', pending)
+        self.assertEqual(pending['adl_ingest_qc_seconds_bucket{connection="TAHMO",le="0.5"}'], 1)
+        self.assertEqual(pending['adl_ingest_qc_seconds_bucket{connection="TAHMO",le="+Inf"}'], 1)
+        self.assertEqual(pending['adl_ingest_qc_seconds_count{connection="TAHMO"}'], 1)
+
+    def test_recording_leaves_the_flush_to_a_background_thread(self):
+        with patch.object(metrics._MetricBuffer, "flush") as flush:
+            for _ in range(3):
+                metrics.inc("adl_ingest_records_saved_total", connection="TAHMO")
+
+        flush.assert_not_called()
+        self.assertTrue(self.buffer._flusher.is_alive())
+
+    def test_a_failed_flush_does_not_raise(self):
+        metrics.inc("adl_lock_collisions_total", direction="pull", name="TAHMO")
+
+        with patch("django_redis.get_redis_connection", side_effect=ConnectionError("redis down")):
+            self.buffer.flush()
+
+        self.assertEqual(self.pending(), {})
+
+
+class RenderMetricsTests(SimpleTestCase):
+    def render(self, recorded, latest=None, depths=None):
+        with patch.object(metrics, "_read_redis", return_value=(recorded, latest or {})), \
+                patch("adl.core.broker.get_queue_depths", return_value=depths or {}):
+            return metrics.render_metrics()
+
+    def test_histograms_render_cumulative_buckets_in_order(self):
+        series = '{connection="TAHMO"}'
+        output = self.render({
+            f'adl_ingest_qc_seconds_bucket{{connection="TAHMO",le="{bound}"}}': 1.0
+            for bound in ("0.5", "1.0", "2.5", "5.0", "10.0", "30.0", "+Inf")
+        } | {f"adl_ingest_qc_seconds_sum{series}": 0.3, f"adl_ingest_qc_seconds_count{series}": 1.0})
+
+        lines = [line for line in output.splitlines() if line.startswith("adl_ingest_qc_seconds")]
+        self.assertEqual(lines[0], 'adl_ingest_qc_seconds_bucket{connection="TAHMO",le="0.01"} 0')
+        self.assertEqual(lines[-3], 'adl_ingest_qc_seconds_bucket{connection="TAHMO",le="+Inf"} 1')
+        self.assertEqual(lines[-1], 'adl_ingest_qc_seconds_count{connection="TAHMO"} 1')
+
+    def test_scrape_time_gauges(self):
+        with patch.object(metrics.time, "time", return_value=1_000_060.0):
+            output = self.render(
+                {}, latest={'{connection="TAHMO"}': 1_000_000.0}, depths={"adl": 4, "dispatch": None},
+            )
+
+        self.assertIn('adl_ingest_lag_seconds{connection="TAHMO"} 60', output)
+        self.assertIn('adl_queue_depth{queue="adl"} 4', output)
+        self.assertNotIn('queue="dispatch"', output)
+
+    def test_the_backfill_queue_is_reported(self):
+        with patch("adl.core.broker.get_queue_depths", return_value={}) as get_queue_depths, \
+                patch.object(metrics, "_read_redis", return_value=({}, {})):
+            metrics.render_metrics()
+
+        self.assertIn("backfill", get_queue_depths.call_args.args[0])
+
+
+class MetricsViewTests(SimpleTestCase):
+    @override_settings(ADL_METRICS_TOKEN="")
+    def test_the_endpoint_is_off_without_a_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+    @override_settings(ADL_METRICS_TOKEN="s3cr3t")
+    def test_a_scraper_needs_the_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+
+        with patch.object(metrics, "render_metrics", return_value="# metrics\n"):
+            response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cr3t")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"# metrics\n")
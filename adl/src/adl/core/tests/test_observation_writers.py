@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone as py_tz
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from adl.core.models import ObservationRecord, QCMessage, QCStatus
+from adl.monitoring.models import StationLinkActivityLog
+from .factories import StationLinkFactory, DataParameterFactory, CelsiusUnitFactory
+from .helpers import make_test_plugin, make_mapping
+
+WINDOW_START = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+WINDOW_END = datetime(2025, 1, 2, 0, 0, tzinfo=py_tz.utc)
+
+
+class ObservationWriterTests(TestCase):
+    def setUp(self):
+        self.plugin = make_test_plugin()
+        self.link = StationLinkFactory()
+        unit = CelsiusUnitFactory()
+        self.param = DataParameterFactory(name="air_temperature", unit=unit)
+        self.mapping = make_mapping(self.param, unit, source_name="temp")
+        self.link.get_variable_mappings = lambda: [self.mapping]
+
+    def records(self, *values):
+        return [
+            {"observation_time": WINDOW_START + timedelta(hours=h), "temp": value}
+            for h, value in enumerate(values)
+        ]
+
+    def save(self, records):
+        return self.plugin.save_records(self.link, records, WINDOW_START, WINDOW_END)
+
+    @override_settings(ADL_OBSERVATION_WRITER="copy")
+    def test_copy_writer_inserts_then_updates_on_conflict(self):
+        self.save(self.records(1.0, 2.0))
+        saved, _, _ = self.save(self.records(1.0, 5.0, 3.0))
+
+        self.assertEqual(saved, 3)
+        values = list(ObservationRecord.objects.order_by("time").values_list("value", flat=True))
+        self.assertEqual(values, [1.0, 5.0, 3.0])
+
+    @override_settings(ADL_OBSERVATION_WRITER="copy")
+    def test_copy_writer_returns_saved_instances(self):
+        with patch.object(self.plugin, "after_save_records") as after_save:
+            self.save(self.records(1.0, 2.0))
+
+        saved_records = after_save.call_args.args[2]
+        stored_ids = set(ObservationRecord.objects.values_list("id", flat=True))
+        self.assertEqual({record.id for record in saved_records}, stored_ids)
+        self.assertEqual({record.parameter_id for record in saved_records}, {self.param.id})
+        self.assertTrue(all(record.station == self.link.station for record in saved_records))
+
+    def test_qc_messages_are_linked_with_either_writer(self):
+        self.mapping.qc_checks = [SimpleNamespace(block_type="range_check", value={"max_value": 10})]
+
+        for writer in ("bulk_create", "copy"):
+            with self.subTest(writer=writer), override_settings(ADL_OBSERVATION_WRITER=writer):
+                QCMessage.objects.all().delete()
+                self.save(self.records(1.0, 20.0))
+
+                suspect = ObservationRecord.objects.get(qc_status=QCStatus.SUSPECT)
+                message = QCMessage.objects.get()
+                self.assertEqual(message.obs_record_id, suspect.id)
+                self.assertEqual(message.parameter_id, self.param.id)
+
+    @override_settings(ADL_OBSERVATION_WRITER="nope")
+    def test_unknown_writer_is_a_configuration_error(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.save(self.records(1.0))
+
+    def test_identical_refetch_is_left_untouched_with_either_writer(self):
+        for writer in ("bulk_create", "copy"):
+            with self.subTest(writer=writer), override_settings(ADL_OBSERVATION_WRITER=writer):
+                ObservationRecord.objects.all().delete()
+                self.save(self.records(1.0, 2.0))
+                modified = dict(ObservationRecord.objects.values_list("id", "modified_at"))
+
+                with patch.object(self.plugin, "after_save_records") as after_save:
+                    saved, _, _ = self.save(self.records(1.0, 2.0, 3.0))
+
+                self.assertEqual(saved, 3)
+                written = after_save.call_args.args[2]
+                self.assertEqual([record.value for record in written], [3.0])
+                for record_id, modified_at in modified.items():
+                    self.assertEqual(ObservationRecord.objects.get(id=record_id).modified_at, modified_at)
+
+    def test_a_changed_qc_outcome_alone_is_rewritten(self):
+        for writer in ("bulk_create", "copy"):
+            with self.subTest(writer=writer), override_settings(ADL_OBSERVATION_WRITER=writer):
+                ObservationRecord.objects.all().delete()
+                self.mapping.qc_checks = []
+                self.save(self.records(1.0, 2.0))
+
+                self.mapping.qc_checks = [SimpleNamespace(block_type="range_check", value={"max_value": 1.5})]
+                with patch.object(self.plugin, "after_save_records") as after_save:
+                    self.save(self.records(1.0, 2.0))
+
+                written = after_save.call_args.args[2]
+                self.assertEqual([(record.value, record.qc_status) for record in written], [(2.0, QCStatus.SUSPECT)])
+
+    def test_activity_log_records_inserted_updated_and_unchanged(self):
+        self.save(self.records(1.0, 2.0))
+        with patch.object(type(self.plugin), "get_dates_for_station", return_value=(WINDOW_START, WINDOW_END)), \
+                patch.object(self.plugin, "get_station_data", return_value=self.records(1.0, 5.0, 3.0)):
+            self.plugin.process_station(self.link, bypass_lock=True)
+
+        log = StationLinkActivityLog.objects.get()
+        self.assertEqual(log.records_count, 3)
+        self.assertEqual(
+            (log.inserted_count, log.updated_count, log.unchanged_count), (1, 1, 1)
+        )
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone as py_tz
+from typing import Any, Dict, Set
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from adl.core.normalization import datetime_to_epoch_us
+from adl.core.qc.pipeline import QCPipelineBuilder
+from adl.core.qc.validators import (
+    QCContext,
+    QCFlag,
+    QCResult,
+    QCValidator,
+    PersistenceValidator,
+    RangeValidator,
+    SpikeValidator,
+    StepValidator,
+)
+
+T0 = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+
+# Ten-minute series with a jump, a gap, a stuck stretch and a run of zeros
+VALUES = [10.0, 10.4, 10.1, 18.0, 18.2, 17.9, 12.0, 12.0, 12.0, 12.0, 12.0, 12.0,
+          0.0, 0.0, 0.0, 0.0, 0.0, 11.5, 11.8, 30.0, 11.6, 11.7, 11.9, 12.1]
+MINUTES = [10 * i + (60 if i >= 6 else 0) for i in range(len(VALUES))]
+TIMES = [T0 + timedelta(minutes=m) for m in MINUTES]
+TIMES_US = np.array([datetime_to_epoch_us(t, None) for t in TIMES], dtype=np.int64)
+
+SPLIT = 4
+HISTORY = [
+    {"value": VALUES[i], "time": TIMES[i], "qc_status": None} for i in reversed(range(SPLIT))
+]
+
+
+class NegativeValidator(QCValidator):
+    """A custom validator with only the scalar contract."""
+
+    @property
+    def validator_type(self) -> str:
+        return "negative_check"
+
+    @property
+    def supported_flags(self) -> Set[QCFlag]:
+        return {QCFlag.RANGE}
+
+    def validate(self, value: float, context: QCContext) -> QCResult:
+        if value < 0:
+            return QCResult(passed=False, flags={QCFlag.RANGE}, message="negative")
+        return QCResult(passed=True, flags=set())
+
+    def get_config_schema(self) -> Dict[str, Any]:
+        return {"type": "object"}
+
+
+class ValidateBatchTests(SimpleTestCase):
+    validators = [
+        RangeValidator({"min_value": 5, "max_value": 20}),
+        StepValidator({"max_step_change": 5}),
+        StepValidator({"max_step_change": 50, "max_step_change_per_minute": 0.2}),
+        PersistenceValidator({"max_identical_readings": 4}),
+        PersistenceValidator({"max_identical_readings": 4, "allow_zero_persistence": False}),
+        SpikeValidator({"threshold_multiplier": 2.0, "lookback_samples": 6, "min_samples": 4}),
+    ]
+
+    def assertMatchesScalarPath(self, validator, values, times, history):
+        vectorized = validator.validate_batch(values, times, history)
+        scalar = QCValidator.validate_batch(validator, values, times, history)
+
+        np.testing.assert_array_equal(vectorized.passed, scalar.passed)
+        self.assertEqual(
+            {i: r.message for i, r in vectorized.failures.items()},
+            {i: r.message for i, r in scalar.failures.items()},
+        )
+
+    def test_vectorized_validators_match_the_scalar_path(self):
+        for validator in self.validators:
+            with self.subTest(validator=validator.validator_type, config=validator.config):
+                self.assertMatchesScalarPath(validator, np.array(VALUES), TIMES_US, [])
+                self.assertMatchesScalarPath(
+                    validator, np.array(VALUES[SPLIT:]), TIMES_US[SPLIT:], HISTORY
+                )
+
+    def test_history_is_the_start_of_the_series(self):
+        step = StepValidator({"max_step_change": 5})
+
+        result = step.validate_batch(np.array(VALUES[SPLIT:]), TIMES_US[SPLIT:], HISTORY)
+
+        # 18.2 follows 18.0 from history; against 10.1 it would be a step
+        self.assertTrue(result.passed[0])
+        self.assertFalse(step.validate_batch(np.array([18.2]), TIMES_US[SPLIT:SPLIT + 1], HISTORY[1:]).passed[0])
+
+    def test_custom_validators_fall_back_to_the_scalar_path(self):
+        result = NegativeValidator().validate_batch(np.array([1.0, -1.0]), TIMES_US[:2])
+
+        self.assertEqual(result.passed.tolist(), [True, False])
+        self.assertEqual(result.failures[1].message, "negative")
+
+
+class PipelineRunBatchTests(SimpleTestCase):
+    def test_results_match_run_single_with_a_rolling_history(self):
+        pipeline = (
+            QCPipelineBuilder()
+            .with_range_check(min_value=5, max_value=20)
+            .with_step_check(max_step_change=5)
+            .with_persistence_check(max_identical_readings=4)
+            .build()
+        )
+
+        batch = pipeline.run_batch(np.array(VALUES), TIMES_US)
+
+        history = []
+        for index, (value, time) in enumerate(zip(VALUES, TIMES)):
+            context = QCContext({}, {"observation_time": time}, recent_history=list(history))
+            single = pipeline.run_single(value, context)
+            self.assertEqual(bool(batch.passed[index]), single.passed)
+            self.assertEqual(batch.get_flags(index), single.flags)
+            self.assertEqual(batch.get_summary_message(index), single.get_summary_message())
+            history.insert(0, {"value": value, "time": time, "qc_status": None})
+
+    def test_fail_fast_stops_later_validators_per_value(self):
+        pipeline = (
+            QCPipelineBuilder()
+            .with_range_check(min_value=5, fail_fast=True)
+            .with_custom_validator(NegativeValidator())
+            .build()
+        )
+
+        result = pipeline.run_batch(np.array([-1.0, 6.0]), TIMES_US[:2])
+
+        self.assertEqual(result.get_flags(0), {QCFlag.RANGE})
+        self.assertEqual(len(result.failures[0]), 1)
+        self.assertTrue(result.passed[1])
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone as py_tz
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+
+from adl.core.models import ObservationRecord, QCStatus
+from adl.core.qc.history import RollingHistory
+from .factories import StationLinkFactory, DataParameterFactory, CelsiusUnitFactory
+from .helpers import make_test_plugin, make_mapping
+
+T0 = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+
+
+def _at(minutes):
+    return T0 + timedelta(minutes=minutes)
+
+
+class RollingHistoryTests(SimpleTestCase):
+    def test_before_is_newest_first_and_bounded_by_limit(self):
+        history = RollingHistory(2, [
+            {"time": _at(m), "value": float(m), "qc_status": QCStatus.PASS} for m in (0, 10, 20, 30)
+        ])
+
+        window = history.before(_at(25))
+
+        self.assertEqual([entry["value"] for entry in window], [20.0, 10.0])
+
+    def test_an_added_value_replaces_the_stored_one_at_the_same_time(self):
+        history = RollingHistory(5, [{"time": _at(0), "value": 1.0, "qc_status": QCStatus.PASS}])
+
+        history.add(_at(0), 2.0, QCStatus.SUSPECT)
+
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history.before(_at(1))[0]["value"], 2.0)
+
+
+class SaveChunkQCHistoryTests(TestCase):
+    def setUp(self):
+        self.plugin = make_test_plugin()
+        self.link = StationLinkFactory()
+        unit = CelsiusUnitFactory()
+        self.param = DataParameterFactory(name="air_temperature", unit=unit)
+        mapping = make_mapping(self.param, unit, source_name="temp")
+        mapping.qc_checks = [SimpleNamespace(block_type="step_check", value={"max_step_change": 5})]
+        self.link.get_variable_mappings = lambda: [mapping]
+
+    def test_step_check_sees_the_chunks_own_earlier_values(self):
+        ObservationRecord.objects.create(
+            station=self.link.station,
+            connection=self.link.network_connection,
+            parameter=self.param,
+            value=10.0,
+            time=_at(0),
+        )
+        records = [
+            {"observation_time": _at(m), "temp": value}
+            for m, value in ((10, 12.0), (20, 30.0), (30, 31.0))
+        ]
+
+        with patch.object(self.plugin, "_get_recent_history_for_qc") as per_value_lookup:
+            saved, _, _ = self.plugin.save_records(self.link, records, _at(5), _at(60))
+
+        per_value_lookup.assert_not_called()
+        self.assertEqual(saved, 3)
+        statuses = dict(
+            ObservationRecord.objects.filter(time__gt=_at(0)).values_list("value", "qc_status")
+        )
+        self.assertEqual(statuses, {12.0: QCStatus.PASS, 30.0: QCStatus.SUSPECT, 31.0: QCStatus.PASS})
@@ -0,0 +1,78 @@
+import tempfile
+from datetime import datetime, timedelta, timezone as py_tz
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from adl.core.archive import archived_runs, replay_station_link
+from adl.core.models import ObservationRecord
+from .factories import StationLinkFactory, DataParameterFactory, CelsiusUnitFactory
+from .helpers import make_test_plugin, make_mapping
+
+WINDOW_START = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+WINDOW_END = datetime(2025, 1, 2, 0, 0, tzinfo=py_tz.utc)
+
+
+class RawArchiveTests(TestCase):
+    def setUp(self):
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        settings_override = override_settings(ADL_RAW_ARCHIVE_ROOT=archive_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.plugin = make_test_plugin()
+        self.plugin.records = [
+            {"observation_time": WINDOW_START + timedelta(hours=h, microseconds=250), "temp": value}
+            for h, value in enumerate((1.5, 2.5, 3.5))
+        ]
+        self.link = StationLinkFactory(network_connection__archive_raw_records=True)
+        unit = CelsiusUnitFactory()
+        self.mapping = make_mapping(DataParameterFactory(name="air_temperature", unit=unit), unit,
+                                    source_name="temp")
+        self.link.get_variable_mappings = lambda: [self.mapping]
+
+    def ingest(self):
+        with patch.object(type(self.plugin), "get_dates_for_station", return_value=(WINDOW_START, WINDOW_END)):
+            return self.plugin.process_station(self.link, bypass_lock=True)
+
+    def test_a_run_archives_what_the_source_yielded(self):
+        self.ingest()
+
+        runs = archived_runs(self.link)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual((runs[0].start_date, runs[0].end_date), (WINDOW_START, WINDOW_END))
+        self.assertEqual([record["temp"] for record in runs[0].read()], [1.5, 2.5, 3.5])
+
+    def test_replay_reprocesses_without_calling_the_source(self):
+        self.ingest()
+        ObservationRecord.objects.all().delete()
+
+        with patch.object(type(self.plugin), "get_station_data") as get_station_data:
+            saved = replay_station_link(self.plugin, self.link)
+
+        get_station_data.assert_not_called()
+        self.assertEqual(saved, 3)
+        times = list(ObservationRecord.objects.order_by("time").values_list("time", flat=True))
+        self.assertEqual(times, [record["observation_time"] for record in self.plugin.records])
+        # The replay itself is not archived again
+        self.assertEqual(len(archived_runs(self.link)), 1)
+
+    def test_replay_never_reaches_below_the_retention_floor(self):
+        self.ingest()
+        ObservationRecord.objects.all().delete()
+        floor = WINDOW_START + timedelta(hours=1)
+
+        with patch("adl.core.retention.backfill_floor", return_value=floor):
+            saved = replay_station_link(self.plugin, self.link)
+            self.assertIsNone(replay_station_link(self.plugin, self.link, end_date=floor))
+
+        self.assertEqual(saved, 2)
+        self.assertFalse(ObservationRecord.objects.filter(time__lt=floor).exists())
+
+    def test_connections_without_the_archive_write_nothing(self):
+        self.link.network_connection.archive_raw_records = False
+        self.ingest()
+
+        self.assertEqual(archived_runs(self.link), [])
+        self.assertIsNone(replay_station_link(self.plugin, self.link))
@@ -0,0 +1,123 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone as dj_timezone
+
+from adl.core.models import ObservationRecord
+from adl.core.retention import (
+    RAW_RETENTION_MIN_DAYS,
+    apply_raw_retention,
+    backfill_floor,
+    plan_raw_retention,
+    validate_backfill_start,
+    validate_raw_retention_days,
+)
+from .factories import DataParameterFactory, NetworkConnectionFactory, ObservationRecordFactory, StationFactory
+
+
+class RetentionValidatorTests(SimpleTestCase):
+    def test_zero_keeps_data_for_good(self):
+        validate_raw_retention_days(0)
+
+    def test_retentions_inside_the_aggregate_refresh_window_are_rejected(self):
+        validate_raw_retention_days(RAW_RETENTION_MIN_DAYS)
+        with self.assertRaises(ValidationError):
+            validate_raw_retention_days(RAW_RETENTION_MIN_DAYS - 1)
+
+
+class RetentionPlanTests(TestCase):
+    def setUp(self):
+        self.now = dj_timezone.now()
+
+    def test_chunks_are_dropped_only_below_the_longest_retention(self):
+        first = NetworkConnectionFactory(raw_retention_days=100)
+        second = NetworkConnectionFactory(raw_retention_days=200)
+        parameter = DataParameterFactory(raw_retention_days=400)
+
+        plan = plan_raw_retention(self.now)
+
+        self.assertEqual(plan.connection_cutoffs, {
+            first.id: self.now - timedelta(days=100),
+            second.id: self.now - timedelta(days=200),
+        })
+        self.assertEqual(plan.parameter_cutoffs, {parameter.id: self.now - timedelta(days=400)})
+        self.assertEqual(plan.chunk_cutoff, self.now - timedelta(days=400))
+        self.assertEqual(plan.latest_cutoff, self.now - timedelta(days=100))
+
+    def test_a_connection_keeping_its_data_prevents_chunk_drops(self):
+        NetworkConnectionFactory(raw_retention_days=100)
+        NetworkConnectionFactory(raw_retention_days=0)
+
+        self.assertIsNone(plan_raw_retention(self.now).chunk_cutoff)
+
+
+
+class BackfillFloorTests(TestCase):
+    def setUp(self):
+        cache_get = patch("django.core.cache.cache.get", return_value=None)
+        self.cache_get = cache_get.start()
+        self.addCleanup(cache_get.stop)
+
+    def test_a_connection_whose_rows_never_expire_has_no_floor(self):
+        self.assertIsNone(backfill_floor(NetworkConnectionFactory(raw_retention_days=0)))
+
+    def test_the_floor_is_how_far_the_aggregate_has_been_refreshed(self):
+        network_connection = NetworkConnectionFactory(raw_retention_days=200)
+        refreshed_until = dj_timezone.now() - timedelta(days=150)
+        self.cache_get.return_value = refreshed_until
+
+        self.assertEqual(backfill_floor(network_connection), refreshed_until)
+
+    def test_a_backfill_below_the_floor_is_refused(self):
+        network_connection = NetworkConnectionFactory(raw_retention_days=200)
+        now = dj_timezone.now()
+
+        validate_backfill_start(network_connection, now - timedelta(days=199))
+        with self.assertRaises(ValidationError):
+            validate_backfill_start(network_connection, now - timedelta(days=201))
+
+class ApplyRetentionTests(TestCase):
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("Retention runs on PostgreSQL only")
+        refresh = patch("adl.core.retention._refresh_expiring_band")
+        self.refresh = refresh.start()
+        self.addCleanup(refresh.stop)
+
+        self.now = dj_timezone.now()
+        self.station = StationFactory()
+        self.expiring = NetworkConnectionFactory(raw_retention_days=100)
+        self.kept = NetworkConnectionFactory(raw_retention_days=0)
+        self.parameter = DataParameterFactory()
+
+    def record(self, network_connection, days_ago, parameter=None):
+        return ObservationRecordFactory(station=self.station, connection=network_connection,
+                                        parameter=parameter or self.parameter,
+                                        time=self.now - timedelta(days=days_ago))
+
+    def test_rows_past_their_connections_retention_are_deleted(self):
+        old = self.record(self.expiring, 150)
+        recent = self.record(self.expiring, 50)
+        kept = self.record(self.kept, 150)
+
+        chunks_dropped, rows_deleted, _ = apply_raw_retention(self.now)
+
+        self.assertEqual((chunks_dropped, rows_deleted), (0, 1))
+        remaining = set(ObservationRecord.objects.values_list("id", flat=True))
+        self.assertEqual(remaining, {recent.id, kept.id})
+        self.assertNotIn(old.id, remaining)
+        self.refresh.assert_called_once()
+
+    def test_a_parameter_retention_replaces_the_connections(self):
+        long_lived = DataParameterFactory(raw_retention_days=300)
+        on_expiring = self.record(self.expiring, 150, parameter=long_lived)
+        on_kept = self.record(self.kept, 350, parameter=long_lived)
+
+        apply_raw_retention(self.now)
+
+        remaining = set(ObservationRecord.objects.values_list("id", flat=True))
+        self.assertIn(on_expiring.id, remaining)
+        self.assertNotIn(on_kept.id, remaining)
@@ -10,6 +10,7 @@ that close that gap: buffered records are persisted when the source raises,
 and a source can yield ``FLUSH`` to persist at its own boundaries.
 """
 
+import threading
 from datetime import datetime, timedelta, timezone as py_tz
 from unittest.mock import patch
 
@@ -17,7 +18,7 @@ from celery.exceptions import SoftTimeLimitExceeded
 from django.test import TestCase
 
 from adl.core.models import ObservationRecord
-from adl.core.registries import FLUSH
+from adl.core.registries import FLUSH, station_cancellation
 from adl.monitoring.models import StationLinkActivityLog
 from .factories import (
     StationLinkFactory,
@@ -90,6 +91,25 @@ class InterruptionFlushTests(SaveFlushTestCase):
         # 2 + 2 flushed on size, the trailing 1 flushed on interruption
         self.assertEqual(ObservationRecord.objects.count(), 5)
 
+    def test_a_cut_off_station_stops_before_the_next_record(self):
+        cancelled = threading.Event()
+        read = []
+
+        def source():
+            for minutes in range(1, 6):
+                read.append(minutes)
+                if minutes == 3:
+                    cancelled.set()
+                yield self.record(minutes)
+
+        with station_cancellation(cancelled):
+            with self.assertRaises(SoftTimeLimitExceeded):
+                self.save(source(), chunk_size=2)
+
+        # The chunk saved on size and the record buffered at the cut-off
+        self.assertEqual(read, [1, 2, 3])
+        self.assertEqual(ObservationRecord.objects.count(), 3)
+
     def test_the_original_exception_is_the_one_re_raised(self):
         marker = ValueError("this exact instance")
 
@@ -167,6 +187,71 @@ class FlushMarkerTests(SaveFlushTestCase):
         self.assertEqual(total, 2)
 
 
+class PipelinedSaveTests(SaveFlushTestCase):
+    """With a pipeline depth the source is read on a producer thread while
+    the previous chunk is saved; the guarantees above must not change."""
+
+    def setUp(self):
+        super().setUp()
+        self.plugin.PIPELINE_DEPTH = 1
+        self.events = []
+        original_save_chunk = self.plugin._save_chunk
+
+        def save_chunk(station_link, chunk, *args, **kwargs):
+            self.events.append(f"save {len(chunk)}")
+            return original_save_chunk(station_link, chunk, *args, **kwargs)
+
+        patcher = patch.object(self.plugin, "_save_chunk", side_effect=save_chunk)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_the_next_chunk_is_read_while_the_previous_one_is_saved(self):
+        third_read = threading.Event()
+        overlapped = []
+
+        def source():
+            for minutes in range(1, 5):
+                if minutes == 3:
+                    third_read.set()
+                yield self.record(minutes)
+
+        original_save_chunk = self.plugin._save_chunk.side_effect
+
+        def slow_save(*args, **kwargs):
+            if not overlapped:
+                overlapped.append(third_read.wait(timeout=5))
+            return original_save_chunk(*args, **kwargs)
+
+        self.plugin._save_chunk.side_effect = slow_save
+        total, _, _ = self.save(source(), chunk_size=2)
+
+        self.assertEqual(total, 4)
+        self.assertEqual(overlapped, [True])
+
+    def test_the_source_is_not_resumed_past_flush_until_the_chunk_is_saved(self):
+        def source():
+            yield self.record(1)
+            yield FLUSH
+            self.events.append("resumed")
+            yield self.record(2)
+
+        total, _, _ = self.save(source())
+
+        self.assertEqual(total, 2)
+        self.assertEqual(self.events, ["save 1", "resumed", "save 1"])
+
+    def test_read_ahead_records_are_persisted_before_the_source_error(self):
+        def source():
+            for minutes in range(1, 6):
+                yield self.record(minutes)
+            raise ConnectionError("server went away")
+
+        with self.assertRaises(ConnectionError):
+            self.save(source(), chunk_size=2)
+
+        self.assertEqual(ObservationRecord.objects.count(), 5)
+
+
 class ProcessStationPartialSaveTests(SaveFlushTestCase):
     """The activity log for a run that failed part-way must carry what *was*
     saved, not zero — otherwise the operator sees FAILED / 0 records next to
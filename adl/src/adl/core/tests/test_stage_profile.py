@@ -0,0 +1,67 @@
+import time
+from datetime import datetime, timedelta, timezone as py_tz
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+
+from adl.core.profiling import StageProfile, profile_stage
+from adl.monitoring.models import StationLinkActivityLog
+from .factories import (
+    CelsiusUnitFactory,
+    DataParameterFactory,
+    KelvinUnitFactory,
+    StationLinkFactory,
+)
+from .helpers import make_test_plugin, make_mapping
+
+WINDOW_START = datetime(2025, 1, 1, 0, 0, tzinfo=py_tz.utc)
+WINDOW_END = datetime(2025, 1, 2, 0, 0, tzinfo=py_tz.utc)
+
+
+class StageProfileTests(SimpleTestCase):
+    def test_a_nested_stage_pauses_the_outer_one(self):
+        profile = StageProfile()
+        profile.start()
+        try:
+            with profile_stage("fetch"):
+                time.sleep(0.02)
+                with profile_stage("convert"):
+                    time.sleep(0.05)
+        finally:
+            profile.stop()
+
+        stages = profile.as_dict()
+        self.assertGreaterEqual(stages["convert"]["ms"], 50)
+        self.assertLess(stages["fetch"]["ms"], 50)
+
+    def test_stages_outside_a_profiled_run_do_nothing(self):
+        with profile_stage("fetch"):
+            pass
+
+
+class ProcessStationProfileTests(TestCase):
+    def setUp(self):
+        self.plugin = make_test_plugin()
+        self.link = StationLinkFactory()
+        param = DataParameterFactory(name="air_temperature", unit=CelsiusUnitFactory())
+        mapping = make_mapping(param, KelvinUnitFactory())
+        self.link.get_variable_mappings = lambda: [mapping]
+
+        patcher = patch.object(
+            type(self.plugin), "get_dates_for_station", return_value=(WINDOW_START, WINDOW_END),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_the_run_records_its_stages_on_the_activity_log(self):
+        def fetch(station_link, start_date=None, end_date=None):
+            time.sleep(0.02)
+            for minutes in range(3):
+                yield {"observation_time": WINDOW_START + timedelta(minutes=minutes), "temp_K": 293.15}
+
+        with patch.object(self.plugin, "get_station_data", side_effect=fetch):
+            self.plugin.process_station(self.link, bypass_lock=True)
+
+        stages = StationLinkActivityLog.objects.get().stage_profile
+        self.assertGreaterEqual(stages["fetch"]["ms"], 20)
+        self.assertGreater(stages["upsert"]["queries"], 0)
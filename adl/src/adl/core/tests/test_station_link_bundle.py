@@ -0,0 +1,119 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, models
+from django.test import TestCase
+
+from adl.core.models import DataParameter, StationLink, Unit
+from adl.core.tasks import load_station_link_bundle
+from .factories import (
+    DataParameterFactory,
+    KelvinUnitFactory,
+    NetworkConnectionFactory,
+    StationFactory,
+    StationLinkFactory,
+)
+
+
+class BundleStationLink(StationLink):
+    """A plugin's station link, with its variable mappings."""
+    station_code = models.CharField(max_length=32)
+
+    class Meta:
+        app_label = "core"
+
+
+class BundleVariableMapping(models.Model):
+    station_link = models.ForeignKey(BundleStationLink, on_delete=models.CASCADE, related_name="variable_mappings")
+    adl_parameter = models.ForeignKey(DataParameter, on_delete=models.CASCADE, related_name="+")
+    source_parameter_name = models.CharField(max_length=32)
+    source_parameter_unit = models.ForeignKey(Unit, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        app_label = "core"
+
+
+class StationLinkBundleTests(TestCase):
+    def setUp(self):
+        self.connection = NetworkConnectionFactory()
+        self.links = [StationLinkFactory(network_connection=self.connection) for _ in range(3)]
+        # The polymorphic lookup's content type is cached after the first use
+        ContentType.objects.get_for_model(StationLink)
+
+    def test_the_query_count_does_not_grow_with_the_batch(self):
+        ids = [link.id for link in self.links]
+
+        with self.assertNumQueries(1):
+            bundle = load_station_link_bundle(ids, self.connection)
+
+        self.assertEqual(set(bundle), set(ids))
+
+    def test_what_ingestion_reads_is_already_loaded(self):
+        bundle = load_station_link_bundle([link.id for link in self.links], self.connection)
+
+        with self.assertNumQueries(0):
+            for station_link in bundle.values():
+                str(station_link)
+                station_link.timezone
+                station_link.station.location
+                self.assertIs(station_link.network_connection, self.connection)
+
+    def test_missing_links_are_left_out(self):
+        bundle = load_station_link_bundle([self.links[0].id, 0])
+
+        self.assertEqual(list(bundle), [self.links[0].id])
+
+
+class PluginStationLinkBundleTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Plugin models have no migration in core: their tables live in the
+        # test's transaction and go with it
+        with connection.schema_editor() as editor:
+            editor.create_model(BundleStationLink)
+            editor.create_model(BundleVariableMapping)
+
+    def setUp(self):
+        self.connection = NetworkConnectionFactory()
+        self.links = [StationLinkFactory(network_connection=self.connection) for _ in range(2)]
+        kelvin = KelvinUnitFactory()
+        for index in range(2):
+            link = BundleStationLink.objects.create(
+                network_connection=self.connection, station=StationFactory(), station_code=f"B{index}",
+            )
+            for name in ("temp", "rh"):
+                BundleVariableMapping.objects.create(
+                    station_link=link, adl_parameter=DataParameterFactory(), source_parameter_name=name,
+                    source_parameter_unit=kelvin,
+                )
+            self.links.append(link)
+        for model in (StationLink, BundleStationLink):
+            ContentType.objects.get_for_model(model)
+
+    def test_subclass_links_and_their_mappings_take_one_query_each(self):
+        ids = [link.id for link in self.links]
+
+        # The links, the subclass rows, the subclass's mappings
+        with self.assertNumQueries(3):
+            bundle = load_station_link_bundle(ids, self.connection)
+
+        self.assertEqual(set(bundle), set(ids))
+        self.assertEqual(
+            [type(bundle[link.id]) for link in self.links],
+            [StationLink, StationLink, BundleStationLink, BundleStationLink],
+        )
+
+    def test_subclass_stations_and_mappings_are_already_loaded(self):
+        bundle = load_station_link_bundle([link.id for link in self.links], self.connection)
+        plugin_links = [link for link in bundle.values() if isinstance(link, BundleStationLink)]
+
+        with self.assertNumQueries(0):
+            for station_link in plugin_links:
+                station_link.station.location
+                self.assertIs(station_link.network_connection, self.connection)
+                mappings = list(station_link.variable_mappings.all())
+                self.assertEqual(len(mappings), 2)
+                for mapping in mappings:
+                    mapping.adl_parameter.name
+                    mapping.adl_parameter.unit.symbol
+                    self.assertEqual(mapping.source_parameter_unit.symbol, "K")
+
@@ -0,0 +1,96 @@
+import logging
+from unittest.mock import patch
+
+from celery.signals import task_postrun
+from django.test import SimpleTestCase
+
+from adl.core import logging as task_logging
+from adl.core.logging import TaskLogger, flush_task_log_stream
+
+
+class TaskLoggerStreamTests(SimpleTestCase):
+    def setUp(self):
+        self.logger = TaskLogger(task_id="abc", plugin_label="Test")
+        flush_task_log_stream()
+
+        patcher = patch("adl.core.logging.send_event")
+        self.send_event = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def streamed(self):
+        return [c.args[2]["message"] for c in self.send_event.call_args_list]
+
+    def test_a_disabled_level_is_neither_formatted_nor_streamed(self):
+        class Unprintable:
+            def __str__(self):
+                raise AssertionError("formatted a disabled message")
+
+        with patch.object(self.logger.standard_logger, "isEnabledFor", return_value=False):
+            self.logger.debug("value: %s", Unprintable())
+        flush_task_log_stream()
+
+        self.send_event.assert_not_called()
+
+    def test_the_stream_keeps_its_own_threshold(self):
+        # A worker logging at WARNING still streams info and success lines
+        with patch.object(self.logger.standard_logger, "isEnabledFor", return_value=False), \
+                patch.object(self.logger.standard_logger, "info") as info:
+            self.logger.info("fetching")
+            self.logger.success("done")
+        flush_task_log_stream()
+
+        info.assert_not_called()
+        self.assertEqual(self.streamed(), ["[Test] fetching", "[Test] done"])
+
+    def test_lines_are_queued_until_an_error_sends_them_in_order(self):
+        # Keep the sender thread from picking the lines up first
+        with patch.object(task_logging, "STREAM_FLUSH_SIZE", 1000), \
+                patch.object(task_logging, "STREAM_FLUSH_INTERVAL_SECONDS", 60):
+            self.logger.warning("first")
+            self.logger.error("second")
+
+        self.assertEqual(self.streamed(), ["[Test] first", "[Test] second"])
+
+    def test_queued_lines_are_sent_when_the_task_ends(self):
+        with patch.object(task_logging, "STREAM_FLUSH_SIZE", 1000), \
+                patch.object(task_logging, "STREAM_FLUSH_INTERVAL_SECONDS", 60):
+            self.logger.info("last line")
+            task_postrun.send(sender=None, task_id="abc")
+
+        self.assertEqual(self.streamed(), ["[Test] last line"])
+
+    def test_a_flood_is_capped_per_flush(self):
+        with patch.object(task_logging, "STREAM_FLUSH_SIZE", 1000), \
+                patch.object(task_logging, "STREAM_FLUSH_INTERVAL_SECONDS", 60), \
+                patch.object(task_logging, "STREAM_MAX_EVENTS_PER_FLUSH", 3):
+            for i in range(5):
+                self.logger.warning("line %d", i)
+            self.logger.flush()
+
+        streamed = self.streamed()
+        self.assertEqual(streamed[:3], ["[Test] line 0", "[Test] line 1", "[Test] line 2"])
+        self.assertTrue(streamed[3].startswith("2 log lines not streamed"))
+
+
+class TaskLoggerSummaryTests(SimpleTestCase):
+    def setUp(self):
+        self.logger = TaskLogger(plugin_label="Test")
+
+    def test_repeated_occurrences_are_logged_once_with_their_count(self):
+        with self.assertLogs("adl.core.logging", level=logging.WARNING) as captured:
+            for _ in range(3):
+                self.logger.summarize("warning", "Rejected %d records for station %s", "A", count=2)
+            self.logger.summarize("warning", "Rejected %d records for station %s", "B")
+            self.logger.flush_summaries()
+
+        self.assertCountEqual(captured.output, [
+            "WARNING:adl.core.logging:[Test] Rejected 6 records for station A",
+            "WARNING:adl.core.logging:[Test] Rejected 1 records for station B",
+        ])
+
+    def test_a_summary_is_emitted_once_its_interval_has_passed(self):
+        with patch.object(task_logging, "SUMMARY_INTERVAL_SECONDS", 0), \
+                patch.object(self.logger, "warning") as warning:
+            self.logger.summarize("warning", "Rejected %d records", count=4)
+
+        warning.assert_called_once_with("Rejected %d records", 4)
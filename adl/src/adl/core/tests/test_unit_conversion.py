@@ -0,0 +1,90 @@
+from datetime import datetime, timezone as py_tz
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from pint.errors import DimensionalityError
+
+from adl.core.dispatchers import get_station_dispatch_records
+from adl.core.models import DispatchChannelParameterMapping, ObservationRecord
+from adl.core.units import _pint_convert, get_conversion_plan, units
+from .factories import (
+    CelsiusUnitFactory,
+    DataParameterFactory,
+    KelvinUnitFactory,
+    StationLinkFactory,
+    Wis2BoxUploadFactory,
+)
+
+
+class ConversionPlanTests(SimpleTestCase):
+    def test_temperature_compiles_to_an_affine_plan(self):
+        plan = get_conversion_plan("K", "degC")
+
+        self.assertTrue(plan.is_affine)
+        self.assertAlmostEqual(plan.convert(293.15), 20.0, places=9)
+
+    def test_array_and_scalar_paths_agree_with_pint(self):
+        plan = get_conversion_plan("degF", "degC")
+        values = np.array([-40.0, 32.0, 98.6])
+
+        expected = units.Quantity(values, "degF").to("degC").magnitude
+        np.testing.assert_allclose(plan.convert_array(values), expected, rtol=1e-12)
+        self.assertAlmostEqual(plan.convert(98.6), expected[-1], places=9)
+
+    def test_logarithmic_units_fall_back_to_pint(self):
+        plan = get_conversion_plan("dBz", "mm^6/m^3")
+
+        self.assertFalse(plan.is_affine)
+        np.testing.assert_allclose(plan.convert_array([10.0, 20.0]), [10.0, 100.0])
+
+    def test_plans_convert_exactly_as_pint_does(self):
+        values = np.array([-40.0, -3.7, 0.1, 21.7, 300.0, 1013.25, 12345.678])
+        for from_symbol, to_symbol, context in (
+                ("K", "degC", None), ("degC", "K", None), ("km/h", "m/s", None), ("hPa", "Pa", None),
+                ("degF", "degC", None), ("mm", "kg/m^2", "precipitation"),
+        ):
+            with self.subTest(from_symbol=from_symbol, to_symbol=to_symbol):
+                plan = get_conversion_plan(from_symbol, to_symbol, context)
+                expected = [_pint_convert(value, from_symbol, to_symbol, context) for value in values]
+                np.testing.assert_array_equal(plan.convert_array(values), expected)
+
+    def test_probed_coefficients_carry_no_float_noise(self):
+        plan = get_conversion_plan("degC", "K")
+
+        self.assertEqual((plan.scale, plan.offset), (1.0, 273.15))
+        self.assertEqual(plan.convert(300.0), 573.15)
+
+    def test_custom_context_is_part_of_the_key(self):
+        plan = get_conversion_plan("mm", "kg/m^2", "precipitation")
+
+        self.assertAlmostEqual(plan.convert(5.0), 5.0)
+        with self.assertRaises(DimensionalityError):
+            get_conversion_plan("mm", "kg/m^2")
+
+    def test_plans_are_cached(self):
+        self.assertIs(get_conversion_plan("km/h", "m/s"), get_conversion_plan("km/h", "m/s"))
+
+
+class DispatchConversionTests(TestCase):
+    def test_values_are_converted_to_the_channel_unit(self):
+        link = StationLinkFactory()
+        param = DataParameterFactory(name="air_temperature", unit=CelsiusUnitFactory())
+        channel = Wis2BoxUploadFactory()
+        channel.network_connections.add(link.network_connection)
+        DispatchChannelParameterMapping.objects.create(
+            dispatch_channel=channel,
+            parameter=param,
+            channel_parameter="air_temperature",
+            channel_unit=KelvinUnitFactory(),
+        )
+        ObservationRecord.objects.create(
+            station=link.station,
+            connection=link.network_connection,
+            parameter=param,
+            value=20.0,
+            time=datetime(2025, 1, 1, tzinfo=py_tz.utc),
+        )
+
+        records = get_station_dispatch_records(channel, link)
+
+        self.assertAlmostEqual(records[0]["values"]["air_temperature"], 293.15, places=6)
@@ -1,8 +1,11 @@
 # This file is heavily inspired by the MetPy (metpy.units) library, which is licensed under the BSD 3-Clause License.
 
 import contextlib
+import math
 import re
+import warnings
 
+import numpy as np
 import pint
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
@@ -133,3 +136,143 @@ TEMPERATURE_UNITS = [
     'degreeR',
     '°R'
 ]
+
+
+# Probe inputs used to decide whether a conversion is affine. Spread across
+# signs and magnitudes so an offset, a scale or a curve all show up
+_AFFINE_PROBES = (-40.0, 1.0, 37.5, 1000.0)
+_AFFINE_RELATIVE_TOLERANCE = 1e-9
+
+# Values an affine plan must convert to exactly what pint gives, bit for bit.
+# Rows already stored were converted by pint: a value one ulp away would be
+# rewritten, and never recognised as already stored
+_EXACT_SAMPLES = (-40.0, -12.3, -3.7, 0.0, 0.1, 1.0, 21.7, 37.5, 101.325, 288.15, 300.0, 1013.25, 12345.678)
+
+# Probing leaves float noise in the coefficients (a degC to K scale of
+# 1.0000000000000002); rounded to this many significant digits it is gone
+_SIGNIFICANT_DIGITS = 12
+
+
+def _snap(value):
+    return float(f"{value:.{_SIGNIFICANT_DIGITS}g}")
+
+
+def _pint_convert(value, from_symbol, to_symbol, context=None):
+    """Convert ``value`` (scalar or array) through pint, the slow reference path."""
+    if from_symbol in TEMPERATURE_UNITS or to_symbol in TEMPERATURE_UNITS:
+        quantity = units.Quantity(value, from_symbol)
+    else:
+        quantity = value * units(from_symbol)
+    # use custom unit context if set
+    # Useful for converting units that are not directly convertible  using pint,
+    # like precipitation (from mm -> kg/m²)
+    if context:
+        with units.context(context):
+            return quantity.to(to_symbol).magnitude
+    return quantity.to(to_symbol).magnitude
+
+
+class ConversionPlan:
+    """
+    A unit conversion compiled once for one ``(from, to, context)`` triple.
+
+    Almost every conversion ADL meets is affine — ``K`` to ``degC``, ``km/h``
+    to ``m/s`` — and is applied as ``value * scale + offset`` without
+    touching pint. A conversion that is not (the logarithmic ``dBz``), or
+    whose pint arithmetic no single ``scale`` and ``offset`` reproduce to the
+    last bit, keeps a pint fallback, so the answer never depends on which
+    path ran.
+
+    Both paths accept a scalar or a NumPy array; use :meth:`convert` for a
+    single value and :meth:`convert_array` for a column.
+    """
+    __slots__ = ("from_symbol", "to_symbol", "context", "scale", "offset")
+
+    def __init__(self, from_symbol, to_symbol, context=None, scale=None, offset=None):
+        self.from_symbol = from_symbol
+        self.to_symbol = to_symbol
+        self.context = context
+        self.scale = scale
+        self.offset = offset
+
+    @property
+    def is_affine(self):
+        return self.scale is not None
+
+    def convert(self, value):
+        if self.scale is not None:
+            return value * self.scale + self.offset
+        return _pint_convert(value, self.from_symbol, self.to_symbol, self.context)
+
+    def convert_array(self, values) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        if self.scale is not None:
+            return values * self.scale + self.offset
+        return np.asarray(
+            _pint_convert(values, self.from_symbol, self.to_symbol, self.context), dtype=np.float64
+        )
+
+    def __repr__(self):
+        if self.is_affine:
+            return f"ConversionPlan({self.from_symbol!r} -> {self.to_symbol!r}: x * {self.scale} + {self.offset})"
+        return f"ConversionPlan({self.from_symbol!r} -> {self.to_symbol!r}: pint)"
+
+
+def _compile_conversion_plan(from_symbol, to_symbol, context=None):
+    if from_symbol == to_symbol:
+        return ConversionPlan(from_symbol, to_symbol, context, scale=1.0, offset=0.0)
+
+    # Probing a logarithmic unit at zero is expected to produce -inf; that is
+    # how it is recognised, not something to warn about
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+
+        # Raised on purpose: an impossible conversion must fail at compile
+        # time exactly as it would have failed on the value
+        offset = float(_pint_convert(0.0, from_symbol, to_symbol, context))
+
+        try:
+            # Measured over a wide span so a large offset does not eat the
+            # scale's precision
+            span = _AFFINE_PROBES[-1]
+            scale = (float(_pint_convert(span, from_symbol, to_symbol, context)) - offset) / span
+            for probe in _AFFINE_PROBES:
+                expected = float(_pint_convert(probe, from_symbol, to_symbol, context))
+                predicted = probe * scale + offset
+                if not (math.isfinite(expected) and math.isclose(
+                        predicted, expected, rel_tol=_AFFINE_RELATIVE_TOLERANCE, abs_tol=1e-12)):
+                    return ConversionPlan(from_symbol, to_symbol, context)
+            # A purely multiplicative conversion is pint's own factor at 1
+            unit_scale = float(_pint_convert(1.0, from_symbol, to_symbol, context)) - offset
+            expected = [float(_pint_convert(sample, from_symbol, to_symbol, context)) for sample in _EXACT_SAMPLES]
+        except Exception:
+            return ConversionPlan(from_symbol, to_symbol, context)
+
+    if not (math.isfinite(scale) and math.isfinite(offset)):
+        return ConversionPlan(from_symbol, to_symbol, context)
+
+    for candidate_scale, candidate_offset in ((_snap(scale), _snap(offset)), (unit_scale, offset), (scale, offset)):
+        if all(sample * candidate_scale + candidate_offset == value for sample, value in zip(_EXACT_SAMPLES, expected)):
+            return ConversionPlan(from_symbol, to_symbol, context, scale=candidate_scale, offset=candidate_offset)
+    return ConversionPlan(from_symbol, to_symbol, context)
+
+
+# Plans are immutable, so two threads racing to compile the same key is
+# harmless: both build an identical plan and one of them is kept
+_conversion_plans = {}
+
+
+def get_conversion_plan(from_symbol, to_symbol, context=None) -> ConversionPlan:
+    """
+    The cached :class:`ConversionPlan` converting ``from_symbol`` to
+    ``to_symbol``, optionally under a custom pint ``context``.
+
+    Compiled on first use per process. Raises whatever pint raises when the
+    units are not convertible, so callers keep their existing error handling.
+    """
+    key = (from_symbol, to_symbol, context or None)
+    plan = _conversion_plans.get(key)
+    if plan is None:
+        plan = _compile_conversion_plan(*key)
+        _conversion_plans[key] = plan
+    return plan
@@ -0,0 +1,253 @@
+"""
+Writers that upsert one chunk of observations into the
+:class:`~adl.core.models.ObservationRecord` hypertable.
+
+:meth:`~adl.core.registries.Plugin._save_chunk` hands a writer the chunk's
+surviving ``(time, parameter, value)`` rows together with their QC outcome;
+the writer inserts new rows, updates existing ones on the
+``(time, station, connection, parameter)`` constraint, and returns an
+:class:`UpsertResult`: the ``ObservationRecord`` instances it wrote, with
+their primary keys set — what ``_create_qc_messages`` and
+``after_save_records`` consume — whichever writer ran, plus how many rows
+were inserted, updated or left unchanged.
+
+A conflicting row is only rewritten when its ``value``, ``is_daily`` or QC
+state actually differs. Every run re-fetches from the latest saved
+timestamp and many sources re-send the boundary records, so most conflicts
+are exact repeats; skipping them saves the WAL, the dead tuples and, on a
+compressed chunk, the decompression an identical rewrite would cost.
+Unchanged rows are counted but not returned.
+
+Two writers exist, chosen per plugin with
+:attr:`~adl.core.registries.Plugin.OBSERVATION_WRITER` or deployment-wide
+with the ``ADL_OBSERVATION_WRITER`` setting:
+
+- ``"bulk_create"`` (the default) — ``bulk_create(update_conflicts=True)``.
+- ``"copy"`` — streams the chunk with ``COPY`` into a session-local staging
+  table and moves it into the hypertable with a single
+  ``INSERT ... SELECT ... ON CONFLICT ... RETURNING``. No model instance is
+  built before the write and no multi-row ``INSERT`` is bound parameter by
+  parameter, which is what limits the rate a long backfill can be written
+  at. The saved instances are built from the ``RETURNING`` rows.
+"""
+
+import io
+from typing import Sequence, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone as dj_timezone
+
+WRITER_BULK_CREATE = "bulk_create"
+WRITER_COPY = "copy"
+
+OBSERVATION_WRITERS = (WRITER_BULK_CREATE, WRITER_COPY)
+
+#: Session-local staging table for the ``copy`` writer. ``ON COMMIT DELETE
+#: ROWS`` keeps it empty between transactions; it is also truncated before
+#: every load in case the load runs inside an outer transaction.
+_STAGING_TABLE = "adl_observation_staging"
+
+_CREATE_STAGING_SQL = f"""
+    CREATE TEMPORARY TABLE IF NOT EXISTS {_STAGING_TABLE} (
+        time timestamptz NOT NULL,
+        parameter_id integer NOT NULL,
+        value double precision NOT NULL,
+        qc_status smallint NOT NULL,
+        qc_bits integer NOT NULL
+    ) ON COMMIT DELETE ROWS
+"""
+
+_COPY_SQL = f"COPY {_STAGING_TABLE} (time, parameter_id, value, qc_status, qc_bits) FROM STDIN"
+
+_UPSERT_SQL = f"""
+    INSERT INTO core_observationrecord AS o (
+        time, created_at, modified_at, station_id, connection_id, parameter_id,
+        value, is_daily, qc_status, qc_bits, qc_version
+    )
+    SELECT s.time, %(now)s, %(now)s, %(station_id)s, %(connection_id)s, s.parameter_id,
+           s.value, %(is_daily)s, s.qc_status, s.qc_bits, 1
+    FROM {_STAGING_TABLE} s
+    ON CONFLICT (time, station_id, connection_id, parameter_id) DO UPDATE SET
+        value = EXCLUDED.value,
+        is_daily = EXCLUDED.is_daily,
+        qc_status = EXCLUDED.qc_status,
+        qc_bits = EXCLUDED.qc_bits,
+        qc_version = EXCLUDED.qc_version,
+        modified_at = EXCLUDED.modified_at
+    WHERE (o.value, o.is_daily, o.qc_status, o.qc_bits, o.qc_version)
+        IS DISTINCT FROM (EXCLUDED.value, EXCLUDED.is_daily, EXCLUDED.qc_status, EXCLUDED.qc_bits, EXCLUDED.qc_version)
+    RETURNING id, time, parameter_id, created_at, modified_at, (xmax = 0) AS inserted
+"""
+
+#: Matches the ``batch_size`` the ``bulk_create`` writer has always used
+_BULK_CREATE_BATCH_SIZE = 500
+
+
+#: The fields an upsert compares and rewrites on conflict
+_UPDATE_FIELDS = ["value", "is_daily", "qc_status", "qc_bits", "qc_version"]
+
+
+class UpsertResult:
+    """What one writer call did: the records it wrote and the row counts."""
+    __slots__ = ("records", "inserted", "updated", "unchanged")
+
+    def __init__(self, records=None, inserted=0, updated=0, unchanged=0):
+        self.records = records if records is not None else []
+        self.inserted = inserted
+        self.updated = updated
+        self.unchanged = unchanged
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+def get_default_observation_writer() -> str:
+    return getattr(settings, "ADL_OBSERVATION_WRITER", WRITER_BULK_CREATE)
+
+
+def bulk_create_observations(station, connection, is_daily: bool, rows: Sequence[Tuple],
+                             qc_statuses: Sequence[int], qc_bits: Sequence[int]) -> UpsertResult:
+    """
+    Upsert ``rows`` — ``(utc_time, adl_param, value)`` tuples, aligned with
+    ``qc_statuses`` and ``qc_bits`` — with ``bulk_create(update_conflicts=True)``.
+
+    ``bulk_create`` cannot make the conflict update conditional, so the
+    stored state of the chunk's span is read first, in one query, and rows
+    identical to it are left out of the write.
+    """
+    from adl.core.models import ObservationRecord
+
+    if not rows:
+        return UpsertResult()
+
+    times = [obs_time for obs_time, _, _ in rows]
+    stored = {
+        (obs_time, parameter_id): (value, stored_is_daily, qc_status, int(bits), qc_version)
+        for obs_time, parameter_id, value, stored_is_daily, qc_status, bits, qc_version
+        in ObservationRecord.objects.filter(
+            station=station,
+            connection=connection,
+            parameter_id__in={adl_param.id for _, adl_param, _ in rows},
+            time__gte=min(times),
+            time__lte=max(times),
+        ).order_by().values_list("time", "parameter_id", *_UPDATE_FIELDS)
+    }
+
+    result = UpsertResult()
+    observation_records = []
+    for (obs_time, adl_param, value), qc_status, bits in zip(rows, qc_statuses, qc_bits):
+        current = stored.get((obs_time, adl_param.id))
+        if current is None:
+            result.inserted += 1
+        elif current == (value, is_daily, int(qc_status), int(bits), 1):
+            result.unchanged += 1
+            continue
+        else:
+            result.updated += 1
+
+        observation_records.append(ObservationRecord(
+            station=station,
+            parameter=adl_param,
+            time=obs_time,
+            value=value,
+            connection=connection,
+            is_daily=is_daily,
+            qc_status=qc_status,
+            qc_bits=bits,
+            qc_version=1,
+        ))
+
+    if observation_records:
+        result.records = ObservationRecord.objects.bulk_create(
+            observation_records,
+            update_conflicts=True,
+            update_fields=[*_UPDATE_FIELDS, "modified_at"],
+            unique_fields=["time", "station", "connection", "parameter"],
+            batch_size=_BULK_CREATE_BATCH_SIZE
+        )
+
+    return result
+
+
+def _copy_buffer(rows, qc_statuses, qc_bits) -> io.StringIO:
+    # COPY text format: tab-separated, one line per row. repr() round-trips
+    # a float exactly and spells nan/inf the way Postgres accepts them
+    buffer = io.StringIO()
+    buffer.writelines(
+        f"{obs_time.isoformat()}\t{adl_param.id}\t{float(value)!r}\t{int(qc_status)}\t{int(bits)}\n"
+        for (obs_time, adl_param, value), qc_status, bits in zip(rows, qc_statuses, qc_bits)
+    )
+    buffer.seek(0)
+    return buffer
+
+
+def copy_observations(station, connection, is_daily: bool, rows: Sequence[Tuple],
+                      qc_statuses: Sequence[int], qc_bits: Sequence[int], using: str = "default") -> UpsertResult:
+    """
+    Upsert ``rows`` through a ``COPY``-loaded staging table.
+
+    Same arguments, semantics and return value as
+    :func:`bulk_create_observations`: a conflicting row that differs has its
+    ``value``, ``is_daily`` and QC fields updated, and the returned instances
+    carry the stored ``id``. Here the comparison happens in the conflict
+    clause itself, and ``xmax = 0`` on a returned row tells an insert from an
+    update. Rows must be unique on ``(time, parameter)``, which
+    :func:`~adl.core.normalization.normalize_chunk` guarantees — Postgres
+    rejects an ``ON CONFLICT DO UPDATE`` that would touch a row twice.
+    """
+    from adl.core.models import ObservationRecord
+
+    if not rows:
+        return UpsertResult()
+
+    params_by_id = {adl_param.id: adl_param for _, adl_param, _ in rows}
+    values_by_key = {
+        (obs_time, adl_param.id): (value, qc_status, bits)
+        for (obs_time, adl_param, value), qc_status, bits in zip(rows, qc_statuses, qc_bits)
+    }
+
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute(_CREATE_STAGING_SQL)
+        cursor.execute(f"TRUNCATE {_STAGING_TABLE}")
+        cursor.copy_expert(_COPY_SQL, _copy_buffer(rows, qc_statuses, qc_bits))
+        cursor.execute(_UPSERT_SQL, {
+            "now": dj_timezone.now(),
+            "station_id": station.pk,
+            "connection_id": connection.pk,
+            "is_daily": is_daily,
+        })
+        returned = cursor.fetchall()
+
+    # from_db() takes values in concrete-field order, as a queryset would
+    attnames = [field.attname for field in ObservationRecord._meta.concrete_fields]
+    result = UpsertResult(unchanged=len(rows) - len(returned))
+    for record_id, obs_time, parameter_id, created_at, modified_at, inserted in returned:
+        if inserted:
+            result.inserted += 1
+        else:
+            result.updated += 1
+
+        value, qc_status, bits = values_by_key[(obs_time, parameter_id)]
+        stored = {
+            "id": record_id,
+            "time": obs_time,
+            "created_at": created_at,
+            "modified_at": modified_at,
+            "station_id": station.pk,
+            "connection_id": connection.pk,
+            "parameter_id": parameter_id,
+            "value": value,
+            "is_daily": is_daily,
+            "qc_status": qc_status,
+            "qc_bits": bits,
+            "qc_version": 1,
+        }
+        record = ObservationRecord.from_db(using, attnames, [stored[attname] for attname in attnames])
+        record.station = station
+        record.connection = connection
+        record.parameter = params_by_id[parameter_id]
+        result.records.append(record)
+
+    return result
@@ -1,16 +1,20 @@
+import hmac
 import json
 from collections import defaultdict
 
+from django.conf import settings
 from django.contrib.gis.geos import Point
 from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator, InvalidPage
 from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse_lazy, reverse
 from django.utils import timezone as dj_timezone
 from django.utils.translation import gettext as _
 from django.views.decorators.http import (
+    require_GET,
     require_http_methods,
     require_POST
 )
@@ -1506,3 +1510,25 @@ def trigger_station_dispatch(request, station_link_id, channel_id):
         return redirect(request.META.get('HTTP_REFERER', 'wagtailadmin_home'))
     
     return redirect('wagtailadmin_home')
+
+
+@require_GET
+def metrics(request):
+    """
+    Operational metrics in the Prometheus text format (see
+    :mod:`adl.core.metrics`), for a scraper rather than a user: outside the
+    admin, authenticated by the bearer token in ``ADL_METRICS_TOKEN``. The
+    endpoint does not exist while no token is configured.
+    """
+    from .metrics import render_metrics
+
+    token = settings.ADL_METRICS_TOKEN
+    if not token:
+        raise Http404
+
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = "Bearer"
+        return response
+
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,6 +1,7 @@
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
+from wagtail.admin.panels import ObjectList
 from wagtail.admin.ui.tables import BulkActionsCheckboxColumn
 from wagtail.admin.views import generic
 from wagtail.admin.viewsets.chooser import ChooserViewSet
@@ -9,7 +10,9 @@ from wagtail.admin.widgets import HeaderButton
 
 from .components import StationLinkCollectionStatusPanel, StationLinkSourceCheckPanel
 from .constants import PREDEFINED_DATA_PARAMETERS
+from .forms import BackfillJobForm
 from .models import (
+    BackfillJob,
     Network,
     Station,
     DataParameter,
@@ -295,6 +298,26 @@ class DataParameterChooserViewSet(ChooserViewSet):
     per_page = 50
 
 
+class BackfillJobCreateView(generic.CreateView):
+    def save_instance(self):
+        from .backfill import plan_backfill_job
+        
+        instance = super().save_instance()
+        plan_backfill_job(instance)
+        return instance
+
+
+class BackfillJobViewSet(ModelViewSet):
+    model = BackfillJob
+    icon = "history"
+    add_to_admin_menu = True
+    menu_order = 550
+    add_view_class = BackfillJobCreateView
+    list_display = ["__str__", "status", "progress_display", "created_at", "finished_at"]
+    list_filter = ["status", "network_connection"]
+    edit_handler = ObjectList(BackfillJob.panels, base_form_class=BackfillJobForm)
+
+
 admin_viewsets = [
     NetworkViewSet(),
     NetworkChooserViewSet("network_chooser"),
@@ -304,4 +327,5 @@ admin_viewsets = [
     UnitChooserViewSet("unit_chooser"),
     DataParameterViewSet(),
     DataParameterChooserViewSet("data_parameter_chooser"),
+    BackfillJobViewSet(),
 ]
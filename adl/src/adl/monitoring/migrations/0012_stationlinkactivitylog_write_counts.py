@@ -0,0 +1,28 @@
+# Generated by Django 6.0.7 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0011_alter_networkconnectionhealth_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stationlinkactivitylog',
+            name='inserted_count',
+            field=models.PositiveIntegerField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='stationlinkactivitylog',
+            name='updated_count',
+            field=models.PositiveIntegerField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='stationlinkactivitylog',
+            name='unchanged_count',
+            field=models.PositiveIntegerField(blank=True, default=None, null=True),
+        ),
+    ]
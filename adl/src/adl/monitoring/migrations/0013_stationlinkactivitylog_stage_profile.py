@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-17 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0012_stationlinkactivitylog_write_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stationlinkactivitylog',
+            name='stage_profile',
+            field=models.JSONField(blank=True, default=None, null=True),
+        ),
+    ]
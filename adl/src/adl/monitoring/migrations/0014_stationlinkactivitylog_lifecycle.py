@@ -0,0 +1,53 @@
+# Generated by Django 6.0.7 on 2026-10-17 17:40
+
+from django.db import migrations, models
+
+
+def _has_timescaledb(schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+        return cursor.fetchone() is not None
+
+
+def forwards_enable_compression(apps, schema_editor):
+    if not _has_timescaledb(schema_editor):
+        return
+    tbl = apps.get_model("monitoring", "StationLinkActivityLog")._meta.db_table
+    # Every read is per station link over time. Logs are finalized within a
+    # batch budget, at most a day for a daily connection, hence two days
+    schema_editor.execute(f"""
+        ALTER TABLE {tbl} SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'station_link_id',
+            timescaledb.compress_orderby = 'time DESC, id'
+        );
+        SELECT add_compression_policy('{tbl}', compress_after => INTERVAL '2 days', if_not_exists => true);
+    """)
+
+
+def backwards_disable_compression(apps, schema_editor):
+    if not _has_timescaledb(schema_editor):
+        return
+    tbl = apps.get_model("monitoring", "StationLinkActivityLog")._meta.db_table
+    schema_editor.execute(f"""
+        SELECT remove_compression_policy('{tbl}', if_exists => true);
+        SELECT decompress_chunk(chunk, true) FROM show_chunks('{tbl}') AS chunk;
+        ALTER TABLE {tbl} SET (timescaledb.compress = false);
+    """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0013_stationlinkactivitylog_stage_profile'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stationlinkactivitylog',
+            index=models.Index(condition=models.Q(('status', 'STARTED')), fields=['time'], name='sta_started_time_idx'),
+        ),
+        migrations.RunPython(forwards_enable_compression, backwards_disable_compression),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-17 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0014_stationlinkactivitylog_lifecycle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stationlinkactivitylog',
+            name='is_backfill',
+            field=models.BooleanField(blank=True, default=None, null=True),
+        ),
+    ]
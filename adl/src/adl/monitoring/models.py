@@ -32,6 +32,19 @@ class StationLinkActivityLog(TimescaleModel):
     duration_ms = models.IntegerField(blank=True, null=True)
     task_id = models.CharField(max_length=255, blank=True, null=True)
     records_count = models.PositiveIntegerField(default=0, null=True, blank=True)
+    # How a pull's records_count split on write. NULL = not recorded (pushes,
+    # and pulls from before the counts existed).
+    inserted_count = models.PositiveIntegerField(default=None, null=True, blank=True)
+    updated_count = models.PositiveIntegerField(default=None, null=True, blank=True)
+    unchanged_count = models.PositiveIntegerField(default=None, null=True, blank=True)
+    # Where a pull's time went: {stage: {"ms", "queries", "sql_ms"}}, see
+    # adl.core.profiling. NULL = not recorded (pushes, skipped runs, and pulls
+    # from before the profile existed).
+    stage_profile = models.JSONField(default=None, null=True, blank=True)
+    # True for the pull run of a backfill slice (see adl.core.backfill), which
+    # the stale-run sweep measures against the slice budget. NULL = any other
+    # run.
+    is_backfill = models.BooleanField(default=None, null=True, blank=True)
     # Tri-state: NULL = the plugin did not report how many candidate source
     # items it resolved; 0 = it looked and found nothing; n = it found n.
     sources_count = models.PositiveIntegerField(default=None, null=True, blank=True)
@@ -72,6 +85,13 @@ class StationLinkActivityLog(TimescaleModel):
                 condition=Q(success=False),
             ),
             
+            # the stale-run sweep: rows still STARTED
+            models.Index(
+                fields=["time"],
+                name="sta_started_time_idx",
+                condition=Q(status="STARTED"),
+            ),
+            
             # For push filtered by dispatch channel
             models.Index(
                 fields=["dispatch_channel", "time"],
@@ -87,6 +107,12 @@ class StationLinkActivityLog(TimescaleModel):
             return self.duration_ms / 1000.0
         return None
     
+    def profile_stages(self):
+        """The recorded stages as ``(stage, timings)`` pairs, slowest first."""
+        if not self.stage_profile:
+            return []
+        return sorted(self.stage_profile.items(), key=lambda item: item[1].get("ms", 0), reverse=True)
+    
     @property
     def complete(self):
         return self.success and self.status == self.ActivityStatus.COMPLETED
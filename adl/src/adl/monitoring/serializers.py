@@ -62,6 +62,10 @@ class StationLinkActivityLogSerializer(serializers.ModelSerializer):
             "message",
             "duration_ms",
             "records_count",
+            "inserted_count",
+            "updated_count",
+            "unchanged_count",
+            "stage_profile",
             "messages_count",
             "start_date",
             "end_date",
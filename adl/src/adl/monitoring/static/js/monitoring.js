@@ -163,10 +163,18 @@ class StationsActivityTimeline {
 
         const fmt = (d) => new Date(d).toLocaleString(undefined, {hour12: false});
         const dirLabel = log.direction === "pull" ? "⬇ Pull" : "⬆ Push";
-        const recs = log.records_count != null ? ` • ${log.records_count} recs` : "";
+        const writes = log.inserted_count != null
+            ? ` (${log.inserted_count} new, ${log.updated_count} updated, ${log.unchanged_count} unchanged)` : "";
+        const recs = log.records_count != null ? ` • ${log.records_count} recs${writes}` : "";
         const status = success ? "success" : "error";
         const duration = typeof log.duration_ms === "number" ? ` • ${Math.round(log.duration_ms / 1000)}s` : "";
         const msg = log.message ? `\n${log.message}` : "";
+        const stages = log.stage_profile
+            ? "\n" + Object.entries(log.stage_profile)
+                .sort((a, b) => b[1].ms - a[1].ms)
+                .map(([stage, t]) => `${stage} ${t.ms}ms` + (t.queries ? ` (${t.queries} q, ${t.sql_ms}ms SQL)` : ""))
+                .join(" • ")
+            : "";
 
         const channelTag = (log.dispatch_channel && log.dispatch_channel.name)
             ? ` • ch: ${log.dispatch_channel.name}` : "";
@@ -178,7 +186,7 @@ class StationsActivityTimeline {
                 ? `${dirLabel} · ${log.dispatch_channel.name}` : dirLabel,
             start, end,
             className: cls,
-            title: `${log.station} • ${dirLabel}${channelTag} • ${status}${recs}${duration}\n${fmt(start)} → ${fmt(end)}${msg}`,
+            title: `${log.station} • ${dirLabel}${channelTag} • ${status}${recs}${duration}\n${fmt(start)} → ${fmt(end)}${stages}${msg}`,
             status,
             direction: log.direction,
             task_id: log.task_id || null,
@@ -122,7 +122,7 @@ def dispatch_channel_thresholds(channel):
     if channel.send_aggregated_data:
         if channel.aggregation_period == "hourly":
             aggregation_offset = timedelta(hours=2)
-        elif channel.aggregation_period == "daily":  # Future proofing
+        elif channel.aggregation_period == "daily":
             aggregation_offset = timedelta(days=1)
 
         # Extra buffer: aggregation runs *after* the period closes.
@@ -3,20 +3,42 @@ from datetime import timedelta
 
 from celery.schedules import crontab
 from celery_singleton import Singleton
+from django.conf import settings
+from django.db import connection
 from django.utils import timezone
 
 from adl.config.celery import app
+from adl.core.compression import timescaledb_available
 from .models import NetworkConnectionHealthTransition, SourceProbeResult, StationLinkActivityLog
 
 logger = logging.getLogger(__name__)
 
 
+def drop_expired_activity_logs(now=None):
+    """
+    Drop activity logs older than ``ADL_ACTIVITY_LOG_RETENTION_DAYS``.
+
+    The log is a hypertable of one-day chunks, so retention drops whole
+    chunks: no per-row delete, nothing left to vacuum. A chunk goes once all
+    of it has expired, so up to a day more than the window is kept. Without
+    TimescaleDB the rows are deleted instead. Returns ``(chunks, rows)``
+    dropped, one of them always 0.
+    """
+    cutoff = (now or timezone.now()) - timedelta(days=settings.ADL_ACTIVITY_LOG_RETENTION_DAYS)
+    with connection.cursor() as cursor:
+        if timescaledb_available(cursor):
+            cursor.execute("SELECT count(*) FROM drop_chunks(%s::regclass, older_than => %s)",
+                           [StationLinkActivityLog._meta.db_table, cutoff])
+            return cursor.fetchone()[0], 0
+    deleted_count, _ = StationLinkActivityLog.objects.filter(time__lt=cutoff).delete()
+    return 0, deleted_count
+
+
 @app.task(base=Singleton, bind=True)
 def run_station_link_activity_log_cleanup(self):
     logger.info("[StationLinkActivityLog Cleanup] Starting cleanup...")
-    cutoff = timezone.now() - timedelta(days=7)
-    deleted_count, _ = StationLinkActivityLog.objects.filter(time__lt=cutoff).delete()
-    logger.info(f"[StationLinkActivityLog Cleanup] Deleted {deleted_count} old logs")
+    dropped_chunks, deleted_count = drop_expired_activity_logs()
+    logger.info(f"[StationLinkActivityLog Cleanup] Dropped {dropped_chunks} chunks, deleted {deleted_count} old logs")
 
     transition_cutoff = timezone.now() - timedelta(days=NetworkConnectionHealthTransition.RETENTION_DAYS)
     deleted_transitions, _ = NetworkConnectionHealthTransition.objects.filter(
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone as dj_timezone
+
+from adl.core.tests.factories import StationLinkFactory
+from adl.monitoring.models import StationLinkActivityLog
+from adl.monitoring.tasks import drop_expired_activity_logs
+
+
+@override_settings(ADL_ACTIVITY_LOG_RETENTION_DAYS=7)
+class ActivityLogRetentionTests(TestCase):
+    def setUp(self):
+        self.now = dj_timezone.now()
+        self.link = StationLinkFactory()
+
+    def log(self, days_ago):
+        return StationLinkActivityLog.objects.create(
+            time=self.now - timedelta(days=days_ago),
+            station_link=self.link,
+            direction="pull",
+        )
+
+    def test_logs_past_the_window_are_dropped(self):
+        expired = self.log(10)
+        recent = self.log(1)
+
+        dropped_chunks, deleted = drop_expired_activity_logs(self.now)
+
+        self.assertGreaterEqual(dropped_chunks + deleted, 1)
+        remaining = set(StationLinkActivityLog.objects.values_list("id", flat=True))
+        self.assertIn(recent.id, remaining)
+        self.assertNotIn(expired.id, remaining)
@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 
 import logging
 
@@ -17,6 +17,7 @@ from adl.core.broker import (
     local_library_versions,
     tested_range_display,
 )
+from adl.core.fairness import held_batch_count, latest_batch_waits
 from adl.core.models import NetworkConnection, StationLink
 from adl.core.permissions import can_manage_connection
 from adl.core.probes import claim_probe_cooldown, read_probe_claim
@@ -229,6 +230,13 @@ def connection_health(request, connection_id):
         for transition in transitions_page
     ]
 
+    # How long this connection's latest batch sat on the shared queue, and
+    # how many of its batches wait for an in-flight slot — what a cap (or
+    # another connection's flood) does to it
+    batch_wait = latest_batch_waits([connection.id]).get(connection.id)
+    if batch_wait:
+        batch_wait["at"] = datetime.fromtimestamp(batch_wait["at"], tz=dt_timezone.utc)
+
     context = {
         "breadcrumbs_items": [
             {"url": reverse("wagtailadmin_home"), "label": _("Home")},
@@ -250,6 +258,8 @@ def connection_health(request, connection_id):
                             and not ingestion_queue_unconsumed),
         "latest_run_was_manual": latest_run_was_manual(heartbeat),
         "heartbeat": heartbeat,
+        "batch_wait": batch_wait,
+        "held_batches": held_batch_count(connection) if connection.max_inflight_batches else None,
         "transitions_page": transitions_page,
         "transition_rows": transition_rows,
         "elided_page_range": paginator.get_elided_page_range(transitions_page.number),
@@ -33,6 +33,7 @@ gunicorn-wsgi       : Start ADL using a prod ready gunicorn server:
 celery-worker-default: Start the Celery worker (default queue)
 celery-worker-adl   : Start the Celery worker for the ADL ingestion queue
 celery-worker-dispatch : Start the Celery worker for the outbound dispatch queue
+celery-worker-backfill : Start the Celery worker for the historical backfill queue
 celery-worker-dev   : Start the Celery worker with auto-reload on code changes
                       (requires the dev build target)
 celery-beat         : Start the Celery beat scheduler
@@ -149,6 +150,9 @@ celery-worker-adl)
 celery-worker-dispatch)
     start_celery_worker -Q dispatch -n dispatch-worker@%h "${@:2}"
     ;;
+celery-worker-backfill)
+    start_celery_worker -Q backfill -n backfill-worker@%h "${@:2}"
+    ;;
 celery-worker-dev)
     startup_plugin_setup
     exec watchfiles \